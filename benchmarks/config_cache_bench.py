@@ -0,0 +1,92 @@
+"""Config lookups through utils.cache against hitting SQLite every time.
+
+Times ``get_ignore_data`` uncached (a fresh connection and four queries, as
+before) and cached under each backend, then how long an invalidation takes
+to reach a second cache: two caches sharing an IPC hub for ``ipc`` and two
+mappings of the same shared block (what two processes see) for ``shm``.
+
+Run from the repository root:
+
+    python -m benchmarks.config_cache_bench [lookups]
+"""
+import asyncio
+import sys
+import time
+
+from utils.cache import ConfigCache, IPCVersions, MemoryVersions, SharedVersions
+from utils.ipc import IPCClient, IPCHub
+from utils.Tools import _load_ignore_data
+
+GUILD = 699587669059174461
+PORT = 18766
+
+
+async def per_lookup(func, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        await func()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+async def propagation(writer: ConfigCache, reader: ConfigCache, rounds: int = 50) -> float:
+    """Mean time from ``writer.invalidate`` until ``reader`` reloads."""
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        return loads
+
+    total = 0.0
+    for _ in range(rounds):
+        await reader.get("ignore", GUILD, load)
+        before = loads
+        start = time.perf_counter()
+        await writer.invalidate("ignore", GUILD)
+        while await reader.get("ignore", GUILD, load) == before:
+            await asyncio.sleep(0)
+        total += time.perf_counter() - start
+    return total / rounds * 1e3
+
+
+async def main(count: int) -> None:
+    uncached = await per_lookup(lambda: _load_ignore_data(GUILD), count)
+    print(f"{'sqlite':<7} {uncached:8.1f} us/lookup")
+
+    hub = IPCHub(PORT)
+    await hub.start()
+    clients = [IPCClient(cluster) for cluster in range(2)]
+    for client in clients:
+        await client.connect(PORT)
+    shm_name = f"{SharedVersions.NAME}-bench"
+    first, second = SharedVersions(shm_name), SharedVersions(shm_name)
+    try:
+        backends = {
+            "memory": (MemoryVersions(), None),
+            "ipc": (IPCVersions(), IPCVersions()),
+            "shm": (first, second),
+        }
+        await asyncio.sleep(0.1)
+        for name, (versions, other) in backends.items():
+            cache = ConfigCache(versions)
+            cached = await per_lookup(lambda: cache.get("ignore", GUILD, lambda: _load_ignore_data(GUILD)), count)
+            line = f"{name:<7} {cached:8.1f} us/lookup  {uncached / cached:6.0f}x"
+            if other is not None:
+                peer = ConfigCache(other)
+                if name == "ipc":
+                    cache.attach(clients[0])
+                    peer.attach(clients[1])
+                line += f"  invalidation seen by another cache in {await propagation(cache, peer):.3f} ms"
+            print(line)
+    finally:
+        for client in clients:
+            await client.close()
+        await asyncio.sleep(0.1)
+        await hub.close()
+        second.close()
+        first.close()
+        first.unlink()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,95 @@
+"""Connect-4 engine throughput: win detection and solver positions per second.
+
+Run from the repository root:
+
+    python -m benchmarks.connect_four_bench [positions]
+"""
+import random
+import sys
+import time
+
+from games.connect_four import DIFFICULTIES, HEIGHT, WIDTH, Position, Solver
+
+
+def random_positions(count: int, rng: random.Random) -> list:
+    positions = []
+    while len(positions) < count:
+        pos = Position()
+        for _ in range(rng.randrange(4, 30)):
+            cols = [c for c in range(WIDTH) if pos.can_play(c) and not pos.is_winning_move(c)]
+            if not cols:
+                break
+            pos.play(rng.choice(cols))
+        if not pos.is_full():
+            positions.append(pos)
+    return positions
+
+
+def scan_win(grid: list) -> bool:
+    """The old list-of-lists scan, run after every move."""
+    for x in range(HEIGHT):
+        for i in range(WIDTH - 3):
+            if grid[x][i] == grid[x][i + 1] == grid[x][i + 2] == grid[x][i + 3] != 0:
+                return True
+    for x in range(HEIGHT - 3):
+        for i in range(WIDTH):
+            if grid[x][i] == grid[x + 1][i] == grid[x + 2][i] == grid[x + 3][i] != 0:
+                return True
+    for x in range(HEIGHT - 3):
+        for i in range(WIDTH - 3):
+            if grid[x][i] == grid[x + 1][i + 1] == grid[x + 2][i + 2] == grid[x + 3][i + 3] != 0:
+                return True
+    for x in range(HEIGHT - 1, 2, -1):
+        for i in range(WIDTH - 3):
+            if grid[x][i] == grid[x - 1][i + 1] == grid[x - 2][i + 2] == grid[x - 3][i + 3] != 0:
+                return True
+    return False
+
+
+def bench_win_detection(positions: list) -> None:
+    grids = []
+    for pos in positions:
+        first, second = pos.stones(first=True), pos.stones(first=False)
+        grids.append([
+            [1 if first >> (c * (HEIGHT + 1) + r) & 1 else 2 if second >> (c * (HEIGHT + 1) + r) & 1 else 0
+             for c in range(WIDTH)]
+            for r in range(HEIGHT - 1, -1, -1)
+        ])
+
+    start = time.perf_counter()
+    for grid in grids:
+        scan_win(grid)
+    scan = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for pos in positions:
+        for col in range(WIDTH):
+            if pos.can_play(col):
+                pos.is_winning_move(col)
+    bitboard = time.perf_counter() - start
+
+    print(f"win check  scan {len(grids) / scan:10.0f} boards/s   "
+          f"bitboard {len(positions) * WIDTH / bitboard:10.0f} columns/s")
+
+
+def bench_solver(positions: list) -> None:
+    for name in DIFFICULTIES:
+        solver = Solver.for_difficulty(name)
+        nodes = 0
+        start = time.perf_counter()
+        for pos in positions:
+            solver.best_move(pos)
+            nodes += solver.nodes
+        elapsed = time.perf_counter() - start
+        print(f"{name:<7} {len(positions) / elapsed:8.1f} positions/s  "
+              f"{elapsed / len(positions) * 1000:7.1f} ms/move  {nodes / elapsed:9.0f} nodes/s")
+
+
+def main(count: int = 50) -> None:
+    positions = random_positions(count, random.Random(0))
+    bench_win_detection(positions)
+    bench_solver(positions)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,104 @@
+"""Member cache memory and startup work per cache profile.
+
+Builds synthetic guilds through discord.py's own Guild/Member parsing the
+way each profile receives them: GUILD_CREATE carries every member of small
+guilds but only the online ones of large guilds (and none of them without
+the presences intent), and ``full`` then chunks every guild. Gateway
+round-trips are not simulated, so startup time is parsing and caching only.
+
+Run from the repository root:
+
+    python -m benchmarks.profile_bench [guilds] [members per guild]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+import discord
+from discord.member import Member
+from discord.presences import RawPresenceUpdateEvent
+
+from utils.profiles import PROFILES, cache_profile
+
+LARGE_THRESHOLD = 250
+ONLINE = 0.2
+
+
+def member_payload(user_id: int) -> dict:
+    return {
+        "user": {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0", "avatar": None, "global_name": None},
+        "roles": [], "joined_at": "2024-01-01T00:00:00+00:00", "deaf": False, "mute": False, "flags": 0,
+    }
+
+
+def presence_payload(user_id: int, guild_id: int) -> dict:
+    return {"user": {"id": str(user_id)}, "guild_id": str(guild_id), "status": "online",
+            "activities": [], "client_status": {"desktop": "online"}}
+
+
+def guild_payload(guild_id: int, size: int, presences: bool, rng: random.Random) -> tuple[dict, list[int]]:
+    users = [guild_id * 1_000_000 + i for i in range(size)]
+    online = [u for u in users if rng.random() < ONLINE]
+    large = size >= LARGE_THRESHOLD
+    sent = users if not large else online if presences else []
+    return {
+        "id": str(guild_id), "name": f"guild{guild_id}", "owner_id": str(users[0]), "member_count": size,
+        "large": large, "features": [], "emojis": [], "stickers": [], "channels": [], "voice_states": [],
+        "roles": [{"id": str(guild_id), "name": "@everyone", "permissions": "0", "position": 0, "color": 0,
+                   "hoist": False, "managed": False, "mentionable": False}],
+        "members": [member_payload(u) for u in sent],
+        "presences": [presence_payload(u, guild_id) for u in online] if presences else [],
+    }, users
+
+
+def build(kwargs: dict, state, payloads: list) -> list[discord.Guild]:
+    guilds = []
+    for payload, users in payloads:
+        guild = discord.Guild(data=payload, state=state)
+        if kwargs["chunk_guilds_at_startup"] and not guild.chunked:
+            # what a GUILD_MEMBERS_CHUNK sequence adds
+            for user_id in users:
+                if guild.get_member(user_id) is None:
+                    guild._add_member(Member(data=member_payload(user_id), guild=guild, state=state))
+            for presence in payload["presences"]:
+                member = guild.get_member(int(presence["user"]["id"]))
+                member._presence_update(RawPresenceUpdateEvent(data=presence, state=state), ())
+        guilds.append(guild)
+    return guilds
+
+
+def run(name: str, sizes: list[int]) -> tuple[int, float, int]:
+    kwargs = cache_profile(name)
+    rng = random.Random(0)
+    payloads = [guild_payload(i + 1, size, kwargs["intents"].presences, rng) for i, size in enumerate(sizes)]
+
+    start = time.perf_counter()
+    guilds = build(kwargs, discord.Client(**kwargs)._connection, payloads)
+    elapsed = time.perf_counter() - start
+    cached = sum(len(guild.members) for guild in guilds)
+    del guilds
+
+    state = discord.Client(**kwargs)._connection
+    tracemalloc.start()
+    guilds = build(kwargs, state, payloads)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cached, elapsed, memory
+
+
+def main(guilds: int, members: int) -> None:
+    rng = random.Random(1)
+    # mostly small guilds and a few big ones, like a public bot
+    sizes = [max(2, int(rng.paretovariate(1.2) * members / 5)) for _ in range(guilds)]
+    print(f"{guilds} guilds, {sum(sizes)} members ({sum(s >= LARGE_THRESHOLD for s in sizes)} large guilds)")
+    for name in PROFILES:
+        cached, elapsed, memory = run(name, sizes)
+        print(f"{name:<9} {cached:9d} members cached  {memory / 2**20:8.1f} MiB  {elapsed * 1000:8.0f} ms")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 500,
+    )
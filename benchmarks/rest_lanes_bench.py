@@ -0,0 +1,94 @@
+"""Ban latency during a simulated raid, with and without utils.rest's lanes.
+
+A fake ``HTTPClient.request`` stands in for Discord: a global limit of 50
+calls/s handed out first come, first served (like discord.py's global lock),
+a per-channel reaction bucket of 4/s and 50 ms round trips. A join raid
+sets off welcome messages and a burst of autoreact reactions; a second later
+antinuke starts banning. Prints how long the bans took to go out, and what
+the cosmetic lane shed and coalesced along the way.
+
+Run from the repository root:
+
+    python -m benchmarks.rest_lanes_bench [raiders]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+from discord.http import Route
+
+from utils.rest import COSMETIC, SECURITY, RequestShed, RestScheduler, lane
+
+GLOBAL_RATE = 50
+REACTIONS_RATE = 4
+ROUND_TRIP = 0.05
+
+
+class FakeDiscord:
+    def __init__(self):
+        self.next_global = 0.0
+        self.next_bucket: dict[str, float] = {}
+
+    async def slot(self, key: str, rate: float, table: dict) -> None:
+        now = time.monotonic()
+        at = max(now, table.get(key, 0.0))
+        table[key] = at + 1 / rate
+        await asyncio.sleep(at - now)
+
+    async def request(self, route: Route, **kwargs):
+        if "reactions" in route.path:
+            await self.slot(f"{route.channel_id}", REACTIONS_RATE, self.next_bucket)
+        now = time.monotonic()
+        at = max(now, self.next_global)
+        self.next_global = at + 1 / GLOBAL_RATE
+        await asyncio.sleep(at - now + ROUND_TRIP)
+        return {"id": route.url}
+
+
+async def raid(request, raiders: int) -> dict:
+    shed = 0
+
+    async def cosmetic(route: Route):
+        nonlocal shed
+        with lane(COSMETIC):
+            try:
+                await request(route)
+            except RequestShed:
+                shed += 1
+
+    async def ban(user_id: int) -> float:
+        start = time.monotonic()
+        with lane(SECURITY):
+            await request(Route("PUT", "/guilds/{guild_id}/bans/{user_id}", guild_id=1, user_id=user_id))
+        return time.monotonic() - start
+
+    noise = []
+    for user_id in range(raiders):
+        noise.append(cosmetic(Route("POST", "/channels/{channel_id}/messages", channel_id=10)))
+        for emoji in range(5):
+            noise.append(cosmetic(Route("PUT", "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me",
+                                        channel_id=20 + user_id % 10, message_id=user_id, emoji=str(emoji))))
+        # the music controller refreshing the same message over and over
+        noise.append(cosmetic(Route("PATCH", "/channels/{channel_id}/messages/{message_id}",
+                                    channel_id=30, message_id=1)))
+    background = [asyncio.create_task(call) for call in noise]
+    await asyncio.sleep(1.0)
+    bans = await asyncio.gather(*(ban(user_id) for user_id in range(raiders)))
+    await asyncio.gather(*background)
+    return {"bans": bans, "shed": shed}
+
+
+async def main(raiders: int) -> None:
+    direct = await raid(FakeDiscord().request, raiders)
+    scheduler = RestScheduler(FakeDiscord().request)
+    laned = await raid(scheduler.request, raiders)
+    for name, outcome in (("direct", direct), ("lanes", laned)):
+        bans = outcome["bans"]
+        print(f"{name:<7} bans p50 {statistics.median(bans) * 1e3:7.0f} ms  max {max(bans) * 1e3:7.0f} ms"
+              f"  cosmetic shed {outcome['shed']}")
+    print(f"coalesced edits: {scheduler.coalesced[COSMETIC]}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
@@ -0,0 +1,63 @@
+"""Slots GIF throughput, old per-frame RGBA pipeline vs. precomputed strips.
+
+Run from the repository root:
+
+    python -m benchmarks.slots_bench [spins]
+"""
+import random
+import sys
+import time
+from io import BytesIO
+
+from PIL import Image
+
+from utils import render
+from utils.assets import atlas
+
+PATH = "data/pictures/"
+
+
+def baseline(s1: int, s2: int, s3: int) -> bytes:
+    facade = atlas.image(f'{PATH}slot-face.png')
+    reel = atlas.image(f'{PATH}slot-reel.png')
+    rw = reel.width
+
+    images = []
+    for i in range(1, render.SLOT_FRAMES + 1):
+        bg = Image.new('RGBA', facade.size, color=(255, 255, 255))
+        for column, stop in enumerate((s1, s2, s3)):
+            bg.paste(reel, (25 + rw * column, 100 - (render.SLOT_SPEED * i * stop)))
+        bg.alpha_composite(facade)
+        images.append(bg)
+
+    buf = BytesIO()
+    images[0].save(buf, "GIF", save_all=True, append_images=images[1:], duration=50)
+    return buf.getvalue()
+
+
+def bench(name: str, func, outcomes: list) -> float:
+    start = time.perf_counter()
+    size = sum(len(func(*outcome)) for outcome in outcomes)
+    elapsed = time.perf_counter() - start
+    rate = len(outcomes) / elapsed
+    print(f"{name:<10} {rate:7.2f} spins/s  {elapsed / len(outcomes) * 1000:7.1f} ms/spin  "
+          f"{size // len(outcomes) // 1024} KiB/gif")
+    return rate
+
+
+def main(spins: int = 20) -> None:
+    items = atlas.image(f'{PATH}slot-reel.png').height // render.SLOT_ITEM
+    rng = random.Random(0)
+    outcomes = [tuple(rng.randint(1, items - 1) for _ in range(3)) for _ in range(spins)]
+
+    start = time.perf_counter()
+    render._slot_strips(PATH)
+    print(f"strips built in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    old = bench("baseline", baseline, outcomes)
+    new = bench("strips", lambda *s: render._render_slots(*s, path=PATH), outcomes)
+    print(f"speedup    {new / old:7.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
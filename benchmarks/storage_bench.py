@@ -0,0 +1,104 @@
+"""Per-message database I/O under each storage mode.
+
+Replays the queries one guild message triggers (prefix lookup, blacklist
+and mention checks, afk, the automod listeners, autoreact, autoresponder,
+media and word filters), opening a connection per query the way the cogs
+do, plus one write every ``WRITE_EVERY`` messages, then commits on their
+own. Runs against a copy of the shipped db/ files in a temporary directory.
+
+Shared files win on commits (WAL, no fsync per commit), and on reads too
+since their connections are pooled: with one file per module every query
+opens a connection and parses its schema.
+
+Run from the repository root:
+
+    python -m benchmarks.storage_bench [messages] [concurrency]
+"""
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from utils import storage
+
+WRITE_EVERY = 10
+
+MESSAGE_QUERIES: list[tuple[str, str, int]] = [
+    ("db/np.db", "SELECT id FROM np WHERE id = ?", 1),
+    ("db/prefix.db", "SELECT prefix FROM prefixes WHERE guild_id = ?", 1),
+    ("db/block.db", "SELECT 1 FROM guild_blacklist WHERE guild_id = ?", 1),
+    ("db/block.db", "SELECT 1 FROM user_blacklist WHERE user_id = ?", 1),
+    ("db/afk.db", "SELECT AFK, time, mentions, reason FROM afk WHERE user_id = ?", 1),
+    ("db/autoreact.db", "SELECT trigger, emojis FROM autoreact WHERE guild_id = ?", 1),
+    ("db/autoresponder.db", "SELECT message FROM autoresponses WHERE guild_id = ? AND LOWER(name) = ?", 2),
+    ("db/media.db", "SELECT channel_id FROM media_channels WHERE guild_id = ?", 1),
+    ("db/blword.db", "SELECT * FROM blacklist WHERE guild_id = ? AND word = ?", 2),
+] + [
+    # six automod listeners, each checks the toggle and its ignore list
+    (path, query, args)
+    for _ in range(6)
+    for path, query, args in (
+        ("db/automod.db", "SELECT enabled FROM automod WHERE guild_id = ?", 1),
+        ("db/automod.db", "SELECT id FROM automod_ignored WHERE guild_id = ? AND type = ?", 2),
+    )
+]
+
+
+async def query(mode: str, path: str, sql: str, args: int, value: int) -> None:
+    async with storage.connect(path, mode=mode) as db:
+        async with db.execute(sql, (value,) * args) as cursor:
+            await cursor.fetchall()
+
+
+async def write(mode: str, value: int) -> None:
+    async with storage.connect("db/stats.db", mode=mode) as db:
+        await db.execute("INSERT OR REPLACE INTO stats (key, value) VALUES ('bench', ?)", (value,))
+        await db.commit()
+
+
+async def message(mode: str, i: int) -> None:
+    for path, sql, args in MESSAGE_QUERIES:
+        await query(mode, path, sql, args, i)
+    if i % WRITE_EVERY == 0:
+        await write(mode, i)
+
+
+async def run(func, mode: str, count: int, concurrency: int) -> float:
+    start = time.perf_counter()
+    for base in range(0, count, concurrency):
+        await asyncio.gather(*(func(mode, i) for i in range(base, min(base + concurrency, count))))
+    return count / (time.perf_counter() - start)
+
+
+def files_touched(mode: str) -> int:
+    return len({storage.resolve(path, mode) for path, _, _ in MESSAGE_QUERIES} | {storage.resolve("db/stats.db", mode)})
+
+
+async def main(count: int, concurrency: int) -> None:
+    root = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copytree(os.path.join(root, "db"), os.path.join(tmp, "db"))
+        os.chdir(tmp)
+        try:
+            for mode in ("single", "sharded"):
+                await storage.migrate_storage(mode)
+
+            print(f"{len(MESSAGE_QUERIES)} reads per message, 1 write every {WRITE_EVERY}, concurrency {concurrency}")
+            for mode in storage.MODES:
+                await run(message, mode, min(count, 20), concurrency)
+                rate = await run(message, mode, count, concurrency)
+                writes = await run(write, mode, count, concurrency)
+                print(f"{mode:<8} {files_touched(mode):3d} files/message  {rate:8.1f} messages/s  "
+                      f"{1000 / rate:6.2f} ms/message  {writes:8.1f} commits/s")
+        finally:
+            await storage.close_pool()
+            os.chdir(root)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 300,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 8,
+    ))
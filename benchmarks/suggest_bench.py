@@ -0,0 +1,81 @@
+"""Typo suggestions: difflib over every command name vs the bigram posting-list index.
+
+Command names and aliases are read from the cog sources (no bot needed).
+
+Run from the repository root:
+
+    python -m benchmarks.suggest_bench [lookups]
+"""
+import ast
+import difflib
+import pathlib
+import random
+import sys
+import time
+
+from utils.help import SuggestionIndex
+
+DECORATORS = {"command", "group", "hybrid_command", "hybrid_group"}
+
+
+def command_terms(root: str = "cogs") -> dict[str, str]:
+    """name/alias -> command name, for every decorated command under ``root``."""
+    terms = {}
+    for path in pathlib.Path(root).rglob("*.py"):
+        if "unused" in str(path):
+            continue
+        for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+            if not isinstance(node, ast.AsyncFunctionDef):
+                continue
+            for deco in node.decorator_list:
+                if not isinstance(deco, ast.Call) or getattr(deco.func, "attr", getattr(deco.func, "id", None)) not in DECORATORS:
+                    continue
+                kwargs = {kw.arg: kw.value for kw in deco.keywords}
+                name = node.name
+                if isinstance(kwargs.get("name"), ast.Constant):
+                    name = kwargs["name"].value
+                aliases = []
+                if isinstance(kwargs.get("aliases"), (ast.List, ast.Tuple)):
+                    aliases = [e.value for e in kwargs["aliases"].elts if isinstance(e, ast.Constant)]
+                for term in (name, *aliases):
+                    terms.setdefault(term.lower(), name)
+    return terms
+
+
+def typo(word: str, rng: random.Random) -> str:
+    i = rng.randrange(len(word))
+    op = rng.randrange(3)
+    if op == 0 and len(word) > 1:
+        return word[:i] + word[i + 1:]
+    if op == 1 and i + 1 < len(word):
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + word[i:]
+
+
+def main(count: int = 2000) -> None:
+    terms = command_terms()
+    rng = random.Random(0)
+    words = [typo(rng.choice(list(terms)), rng) for _ in range(count)]
+
+    start = time.perf_counter()
+    index = SuggestionIndex(terms)
+    print(f"{len(terms)} names and aliases, index built in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    names = sorted(set(terms.values()))
+    start = time.perf_counter()
+    for word in words:
+        difflib.get_close_matches(word, names)
+    old = (time.perf_counter() - start) / count
+
+    start = time.perf_counter()
+    for word in words:
+        index.suggest(word)
+    new = (time.perf_counter() - start) / count
+
+    hits = sum(1 for word in words if index.suggest(word))
+    print(f"difflib {old * 1e6:8.1f} us/lookup   index {new * 1e6:8.1f} us/lookup   ({old / new:.1f}x)")
+    print(f"{hits}/{count} typos got a suggestion")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,118 @@
+"""2048 engine throughput: list moves vs. packed row tables, hint latency and autoplay.
+
+Run from the repository root:
+
+    python -m benchmarks.twenty_48_bench [games]
+"""
+import random
+import sys
+import time
+
+from games.twenty_48 import DIRECTIONS, Twenty48, best_move, empty_cells, move_cells, _move_tables, _score_table
+
+
+def list_move(board: list, direction: str) -> list:
+    """The old list-of-lists pipeline: transpose/reverse, compress, merge, compress."""
+    game = _ListBoard(board)
+    return game.moves[direction]()
+
+
+class _ListBoard:
+    def __init__(self, board: list) -> None:
+        self.board = [row[:] for row in board]
+        self.moves = {
+            "⬅️": lambda: self._run(False, False),
+            "➡️": lambda: self._run(False, True),
+            "⬆️": lambda: self._run(True, False),
+            "⬇️": lambda: self._run(True, True),
+        }
+
+    @staticmethod
+    def _transp(board):
+        return [[board[i][j] for i in range(4)] for j in range(4)]
+
+    @staticmethod
+    def _compress(board):
+        new_board = [[0 for _ in range(4)] for _ in range(4)]
+        for i in range(4):
+            pos = 0
+            for j in range(4):
+                if board[i][j] != 0:
+                    new_board[i][pos] = board[i][j]
+                    pos += 1
+        return new_board
+
+    @staticmethod
+    def _merge(board):
+        for i in range(4):
+            for j in range(3):
+                if board[i][j] == board[i][j + 1] and board[i][j] != 0:
+                    board[i][j] *= 2
+                    board[i][j + 1] = 0
+        return board
+
+    def _run(self, transpose: bool, reverse: bool):
+        stage = self._transp(self.board) if transpose else self.board
+        stage = [row[::-1] for row in stage] if reverse else stage
+        stage = self._compress(self._merge(self._compress(stage)))
+        stage = [row[::-1] for row in stage] if reverse else stage
+        return self._transp(stage) if transpose else stage
+
+
+def autoplay(rng: random.Random) -> tuple[int, int, float]:
+    cells = 0
+    for _ in range(2):
+        cells |= 1 << (4 * rng.choice(empty_cells(cells)))
+    moves = 0
+    thinking = 0.0
+    while True:
+        start = time.perf_counter()
+        direction = best_move(cells)
+        thinking += time.perf_counter() - start
+        if direction is None:
+            break
+        cells = move_cells(cells, direction)
+        moves += 1
+        empty = empty_cells(cells)
+        if not empty:
+            break
+        cells |= 1 << (4 * rng.choice(empty))
+    top = max((cells >> (4 * i)) & 0xF for i in range(16))
+    return 1 << top, moves, thinking
+
+
+def main(games: int = 3) -> None:
+    start = time.perf_counter()
+    _move_tables()
+    _score_table()
+    print(f"tables built in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    rng = random.Random(0)
+    game = Twenty48()
+    boards = [[[rng.choice((0, 0, 2, 4, 8, 16, 32)) for _ in range(4)] for _ in range(4)] for _ in range(2000)]
+    packed = []
+    for board in boards:
+        game.board = board
+        packed.append(game.cells)
+
+    start = time.perf_counter()
+    for board in boards:
+        for direction in DIRECTIONS:
+            list_move(board, direction)
+    lists = len(boards) * 4 / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for cells in packed:
+        for direction in DIRECTIONS:
+            move_cells(cells, direction)
+    tables = len(packed) * 4 / (time.perf_counter() - start)
+    print(f"moves      lists {lists:10.0f}/s   packed {tables:10.0f}/s   ({tables / lists:.1f}x)")
+
+    for i in range(games):
+        top, moves, thinking = autoplay(random.Random(i))
+        print(f"autoplay   game {i}: reached {top:5d} in {moves:4d} moves, "
+              f"{thinking / max(moves, 1) * 1000:6.1f} ms/hint")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
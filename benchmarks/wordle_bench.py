@@ -0,0 +1,58 @@
+"""Wordle/typeracer word handling: games started per second and guess validation.
+
+Run from the repository root:
+
+    python -m benchmarks.wordle_bench [games]
+"""
+import random
+import sys
+import time
+
+from games.words import WORDS_PATH, WordIndex
+
+
+def read_words() -> tuple:
+    """The old per-game load: read the whole list into a tuple."""
+    with open(WORDS_PATH, "r") as fp:
+        return tuple(fp.read().splitlines())
+
+
+def rate(func, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return count / (time.perf_counter() - start)
+
+
+def main(count: int = 500) -> None:
+    start = time.perf_counter()
+    index = WordIndex.of()
+    print(f"index built in {(time.perf_counter() - start) * 1000:.1f} ms ({len(index)} words)")
+
+    words = read_words()
+    rng = random.Random(0)
+    guesses = [rng.choice(words) for _ in range(count)] + ["zzzzz"] * count
+
+    reread = rate(lambda: random.choice(read_words()), count)
+    indexed = rate(lambda: index.random(5), count * 100)
+    print(f"wordle     reread {reread:10.0f} games/s   index {indexed:10.0f} games/s   ({indexed / reread:.0f}x)")
+
+    reread = rate(lambda: " ".join(random.choice(read_words()).lower() for _ in range(8)), count)
+    indexed = rate(lambda: " ".join(index.sample(8)), count * 100)
+    print(f"typeracer  reread {reread:10.0f} games/s   index {indexed:10.0f} games/s   ({indexed / reread:.0f}x)")
+
+    start = time.perf_counter()
+    for guess in guesses:
+        guess in words
+    scan = len(guesses) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(100):
+        for guess in guesses:
+            guess in index
+    lookup = len(guesses) * 100 / (time.perf_counter() - start)
+    print(f"guesses    tuple  {scan:10.0f} checks/s  set   {lookup:10.0f} checks/s  ({lookup / scan:.0f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
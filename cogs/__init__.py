@@ -1,284 +1,178 @@
 from __future__ import annotations
+import asyncio
+import importlib
+import time
 from core import Olympus
 from colorama import Fore, Style, init
 
-
-#----------Commands---------#
-from .commands.help import Help
-from .commands.general import General
-from .commands.music import Music
-from .commands.automod import Automod
-from .commands.welcome import Welcomer
-from .commands.fun import Fun
-from .commands.Games import Games
-from .commands.extra import Extra
-from .commands.owner import Owner
-from .commands.voice import Voice
-from .commands.afk import afk
-from .commands.ignore import Ignore
-from .commands.Media import Media
-from .commands.Invc import Invcrole
-from .commands.giveaway import Giveaway
-from .commands.Embed import Embed
-from .commands.steal import Steal
-from .commands.ship import Ship
-from .commands.timer import Timer
-from .commands.blacklist import Blacklist
-from .commands.block import Block
-from .commands.nightmode import Nightmode
-from .commands.imagine import AiStuffCog
-from .commands.owner import Badges
-from .commands.map import Map
-from .commands.autoresponder import AutoResponder
-from .commands.customrole import Customrole
-from .commands.autorole import AutoRole
-
-from .commands.antinuke import Antinuke
-from .commands.extraown import Extraowner
-from .commands.anti_wl import Whitelist
-from .commands.anti_unwl import Unwhitelist
-from .commands.slots import Slots
-from .commands.blackjack import Blackjack
-from .commands.autoreact import AutoReaction
-from .commands.stats import Stats
-from .commands.emergency import Emergency
-from .commands.notify import NotifCommands
-from .commands.status import Status
-from .commands.np import NoPrefix
-from .commands.filters import FilterCog
-from .commands.owner2 import Global
-#from .commands.activity import Activity
-#____________ Events _____________
-
-from .events.autoblacklist import AutoBlacklist
-from .events.Errors import Errors
-from .events.on_guild import Guild
-from .events.autorole import Autorole2
-from .events.auto import Autorole
-from .events.greet2 import greet
-from .events.mention import Mention
-from .events.react import React
-from .events.autoreact import AutoReactListener
-from .events.topgg import TopGG
+# (module, cog class) in load order; modules are only imported when the
+# extension is set up, so importing the package itself is free.
+
+#----------Commands, Events, Antinuke, Automod, Moderation---------#
+COGS: list[tuple[str, str]] = [
+  (".commands.help", "Help"),
+  (".commands.general", "General"),
+  (".commands.music", "Music"),
+  (".commands.automod", "Automod"),
+  (".commands.welcome", "Welcomer"),
+  (".commands.fun", "Fun"),
+  (".commands.Games", "Games"),
+  (".commands.extra", "Extra"),
+  (".commands.voice", "Voice"),
+  (".commands.owner", "Owner"),
+  (".commands.customrole", "Customrole"),
+  (".commands.afk", "afk"),
+  (".commands.Embed", "Embed"),
+  (".commands.Media", "Media"),
+  (".commands.ignore", "Ignore"),
+  (".commands.Invc", "Invcrole"),
+  (".commands.giveaway", "Giveaway"),
+  (".commands.steal", "Steal"),
+  (".commands.ship", "Ship"),
+  (".commands.timer", "Timer"),
+  (".commands.blacklist", "Blacklist"),
+  (".commands.block", "Block"),
+  (".commands.nightmode", "Nightmode"),
+  (".commands.imagine", "AiStuffCog"),
+  (".commands.owner", "Badges"),
+  (".commands.antinuke", "Antinuke"),
+  (".commands.anti_wl", "Whitelist"),
+  (".commands.anti_unwl", "Unwhitelist"),
+  (".commands.extraown", "Extraowner"),
+  (".commands.slots", "Slots"),
+  (".commands.blackjack", "Blackjack"),
+  (".commands.stats", "Stats"),
+  (".commands.emergency", "Emergency"),
+  (".commands.status", "Status"),
+  (".commands.np", "NoPrefix"),
+  (".commands.filters", "FilterCog"),
+  (".commands.owner2", "Global"),
+  (".commands.map", "Map"),
+  #(".commands.activity", "Activity"),
+
+  (".events.autoblacklist", "AutoBlacklist"),
+  (".events.on_guild", "Guild"),
+  (".events.Errors", "Errors"),
+  (".events.autorole", "Autorole2"),
+  (".events.auto", "Autorole"),
+  (".events.greet2", "greet"),
+  (".commands.autoresponder", "AutoResponder"),
+  (".events.mention", "Mention"),
+  (".commands.autorole", "AutoRole"),
+  (".events.react", "React"),
+  (".commands.autoreact", "AutoReaction"),
+  (".events.autoreact", "AutoReactListener"),
+  (".commands.notify", "NotifCommands"),
+
+  (".antinuke.anti_member_update", "AntiMemberUpdate"),
+  (".antinuke.antiban", "AntiBan"),
+  (".antinuke.antibotadd", "AntiBotAdd"),
+  (".antinuke.antichcr", "AntiChannelCreate"),
+  (".antinuke.antichdl", "AntiChannelDelete"),
+  (".antinuke.antichup", "AntiChannelUpdate"),
+  (".antinuke.antieveryone", "AntiEveryone"),
+  (".antinuke.antiguild", "AntiGuildUpdate"),
+  (".antinuke.antiIntegration", "AntiIntegration"),
+  (".antinuke.antikick", "AntiKick"),
+  (".antinuke.antiprune", "AntiPrune"),
+  (".antinuke.antirlcr", "AntiRoleCreate"),
+  (".antinuke.antirldl", "AntiRoleDelete"),
+  (".antinuke.antirlup", "AntiRoleUpdate"),
+  (".antinuke.antiwebhook", "AntiWebhookUpdate"),
+  (".antinuke.antiwebhookcr", "AntiWebhookCreate"),
+  (".antinuke.antiwebhookdl", "AntiWebhookDelete"),
+
+  #Extra Optional Events
+  #(".antinuke.antiemocr", "AntiEmojiCreate"),
+  #(".antinuke.antiemodl", "AntiEmojiDelete"),
+  #(".antinuke.antiemoup", "AntiEmojiUpdate"),
+  #(".antinuke.antisticker", "AntiSticker"),
+  #(".antinuke.antiunban", "AntiUnban"),
+
+  (".automod.antispam", "AntiSpam"),
+  (".automod.anticaps", "AntiCaps"),
+  (".automod.anti_invites", "AntiInvite"),
+  (".automod.antilink", "AntiLink"),
+  (".automod.anti_mass_mention", "AntiMassMention"),
+  (".automod.anti_emoji_spam", "AntiEmojiSpam"),
+
+  (".moderation.ban", "Ban"),
+  (".moderation.unban", "Unban"),
+  (".moderation.timeout", "Mute"),
+  (".moderation.unmute", "Unmute"),
+  (".moderation.lock", "Lock"),
+  (".moderation.unlock", "Unlock"),
+  (".moderation.hide", "Hide"),
+  (".moderation.unhide", "Unhide"),
+  (".moderation.kick", "Kick"),
+  (".moderation.warn", "Warn"),
+  (".moderation.role", "Role"),
+  (".moderation.message", "Message"),
+  (".moderation.moderation", "Moderation"),
+  (".moderation.topcheck", "TopCheck"),
+  (".moderation.snipe", "Snipe"),
+]
 
 ########-------HELP-------########
-from .olympus.antinuke import _antinuke
-from .olympus.extra import _extra
-from .olympus.general import _general
-from .olympus.automod import _automod 
-from .olympus.moderation import _moderation
-from .olympus.music import _music
-from .olympus.fun import _fun
-from .olympus.games import _games
-from .olympus.ignore import _ignore
-from .olympus.server import _server
-from .olympus.voice import _voice 
-from .olympus.welcome import _welcome 
-from .olympus.giveaway import _giveaway
-
-
-#########ANTINUKE#########
-
-from .antinuke.anti_member_update import AntiMemberUpdate
-from .antinuke.antiban import AntiBan
-from .antinuke.antibotadd import AntiBotAdd
-from .antinuke.antichcr import AntiChannelCreate
-from .antinuke.antichdl import AntiChannelDelete
-from .antinuke.antichup import AntiChannelUpdate
-from .antinuke.antieveryone import AntiEveryone
-from .antinuke.antiguild import AntiGuildUpdate
-from .antinuke.antiIntegration import AntiIntegration
-from .antinuke.antikick import AntiKick
-from .antinuke.antiprune import AntiPrune
-from .antinuke.antirlcr import AntiRoleCreate
-from .antinuke.antirldl import AntiRoleDelete
-from .antinuke.antirlup import AntiRoleUpdate
-from .antinuke.antiwebhook import AntiWebhookUpdate
-from .antinuke.antiwebhookcr import AntiWebhookCreate
-from .antinuke.antiwebhookdl import AntiWebhookDelete
-
-#Extra Optional Events 
-
-#from .antinuke.antiemocr import AntiEmojiCreate
-#from .antinuke.antiemodl import AntiEmojiDelete
-#from .antinuke.antiemoup import AntiEmojiUpdate
-#from .antinuke.antisticker import AntiSticker
-#from .antinuke.antiunban import AntiUnban
-
-############ AUTOMOD ############
-from .automod.antispam import AntiSpam
-from .automod.anticaps import AntiCaps
-from .automod.antilink import AntiLink
-from .automod.anti_invites import AntiInvite
-from .automod.anti_mass_mention import AntiMassMention
-from .automod.anti_emoji_spam import AntiEmojiSpam
-
-
-from .moderation.ban import Ban
-from .moderation.unban import Unban
-from .moderation.timeout import Mute
-from .moderation.unmute import Unmute
-from .moderation.lock import Lock
-from .moderation.unlock import Unlock
-from .moderation.hide import Hide
-from .moderation.unhide import Unhide
-from .moderation.kick import Kick
-from .moderation.warn import Warn
-from .moderation.role import Role
-from .moderation.message import Message
-from .moderation.moderation import Moderation
-from .moderation.topcheck import TopCheck
-from .moderation.snipe import Snipe
+# help pages are listed by the help menu in registration order, so they are
+# added one after another; everything else is added concurrently.
+HELP_PAGES: list[tuple[str, str]] = [
+  (".olympus.antinuke", "_antinuke"),
+  (".olympus.extra", "_extra"),
+  (".olympus.general", "_general"),
+  (".olympus.automod", "_automod"),
+  (".olympus.moderation", "_moderation"),
+  (".olympus.music", "_music"),
+  (".olympus.fun", "_fun"),
+  (".olympus.games", "_games"),
+  (".olympus.ignore", "_ignore"),
+  (".olympus.server", "_server"),
+  (".olympus.voice", "_voice"),
+  (".olympus.welcome", "_welcome"),
+  (".olympus.giveaway", "_giveaway"),
+]
+
+
+def _import(module: str, name: str) -> tuple[type, float]:
+  start = time.perf_counter()
+  cog = getattr(importlib.import_module(module, __name__), name)
+  return cog, time.perf_counter() - start
+
+
+async def _add(bot: Olympus, cog: type, imported: float, timings: dict) -> None:
+  start = time.perf_counter()
+  try:
+    await bot.add_cog(cog(bot))
+  except Exception as e:
+    print(f"{Fore.RED}{Style.BRIGHT}Failed to load cog {cog.__name__}. {e!r}")
+    return
+  timings[cog.__name__] = (imported, time.perf_counter() - start)
 
 
 async def setup(bot: Olympus):
-  cogs_to_load = [
-        Help, General, Moderation, Automod, Welcomer, Fun, Games, Extra,
-        Voice, Owner, Customrole, afk, Embed, Media, Ignore,
-        Invcrole, Steal, Ship, Timer,
-        Blacklist, Block, Nightmode, AiStuffCog, Badges, Antinuke, Whitelist, 
-        Unwhitelist, Extraowner, Map, Blackjack, Slots,
-        AutoBlacklist, Guild, Errors, Autorole2, Autorole, greet, AutoResponder,
-        Mention, AutoRole, React, AntiMemberUpdate, AntiBan, AntiBotAdd,
-        AntiChannelCreate, AntiChannelDelete, AntiChannelUpdate, AntiEveryone, AntiGuildUpdate,
-        AntiIntegration, AntiKick, AntiPrune, AntiRoleCreate, AntiRoleDelete,
-        AntiRoleUpdate, AntiWebhookUpdate, AntiWebhookCreate,
-        AntiWebhookDelete, AntiSpam, AntiCaps, AntiLink, AntiInvite, AntiMassMention, Music, Stats, Emergency, Status, NoPrefix, FilterCog, AutoReaction, AutoReactListener, Ban, Unban, Mute, Unmute, Lock, Unlock, Hide, Unhide, Kick, Warn, Role, Message, Moderation, TopCheck, Snipe, Global
-    ]
-
-
-  await bot.add_cog(Help(bot))
-  await bot.add_cog(General(bot))
-  await bot.add_cog(Music(bot))
-  await bot.add_cog(Automod(bot))
-  await bot.add_cog(Welcomer(bot))
-  await bot.add_cog(Fun(bot))
-  await bot.add_cog(Games(bot))
-  await bot.add_cog(Extra(bot))
-  await bot.add_cog(Voice(bot))
-  await bot.add_cog(Owner(bot))
-  await bot.add_cog(Customrole(bot))
-  await bot.add_cog(afk(bot))
-  await bot.add_cog(Embed(bot))
-  await bot.add_cog(Media(bot))
-  await bot.add_cog(Ignore(bot))
-  await bot.add_cog(Invcrole(bot))
-  await bot.add_cog(Giveaway(bot))
-  await bot.add_cog(Steal(bot))
-  await bot.add_cog(Ship(bot))
-  await bot.add_cog(Timer(bot))
-  await bot.add_cog(Blacklist(bot))
-  await bot.add_cog(Block(bot))
-  await bot.add_cog(Nightmode(bot))
-  await bot.add_cog(AiStuffCog(bot))
-  await bot.add_cog(Badges(bot))
-  await bot.add_cog(Antinuke(bot))
-  await bot.add_cog(Whitelist(bot))
-  await bot.add_cog(Unwhitelist(bot))
-  await bot.add_cog(Extraowner(bot))
-  await bot.add_cog(Slots(bot))
-  await bot.add_cog(Blackjack(bot))
-  await bot.add_cog(Stats(bot))
-  await bot.add_cog(Emergency(bot))
-  await bot.add_cog(Status(bot))
-  await bot.add_cog(NoPrefix(bot))
-  await bot.add_cog(FilterCog(bot))
-  await bot.add_cog(Global(bot))
-  await bot.add_cog(Map(bot))
-  #await bot.add_cog(Activity(bot))
-
-
-
-  await bot.add_cog(_antinuke(bot))
-  await bot.add_cog(_extra(bot))
-  await bot.add_cog(_general(bot))
-  await bot.add_cog(_automod(bot))  
-  await bot.add_cog(_moderation(bot))
-  await bot.add_cog(_music(bot))
-  await bot.add_cog(_fun(bot))
-  await bot.add_cog(_games(bot))
-  await bot.add_cog(_ignore(bot))
-  await bot.add_cog(_server(bot))
-  await bot.add_cog(_voice(bot))   
-  await bot.add_cog(_welcome(bot))
-  await bot.add_cog(_giveaway(bot))
-  
-
-
-
-
-  
-  await bot.add_cog(AutoBlacklist(bot))
-  await bot.add_cog(Guild(bot))
-  await bot.add_cog(Errors(bot))
-  await bot.add_cog(Autorole2(bot))
-  await bot.add_cog(Autorole(bot))
-  await bot.add_cog(greet(bot))
-  await bot.add_cog(AutoResponder(bot))
-  await bot.add_cog(Mention(bot))
-  await bot.add_cog(AutoRole(bot))
-  await bot.add_cog(React(bot))
-  await bot.add_cog(AutoReaction(bot))
-  await bot.add_cog(AutoReactListener(bot))
-  await bot.add_cog(NotifCommands(bot))
-
-
-  await bot.add_cog(AntiMemberUpdate(bot))
-  await bot.add_cog(AntiBan(bot))
-  await bot.add_cog(AntiBotAdd(bot))
-  await bot.add_cog(AntiChannelCreate(bot))
-  await bot.add_cog(AntiChannelDelete(bot))
-  await bot.add_cog(AntiChannelUpdate(bot))
-  await bot.add_cog(AntiEveryone(bot))
-  await bot.add_cog(AntiGuildUpdate(bot))
-  await bot.add_cog(AntiIntegration(bot))
-  await bot.add_cog(AntiKick(bot))
-  await bot.add_cog(AntiPrune(bot))
-  await bot.add_cog(AntiRoleCreate(bot))
-  await bot.add_cog(AntiRoleDelete(bot))
-  await bot.add_cog(AntiRoleUpdate(bot))
-  await bot.add_cog(AntiWebhookUpdate(bot))
-  await bot.add_cog(AntiWebhookCreate(bot))
-  await bot.add_cog(AntiWebhookDelete(bot))
-
-
-#Extra Optional Events 
-
-  #await bot.add_cog(AntiEmojiCreate(bot))
-  #await bot.add_cog(AntiEmojiDelete(bot))
-  #await bot.add_cog(AntiEmojiUpdate(bot))
-  #await bot.add_cog(AntiSticker(bot))
-  #await bot.add_cog(AntiUnban(bot))
-
-
-  await bot.add_cog(AntiSpam(bot))
-  await bot.add_cog(AntiCaps(bot))
-  await bot.add_cog(AntiInvite(bot))
-  await bot.add_cog(AntiLink(bot))
-  await bot.add_cog(AntiMassMention(bot))
-  await bot.add_cog(AntiEmojiSpam(bot))
-
-
-
-
-
-
-  await bot.add_cog(Ban(bot))
-  await bot.add_cog(Unban(bot))
-  await bot.add_cog(Mute(bot))
-  await bot.add_cog(Unmute(bot))
-  await bot.add_cog(Lock(bot))
-  await bot.add_cog(Unlock(bot))
-  await bot.add_cog(Hide(bot))
-  await bot.add_cog(Unhide(bot))
-  await bot.add_cog(Kick(bot))
-  await bot.add_cog(Warn(bot))
-  await bot.add_cog(Role(bot))
-  await bot.add_cog(Message(bot))
-  await bot.add_cog(Moderation(bot))
-  await bot.add_cog(TopCheck(bot))
-  await bot.add_cog(Snipe(bot))
-
-  for cog in cogs_to_load:
-    print(Fore.GREEN + Style.BRIGHT + f"Loaded cog: {cog.__name__}")
-  print(Fore.GREEN + Style.BRIGHT + "All cogs loaded successfully.")
+  started = time.perf_counter()
+  timings: dict[str, tuple[float, float]] = {}
+  loaded: list[tuple[type, float]] = []
+
+  for module, name in COGS + HELP_PAGES:
+    try:
+      loaded.append(_import(module, name))
+    except Exception as e:
+      print(f"{Fore.RED}{Style.BRIGHT}Failed to import cog {name} from cogs{module}. {e}")
+  imported = time.perf_counter() - started
+
+  pages = {name for _, name in HELP_PAGES}
+  await asyncio.gather(
+    *(_add(bot, cog, took, timings) for cog, took in loaded if cog.__name__ not in pages))
+  for cog, took in loaded:
+    if cog.__name__ in pages:
+      await _add(bot, cog, took, timings)
+
+  for name, (import_time, load_time) in timings.items():
+    print(Fore.GREEN + Style.BRIGHT +
+          f"Loaded cog: {name:<20} import {import_time * 1000:7.1f} ms   load {load_time * 1000:7.1f} ms")
+  total = time.perf_counter() - started
+  print(Fore.GREEN + Style.BRIGHT +
+        f"Loaded {len(timings)}/{len(COGS) + len(HELP_PAGES)} cogs in {total * 1000:.0f} ms "
+        f"(imports {imported * 1000:.0f} ms, setup {(total - imported) * 1000:.0f} ms)")
+  bot.startup_timings = timings
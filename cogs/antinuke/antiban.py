@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands
 import aiosqlite
+from utils import storage
 import asyncio
 import datetime
 import time  # Added for time measurement
@@ -16,7 +17,7 @@ class AntiBan(commands.Cog):
     async def initialize_db(self):
         """Initialize the SQLite database connection."""
         try:
-            self.db = await aiosqlite.connect('db/anti.db')
+            self.db = await storage.connect('db/anti.db')
             await self.db.execute('''CREATE TABLE IF NOT EXISTS antinuke (
                 guild_id INTEGER PRIMARY KEY,
                 status INTEGER DEFAULT 0
@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands
 import aiosqlite
+from utils import storage
 import asyncio
 import datetime
 import time  # Added for time measurement
@@ -16,7 +17,7 @@ class AntiKick(commands.Cog):
     async def initialize_db(self):
         """Initialize the SQLite database connection."""
         try:
-            self.db = await aiosqlite.connect('db/anti.db')
+            self.db = await storage.connect('db/anti.db')
             await self.db.execute('''CREATE TABLE IF NOT EXISTS antinuke (
                 guild_id INTEGER PRIMARY KEY,
                 status INTEGER DEFAULT 0
@@ -43,7 +44,7 @@ class AntiKick(commands.Cog):
 
     async def is_blacklisted_guild(self, guild_id):
         """Check if a guild is blacklisted."""
-        async with aiosqlite.connect('db/block.db') as block_db:
+        async with storage.connect('db/block.db') as block_db:
             async with block_db.execute("SELECT 1 FROM guild_blacklist WHERE guild_id = ?", (str(guild_id),)) as cursor:
                 return await cursor.fetchone() is not None
 
@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands
 import aiosqlite
+from utils.Tools import get_automod_data
 import re
 from datetime import timedelta
 import asyncio
@@ -11,40 +12,25 @@ class AntiEmojiSpam(commands.Cog):
         self.emoji_threshold = 5  
 
     async def is_automod_enabled(self, guild_id):
-        async with aiosqlite.connect("db/automod.db") as db:
-            cursor = await db.execute("SELECT enabled FROM automod WHERE guild_id = ?", (guild_id,))
-            result = await cursor.fetchone()
-            return result is not None and result[0] == 1
+        return (await get_automod_data(guild_id))["enabled"]
 
     async def is_anti_emoji_spam_enabled(self, guild_id):
-        async with aiosqlite.connect("db/automod.db") as db:
-            cursor = await db.execute("SELECT punishment FROM automod_punishments WHERE guild_id = ? AND event = 'Anti emoji spam'", (guild_id,))
-            result = await cursor.fetchone()
-            return result is not None
+        return "Anti emoji spam" in (await get_automod_data(guild_id))["punishments"]
 
     async def get_ignored_channels(self, guild_id):
-        async with aiosqlite.connect("db/automod.db") as db:
-            cursor = await db.execute("SELECT id FROM automod_ignored WHERE guild_id = ? AND type = 'channel'", (guild_id,))
-            return [row[0] for row in await cursor.fetchall()]
+        return (await get_automod_data(guild_id))["channel"]
 
     async def get_ignored_roles(self, guild_id):
-        async with aiosqlite.connect("db/automod.db") as db:
-            cursor = await db.execute("SELECT id FROM automod_ignored WHERE guild_id = ? AND type = 'role'", (guild_id,))
-            return [row[0] for row in await cursor.fetchall()]
+        return (await get_automod_data(guild_id))["role"]
 
     async def get_punishment(self, guild_id):
-        async with aiosqlite.connect("db/automod.db") as db:
-            cursor = await db.execute("SELECT punishment FROM automod_punishments WHERE guild_id = ? AND event = 'Anti emoji spam'", (guild_id,))
-            result = await cursor.fetchone()
-            return result[0] if result else None
+        return (await get_automod_data(guild_id))["punishments"].get("Anti emoji spam")
 
     async def log_action(self, guild, user, channel, action, reason):
-        async with aiosqlite.connect("db/automod.db") as db:
-            cursor = await db.execute("SELECT log_channel FROM automod_logging WHERE guild_id = ?", (guild.id,))
-            log_channel_id = await cursor.fetchone()
+        log_channel_id = (await get_automod_data(guild.id))["log_channel"]
 
-        if log_channel_id and log_channel_id[0]:
-            log_channel = guild.get_channel(log_channel_id[0])
+        if log_channel_id:
+            log_channel = guild.get_channel(log_channel_id)
             if log_channel:
                 embed = discord.Embed(title="Automod Log: Anti Emoji Spam", color=0xff0000)
                 embed.add_field(name="User", value=user.mention, inline=False)
@@ -5,9 +5,17 @@ from core import Cog, Olympus, Context
 import games as games
 from utils.Tools import *
 from games import button_games as btn
+from games.chess_engine import engine as chess_engine
+from games.country_guess import CountryAssets, BLUR_STEPS
 import random
 import asyncio
+import typing
+import datetime
+import aiosqlite
+from utils import storage
 
+db_folder = 'db'
+db_path = os.path.join(db_folder, 'wordle.db')
 
 
 class Games(Cog):
@@ -15,18 +23,77 @@ class Games(Cog):
 
     def __init__(self, client: Olympus):
         self.client = client
+        self.connection = None
+        self.flag_warmup = None
+
+    async def cog_load(self):
+        if not os.path.exists(db_folder):
+            os.makedirs(db_folder)
+        self.connection = await storage.connect(db_path)
+        await self.connection.execute('''CREATE TABLE IF NOT EXISTS wordle_stats (
+            guild_id INTEGER,
+            user_id INTEGER,
+            played INTEGER DEFAULT 0,
+            won INTEGER DEFAULT 0,
+            streak INTEGER DEFAULT 0,
+            best_streak INTEGER DEFAULT 0,
+            last_daily TEXT,
+            PRIMARY KEY (guild_id, user_id)
+        )''')
+        await self.connection.execute('''CREATE TABLE IF NOT EXISTS wordle_daily (
+            user_id INTEGER PRIMARY KEY,
+            last_daily TEXT
+        )''')
+        await self.connection.commit()
+        self.flag_warmup = asyncio.create_task(
+            CountryAssets.of("assets/country-flags").warm(blur=(0, BLUR_STEPS[0])))
+
+    async def cog_unload(self):
+        chess_engine.close()
+        if self.flag_warmup:
+            self.flag_warmup.cancel()
+        if self.connection:
+            await self.connection.close()
+
+    async def record_wordle(self, ctx: Context, game: games.Wordle):
+        """Stores the result of a finished wordle game; cancelled free games are not counted."""
+        if game.won is None and not game.daily:
+            return
+        won = int(bool(game.won))
+        await self.connection.execute('''INSERT INTO wordle_stats (guild_id, user_id, played, won, streak, best_streak)
+            VALUES (?, ?, 1, ?, ?, ?)
+            ON CONFLICT (guild_id, user_id) DO UPDATE SET
+                played = played + 1,
+                won = won + excluded.won,
+                streak = CASE WHEN excluded.won THEN streak + 1 ELSE 0 END,
+                best_streak = MAX(best_streak, CASE WHEN excluded.won THEN streak + 1 ELSE 0 END)''',
+            (ctx.guild.id, ctx.author.id, won, won, won))
+        await self.connection.commit()
+
+    async def claim_daily(self, user_id: int) -> bool:
+        """Stamps today's daily as played by ``user_id``; False if they already played it, in any server."""
+        today = datetime.datetime.utcnow().date().isoformat()
+        cursor = await self.connection.execute('''INSERT INTO wordle_daily (user_id, last_daily) VALUES (?, ?)
+            ON CONFLICT (user_id) DO UPDATE SET last_daily = excluded.last_daily
+            WHERE last_daily IS NOT excluded.last_daily''', (user_id, today))
+        await self.connection.commit()
+        return cursor.rowcount > 0
 
 
     @commands.hybrid_command(name="chess",
-                             help="Play Chess with a user.",
-                             usage="Chess <user>")
+                             help="Play Chess with a user, or against the bot.",
+                             usage="Chess [user] [easy|medium|hard]")
     @blacklist_check()
     @ignore_check()
     @commands.cooldown(1, 3, commands.BucketType.user)
     @commands.max_concurrency(5, per=commands.BucketType.default, wait=False)
     @commands.guild_only()
-    async def _chess(self, ctx: Context, player: discord.Member):
-        if player == ctx.author:
+    async def _chess(self, ctx: Context, player: typing.Optional[discord.Member] = None,
+                     difficulty: typing.Literal["easy", "medium", "hard"] = "medium"):
+        if player is None or player == ctx.me:
+            game = btn.BetaChess(white=ctx.author, black=ctx.me, difficulty=difficulty)
+            await game.start(ctx)
+        elif player == ctx.author:
             await ctx.send("You Cannot play game with yourself!",
                            mention_author=False)
         elif player.bot:
@@ -68,17 +135,63 @@ class Games(Cog):
             game = btn.BetaTictactoe(cross=ctx.author, circle=player)
             await game.start(ctx, timeout=30)
 
-    @commands.hybrid_command(name="wordle",
-                             help="Wordle Game | Play with bot.",
-                             usage="Wordle")
+    @commands.hybrid_group(name="wordle",
+                           invoke_without_command=True,
+                           help="Wordle Game | Play with bot.",
+                           usage="Wordle [daily|stats]")
     @blacklist_check()
     @ignore_check()
     @commands.cooldown(1, 3, commands.BucketType.user)
     @commands.max_concurrency(3, per=commands.BucketType.default, wait=False)
     @commands.guild_only()
     async def _wordle(self, ctx: Context):
-        game = games.Wordle()
-        await game.start(ctx, timeout=120)
+        if ctx.invoked_subcommand is None:
+            game = games.Wordle()
+            await game.start(ctx, timeout=120)
+            await self.record_wordle(ctx, game)
+
+    @_wordle.command(name="daily",
+                     help="Play today's Wordle, the same word in every server. One attempt per day.",
+                     usage="Wordle daily")
+    @blacklist_check()
+    @ignore_check()
+    @commands.cooldown(1, 3, commands.BucketType.user)
+    @commands.max_concurrency(1, per=commands.BucketType.user, wait=False)
+    @commands.guild_only()
+    async def _wordle_daily(self, ctx: Context):
+        # the word is the same in every server, so the attempt is per user, not per guild;
+        # stamped up front so leaving the game early doesn't earn a second try
+        if not await self.claim_daily(ctx.author.id):
+            return await ctx.send("You have already played today's Wordle, come back tomorrow!")
+
+        game = games.Wordle(daily=True)
+        await game.start(ctx, timeout=300)
+        await self.record_wordle(ctx, game)
+
+    @_wordle.command(name="stats",
+                     help="Shows Wordle stats of a user in this server.",
+                     usage="Wordle stats [user]")
+    @blacklist_check()
+    @ignore_check()
+    @commands.cooldown(1, 3, commands.BucketType.user)
+    @commands.guild_only()
+    async def _wordle_stats(self, ctx: Context, member: discord.Member = None):
+        member = member or ctx.author
+        async with self.connection.execute(
+                "SELECT played, won, streak, best_streak FROM wordle_stats WHERE guild_id = ? AND user_id = ?",
+                (ctx.guild.id, member.id)) as cursor:
+            row = await cursor.fetchone()
+        if not row:
+            return await ctx.send(f"**{member}** hasn't played Wordle in this server yet.")
+
+        played, won, streak, best_streak = row
+        embed = discord.Embed(title=f"Wordle stats | {member}", color=0x00FFFF)
+        embed.add_field(name="Played", value=played)
+        embed.add_field(name="Win %", value=f"{won * 100 // played}%")
+        embed.add_field(name="Current Streak", value=streak)
+        embed.add_field(name="Best Streak", value=best_streak)
+        embed.set_thumbnail(url=member.display_avatar.url)
+        await ctx.send(embed=embed)
 
     @commands.hybrid_command(name="2048",
                              help="Play 2048 game with bot.",
@@ -91,7 +204,7 @@ class Games(Cog):
     @commands.guild_only()
     async def _2048(self, ctx: Context):
         game = btn.BetaTwenty48()
-        await game.start(ctx, win_at=2048)
+        await game.start(ctx, win_at=2048, hints=True)
 
     @commands.hybrid_command(name="memory-game",
                              help="How strong is your memory?",
@@ -142,9 +255,10 @@ class Games(Cog):
             await ctx.send_help("country-guesser")
 
     @_country_guesser.command(name="start",
-                              help="Starts the country guesser game. It's a 100 Seconds Game so suggested to play in a SPECIFIC CHANNEL.")
-    async def _start_country_guesser(self, ctx: Context):
-        game = games.CountryGuesser(is_flags=True, hints=2)
+                              help="Starts the country guesser game. It's a 100 Seconds Game so suggested to play in a SPECIFIC CHANNEL. Use `blurred` for a blurred flag that sharpens with every hint.",
+                              usage="country-guesser start [normal|blurred]")
+    async def _start_country_guesser(self, ctx: Context, mode: typing.Literal["normal", "blurred"] = "normal"):
+        game = games.CountryGuesser(is_flags=True, hard_mode=mode == "blurred", hints=2)
         await game.start(ctx)
 
     """@_country_guesser.command(name="end",
@@ -153,16 +267,20 @@ class Games(Cog):
         await self.country_guesser_game.end_game_manually(ctx)"""
 
     @commands.hybrid_command(name="connectfour",
-                             help="Play Connect Four game with user.",
+                             help="Play Connect Four game with a user, or against the bot.",
                              aliases=["c4", "connect-four", "connect4"],
-                             usage="connectfour <user>")
+                             usage="connectfour [user] [easy|medium|hard]")
     @blacklist_check()
     @ignore_check()
     @commands.cooldown(1, 3, commands.BucketType.user)
     @commands.max_concurrency(1, per=commands.BucketType.user, wait=False)
     @commands.guild_only()
-    async def _connectfour(self, ctx: Context, player: discord.Member):
-        if player == ctx.author:
+    async def _connectfour(self, ctx: Context, player: typing.Optional[discord.Member] = None,
+                           difficulty: typing.Literal["easy", "medium", "hard"] = "medium"):
+        if player is None or player == ctx.me:
+            game = games.ConnectFour(red=ctx.author, blue=ctx.me, difficulty=difficulty)
+            await game.start(ctx, timeout=300)
+        elif player == ctx.author:
             await ctx.send("You cannot play against yourself!")
         elif player.bot:
             await ctx.send("You cannot play with bots!")
@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands
 import aiosqlite
+from utils import storage
 import asyncio
 from utils.Tools import *
 
@@ -11,7 +12,7 @@ class Invcrole(commands.Cog):
         self.bot.loop.create_task(self.create_table())
 
     async def create_table(self):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
             await db.execute('''
                 CREATE TABLE IF NOT EXISTS vcroles (
                     guild_id INTEGER PRIMARY KEY,
@@ -34,7 +35,7 @@ class Invcrole(commands.Cog):
     @ignore_check()
     @commands.has_permissions(administrator=True)
     async def add(self, ctx, role: discord.Role):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
             async with db.execute('SELECT role_id FROM vcroles WHERE guild_id = ?', (ctx.guild.id,)) as cursor:
                 row = await cursor.fetchone()
                 if row:
@@ -53,7 +54,7 @@ class Invcrole(commands.Cog):
     @ignore_check()
     @commands.has_permissions(administrator=True)
     async def remove(self, ctx, role: discord.Role):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
             async with db.execute('SELECT role_id FROM vcroles WHERE guild_id = ? AND role_id = ?', (ctx.guild.id, role.id)) as cursor:
                 row = await cursor.fetchone()
                 if not row:
@@ -72,7 +73,7 @@ class Invcrole(commands.Cog):
     @ignore_check()
     @commands.has_permissions(administrator=True)
     async def config(self, ctx):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
             async with db.execute('SELECT role_id FROM vcroles WHERE guild_id = ?', (ctx.guild.id,)) as cursor:
                 row = await cursor.fetchone()
                 if not row:
@@ -89,7 +90,7 @@ class Invcrole(commands.Cog):
     @commands.Cog.listener()
     async def on_voice_state_update(self, member, before, after):
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with storage.connect(self.db_path) as db:
                 async with db.execute('SELECT role_id FROM vcroles WHERE guild_id = ?', (member.guild.id,)) as cursor:
                     row = await cursor.fetchone()
                     if not row:
@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands
 import aiosqlite
+from utils import storage
 from utils.Tools import *
 
 
@@ -11,7 +12,7 @@ class Unwhitelist(commands.Cog):
 
     #@commands.Cog.listener()
     async def initialize_db(self):
-        self.db = await aiosqlite.connect('db/anti.db')
+        self.db = await storage.connect('db/anti.db')
 
     @commands.hybrid_command(name='unwhitelist', aliases=['unwl'], help="Unwhitelist a user from antinuke")
     @commands.has_permissions(administrator=True)
@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands
 import aiosqlite
+from utils import storage
 from utils.Tools import *
 
 
@@ -12,7 +13,7 @@ class Whitelist(commands.Cog):
     
     #@commands.Cog.listener()
     async def initialize_db(self):
-        self.db = await aiosqlite.connect('db/anti.db')
+        self.db = await storage.connect('db/anti.db')
         await self.db.execute('''
             CREATE TABLE IF NOT EXISTS whitelisted_users (
                 guild_id INTEGER,
@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands
 import aiosqlite
+from utils import storage
 import asyncio
 from discord.ui import Select, View, Modal, TextInput
 
@@ -30,7 +31,7 @@ class Antinuke(commands.Cog):
 
     async def initialize_db(self):
         """Initialize the database and create tables if they don't exist."""
-        self.db = await aiosqlite.connect('db/anti.db')
+        self.db = await storage.connect('db/anti.db')
         await self.db.execute('''
             CREATE TABLE IF NOT EXISTS antinuke (
                 guild_id INTEGER PRIMARY KEY,
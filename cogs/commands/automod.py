@@ -1,7 +1,9 @@
 import discord
 from discord.ext import commands
 import aiosqlite
+from utils import storage
 from utils.Tools import *
+from utils.cache import config_cache
 
 class ShowRules(discord.ui.View):
     def __init__(self, author, selected_events):
@@ -63,7 +65,7 @@ class Automod(commands.Cog):
         self.bot.loop.create_task(self.init_db())
 
     async def get_exempt_roles_channels(self, guild_id):
-        async with aiosqlite.connect("db/automod.db") as db:
+        async with storage.connect("db/automod.db") as db:
             roles_cursor = await db.execute("SELECT id FROM automod_ignored WHERE guild_id = ? AND type = 'role'", (guild_id,))
             channels_cursor = await db.execute("SELECT id FROM automod_ignored WHERE guild_id = ? AND type = 'channel'", (guild_id,))
             
@@ -74,18 +76,19 @@ class Automod(commands.Cog):
             
 
     async def is_automod_enabled(self, guild_id):
-        async with aiosqlite.connect("db/automod.db") as db:
+        async with storage.connect("db/automod.db") as db:
             cursor = await db.execute("SELECT enabled FROM automod WHERE guild_id = ?", (guild_id,))
             result = await cursor.fetchone()
             return result is not None and result[0] == 1
 
     async def update_punishments(self, guild_id, event, punishment):
-        async with aiosqlite.connect("db/automod.db") as db:
+        async with storage.connect("db/automod.db") as db:
             await db.execute("INSERT OR REPLACE INTO automod_punishments (guild_id, event, punishment) VALUES (?, ?, ?)", (guild_id, event, punishment))
             await db.commit()
+            await config_cache.invalidate("automod", guild_id)
 
     async def get_current_punishments(self, guild_id):
-        async with aiosqlite.connect("db/automod.db") as db:
+        async with storage.connect("db/automod.db") as db:
             async with db.execute(
                 "SELECT event, punishment FROM automod_punishments WHERE guild_id = ? AND event != 'Anti NSFW link'", 
                 (guild_id,)
@@ -93,7 +96,7 @@ class Automod(commands.Cog):
                 return await cursor.fetchall()
 
     async def is_anti_nsfw_enabled(self, guild_id):
-        async with aiosqlite.connect("db/automod.db") as db:
+        async with storage.connect("db/automod.db") as db:
             cursor = await db.execute("SELECT punishment FROM automod_punishments WHERE guild_id = ? AND event = 'Anti NSFW link'", (guild_id,))
             result = await cursor.fetchone()
             return result is not None
@@ -101,7 +104,7 @@ class Automod(commands.Cog):
                 
 
     async def init_db(self):
-        async with aiosqlite.connect("db/automod.db") as db:
+        async with storage.connect("db/automod.db") as db:
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS automod (
                     guild_id INTEGER PRIMARY KEY,
@@ -228,11 +231,12 @@ class Automod(commands.Cog):
 
     async def enable_automod(self, ctx, guild_id, selected_events, interaction):
 
-        async with aiosqlite.connect("db/automod.db") as db:
+        async with storage.connect("db/automod.db") as db:
             await db.execute("INSERT OR REPLACE INTO automod (guild_id, enabled) VALUES (?, 1)", (guild_id,))
             for event in selected_events:
                 await db.execute("INSERT OR REPLACE INTO automod_punishments (guild_id, event, punishment) VALUES (?, ?, ?)", (guild_id, event, self.default_punishment))
             await db.commit()
+            await config_cache.invalidate("automod", guild_id)
 
         
         if "Anti NSFW link" in selected_events:
@@ -288,9 +292,10 @@ class Automod(commands.Cog):
                 log_channel = await interaction.guild.create_text_channel("olympus-automod", overwrites=overwrites)
                 guild_id = interaction.guild.id
 
-                async with aiosqlite.connect("db/automod.db") as db:
+                async with storage.connect("db/automod.db") as db:
                     await db.execute("INSERT OR REPLACE INTO automod_logging (guild_id, log_channel) VALUES (?, ?)", (guild_id, log_channel.id))
                     await db.commit()
+                    await config_cache.invalidate("automod", guild_id)
 
                 await interaction.response.send_message(f"Logging channel {log_channel.mention} created and set successfully.", ephemeral=True)
 
@@ -427,7 +432,7 @@ class Automod(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        async with aiosqlite.connect("db/automod.db") as db:
+        async with storage.connect("db/automod.db") as db:
             cursor = await db.execute("SELECT 1 FROM automod_ignored WHERE guild_id = ? AND type = 'channel' AND id = ?", (guild_id, channel.id))
             if await cursor.fetchone() is not None:
                 embed = discord.Embed(title="__Channel Already Whitelisted!__", description=f"<:vx_cross:1346442303786717194> The channel {channel.mention} is already in the ignore list.\n\n➜ Use **{ctx.prefix}automod unignore channel {channel.mention}** to remove it.", color=0x00FFFF)
@@ -446,6 +451,7 @@ class Automod(commands.Cog):
 
             await db.execute("INSERT OR REPLACE INTO automod_ignored (guild_id, type, id) VALUES (?, 'channel', ?)", (guild_id, channel.id))
             await db.commit()
+            await config_cache.invalidate("automod", guild_id)
             
             if await self.is_anti_nsfw_enabled(guild_id):
                 try:
@@ -494,7 +500,7 @@ class Automod(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        async with aiosqlite.connect("db/automod.db") as db:
+        async with storage.connect("db/automod.db") as db:
             cursor = await db.execute("SELECT 1 FROM automod_ignored WHERE guild_id = ? AND type = 'role' AND id = ?", (guild_id, role.id))
             
             if await cursor.fetchone() is not None:
@@ -514,6 +520,7 @@ class Automod(commands.Cog):
 
             await db.execute("INSERT OR REPLACE INTO automod_ignored (guild_id, type, id) VALUES (?, 'role', ?)", (guild_id, role.id))
             await db.commit()
+            await config_cache.invalidate("automod", guild_id)
 
             if await self.is_anti_nsfw_enabled(guild_id):
                 try:
@@ -563,7 +570,7 @@ class Automod(commands.Cog):
             return
             
 
-        async with aiosqlite.connect("db/automod.db") as db:
+        async with storage.connect("db/automod.db") as db:
             cursor = await db.execute("SELECT type, id FROM automod_ignored WHERE guild_id = ?", (guild_id,))
             ignored_items = await cursor.fetchall()
 
@@ -627,9 +634,10 @@ class Automod(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        async with aiosqlite.connect("db/automod.db") as db:
+        async with storage.connect("db/automod.db") as db:
             await db.execute("DELETE FROM automod_ignored WHERE guild_id = ?", (guild_id,))
             await db.commit()
+            await config_cache.invalidate("automod", guild_id)
         embed=discord.Embed(title=f"Automod Settings for {ctx.guild.name}", description=f"** <:vx_tick:1346442266688094251> | All ignored channels and roles have been reset!**\n\nTo view current Automod settings use `{ctx.prefix}automod config`", color=0x00FFFF)
         embed.set_thumbnail(url=self.bot.user.avatar.url)
         embed.set_footer(text=f"“{ctx.command.qualified_name}” Command executed by {ctx.author}",
@@ -685,9 +693,10 @@ class Automod(commands.Cog):
             except discord.HTTPException:
                 pass
         
-        async with aiosqlite.connect("db/automod.db") as db:
+        async with storage.connect("db/automod.db") as db:
             result = await db.execute("DELETE FROM automod_ignored WHERE guild_id = ? AND type = 'channel' AND id = ?", (guild_id, channel.id))
             await db.commit()
+            await config_cache.invalidate("automod", guild_id)
 
         if result.rowcount > 0:
             embed = discord.Embed(title="<:vx_enabled:1346444890913116243> Success", description=f"{channel.mention} has been removed from the automod ignore list.", color=0x00FFFF)
@@ -741,9 +750,10 @@ class Automod(commands.Cog):
                 pass
 
         
-        async with aiosqlite.connect("db/automod.db") as db:
+        async with storage.connect("db/automod.db") as db:
             result = await db.execute("DELETE FROM automod_ignored WHERE guild_id = ? AND type = 'role' AND id = ?", (guild_id, role.id))
             await db.commit()
+            await config_cache.invalidate("automod", guild_id)
 
         if result.rowcount > 0:
             embed = discord.Embed(title="<:vx_enabled:1346444890913116243> Success", description=f"{role.mention} has been removed from the automod ignore list.", color=0x00FFFF)
@@ -803,12 +813,13 @@ class Automod(commands.Cog):
 
         elif view.value:
             
-            async with aiosqlite.connect("db/automod.db") as db:
+            async with storage.connect("db/automod.db") as db:
                 await db.execute("DELETE FROM automod WHERE guild_id = ?", (guild_id,))
                 await db.execute("DELETE FROM automod_punishments WHERE guild_id = ?", (guild_id,))
                 await db.execute("DELETE FROM automod_ignored WHERE guild_id = ?", (guild_id,))
                 await db.execute("DELETE FROM automod_logging WHERE guild_id = ?", (guild_id,))
                 await db.commit()
+                await config_cache.invalidate("automod", guild_id)
 
             rules = await ctx.guild.fetch_automod_rules()
             for rule in rules:
@@ -879,7 +890,7 @@ class Automod(commands.Cog):
         if await self.is_anti_nsfw_enabled(guild_id):
             embed.add_field(name="Anti NSFW Links", value="Block Message", inline=False)
 
-        async with aiosqlite.connect("db/automod.db") as db:
+        async with storage.connect("db/automod.db") as db:
             cursor = await db.execute("SELECT log_channel FROM automod_logging WHERE guild_id = ?", (guild_id,))
             log_channel_id = await cursor.fetchone()
 
@@ -918,9 +929,10 @@ class Automod(commands.Cog):
             await ctx.send(embed=embed)
             return
             
-        async with aiosqlite.connect("db/automod.db") as db:
+        async with storage.connect("db/automod.db") as db:
             await db.execute("INSERT OR REPLACE INTO automod_logging (guild_id, log_channel) VALUES (?, ?)", (guild_id, channel.id))
             await db.commit()
+            await config_cache.invalidate("automod", guild_id)
             embed=discord.Embed(title=f"Automod Settings for {ctx.guild.name}", description=f"**<:vx_enabled:1346444890913116243> | Automoderation Logging channel set to {channel.mention}.**\n\n➜ Use `{ctx.prefix}automod config` to view current Automod settings.", color=0x00FFFF)
             embed.set_footer(text=f"“{ctx.command.qualified_name}” Command executed by {ctx.author}",
                    icon_url=ctx.author.avatar.url if ctx.author.avatar else ctx.author.default_avatar.url)
@@ -931,12 +943,13 @@ class Automod(commands.Cog):
     async def on_guild_remove(self, guild):
         guild_id = guild.id
 
-        async with aiosqlite.connect("db/automod.db") as db:
+        async with storage.connect("db/automod.db") as db:
             await db.execute("DELETE FROM automod WHERE guild_id = ?", (guild_id,))
             await db.execute("DELETE FROM automod_punishments WHERE guild_id = ?", (guild_id,))
             await db.execute("DELETE FROM automod_ignored WHERE guild_id = ?", (guild_id,))
             await db.execute("DELETE FROM automod_logging WHERE guild_id = ?", (guild_id,))
             await db.commit()
+            await config_cache.invalidate("automod", guild_id)
 
 """
 @Author: Sonu Jana
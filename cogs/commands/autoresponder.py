@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands
 import aiosqlite
+from utils import storage
 import os
 from utils.Tools import *
 
@@ -15,7 +16,7 @@ class AutoResponder(commands.Cog):
     async def initialize_db(self):
         if not os.path.exists(os.path.dirname(DB_PATH)):
             os.makedirs(os.path.dirname(DB_PATH))
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with storage.connect(DB_PATH) as db:
             await db.execute('''
                 CREATE TABLE IF NOT EXISTS autoresponses (
                     guild_id INTEGER,
@@ -42,7 +43,7 @@ class AutoResponder(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def _create(self, ctx, name, *, message):
         name_lower = name.lower()
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with storage.connect(DB_PATH) as db:
             async with db.execute("SELECT COUNT(*) FROM autoresponses WHERE guild_id = ?", (ctx.guild.id,)) as cursor:
                 count = (await cursor.fetchone())[0]
                 if count >= 20:
@@ -72,7 +73,7 @@ class AutoResponder(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def _delete(self, ctx, name):
         name_lower = name.lower()
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with storage.connect(DB_PATH) as db:
             async with db.execute("SELECT 1 FROM autoresponses WHERE guild_id = ? AND LOWER(name) = ?", (ctx.guild.id, name_lower)) as cursor:
                 if not await cursor.fetchone():
                     return await ctx.reply(embed=discord.Embed(title="<:vx_cross:1346442303786717194> Error!",
@@ -94,7 +95,7 @@ class AutoResponder(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def _edit(self, ctx, name, *, message):
         name_lower = name.lower()
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with storage.connect(DB_PATH) as db:
             async with db.execute("SELECT 1 FROM autoresponses WHERE guild_id = ? AND LOWER(name) = ?", (ctx.guild.id, name_lower)) as cursor:
                 if not await cursor.fetchone():
                     return await ctx.reply(embed=discord.Embed(title="<:vx_cross:1346442303786717194> Error!",
@@ -115,7 +116,7 @@ class AutoResponder(commands.Cog):
     @commands.cooldown(1, 5, commands.BucketType.user)
     @commands.has_permissions(administrator=True)
     async def _config(self, ctx):
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with storage.connect(DB_PATH) as db:
             async with db.execute("SELECT name FROM autoresponses WHERE guild_id = ?", (ctx.guild.id,)) as cursor:
                 autoresponses = await cursor.fetchall()
 
@@ -135,7 +136,7 @@ class AutoResponder(commands.Cog):
         if message.author == self.bot.user:
             return
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with storage.connect(DB_PATH) as db:
             async with db.execute("SELECT message FROM autoresponses WHERE guild_id = ? AND LOWER(name) = ?", (message.guild.id, message.content.lower())) as cursor:
                 row = await cursor.fetchone()
 
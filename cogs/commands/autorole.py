@@ -1,6 +1,7 @@
 from __future__ import annotations
 import discord
 import aiosqlite
+from utils import storage
 import logging
 from discord.ext import commands
 from typing import List, Dict
@@ -33,7 +34,7 @@ class AutoRole(commands.Cog):
         self.color = 0x000000
 
     async def create_table(self):
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with storage.connect(DATABASE_PATH) as db:
             await db.execute("""
             CREATE TABLE IF NOT EXISTS autorole (
                 guild_id INTEGER PRIMARY KEY,
@@ -44,7 +45,7 @@ class AutoRole(commands.Cog):
             await db.commit()
 
     async def get_autorole(self, guild_id: int) -> Dict[str, List[int]]:
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with storage.connect(DATABASE_PATH) as db:
             async with db.execute("SELECT bots, humans FROM autorole WHERE guild_id = ?", (guild_id,)) as cursor:
                 row = await cursor.fetchone()
                 if row:
@@ -60,7 +61,7 @@ class AutoRole(commands.Cog):
     
 
     async def update_autorole(self, guild_id: int, data: Dict[str, List[int]]):
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with storage.connect(DATABASE_PATH) as db:
             bots = ','.join(map(str, data['bots']))
             humans = ','.join(map(str, data['humans']))
             
@@ -129,12 +130,12 @@ class AutoRole(commands.Cog):
     @ignore_check()
     @commands.has_permissions(administrator=True)
     async def _autorole_humans_reset(self, ctx):
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with storage.connect(DATABASE_PATH) as db:
             async with db.execute("SELECT humans FROM autorole WHERE guild_id = ?", (ctx.guild.id,)) as cursor:
                 data = await cursor.fetchone()
 
         if data and data[0]:
-            async with aiosqlite.connect(DATABASE_PATH) as db:
+            async with storage.connect(DATABASE_PATH) as db:
                 await db.execute("UPDATE autorole SET humans = ? WHERE guild_id = ?", ('[]', ctx.guild.id))
                 await db.commit()
             embed = discord.Embed(title="<:vx_tick:1346442266688094251> Success",
@@ -155,12 +156,12 @@ class AutoRole(commands.Cog):
     @ignore_check()
     @commands.has_permissions(administrator=True)
     async def _autorole_bots_reset(self, ctx):
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with storage.connect(DATABASE_PATH) as db:
             async with db.execute("SELECT bots FROM autorole WHERE guild_id = ?", (ctx.guild.id,)) as cursor:
                 data = await cursor.fetchone()
 
         if data and data[0]:
-            async with aiosqlite.connect(DATABASE_PATH) as db:
+            async with storage.connect(DATABASE_PATH) as db:
                 await db.execute("UPDATE autorole SET bots = ? WHERE guild_id = ?", ('[]', ctx.guild.id))
                 await db.commit()
             embed = discord.Embed(title="<:vx_tick:1346442266688094251> Success",
@@ -181,12 +182,12 @@ class AutoRole(commands.Cog):
     @commands.guild_only()
     @commands.has_permissions(administrator=True)
     async def _autorole_reset_all(self, ctx):
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with storage.connect(DATABASE_PATH) as db:
             async with db.execute("SELECT humans, bots FROM autorole WHERE guild_id = ?", (ctx.guild.id,)) as cursor:
                 data = await cursor.fetchone()
 
         if data and (data[0] or data[1]):
-            async with aiosqlite.connect(DATABASE_PATH) as db:
+            async with storage.connect(DATABASE_PATH) as db:
                 await db.execute("UPDATE autorole SET humans = ?, bots = ? WHERE guild_id = ?", ('[]', '[]', ctx.guild.id))
                 await db.commit()
             embed = discord.Embed(title="<:vx_tick:1346442266688094251> Success",
@@ -218,7 +219,7 @@ class AutoRole(commands.Cog):
     @commands.guild_only()
     @commands.has_permissions(administrator=True)
     async def _autorole_humans_add(self, ctx, *, role: discord.Role):
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with storage.connect(DATABASE_PATH) as db:
             async with db.execute("SELECT humans FROM autorole WHERE guild_id = ?", (ctx.guild.id,)) as cursor:
                 data = await cursor.fetchone()
         
@@ -234,7 +235,7 @@ class AutoRole(commands.Cog):
                                     color=self.color)
             else:
                 humans.append(role.id)
-                async with aiosqlite.connect(DATABASE_PATH) as db:
+                async with storage.connect(DATABASE_PATH) as db:
                     await db.execute("UPDATE autorole SET humans = ? WHERE guild_id = ?", (str(humans), ctx.guild.id))
                     await db.commit()
                 embed = discord.Embed(title="<:vx_tick:1346442266688094251> Success",
@@ -242,7 +243,7 @@ class AutoRole(commands.Cog):
                                     color=self.color)
         else:
             humans = [role.id]
-            async with aiosqlite.connect(DATABASE_PATH) as db:
+            async with storage.connect(DATABASE_PATH) as db:
                 await db.execute("INSERT INTO autorole (guild_id, humans, bots) VALUES (?, ?, ?)", (ctx.guild.id, str(humans), '[]'))
                 await db.commit()
             embed = discord.Embed(title="<:vx_tick:1346442266688094251> Success",
@@ -259,7 +260,7 @@ class AutoRole(commands.Cog):
     @commands.guild_only()
     @commands.has_permissions(administrator=True)
     async def _autorole_humans_remove(self, ctx, *, role: discord.Role):
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with storage.connect(DATABASE_PATH) as db:
             async with db.execute("SELECT humans FROM autorole WHERE guild_id = ?", (ctx.guild.id,)) as cursor:
                 data = await cursor.fetchone()
 
@@ -271,7 +272,7 @@ class AutoRole(commands.Cog):
                                     color=self.color)
             else:
                 humans.remove(role.id)
-                async with aiosqlite.connect(DATABASE_PATH) as db:
+                async with storage.connect(DATABASE_PATH) as db:
                     await db.execute("UPDATE autorole SET humans = ? WHERE guild_id = ?", (str(humans), ctx.guild.id))
                     await db.commit()
                 embed = discord.Embed(title="<:vx_tick:1346442266688094251> Success",
@@ -303,7 +304,7 @@ class AutoRole(commands.Cog):
     @commands.guild_only()
     @commands.has_permissions(administrator=True)
     async def _autorole_bots_add(self, ctx, *, role: discord.Role):
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with storage.connect(DATABASE_PATH) as db:
             async with db.execute("SELECT bots FROM autorole WHERE guild_id = ?", (ctx.guild.id,)) as cursor:
                 data = await cursor.fetchone()
         
@@ -319,7 +320,7 @@ class AutoRole(commands.Cog):
                                     color=self.color)
             else:
                 bots.append(role.id)
-                async with aiosqlite.connect(DATABASE_PATH) as db:
+                async with storage.connect(DATABASE_PATH) as db:
                     await db.execute("UPDATE autorole SET bots = ? WHERE guild_id = ?", (str(bots), ctx.guild.id))
                     await db.commit()
                 embed = discord.Embed(title="<:vx_tick:1346442266688094251> Success",
@@ -327,7 +328,7 @@ class AutoRole(commands.Cog):
                                     color=self.color)
         else:
             bots = [role.id]
-            async with aiosqlite.connect(DATABASE_PATH) as db:
+            async with storage.connect(DATABASE_PATH) as db:
                 await db.execute("INSERT INTO autorole (guild_id, humans, bots) VALUES (?, ?, ?)", (ctx.guild.id, '[]', str(bots)))
                 await db.commit()
             embed = discord.Embed(title="<:vx_tick:1346442266688094251> Success",
@@ -344,7 +345,7 @@ class AutoRole(commands.Cog):
     @commands.guild_only()
     @commands.has_permissions(administrator=True)
     async def _autorole_bots_remove(self, ctx, *, role: discord.Role):
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with storage.connect(DATABASE_PATH) as db:
             async with db.execute("SELECT bots FROM autorole WHERE guild_id = ?", (ctx.guild.id,)) as cursor:
                 data = await cursor.fetchone()
 
@@ -356,7 +357,7 @@ class AutoRole(commands.Cog):
                                       color=self.color)
             else:
                 bots.remove(role.id)
-                async with aiosqlite.connect(DATABASE_PATH) as db:
+                async with storage.connect(DATABASE_PATH) as db:
                     await db.execute("UPDATE autorole SET bots = ? WHERE guild_id = ?", (str(bots), ctx.guild.id))
                     await db.commit()
                 embed = discord.Embed(title="<:vx_tick:1346442266688094251> Success",
@@ -3,8 +3,9 @@ from discord.ext import commands
 import os
 import random
 from typing import List, Tuple, Union
-from PIL import Image
+from io import BytesIO
 from utils.Tools import *
+from utils.render import renderer
 
 CARDS_PATH = 'data/cards/'
 
@@ -52,32 +53,8 @@ class Blackjack(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    @staticmethod
-    def hand_to_images(hand: List[Card]) -> List[Image.Image]:
-        return [Image.open(os.path.join(CARDS_PATH, card.image)) for card in hand]
-
-    @staticmethod
-    def center(*hands: Tuple[Image.Image]) -> Image.Image:
-        bg: Image.Image = Image.open(os.path.join(CARDS_PATH, 'table.png'))
-        bg_center_x = bg.size[0] // 2
-        bg_center_y = bg.size[1] // 2
-
-        img_w = hands[0][0].size[0]
-        img_h = hands[0][0].size[1]
-
-        start_y = bg_center_y - (((len(hands) * img_h) + ((len(hands) - 1) * 15)) // 2)
-
-        for hand in hands:
-            start_x = bg_center_x - (((len(hand) * img_w) + ((len(hand) - 1) * 10)) // 2)
-            for card in hand:
-                bg.alpha_composite(card, (start_x, start_y))
-                start_x += img_w + 10
-            start_y += img_h + 15
-
-        return bg
-
-    def output(self, name, *hands: Tuple[List[Card]]) -> None:
-        self.center(*map(self.hand_to_images, hands)).save(f'data/{name}.png')
+    async def output(self, *hands: Tuple[List[Card]]) -> bytes:
+        return await renderer.render("blackjack", hands=[[card.image for card in hand] for hand in hands], cards_path=CARDS_PATH)
 
     @staticmethod
     def calc_hand(hand: List[Card]) -> int:
@@ -121,9 +98,9 @@ class Blackjack(commands.Cog):
             dealer_score = self.calc_hand(dealer_hand)
 
             async def out_table(**kwargs) -> discord.Message:
-                self.output(ctx.author.id, dealer_hand, player_hand)
+                image = await self.output(dealer_hand, player_hand)
                 embed = discord.Embed(**kwargs)
-                file = discord.File(f"data/{ctx.author.id}.png", filename=f"{ctx.author.id}.png")
+                file = discord.File(BytesIO(image), filename=f"{ctx.author.id}.png")
                 embed.set_image(url=f"attachment://{ctx.author.id}.png")
                 msg: discord.Message = await ctx.send(file=file, embed=embed)
                 return msg
@@ -210,7 +187,6 @@ class Blackjack(commands.Cog):
                     f"Dealer's hand: {dealer_score}"
                 )
             )
-            os.remove(f'data/{ctx.author.id}.png')
         except Exception as e:
             print(e)
 
@@ -3,6 +3,7 @@ from discord import app_commands
 from discord.ext import commands
 from discord.ext.commands import Context
 import aiosqlite
+from utils import storage
 import asyncio
 from utils.Tools import *
 from typing import List, Tuple
@@ -61,7 +62,7 @@ class Customrole(commands.Cog):
     
 
     async def handle_role_command(self, context: Context, member: discord.Member, role_type: str):
-        async with aiosqlite.connect('db/customrole.db') as db:
+        async with storage.connect('db/customrole.db') as db:
             async with db.execute(f"SELECT reqrole, {role_type} FROM roles WHERE guild_id = ?", (context.guild.id,)) as cursor:
                 data = await cursor.fetchone()
                 if data:
@@ -108,7 +109,7 @@ class Customrole(commands.Cog):
 
 
     async def create_tables(self):
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with storage.connect(DATABASE_PATH) as db:
             await db.execute('''
                 CREATE TABLE IF NOT EXISTS roles (
                     guild_id INTEGER PRIMARY KEY,
@@ -144,7 +145,7 @@ class Customrole(commands.Cog):
             context.command.reset_cooldown(context)
 
     async def fetch_role_data(self, guild_id):
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with storage.connect(DATABASE_PATH) as db:
             async with db.execute("SELECT staff, girl, vip, guest, frnd, reqrole FROM roles WHERE guild_id = ?", (guild_id,)) as cursor:
                 return await cursor.fetchone()
 
@@ -153,7 +154,7 @@ class Customrole(commands.Cog):
 
     async def update_role_data(self, guild_id, column, value):
         try:
-            async with aiosqlite.connect(DATABASE_PATH) as db:
+            async with storage.connect(DATABASE_PATH) as db:
                 await db.execute(f"INSERT OR REPLACE INTO roles (guild_id, {column}) VALUES (?, ?) ON CONFLICT(guild_id) DO UPDATE SET {column} = ?",
                                  (guild_id, value, value))
                 await db.commit()
@@ -162,7 +163,7 @@ class Customrole(commands.Cog):
             
 
     async def fetch_custom_role_data(self, guild_id):
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with storage.connect(DATABASE_PATH) as db:
             async with db.execute("SELECT name, role_id FROM custom_roles WHERE guild_id = ?", (guild_id,)) as cursor:
                 return await cursor.fetchall()
 
@@ -342,7 +343,7 @@ class Customrole(commands.Cog):
     @commands.has_permissions(administrator=True)
     @app_commands.describe(name="Command name", role="Role to be assigned")
     async def create(self, context: Context, name: str, role: discord.Role) -> None:
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with storage.connect(DATABASE_PATH) as db:
             async with db.execute("SELECT COUNT(*) FROM custom_roles WHERE guild_id = ?", (context.guild.id,)) as cursor:
                 count = await cursor.fetchone()
                 if count[0] >= 56:
@@ -383,7 +384,7 @@ class Customrole(commands.Cog):
     @commands.has_permissions(administrator=True)
     @app_commands.describe(name="Command name to be deleted")
     async def delete(self, context: Context, name: str) -> None:
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with storage.connect(DATABASE_PATH) as db:
             async with db.execute("SELECT name FROM custom_roles WHERE guild_id = ? AND name = ?", (context.guild.id, name)) as cursor:
                 existing_role = await cursor.fetchone()
 
@@ -395,7 +396,7 @@ class Customrole(commands.Cog):
             await context.reply(embed=embed)
             return
 
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with storage.connect(DATABASE_PATH) as db:
             await db.execute("DELETE FROM custom_roles WHERE guild_id = ? AND name = ?", (context.guild.id, name))
             await db.commit()
 
@@ -471,7 +472,7 @@ class Customrole(commands.Cog):
                             removed_roles.append(f"**{role_name.capitalize()}:** {role.mention}")
                             await self.update_role_data(context.guild.id, role_name, None)
                             
-                async with aiosqlite.connect(DATABASE_PATH) as db:
+                async with storage.connect(DATABASE_PATH) as db:
                     await db.execute("DELETE FROM custom_roles WHERE guild_id = ?", (context.guild.id,))
                     await db.commit()
                     embed = discord.Embed(
@@ -520,7 +521,7 @@ class Customrole(commands.Cog):
         guild_id = message.guild.id
 
         
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with storage.connect(DATABASE_PATH) as db:
             async with db.execute("SELECT role_id FROM custom_roles WHERE guild_id = ? AND name = ?", (guild_id, command_name)) as cursor:
                 result = await cursor.fetchone()
 
@@ -529,7 +530,7 @@ class Customrole(commands.Cog):
             role = message.guild.get_role(role_id)
 
             
-            async with aiosqlite.connect(DATABASE_PATH) as db:
+            async with storage.connect(DATABASE_PATH) as db:
                 async with db.execute("SELECT reqrole FROM roles WHERE guild_id = ?", (guild_id,)) as cursor:
                     reqrole_result = await cursor.fetchone()
 
@@ -17,6 +17,7 @@ from utils import Paginator, DescriptionEmbedPaginator, FieldPagePaginator, Text
 from core import Cog, Olympus, Context
 from typing import Optional
 import aiosqlite 
+from utils import storage
 import asyncio
 import aiohttp
 
@@ -212,6 +213,7 @@ class Extra(commands.Cog):
   @blacklist_check() 
   @ignore_check()
   @commands.cooldown(1, 3, commands.BucketType.user)
+  @chunk_check()
   async def serverinfo(self, ctx):
         embed = discord.Embed(color=0x000000).set_author(
             name=f"{ctx.guild.name}'s Information",
@@ -451,6 +453,7 @@ class Extra(commands.Cog):
   @blacklist_check()
   @ignore_check()
   @commands.cooldown(1, 3, commands.BucketType.user)
+  @chunk_check()
   async def roleinfo(self, ctx, role: discord.Role):
     members = role.members
     created_at = role.created_at.strftime("%Y-%m-%d %H:%M:%S")
@@ -563,6 +566,7 @@ class Extra(commands.Cog):
   @blacklist_check()
   @ignore_check()
   @commands.cooldown(1, 3, commands.BucketType.user)
+  @chunk_check()
   async def list_inrole(self, ctx, role: discord.Role):
     guild = ctx.guild
     entries = [
@@ -627,6 +631,7 @@ class Extra(commands.Cog):
   @blacklist_check()
   @ignore_check()
   @commands.cooldown(1, 3, commands.BucketType.user)
+  @chunk_check()
   async def list_bots(self, ctx):
     guild = ctx.guild
     people = filter(lambda member: member.bot, ctx.guild.members)
@@ -650,6 +655,7 @@ class Extra(commands.Cog):
   @blacklist_check()
   @ignore_check()
   @commands.cooldown(1, 3, commands.BucketType.user)
+  @chunk_check()
   async def list_admin(self, ctx):
     mems = ([
       mem for mem in ctx.guild.members
@@ -697,6 +703,7 @@ class Extra(commands.Cog):
   @blacklist_check()
   @ignore_check()
   @commands.cooldown(1, 3, commands.BucketType.user)
+  @chunk_check()
   async def list_mod(self, ctx):
     membs = ([
       mem for mem in ctx.guild.members
@@ -727,6 +734,7 @@ class Extra(commands.Cog):
   @blacklist_check()
   @ignore_check()
   @commands.cooldown(1, 3, commands.BucketType.user)
+  @chunk_check()
   async def list_early(self, ctx):
     mems = ([
       memb for memb in ctx.guild.members
@@ -756,6 +764,7 @@ class Extra(commands.Cog):
   @blacklist_check()
   @ignore_check()
   @commands.cooldown(1, 3, commands.BucketType.user)
+  @chunk_check()
   async def list_activedeveloper(self, ctx):
     mems = ([
       memb for memb in ctx.guild.members
@@ -783,6 +792,7 @@ class Extra(commands.Cog):
   @blacklist_check()
   @ignore_check()
   @commands.cooldown(1, 3, commands.BucketType.user)
+  @chunk_check()
   async def list_cpos(self, ctx):
     mems = ([memb for memb in ctx.guild.members])
     mems = sorted(mems, key=lambda memb: memb.created_at)
@@ -804,6 +814,7 @@ class Extra(commands.Cog):
   @blacklist_check()
   @ignore_check()
   @commands.cooldown(1, 3, commands.BucketType.user)
+  @chunk_check()
   async def list_joinpos(self, ctx):
     mems = ([memb for memb in ctx.guild.members])
     mems = sorted(mems, key=lambda memb: memb.joined_at)
@@ -929,7 +940,7 @@ class Extra(commands.Cog):
     
     db_latency = None
     try:
-      async with aiosqlite.connect("db/afk.db") as db:
+      async with storage.connect("db/afk.db") as db:
         start_time = time.perf_counter()
         await db.execute("SELECT 1")
         end_time = time.perf_counter()
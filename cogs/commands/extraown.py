@@ -2,6 +2,7 @@ import discord
 from discord.ext import commands
 from discord.ui import View, Button
 import aiosqlite
+from utils import storage
 from utils.Tools import *
 
 class Extraowner(commands.Cog):
@@ -10,7 +11,7 @@ class Extraowner(commands.Cog):
         self.bot.loop.create_task(self.initialize_db())
 
     async def initialize_db(self):
-        self.db = await aiosqlite.connect('db/anti.db')
+        self.db = await storage.connect('db/anti.db')
         await self.db.execute('''
             CREATE TABLE IF NOT EXISTS extraowners (
                 guild_id INTEGER PRIMARY KEY,
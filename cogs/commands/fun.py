@@ -32,13 +32,11 @@ class Fun(commands.Cog):
     self.search_engine_id = '2166875ec165a6c21' 
 
 
-  async def download_avatar(self, url):
-      async with aiohttp.ClientSession() as session:
-          async with session.get(url) as resp:
-              if resp.status != 200:
-                  return None
-              data = await resp.read()
-              return Image.open(io.BytesIO(data)).convert("RGBA")
+  async def download_avatar(self, asset):
+      data = await self.bot.assets.fetch_asset(asset, size=512)
+      if data is None:
+          return None
+      return Image.open(io.BytesIO(data)).convert("RGBA")
 
   def circle_avatar(self, avatar):
       mask = Image.new("L", avatar.size, 0)
@@ -102,11 +100,8 @@ class Fun(commands.Cog):
       base_image_path = "data/pictures/mydog.jpg"
       base_image = Image.open(base_image_path).convert("RGBA")
 
-      author_avatar_url = ctx.author.display_avatar.url
-      user_avatar_url = user.display_avatar.url
-
-      author_avatar = await self.download_avatar(author_avatar_url)
-      user_avatar = await self.download_avatar(user_avatar_url)
+      author_avatar = await self.download_avatar(ctx.author.display_avatar)
+      user_avatar = await self.download_avatar(user.display_avatar)
 
       if author_avatar is None or user_avatar is None:
           await ctx.send("Failed to retrieve avatars.")
@@ -89,7 +89,6 @@ class General(commands.Cog):
   def __init__(self, bot, *args, **kwargs):
     self.bot = bot
 
-    self.aiohttp = aiohttp.ClientSession()
     self._URL_REGEX = r'(?P<url><[^: >]+:\/[^ >]+>|(?:https?|steam):\/\/[^\s<]+[^<.,:;\"\'\]\s])'
     self.color = 0x000000
 
@@ -179,6 +178,7 @@ class General(commands.Cog):
   @blacklist_check()
   @ignore_check()
   @commands.cooldown(1, 2, commands.BucketType.user)
+  @chunk_check()
   async def membercount(self, ctx: commands.Context):
         total_members = len(ctx.guild.members)
         total_humans = len([member for member in ctx.guild.members if not member.bot])
@@ -335,7 +335,7 @@ class General(commands.Cog):
   @ignore_check()
   @commands.cooldown(1, 3, commands.BucketType.user)
   async def urban(self, ctx: commands.Context, *, phrase):
-    async with self.aiohttp.get(
+    async with self.bot.session.get(
         "http://api.urbandictionary.com/v0/define?term={}".format(
           phrase)) as urb:
       urban = await urb.json()
@@ -382,7 +382,7 @@ class General(commands.Cog):
     phrases = [
       "rickroll", "rick roll", "rick astley", "never gonna give you up"
     ]
-    source = str(await (await self.aiohttp.get(
+    source = str(await (await self.bot.session.get(
       url, allow_redirects=True)).content.read()).lower()
     rickRoll = bool((re.findall('|'.join(phrases), source,
                                 re.MULTILINE | re.IGNORECASE)))
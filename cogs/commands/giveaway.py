@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands, tasks
 import aiosqlite
+from utils import storage
 import asyncio
 import datetime
 import random
@@ -44,7 +45,7 @@ class Giveaway(commands.Cog):
         """Initialize database connection and start giveaway end checker."""
         if not os.path.exists(db_folder):
             os.makedirs(db_folder)
-        self.connection = await aiosqlite.connect(self.db_path)
+        self.connection = await storage.connect(self.db_path)
         self.cursor = await self.connection.cursor()
         await self.create_table()
         await self.check_for_ended_giveaways()
@@ -72,13 +73,25 @@ class Giveaway(commands.Cog):
         await self.connection.commit()
 
     ### Giveaway Management
+    def is_local(self, guild_id):
+        """Whether the guild's shard runs in this process (always, unless clustered)."""
+        if self.bot.shard_ids is None:
+            return True
+        return (guild_id >> 22) % self.bot.shard_count in self.bot.shard_ids
+
     async def check_for_ended_giveaways(self):
         """Check for and end giveaways that have reached their end time."""
+        # until the guilds are cached get_guild() is None for all of them,
+        # and end_giveaway would delete every giveaway due
+        if not self.bot.is_ready():
+            return
         current_time = datetime.datetime.now().timestamp()
         await self.cursor.execute("SELECT ends_at, guild_id, message_id, host_id, winners, prize, channel_id FROM Giveaway WHERE ends_at <= ?", (current_time,))
         ended_giveaways = await self.cursor.fetchall()
         for giveaway in ended_giveaways:
-            await self.end_giveaway(giveaway)
+            # every cluster reads the same table; the others' guilds aren't ours to end
+            if self.is_local(giveaway[1]):
+                await self.end_giveaway(giveaway)
 
     async def end_giveaway(self, giveaway):
         """End a giveaway and announce winners."""
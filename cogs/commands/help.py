@@ -1,7 +1,6 @@
 import discord
 from discord.ext import commands
 from discord import app_commands, Interaction
-from difflib import get_close_matches
 from contextlib import suppress
 from core import Context
 from core.Olympus import Olympus
@@ -10,16 +9,36 @@ from utils.Tools import getConfig
 from itertools import chain
 import json
 from utils import help as vhelp
+from utils.help import HelpCatalog, HelpPolicy
 from utils import Paginator, DescriptionEmbedPaginator, FieldPagePaginator, TextPaginator
 import asyncio
 from utils.config import serverLink
 from utils.Tools import *
 
 color = 0x000000
-client = Olympus()
 
 class HelpCommand(commands.HelpCommand):
 
+  async def policy(self) -> HelpPolicy:
+    # a fresh HelpCommand is made per invocation, so this is read once per $help
+    if getattr(self, "_policy", None) is None:
+      self._policy = await HelpPolicy.fetch(self.context)
+    return self._policy
+
+  async def filter_commands(self, commands, /, *, sort=False, key=None):
+    """Like the default, but every command is judged against one cached policy."""
+    if sort and key is None:
+      key = lambda c: c.name
+    catalog = HelpCatalog.of(self.context.bot)
+    policy = await self.policy()
+    ret = [
+      cmd for cmd in commands
+      if (self.show_hidden or not cmd.hidden) and await catalog.can_run(cmd, self.context, policy)
+    ]
+    if sort:
+      ret.sort(key=key)
+    return ret
+
   async def send_ignore_message(self, ctx, ignore_type: str):
 
     if ignore_type == "channel":
@@ -47,18 +66,16 @@ class HelpCommand(commands.HelpCommand):
 
   async def command_not_found(self, string: str) -> None:
     ctx = self.context
-    check_ignore = await ignore_check().predicate(ctx)
-    check_blacklist = await blacklist_check().predicate(ctx)
+    policy = await self.policy()
 
-    if not check_blacklist:
+    if policy.blacklisted:
         return
 
-    if not check_ignore:
+    if policy.ignores(ctx.command):
         await self.send_ignore_message(ctx, "command")
         return
 
-    cmds = (str(cmd) for cmd in self.context.bot.walk_commands())
-    matches = get_close_matches(string, cmds)
+    matches = HelpCatalog.of(ctx.bot).suggestions.suggest(string)
 
     embed = discord.Embed(
         title="",
@@ -78,13 +95,12 @@ class HelpCommand(commands.HelpCommand):
 
   async def send_bot_help(self, mapping):
     ctx = self.context
-    check_ignore = await ignore_check().predicate(ctx)
-    check_blacklist = await blacklist_check().predicate(ctx)
+    policy = await self.policy()
 
-    if not check_blacklist:
+    if policy.blacklisted:
       return
 
-    if not check_ignore:
+    if policy.ignores(ctx.command):
       await self.send_ignore_message(ctx, "command")
       return
 
@@ -93,17 +109,12 @@ class HelpCommand(commands.HelpCommand):
     ok = await self.context.reply(embed=embed)          
     data = await getConfig(self.context.guild.id)
     prefix = data["prefix"]
-    filtered = await self.filter_commands(self.context.bot.walk_commands(),
-                                              sort=True)
-    slash = len([
-  cmd for cmd in self.context.bot.tree.get_commands() 
-  if isinstance(cmd, app_commands.Command)
-])
+    catalog = HelpCatalog.of(self.context.bot)
 
     embed = discord.Embed(
       title="", color=0x00FFFF)
 
-    embed.add_field(name="<:emoji_16:1345804109592133662> __**General Info:**__", value=f"🔴 Server Prefix:  **{prefix}** \n🔴 Total Commands: **{len(set(self.context.bot.walk_commands()))}**\n🔴 Total Slash Commands: **{slash}**\n🔴 **[Want This Bot](https://discord.gg/F8weADeZ)** | **[Support](https://discord.gg/F8weADeZ)**\n\n❓ __**How do you use me?**__\n>>> `{prefix}help <command/module>` to get more info regarding that command/module\nFor example: `{prefix}help antinuke`\n\n")
+    embed.add_field(name="<:emoji_16:1345804109592133662> __**General Info:**__", value=f"🔴 Server Prefix:  **{prefix}** \n🔴 Total Commands: **{catalog.total}**\n🔴 Total Slash Commands: **{catalog.slash}**\n🔴 **[Want This Bot](https://discord.gg/F8weADeZ)** | **[Support](https://discord.gg/F8weADeZ)**\n\n❓ __**How do you use me?**__\n>>> `{prefix}help <command/module>` to get more info regarding that command/module\nFor example: `{prefix}help antinuke`\n\n")
 
     embed.add_field(name="⭐ __**My Features**__", value=">>> **50+ Systems, including:**\n <:security:1345799792382574633> Security\n <:automod:1345799346662281347> Automoderation\n <:emoji_14:1345801279024140349> Utility\n <:music:1345800159573053440> Music\n <:Staff:1345979397051777024> Moderation\n <:welcomer:1345800958306680832> Customrole\n <a:giveaway:1345982612241649736> Giveaway\n <:emoji_15:1345801329104125962> Voice\n <:games:1345800657525014659> Games\n <:welcomer:1345800958306680832> Welcomer\n <:Auto_react:1345800427559714958> Autoreact & responder\n <:emoji_14:1345801279024140349> Autorole & Invc\n 🎭 Fun & AI Image Gen\n   And much more!...")
 
@@ -116,11 +127,10 @@ class HelpCommand(commands.HelpCommand):
     embed.set_author(name=self.context.author, icon_url=self.context.author.avatar.url if self.context.author.avatar else self.context.author.default_avatar.url)
 
     #embed.timestamp = discord.utils.utcnow()
-    view = vhelp.View(mapping=mapping,
+    view = vhelp.View(catalog=catalog,
                           ctx=self.context,
                           homeembed=embed,
                           ui=2)
-    await asyncio.sleep(0.5)
     await ok.edit(embed=embed,view=view)
 
 
@@ -128,13 +138,12 @@ class HelpCommand(commands.HelpCommand):
 
   async def send_command_help(self, command):
     ctx = self.context
-    check_ignore = await ignore_check().predicate(ctx)
-    check_blacklist = await blacklist_check().predicate(ctx)
+    policy = await self.policy()
 
-    if not check_blacklist:
+    if policy.blacklisted:
       return
 
-    if not check_ignore:
+    if policy.ignores(ctx.command):
       await self.send_ignore_message(ctx, "command")
       return
 
@@ -176,13 +185,12 @@ class HelpCommand(commands.HelpCommand):
 
   async def send_group_help(self, group):
     ctx = self.context
-    check_ignore = await ignore_check().predicate(ctx)
-    check_blacklist = await blacklist_check().predicate(ctx)
+    policy = await self.policy()
 
-    if not check_blacklist:
+    if policy.blacklisted:
       return
 
-    if not check_ignore:
+    if policy.ignores(ctx.command):
       await self.send_ignore_message(ctx, "command")
       return
 
@@ -191,10 +199,10 @@ class HelpCommand(commands.HelpCommand):
             f"➜ `{self.context.prefix}{cmd.qualified_name}`\n",
             f"{cmd.short_doc if cmd.short_doc else ''}\n\u200b"
         )
-        for cmd in group.commands
+        for cmd in await self.filter_commands(group.commands)
       ]
 
-    count = len(group.commands)
+    count = len(entries)
 
 
     paginator = Paginator(source=FieldPagePaginator(
@@ -209,13 +217,12 @@ class HelpCommand(commands.HelpCommand):
 
   async def send_cog_help(self, cog):
     ctx = self.context
-    check_ignore = await ignore_check().predicate(ctx)
-    check_blacklist = await blacklist_check().predicate(ctx)
+    policy = await self.policy()
 
-    if not check_blacklist:
+    if policy.blacklisted:
       return
 
-    if not check_ignore:
+    if policy.ignores(ctx.command):
       await self.send_ignore_message(ctx, "command")
       return
 
@@ -224,10 +231,10 @@ class HelpCommand(commands.HelpCommand):
       f"➜ `{self.context.prefix}{cmd.qualified_name}`",
       f"{cmd.short_doc if cmd.short_doc else ''}"
       f"\n\u200b",
-    ) for cmd in cog.get_commands()]
+    ) for cmd in await self.filter_commands(cog.get_commands())]
     paginator = Paginator(source=FieldPagePaginator(
       entries=entries,
-      title=f"{cog.qualified_name.title()} ({len(cog.get_commands())})",
+      title=f"{cog.qualified_name.title()} ({len(entries)})",
       description="< > Duty | [ ] Optional\n\n",
       color=color,
       per_page=4),
@@ -5,6 +5,8 @@ from core import *
 from utils.Tools import *
 from typing import Optional
 import aiosqlite
+from utils import storage
+from utils.cache import config_cache
 
 class Ignore(commands.Cog):
   def __init__(self, bot):
@@ -14,7 +16,7 @@ class Ignore(commands.Cog):
     bot.loop.create_task(self.initialize_db())
 
   async def initialize_db(self):
-    async with aiosqlite.connect(self.db_path) as db:
+    async with storage.connect(self.db_path) as db:
       await db.execute("CREATE TABLE IF NOT EXISTS ignored_commands (guild_id INTEGER, command_name TEXT)")
       await db.execute("CREATE TABLE IF NOT EXISTS ignored_channels (guild_id INTEGER, channel_id INTEGER)")
       await db.execute("CREATE TABLE IF NOT EXISTS ignored_users (guild_id INTEGER, user_id INTEGER)")
@@ -55,7 +57,7 @@ class Ignore(commands.Cog):
           embed = discord.Embed(title="<:vx_cross:1346442303786717194> Error", description=f"`{command_name}` is not a valid command.", color=self.color)
           await ctx.reply(embed=embed, mention_author=False)
           return
-      async with aiosqlite.connect(self.db_path) as db:
+      async with storage.connect(self.db_path) as db:
           cursor = await db.execute("SELECT COUNT(*) FROM ignored_commands WHERE guild_id = ?", (ctx.guild.id,))
           count = await cursor.fetchone()
           if count[0] >= 25:
@@ -70,6 +72,7 @@ class Ignore(commands.Cog):
           else:
               await db.execute("INSERT INTO ignored_commands (guild_id, command_name) VALUES (?, ?)", (ctx.guild.id, command_name_normalized))
               await db.commit()
+              await config_cache.invalidate("ignore", ctx.guild.id)
               embed = discord.Embed(title="<:vx_tick:1346442266688094251> Success", description=f"Successfully added `{command_name}` to the ignore commands list.", color=self.color)
               await ctx.reply(embed=embed)
 
@@ -78,7 +81,7 @@ class Ignore(commands.Cog):
   @blacklist_check()
   async def command_remove(self, ctx: commands.Context, command_name: str):
       command_name_normalized = command_name.strip().lower()
-      async with aiosqlite.connect(self.db_path) as db:
+      async with storage.connect(self.db_path) as db:
           cursor = await db.execute("SELECT command_name FROM ignored_commands WHERE guild_id = ? AND command_name = ?", (ctx.guild.id, command_name_normalized))
           result = await cursor.fetchone()
           if not result:
@@ -87,6 +90,7 @@ class Ignore(commands.Cog):
           else:
               await db.execute("DELETE FROM ignored_commands WHERE guild_id = ? AND command_name = ?", (ctx.guild.id, command_name_normalized))
               await db.commit()
+              await config_cache.invalidate("ignore", ctx.guild.id)
               embed = discord.Embed(title="<:vx_tick:1346442266688094251> Success", description=f"Successfully removed `{command_name}` from the ignore commands list.", color=self.color)
               await ctx.reply(embed=embed)
 
@@ -95,7 +99,7 @@ class Ignore(commands.Cog):
   @ignore_check()
   @commands.has_permissions(administrator=True)
   async def command_show(self, ctx: commands.Context):
-      async with aiosqlite.connect(self.db_path) as db:
+      async with storage.connect(self.db_path) as db:
           cursor = await db.execute("SELECT command_name FROM ignored_commands WHERE guild_id = ?", (ctx.guild.id,))
           commands = await cursor.fetchall()
           if not commands:
@@ -124,7 +128,7 @@ class Ignore(commands.Cog):
   #@ignore_check()
   @commands.has_permissions(administrator=True)
   async def channel_add(self, ctx: commands.Context, channel: discord.TextChannel):
-    async with aiosqlite.connect(self.db_path) as db:
+    async with storage.connect(self.db_path) as db:
       cursor = await db.execute("SELECT COUNT(*) FROM ignored_channels WHERE guild_id = ?", (ctx.guild.id,))
       count = await cursor.fetchone()
 
@@ -142,6 +146,7 @@ class Ignore(commands.Cog):
       else:
         await db.execute("INSERT INTO ignored_channels (guild_id, channel_id) VALUES (?, ?)", (ctx.guild.id, channel.id))
         await db.commit()
+        await config_cache.invalidate("ignore", ctx.guild.id)
         embed = discord.Embed(title="<:vx_tick:1346442266688094251> Success", description=f"Successfully added {channel.mention} to the ignore channels list.", color=self.color)
         await ctx.reply(embed=embed)
 
@@ -150,7 +155,7 @@ class Ignore(commands.Cog):
   #@ignore_check()
   @commands.has_permissions(administrator=True)
   async def channel_remove(self, ctx: commands.Context, channel: discord.TextChannel):
-    async with aiosqlite.connect(self.db_path) as db:
+    async with storage.connect(self.db_path) as db:
       cursor = await db.execute("SELECT channel_id FROM ignored_channels WHERE guild_id = ? AND channel_id = ?", (ctx.guild.id, channel.id))
       result = await cursor.fetchone()
 
@@ -160,6 +165,7 @@ class Ignore(commands.Cog):
       else:
         await db.execute("DELETE FROM ignored_channels WHERE guild_id = ? AND channel_id = ?", (ctx.guild.id, channel.id))
         await db.commit()
+        await config_cache.invalidate("ignore", ctx.guild.id)
         embed = discord.Embed(title="<:vx_tick:1346442266688094251> Success", description=f"Successfully removed {channel.mention} from the ignore channels list.", color=self.color)
         await ctx.reply(embed=embed)
 
@@ -168,7 +174,7 @@ class Ignore(commands.Cog):
   @ignore_check()
   @commands.has_permissions(administrator=True)
   async def channel_show(self, ctx: commands.Context):
-    async with aiosqlite.connect(self.db_path) as db:
+    async with storage.connect(self.db_path) as db:
       cursor = await db.execute("SELECT channel_id FROM ignored_channels WHERE guild_id = ?", (ctx.guild.id,))
       channels = await cursor.fetchall()
 
@@ -198,7 +204,7 @@ class Ignore(commands.Cog):
   @blacklist_check()
 
   async def user_add(self, ctx: commands.Context, user: discord.User):
-    async with aiosqlite.connect(self.db_path) as db:
+    async with storage.connect(self.db_path) as db:
       cursor = await db.execute("SELECT COUNT(*) FROM ignored_users WHERE guild_id = ?", (ctx.guild.id,))
       count = await cursor.fetchone()
 
@@ -216,6 +222,7 @@ class Ignore(commands.Cog):
       else:
         await db.execute("INSERT INTO ignored_users (guild_id, user_id) VALUES (?, ?)", (ctx.guild.id, user.id))
         await db.commit()
+        await config_cache.invalidate("ignore", ctx.guild.id)
         embed = discord.Embed(title="<:vx_tick:1346442266688094251> Success", description=f"Successfully added {user.mention} to the ignore users list.", color=self.color)
         await ctx.reply(embed=embed)
 
@@ -224,7 +231,7 @@ class Ignore(commands.Cog):
 
   @commands.has_permissions(administrator=True)
   async def user_remove(self, ctx: commands.Context, user: discord.User):
-    async with aiosqlite.connect(self.db_path) as db:
+    async with storage.connect(self.db_path) as db:
       cursor = await db.execute("SELECT user_id FROM ignored_users WHERE guild_id = ? AND user_id = ?", (ctx.guild.id, user.id))
       result = await cursor.fetchone()
 
@@ -234,6 +241,7 @@ class Ignore(commands.Cog):
       else:
         await db.execute("DELETE FROM ignored_users WHERE guild_id = ? AND user_id = ?", (ctx.guild.id, user.id))
         await db.commit()
+        await config_cache.invalidate("ignore", ctx.guild.id)
         embed = discord.Embed(title="<:vx_tick:1346442266688094251> Success", description=f"Successfully removed {user.mention} from the ignore users list.", color=self.color)
         await ctx.send(embed=embed)
 
@@ -242,7 +250,7 @@ class Ignore(commands.Cog):
   @ignore_check()
   @commands.has_permissions(administrator=True)
   async def user_show(self, ctx: commands.Context):
-    async with aiosqlite.connect(self.db_path) as db:
+    async with storage.connect(self.db_path) as db:
       cursor = await db.execute("SELECT user_id FROM ignored_users WHERE guild_id = ?", (ctx.guild.id,))
       users = await cursor.fetchall()
 
@@ -271,7 +279,7 @@ class Ignore(commands.Cog):
   
   @commands.has_permissions(administrator=True)
   async def bypass_add(self, ctx: commands.Context, user: discord.User):
-    async with aiosqlite.connect(self.db_path) as db:
+    async with storage.connect(self.db_path) as db:
       cursor = await db.execute("SELECT COUNT(*) FROM bypassed_users WHERE guild_id = ?", (ctx.guild.id,))
       count = await cursor.fetchone()
 
@@ -289,6 +297,7 @@ class Ignore(commands.Cog):
       else:
         await db.execute("INSERT INTO bypassed_users (guild_id, user_id) VALUES (?, ?)", (ctx.guild.id, user.id))
         await db.commit()
+        await config_cache.invalidate("ignore", ctx.guild.id)
         embed = discord.Embed(title="<:vx_tick:1346442266688094251> Success", description=f"Successfully added {user.mention} to the bypass users list.", color=self.color)
         await ctx.reply(embed=embed)
 
@@ -297,7 +306,7 @@ class Ignore(commands.Cog):
   @ignore_check()
   @commands.has_permissions(administrator=True)
   async def bypass_remove(self, ctx: commands.Context, user: discord.User):
-    async with aiosqlite.connect(self.db_path) as db:
+    async with storage.connect(self.db_path) as db:
       cursor = await db.execute("SELECT user_id FROM bypassed_users WHERE guild_id = ? AND user_id = ?", (ctx.guild.id, user.id))
       result = await cursor.fetchone()
 
@@ -307,6 +316,7 @@ class Ignore(commands.Cog):
       else:
         await db.execute("DELETE FROM bypassed_users WHERE guild_id = ? AND user_id = ?", (ctx.guild.id, user.id))
         await db.commit()
+        await config_cache.invalidate("ignore", ctx.guild.id)
         embed = discord.Embed(title="<:vx_tick:1346442266688094251> Success", description=f"Successfully removed {user.mention} from the bypass users list.", color=self.color)
         await ctx.reply(embed=embed)
 
@@ -315,7 +325,7 @@ class Ignore(commands.Cog):
   @ignore_check()
   @commands.has_permissions(administrator=True)
   async def bypass_show(self, ctx: commands.Context):
-    async with aiosqlite.connect(self.db_path) as db:
+    async with storage.connect(self.db_path) as db:
       cursor = await db.execute("SELECT user_id FROM bypassed_users WHERE guild_id = ?", (ctx.guild.id,))
       users = await cursor.fetchall()
 
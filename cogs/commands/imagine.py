@@ -122,7 +122,7 @@ class AiStuffCog(commands.Cog):
         model_uid = Model[model.value].value[0]
 
         try:
-            imagefileobj = await generate_image_prodia(prompt, model_uid, sampler.value, seed, negative)
+            imagefileobj = await generate_image_prodia(prompt, model_uid, sampler.value, seed, negative, self.bot.session)
         except aiohttp.ClientPayloadError:
             await interaction.followup.send("An error occurred while generating the image. Please try again later.", ephemeral=True)
             return
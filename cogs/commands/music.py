@@ -5,6 +5,8 @@ from discord.ext import commands
 from discord.ui import Button, View
 from datetime import datetime
 import aiosqlite
+from utils import storage
+from utils.rest import COSMETIC, RequestShed, lane
 
 yt_dl_options = {
     'format': 'bestaudio/best',
@@ -102,9 +104,13 @@ class MusicPlayer:
 
         if self.message:
             try:
-                await self.message.edit(embed=embed, view=MusicController(self))
+                with lane(COSMETIC):
+                    await self.message.edit(embed=embed, view=MusicController(self))
             except discord.NotFound:
                 self.message = None
+            except RequestShed:
+                # the next song refreshes it again
+                pass
         if not self.message and self.text_channel:
             self.message = await self.text_channel.send(embed=embed, view=MusicController(self))
 
@@ -195,7 +201,7 @@ class Music(commands.Cog):
                 await self.music_players[member.guild.id].cleanup()
     async def ensure_db(self):
         """Ensures the database and table exist."""
-        async with aiosqlite.connect("vc_247.db") as db:
+        async with storage.connect("vc_247.db") as db:
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS vc_status (
                     guild_id INTEGER PRIMARY KEY,
@@ -221,7 +227,7 @@ class Music(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        async with aiosqlite.connect("vc_247.db") as db:
+        async with storage.connect("vc_247.db") as db:
             async with db.execute("SELECT enabled FROM vc_status WHERE guild_id = ?", (guild_id,)) as cursor:
                 row = await cursor.fetchone()
                 if row and row[0] == 1:  # If already enabled, disable it
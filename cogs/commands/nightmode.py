@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands
 import aiosqlite
+from utils import storage
 import os
 from utils.Tools import *
 
@@ -18,7 +19,7 @@ class Nightmode(commands.Cog):
         self.color = 0x000000  
 
     async def initialize_db(self):
-        self.db = await aiosqlite.connect(db_path)
+        self.db = await storage.connect(db_path)
         await self.db.execute('''
             CREATE TABLE IF NOT EXISTS Nightmode (
                 guildId TEXT,
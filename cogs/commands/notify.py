@@ -1,23 +1,95 @@
+import asyncio
+import time
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 import aiosqlite
+from utils import storage
 from utils.Tools import *
 
+# a stream that starts again within this long after it ended is the same
+# stream coming back from a reconnect
+STREAM_TTL = 15 * 60
+# announcements for one channel are collected this long and sent together
+BATCH_WINDOW = 5
+# Discord's limit of embeds per message
+BATCH_SIZE = 10
+
+
+def stream_type(activity: discord.Streaming):
+    url = (activity.url or "").lower()
+    return "twitch" if "twitch" in url else "youtube" if "youtube" in url else None
+
+
 class NotifCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db_path = "db/notify.db"
-        self.loop_task = self.bot.loop.create_task(self.setup_db())
-
-    async def setup_db(self):
-        async with aiosqlite.connect(self.db_path) as db:
+        # guild_id -> type -> (role_id, channel_id), the only thing presence updates read
+        self.configs: dict[int, dict[str, tuple[int, int]]] = {}
+        # (guild_id, user_id) -> monotonic time their stream last ended
+        self.live: dict[tuple[int, int], float] = {}
+        # channel_id -> (role mention, embed) waiting for the batch to go out
+        self.pending: dict[int, list] = {}
+        self.flushes = set()
+        self.backfill_task = None
+
+    async def cog_load(self):
+        async with storage.connect(self.db_path) as db:
             await db.execute('''CREATE TABLE IF NOT EXISTS notifications (
                                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                                type TEXT NOT NULL UNIQUE,
+                                guild_id INTEGER,
+                                type TEXT NOT NULL,
                                 role_id INTEGER NOT NULL,
-                                channel_id INTEGER NOT NULL)''')
+                                channel_id INTEGER NOT NULL,
+                                UNIQUE (guild_id, type))''')
+            await db.commit()
+            async with db.execute('SELECT guild_id, type, role_id, channel_id FROM notifications') as cursor:
+                rows = await cursor.fetchall()
+
+        legacy = []
+        for guild_id, notif_type, role_id, channel_id in rows:
+            if guild_id is None:
+                legacy.append((notif_type, role_id, channel_id))
+            else:
+                self.configs.setdefault(guild_id, {})[notif_type] = (role_id, channel_id)
+        if legacy:
+            self.backfill_task = asyncio.create_task(self.backfill(legacy))
+        self.prune_live.start()
+        self.bot.health.queue("notify", lambda: sum(map(len, self.pending.values())))
+
+    async def cog_unload(self):
+        self.prune_live.cancel()
+        self.bot.health.queues.pop("notify", None)
+        for task in self.flushes:
+            task.cancel()
+        if self.backfill_task:
+            self.backfill_task.cancel()
+
+    async def backfill(self, legacy):
+        """Give settings saved before they were per guild the guild of their channel."""
+        await self.bot.wait_until_ready()
+        async with storage.connect(self.db_path) as db:
+            for notif_type, role_id, channel_id in legacy:
+                channel = self.bot.get_channel(channel_id)
+                if channel is None or notif_type in self.configs.get(channel.guild.id, {}):
+                    continue
+                await db.execute('UPDATE notifications SET guild_id = ? WHERE guild_id IS NULL AND type = ? AND channel_id = ?',
+                                 (channel.guild.id, notif_type, channel_id))
+                self.configs.setdefault(channel.guild.id, {})[notif_type] = (role_id, channel_id)
             await db.commit()
 
+    async def save(self, guild_id: int, notif_type: str, role_id: int, channel_id: int) -> bool:
+        if notif_type in self.configs.get(guild_id, {}):
+            return False
+        async with storage.connect(self.db_path) as db:
+            cursor = await db.execute('INSERT OR IGNORE INTO notifications (guild_id, type, role_id, channel_id) VALUES (?, ?, ?, ?)',
+                                      (guild_id, notif_type, role_id, channel_id))
+            await db.commit()
+            if cursor.rowcount == 0:
+                return False
+        self.configs.setdefault(guild_id, {})[notif_type] = (role_id, channel_id)
+        return True
+
     @commands.group(invoke_without_command=True)
     async def setnotif(self, ctx):
         embed = discord.Embed(title="Notification Commands", color=0x00FFFF)
@@ -29,87 +101,112 @@ class NotifCommands(commands.Cog):
     @ignore_check()
     @commands.has_permissions(administrator=True)
     async def twitch(self, ctx, role: discord.Role, channel: discord.TextChannel):
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute('SELECT * FROM notifications WHERE type = ?', ('twitch',)) as existing:
-                row = await existing.fetchone()
-                if row:
-                    await ctx.reply(embed=discord.Embed(title="<a:vx_warn:1337749180784971881> Access Denied", description="Twitch notification already set. Remove it first.", color=0x00FFFF))
-                    return
-
-            await db.execute('INSERT INTO notifications (type, role_id, channel_id) VALUES (?, ?, ?)', ('twitch', role.id, channel.id))
-            await db.commit()
-            await ctx.reply(embed=discord.Embed(title="<:vx_tick:1346442266688094251> Success", description=f"Twitch notifications set for {role.mention} in {channel.mention}.", color=0x00FFFF))
+        if not await self.save(ctx.guild.id, 'twitch', role.id, channel.id):
+            await ctx.reply(embed=discord.Embed(title="<a:vx_warn:1337749180784971881> Access Denied", description="Twitch notification already set. Remove it first.", color=0x00FFFF))
+            return
+        await ctx.reply(embed=discord.Embed(title="<:vx_tick:1346442266688094251> Success", description=f"Twitch notifications set for {role.mention} in {channel.mention}.", color=0x00FFFF))
 
     @setnotif.command()
     @blacklist_check()
     @ignore_check()
     @commands.has_permissions(administrator=True)
     async def youtube(self, ctx, role: discord.Role, channel: discord.TextChannel):
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute('SELECT * FROM notifications WHERE type = ?', ('youtube',)) as existing:
-                row = await existing.fetchone()
-                if row:
-                    await ctx.reply(embed=discord.Embed(title="<a:vx_warn:1337749180784971881> Access Denied", description="YouTube notification already set. Remove it first.", color=0x00FFFF))
-                    return
-
-            await db.execute('INSERT INTO notifications (type, role_id, channel_id) VALUES (?, ?, ?)', ('youtube', role.id, channel.id))
-            await db.commit()
-            await ctx.reply(embed=discord.Embed(title="<:vx_tick:1346442266688094251> Success", description=f"YouTube notifications set for {role.mention} in {channel.mention}.", color=0x00FFFF))
+        if not await self.save(ctx.guild.id, 'youtube', role.id, channel.id):
+            await ctx.reply(embed=discord.Embed(title="<a:vx_warn:1337749180784971881> Access Denied", description="YouTube notification already set. Remove it first.", color=0x00FFFF))
+            return
+        await ctx.reply(embed=discord.Embed(title="<:vx_tick:1346442266688094251> Success", description=f"YouTube notifications set for {role.mention} in {channel.mention}.", color=0x00FFFF))
 
     @setnotif.command()
     async def list(self, ctx):
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute('SELECT * FROM notifications') as cursor:
-                rows = await cursor.fetchall()
-                if not rows:
-                    await ctx.reply(embed=discord.Embed(description="No Twitch and YouTube notification channels set.", color=0xFF0000))
-                    return
-
-            embed = discord.Embed(title="Current Notification Settings", color=0x00FFFF)
-            for row in rows:
-                notif_type = row[1].capitalize() 
-                role = ctx.guild.get_role(row[2])
-                channel = ctx.guild.get_channel(row[3])
-                if role and channel:
-                    embed.add_field(name=f"{notif_type} Notifications", value=f"Role: {role.mention} | Channel: {channel.mention}", inline=False)
-                else:
-                    embed.add_field(name=f"{notif_type} Notifications", value="Role or Channel not found", inline=False)
-
-            await ctx.reply(embed=embed)
+        configs = self.configs.get(ctx.guild.id)
+        if not configs:
+            await ctx.reply(embed=discord.Embed(description="No Twitch and YouTube notification channels set.", color=0xFF0000))
+            return
+
+        embed = discord.Embed(title="Current Notification Settings", color=0x00FFFF)
+        for notif_type, (role_id, channel_id) in configs.items():
+            role = ctx.guild.get_role(role_id)
+            channel = ctx.guild.get_channel(channel_id)
+            if role and channel:
+                embed.add_field(name=f"{notif_type.capitalize()} Notifications", value=f"Role: {role.mention} | Channel: {channel.mention}", inline=False)
+            else:
+                embed.add_field(name=f"{notif_type.capitalize()} Notifications", value="Role or Channel not found", inline=False)
+
+        await ctx.reply(embed=embed)
 
     @setnotif.command()
     async def reset(self, ctx):
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute('DELETE FROM notifications WHERE type IN (?, ?)', ('twitch', 'youtube'))
+        async with storage.connect(self.db_path) as db:
+            await db.execute('DELETE FROM notifications WHERE guild_id = ? AND type IN (?, ?)', (ctx.guild.id, 'twitch', 'youtube'))
             await db.commit()
-            await ctx.send(embed=discord.Embed(title="<:vx_tick:1346442266688094251> Success", description="Twitch and YouTube notifications have been reset.", color=0x00FF00))
+        self.configs.pop(ctx.guild.id, None)
+        await ctx.send(embed=discord.Embed(title="<:vx_tick:1346442266688094251> Success", description="Twitch and YouTube notifications have been reset.", color=0x00FF00))
+
 
+    @tasks.loop(minutes=5)
+    async def prune_live(self):
+        cutoff = time.monotonic() - STREAM_TTL
+        self.live = {key: seen for key, seen in self.live.items() if seen > cutoff}
 
     @commands.Cog.listener()
     async def on_presence_update(self, before, after):
-        
-        streaming = next((activity for activity in after.activities if isinstance(activity, discord.Streaming)), None)
+        configs = self.configs.get(after.guild.id)
+        if not configs:
+            return
 
-        if streaming:
-            stream_type = "twitch" if "twitch" in streaming.url.lower() else "youtube" if "youtube" in streaming.url.lower() else None
-            if stream_type:
-                async with aiosqlite.connect(self.db_path) as db:
-                    async with db.execute('SELECT role_id, channel_id FROM notifications WHERE type = ?', (stream_type,)) as cursor:
-                        row = await cursor.fetchone()
-                        if row:
-                            role_id, channel_id = row
-                            role = after.guild.get_role(role_id)
-                            channel = after.guild.get_channel(channel_id)
-
-                            if role and channel:
-                                embed = discord.Embed(
-                                    title=f"{after.display_name} is now live!",
-                                    description=f"{after.mention} is now streaming on {stream_type.capitalize()}.",
-                                    color=0x00FFFF
-                                )
-                                embed.add_field(name="Stream Title", value=streaming.name, inline=False)
-                                embed.add_field(name="Watch here", value=streaming.url, inline=False)
-                                await channel.send(content=role.mention, embed=embed)
+        streaming = next((activity for activity in after.activities if isinstance(activity, discord.Streaming)), None)
+        was_streaming = any(isinstance(activity, discord.Streaming) for activity in before.activities)
+        key = (after.guild.id, after.id)
+        if not streaming:
+            if was_streaming:
+                self.live[key] = time.monotonic()
+            return
+        # only the switch to streaming is a start; title edits and other
+        # activity changes during a stream arrive with before streaming too
+        if was_streaming:
+            return
+        ended = self.live.pop(key, None)
+        if ended is not None and time.monotonic() - ended < STREAM_TTL:
+            return
+
+        notif_type = stream_type(streaming)
+        if notif_type not in configs:
+            return
+        role_id, channel_id = configs[notif_type]
+        role = after.guild.get_role(role_id)
+        channel = after.guild.get_channel(channel_id)
+        if not role or not channel:
+            return
+
+        embed = discord.Embed(
+            title=f"{after.display_name} is now live!",
+            description=f"{after.mention} is now streaming on {notif_type.capitalize()}.",
+            color=0x00FFFF
+        )
+        embed.add_field(name="Stream Title", value=streaming.name, inline=False)
+        embed.add_field(name="Watch here", value=streaming.url, inline=False)
+        self.announce(channel, role, embed)
+
+    def announce(self, channel, role, embed):
+        queue = self.pending.get(channel.id)
+        if queue is None:
+            queue = self.pending[channel.id] = []
+            task = asyncio.create_task(self.flush(channel))
+            self.flushes.add(task)
+            task.add_done_callback(self.flushes.discard)
+        queue.append((role.mention, embed))
+
+    async def flush(self, channel):
+        """Sends a channel's queued announcements after BATCH_WINDOW, up to ten embeds a message."""
+        await asyncio.sleep(BATCH_WINDOW)
+        queue = self.pending.pop(channel.id, [])
+        for start in range(0, len(queue), BATCH_SIZE):
+            batch = queue[start:start + BATCH_SIZE]
+            mentions = " ".join(dict.fromkeys(mention for mention, _ in batch))
+            try:
+                await channel.send(content=mentions, embeds=[embed for _, embed in batch])
+            except discord.HTTPException:
+                return
 
 """
 @Author: Sonu Jana
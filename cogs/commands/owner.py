@@ -1,20 +1,20 @@
 from __future__ import annotations
 from discord.ext import commands
 from discord import *
-from PIL import Image, ImageDraw, ImageFont
 import discord
 import json
 import datetime
 import asyncio
 import aiosqlite
+from utils import storage
 from typing import Optional
 from utils import Paginator, DescriptionEmbedPaginator, FieldPagePaginator, TextPaginator
 from utils.Tools import *
+from utils.render import renderer
+from utils.perf import PHASES
 from utils.config import OWNER_IDS
 from core import Cog, Olympus, Context
-import sqlite3
 import os
-import requests
 from io import BytesIO
 from utils.config import OWNER_IDS
 from discord.errors import Forbidden
@@ -54,42 +54,42 @@ db_path = os.path.join(db_folder, db_file)
 FONT_PATH = os.path.join('utils', 'arial.ttf')
 
 
-conn = sqlite3.connect(db_path)
-c = conn.cursor()
-
-
-c.execute('''CREATE TABLE IF NOT EXISTS badges (
-    user_id INTEGER PRIMARY KEY,
-    owner INTEGER DEFAULT 0,
-    staff INTEGER DEFAULT 0,
-    partner INTEGER DEFAULT 0,
-    sponsor INTEGER DEFAULT 0,
-    friend INTEGER DEFAULT 0,
-    early INTEGER DEFAULT 0,
-    vip INTEGER DEFAULT 0,
-    bug INTEGER DEFAULT 0
-)''')
-conn.commit()
-
-def add_badge(user_id, badge):
-    c.execute(f"SELECT {badge} FROM badges WHERE user_id = ?", (user_id,))
-    result = c.fetchone()
-    if result is None:
-        c.execute(f"INSERT INTO badges (user_id, {badge}) VALUES (?, 1)", (user_id,))
-    elif result[0] == 0:
-        c.execute(f"UPDATE badges SET {badge} = 1 WHERE user_id = ?", (user_id,))
-    else:
-        return False
-    conn.commit()
+async def setup_badges():
+    async with storage.connect(db_path) as db:
+        await db.execute('''CREATE TABLE IF NOT EXISTS badges (
+            user_id INTEGER PRIMARY KEY,
+            owner INTEGER DEFAULT 0,
+            staff INTEGER DEFAULT 0,
+            partner INTEGER DEFAULT 0,
+            sponsor INTEGER DEFAULT 0,
+            friend INTEGER DEFAULT 0,
+            early INTEGER DEFAULT 0,
+            vip INTEGER DEFAULT 0,
+            bug INTEGER DEFAULT 0
+        )''')
+        await db.commit()
+
+async def add_badge(user_id, badge):
+    async with storage.connect(db_path) as db:
+        async with db.execute(f"SELECT {badge} FROM badges WHERE user_id = ?", (user_id,)) as cursor:
+            result = await cursor.fetchone()
+        if result is None:
+            await db.execute(f"INSERT INTO badges (user_id, {badge}) VALUES (?, 1)", (user_id,))
+        elif result[0] == 0:
+            await db.execute(f"UPDATE badges SET {badge} = 1 WHERE user_id = ?", (user_id,))
+        else:
+            return False
+        await db.commit()
     return True
 
-def remove_badge(user_id, badge):
-    c.execute(f"SELECT {badge} FROM badges WHERE user_id = ?", (user_id,))
-    result = c.fetchone()
-    if result and result[0] == 1:
-        c.execute(f"UPDATE badges SET {badge} = 0 WHERE user_id = ?", (user_id,))
-        conn.commit()
-        return True
+async def remove_badge(user_id, badge):
+    async with storage.connect(db_path) as db:
+        async with db.execute(f"SELECT {badge} FROM badges WHERE user_id = ?", (user_id,)) as cursor:
+            result = await cursor.fetchone()
+        if result and result[0] == 1:
+            await db.execute(f"UPDATE badges SET {badge} = 0 WHERE user_id = ?", (user_id,))
+            await db.commit()
+            return True
     return False
 
 
@@ -164,8 +164,18 @@ class Owner(commands.Cog):
         self.client.loop.create_task(self.load_staff())
         
 
+    async def cog_load(self):
+        self.client.ipc.register("mutuals", self.local_mutuals)
+
+    async def cog_unload(self):
+        self.client.ipc.unregister("mutuals")
+
+    async def local_mutuals(self, user_id):
+        """(id, name, member count) of this process's guilds that have ``user_id`` as a member."""
+        return [(guild.id, guild.name, guild.member_count) for guild in self.client.guilds if guild.get_member(user_id)]
+
     async def setup_database(self):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
             await db.execute('''
                 CREATE TABLE IF NOT EXISTS staff (
                     id INTEGER PRIMARY KEY
@@ -177,7 +187,7 @@ class Owner(commands.Cog):
 
     async def load_staff(self):
         await self.client.wait_until_ready()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
             async with db.execute('SELECT id FROM staff') as cursor:
                 self.staff = {row[0] for row in await cursor.fetchall()}
      
@@ -207,7 +217,7 @@ class Owner(commands.Cog):
             await ctx.reply(embed=sonu, mention_author=False)
         else:
             self.staff.add(user.id)
-            async with aiosqlite.connect(self.db_path) as db:
+            async with storage.connect(self.db_path) as db:
                 await db.execute('INSERT OR IGNORE INTO staff (id) VALUES (?)', (user.id,))
                 await db.commit()
             sonu2 = discord.Embed(title="<a:emoji_1740993086003:1346047306230792204> Success", description=f"Added {user} to the staff list.", color=0x00FFFF)
@@ -221,7 +231,7 @@ class Owner(commands.Cog):
             await ctx.reply(embed=sonu, mention_author=False)
         else:
             self.staff.remove(user.id)
-            async with aiosqlite.connect(self.db_path) as db:
+            async with storage.connect(self.db_path) as db:
                 await db.execute('DELETE FROM staff WHERE id = ?', (user.id,))
                 await db.commit()
                 sonu2 = discord.Embed(title="<a:emoji_1740993086003:1346047306230792204> Success", description=f"Removed {user} from the staff list.", color=0x00FFFF)
@@ -262,10 +272,11 @@ class Owner(commands.Cog):
     @commands.command(name="mutuals", aliases=["mutual"])
     @commands.is_owner()
     async def mutuals(self, ctx, user: discord.User):
-        guilds = [guild for guild in self.client.guilds if user in guild.members]
+        # each cluster only sees its own shards' guilds
+        guilds = [guild for share in await self.client.ipc.broadcast("mutuals", user_id=user.id) if share for guild in share]
         entries = [
-            f"`#{no}` | [{guild.name}](https://discord.com/channels/{guild.id}) - {guild.member_count}"
-            for no, guild in enumerate(guilds, start=1)
+            f"`#{no}` | [{name}](https://discord.com/channels/{guild_id}) - {member_count}"
+            for no, (guild_id, name, member_count) in enumerate(guilds, start=1)
         ]
         paginator = Paginator(source=DescriptionEmbedPaginator(
             entries=entries,
@@ -276,6 +287,96 @@ class Owner(commands.Cog):
             ctx=ctx)
         await paginator.paginate()
 
+    @commands.group(name="perf", invoke_without_command=True,
+                    help="Shows listener or command timings, or recent event-loop stalls.")
+    @commands.is_owner()
+    async def perf(self, ctx, view: str = "listeners"):
+        perf = self.client.perf
+        lag = self.client.health.monitor
+        if view == "stalls":
+            watchdog = perf.watchdog
+            entries = []
+            for stall in reversed(watchdog.stalls):
+                # innermost frames are what was blocking
+                stack = "".join(stall.stack.splitlines(keepends=True)[-16:])[-1500:]
+                entries.append(f"<t:{int(stall.started)}:R> blocked for **{stall.duration * 1000:.0f} ms**\n```py\n{stack}```")
+            title = f"Event-loop stalls over {watchdog.threshold * 1000:.0f} ms [{watchdog.count}]"
+            per_page = 1
+        elif view in ("listeners", "commands"):
+            table = perf.listeners if view == "listeners" else perf.commands
+            entries = [
+                f"`{name}`\n{stats.calls} calls • p50 {stats.percentile(0.5) * 1000:.1f} ms • "
+                f"p99 {stats.percentile(0.99) * 1000:.1f} ms • db {stats.phases['db'] * 1000:.0f} ms • {stats.errors} errors"
+                for name, stats in sorted(table.items(), key=lambda item: item[1].total, reverse=True)
+            ]
+            title = f"Slowest {view} by total time • loop lag {lag.lag * 1000:.1f} ms (peak {lag.peak * 1000:.1f} ms)"
+            per_page = 8
+        else:
+            return await ctx.reply(f"Usage: `{ctx.prefix}perf [listeners|commands|stalls]` or `{ctx.prefix}perf profile [start|stop] <command>`", mention_author=False)
+
+        if not entries:
+            return await ctx.reply("Nothing recorded yet.", mention_author=False)
+        paginator = Paginator(source=DescriptionEmbedPaginator(
+            entries=entries,
+            description="",
+            title=title,
+            color=0x00FFFF,
+            per_page=per_page),
+            ctx=ctx)
+        await paginator.paginate()
+
+    @perf.command(name="profile", help="Profiles a command's slowest invocations: start, stop, or show them with the pstats attached.")
+    @commands.is_owner()
+    async def perf_profile(self, ctx, *, query: str):
+        action, _, name = query.partition(" ")
+        if action not in ("start", "stop"):
+            action, name = "show", query
+        command = self.client.get_command(name) or self.client.tree.get_command(name)
+        if command is None:
+            return await ctx.reply(f"No command called `{name}`.", mention_author=False)
+        name = command.qualified_name
+        profiler = self.client.perf.profiler
+
+        if action == "start":
+            profiler.targets.add(name)
+            return await ctx.reply(f"Profiling `{name}`. Its runs slower than its p99 keep their profile; "
+                                   f"see them with `{ctx.prefix}perf profile {name}`.", mention_author=False)
+        if action == "stop":
+            profiler.targets.discard(name)
+            return await ctx.reply(f"Stopped profiling `{name}`, its captures are kept.", mention_author=False)
+
+        captures = profiler.captures.get(name)
+        if not captures:
+            hint = "" if name in profiler.targets else f" Start with `{ctx.prefix}perf profile start {name}`."
+            return await ctx.reply(f"No slow runs of `{name}` captured yet.{hint}", mention_author=False)
+        slowest = captures[0]
+        embed = discord.Embed(title=f"Profile of {name}", color=0x00FFFF)
+        embed.description = "```\n" + "\n".join(
+            f"{own * 1000:8.1f} ms {calls:>6}  {function}"[:110] for own, calls, function in slowest.top(12)
+        ) + "```"
+        stats = self.client.perf.commands.get(name)
+        if stats and stats.calls:
+            embed.add_field(name=f"All runs ({stats.calls})", value=(
+                f"p50 {stats.percentile(0.5) * 1000:.1f} ms • p99 {stats.percentile(0.99) * 1000:.1f} ms\n"
+                + " • ".join(f"{phase} {stats.phases[phase] / stats.calls * 1000:.1f} ms" for phase in PHASES)
+            ), inline=False)
+        embed.add_field(name="Captured runs", value="\n".join(
+            f"<t:{int(capture.started)}:R> **{capture.duration * 1000:.0f} ms** • "
+            + " • ".join(f"{phase} {capture.breakdown[phase] * 1000:.0f}" for phase in PHASES)
+            for capture in captures
+        ), inline=False)
+        embed.set_footer(text="cProfile sees everything the loop ran meanwhile, not only this command")
+
+        slug = name.replace(" ", "_")
+        report = "\n\n".join(
+            f"=== {capture.duration * 1000:.0f} ms at {datetime.datetime.fromtimestamp(capture.started):%Y-%m-%d %H:%M:%S}\n{capture.report(40)}"
+            for capture in captures
+        )
+        await ctx.reply(embed=embed, files=[
+            discord.File(BytesIO(slowest.dump()), filename=f"{slug}.pstats"),
+            discord.File(BytesIO(report.encode()), filename=f"{slug}.txt"),
+        ], mention_author=False)
+
     @commands.command(name="getinvite", aliases=["gi", "guildinvite"])
     @commands.is_owner()
     async def getinvite(self, ctx: Context, guild= discord.Guild):
@@ -655,12 +756,12 @@ class Owner(commands.Cog):
         if badge in BADGE_URLS or badge == 'bug' or badge == 'all':
             if badge == 'all':
                 for b in BADGE_URLS.keys():
-                    add_badge(user_id, b)
-                add_badge(user_id, 'bug')
+                    await add_badge(user_id, b)
+                await add_badge(user_id, 'bug')
                 embed = discord.Embed(description=f"All badges added to {member.mention}.", color=0x00FFFF)
                 await ctx.send(embed=embed)
             else:
-                success = add_badge(user_id, badge)
+                success = await add_badge(user_id, badge)
                 if success:
                     embed = discord.Embed(description=f"Badge `{badge}` added to {member.mention}.", color=0x00FFFF)
                 else:
@@ -681,12 +782,12 @@ class Owner(commands.Cog):
         if badge in BADGE_URLS or badge == 'bug' or badge == 'all':
             if badge == 'all':
                 for b in BADGE_URLS.keys():
-                    remove_badge(user_id, b)
-                remove_badge(user_id, 'bug')
+                    await remove_badge(user_id, b)
+                await remove_badge(user_id, 'bug')
                 embed = discord.Embed(description=f"All badges removed from {member.mention}.", color=0x00FFFF)
                 await ctx.send(embed=embed)
             else:
-                success = remove_badge(user_id, badge)
+                success = await remove_badge(user_id, badge)
                 if success:
                     embed = discord.Embed(description=f"Badge `{badge}` removed from {member.mention}.", color=0x00FFFF)
                 else:
@@ -733,7 +834,9 @@ class Badges(commands.Cog):
         self.bot = bot
         self.db_path = 'db/np.db'
 
-        
+    async def cog_load(self):
+        await setup_badges()
+
     @commands.hybrid_command(aliases=['profile', 'pr'])
     @blacklist_check()
     @ignore_check()
@@ -746,68 +849,28 @@ class Badges(commands.Cog):
         user_id = member.id
 
         
-        c.execute("SELECT * FROM badges WHERE user_id = ?", (user_id,))
-        badges = c.fetchone()
+        async with storage.connect(db_path) as db:
+            async with db.execute("SELECT * FROM badges WHERE user_id = ?", (user_id,)) as cursor:
+                badges = await cursor.fetchone()
+                columns = [column[0] for column in cursor.description]
 
         if badges:
-            badges = dict(zip([column[0] for column in c.description], badges))
+            badges = dict(zip(columns, badges))
         else:
             badges = {k: 0 for k in BADGE_URLS.keys()}
 
         
-        badge_size = 120
-        padding = 80
-        num_columns = 4
-        image_width = 960
-        image_height = 540
-
-
-
-        def calculate_text_dimensions(badge_name, font, padding=1):
-            text_bbox = draw.textbbox((0, 0), badge_name, font=font)
-            text_width = (text_bbox[2] - text_bbox[0]) + 2 * padding
-            text_height = (text_bbox[3] - text_bbox[1]) + 2 * padding
-            return text_width, text_height
-
-        
-        def draw_badges(badges, draw, img):
-
-            
-            upper_y = (image_height // 4) - (badge_size // 2)
-            lower_y = (3 * image_height // 4) - (badge_size // 2)
-            
-            x_positions = [padding + i * ((image_width - 2 * padding) // (num_columns - 1)) for i in range(num_columns)]
-
-            badge_positions = []
-            for badge in BADGE_URLS.keys():
-                if badges[badge]:
-                    badge_positions.append(badge)
-
-            for i, badge in enumerate(badge_positions):
-                y = upper_y if i < num_columns else lower_y
-                x = x_positions[i % num_columns]
-                response = requests.get(BADGE_URLS[badge])
-                badge_img = Image.open(BytesIO(response.content)).resize((badge_size, badge_size))
-                img.paste(badge_img, (x - badge_size // 2, y), badge_img)
-                text_width, text_height = calculate_text_dimensions(BADGE_NAMES[badge], font)
-                draw.text((x - text_width // 2, y + badge_size + 5), BADGE_NAMES[badge], fill=(255, 0, 0), font=font)  
-
-        
         has_badges = any(value == 1 for value in badges.values())
 
         if has_badges:
-            
-            img = Image.new('RGBA', (image_width, image_height), (255, 255, 255, 0))
-            draw = ImageDraw.Draw(img)
-            font = ImageFont.truetype(FONT_PATH, 25)  
-
-            
-            draw_badges(badges, draw, img)
+            owned = []
+            for badge in BADGE_URLS.keys():
+                if badges[badge]:
+                    data = await self.bot.assets.fetch(BADGE_URLS[badge])
+                    if data is not None:
+                        owned.append((BADGE_NAMES[badge], data))
 
-            with BytesIO() as image_binary:
-                img.save(image_binary, 'PNG')
-                image_binary.seek(0)
-                file = discord.File(fp=image_binary, filename='badge.png')
+            file = await renderer.render_file("badges", "badge.png", badges=owned, font_path=FONT_PATH)
 
             embed = discord.Embed(title=f"{member.display_name}'s Profile", color=0x00FFFF)
 
@@ -857,7 +920,7 @@ class Badges(commands.Cog):
                 if omg or wtf:
                     user_badges.append("<:BadgeNitro:1274895915689443431> Nitro Subscriber")
                 for guild in self.bot.guilds:
-                    if member in guild.members:
+                    if guild.get_member(member.id):
                         if guild.premium_subscription_count > 0 and member in guild.premium_subscribers:
                             user_badges.append("<:booster:1274896054810312816> Server Booster Badge")
                             
@@ -923,7 +986,7 @@ class Badges(commands.Cog):
                 if omg or wtf:
                     user_badges.append("<:BadgeNitro:1274895915689443431> Nitro Subscriber")
                 for guild in self.bot.guilds:
-                    if member in guild.members:
+                    if guild.get_member(member.id):
                         if guild.premium_subscription_count > 0 and member in guild.premium_subscribers:
                             user_badges.append("<:booster:1274896054810312816> Server Booster Badge")
 
@@ -12,6 +12,24 @@ class Global(commands.Cog):
         self.local_frozen_nicks = {}  
         self.client.frozen_nicknames = {}
 
+    async def cog_load(self):
+        self.client.ipc.register("global_ban", self.local_ban)
+
+    async def cog_unload(self):
+        self.client.ipc.unregister("global_ban")
+
+    async def local_ban(self, user_id, reason):
+        """Bans ``user_id`` from this process's mutual guilds; returns (banned in, failed in) guild names."""
+        success, failure = [], []
+        for guild in self.client.guilds:
+            if guild.get_member(user_id):
+                try:
+                    await guild.ban(discord.Object(user_id), reason=reason)
+                    success.append(guild.name)
+                except:
+                    failure.append(guild.name)
+        return success, failure
+
     @commands.group(name="global", invoke_without_command=True)
     @commands.is_owner()
     async def global_command(self, ctx: commands.Context):
@@ -22,8 +40,8 @@ class Global(commands.Cog):
     @commands.command(name="brahmastra",help="Bans the user from all mutual guilds.")
     @commands.is_owner()
     async def global_ban(self, ctx: commands.Context, user: discord.User, reason: str = "Severe violations of Discord's terms of service."):
-        mutual_guilds = [guild for guild in self.client.guilds if guild.get_member(user.id)]
-        mutual_count = len(mutual_guilds)
+        # mutual guilds are spread over every cluster
+        mutual_count = sum(len(share) for share in await self.client.ipc.broadcast("mutuals", user_id=user.id) if share)
 
         confirm_embed = discord.Embed(
             title=f"Are you sure to Ban {user.display_name} Globally?",
@@ -43,12 +61,10 @@ class Global(commands.Cog):
             await interaction.response.edit_message(view=view)
             await ctx.send(f"Processing global ban for {user.name}...")
             success, failure = [], []
-            for guild in mutual_guilds:
-                try:
-                    await guild.ban(user, reason=reason)
-                    success.append(guild.name)
-                except:
-                    failure.append(guild.name)
+            for share in await self.client.ipc.broadcast("global_ban", timeout=300, user_id=user.id, reason=reason):
+                if share:
+                    success += share[0]
+                    failure += share[1]
             embed = discord.Embed(
                 title="Success",
                 description=f"Banned the user in {len(success)} of {mutual_count} mutual guilds.",
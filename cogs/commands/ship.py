@@ -3,11 +3,10 @@ import io
 import random
 import discord
 import datetime
-import requests
 from discord.ext import commands
 from discord.ext.commands import errors
-from PIL import Image, ImageFont, ImageDraw
 from utils.Tools import *
+from utils.render import renderer
 
 class Ship(commands.Cog):
     def __init__(self, bot):
@@ -18,6 +17,7 @@ class Ship(commands.Cog):
     @blacklist_check()
     @ignore_check()
     @commands.cooldown(1, 3, commands.BucketType.user)
+    @chunk_check()
     async def ship(self, ctx, user1: discord.Member = None, user2: discord.Member = None):
         
 
@@ -42,49 +42,29 @@ class Ship(commands.Cog):
             random.seed(seed)
             rate = random.randint(1, 99)
 
-        user_avatar = await get_avatar(user2)
-        author_avatar = await get_avatar(user1)
+        user_avatar = await get_avatar(self.bot, user2)
+        author_avatar = await get_avatar(self.bot, user1)
 
         if user_avatar and author_avatar:
-            self.make_image(author_avatar, user_avatar, user1.name, user2.name, rate)
-            await self.img_ship(ctx, user1.mention, user2.mention, rate)
+            image = await renderer.render(
+                "ship", author_avatar=author_avatar, user_avatar=user_avatar,
+                author=user1.name, user=user2.name, rate=rate
+            )
+            await self.img_ship(ctx, user1.mention, user2.mention, rate, image)
         else:
             await self.text_ship(ctx, user1.mention, user2.mention, rate)
 
-    async def img_ship(self, ctx, author, user, rate):
+    async def img_ship(self, ctx, author, user, rate, image):
         msg = "**Love rate between {0} & {1} is:**\n`{3}` {2}%"
         progress_bar = self.create_progress_bar(rate)
         try:
             b = discord.Embed(color=discord.Color(0xeb1818), description=msg.format(author, user, rate, progress_bar))
-            f = discord.File("./data/ship/tmp_ship.png")
+            f = discord.File(io.BytesIO(image), "tmp_ship.png")
             b.set_image(url="attachment://tmp_ship.png")
             await ctx.send(file=f, embed=b)
         except errors.BadArgument:
             await ctx.send("Oops, something went wrong! Try again later!")
 
-    def make_image(self, author_avatar, user_avatar, author, user, rate):
-        red = (191, 15, 0, 255)
-        white = (255, 255, 255, 255)
-        blank = (255, 255, 255, 0)
-        tmpl = Image.open("./data/ship/Template.png", "r").convert('RGBA')
-        fill = Image.open("./data/ship/Tmpl_fill.png", "r").convert('RGBA')
-        blank = Image.new('RGBA', tmpl.size, blank)
-        fnt = ImageFont.truetype("./data/ship/font.ttf", 34)
-        draw = ImageDraw.Draw(blank)
-        author_avatar = author_avatar.resize((150, 150), Image.Resampling.LANCZOS)
-        user_avatar = user_avatar.resize((150, 150), Image.Resampling.LANCZOS)
-        tmpl.paste(author_avatar, (20, 50))
-        tmpl.paste(user_avatar, (20, 312))
-        offset = (100 - rate) * 2
-        fill = fill.crop((0, offset, fill.width, fill.height))
-        blank.paste(fill, (tmpl.width - fill.width - 1, 154 + offset))
-        draw.text((20, 10), str(author), font=fnt, fill=red)
-        draw.text((20, 460), str(user), font=fnt, fill=red)
-        fnt = ImageFont.truetype("./data/ship/font.ttf", 80)
-        draw.text((330, 192), str(rate) + "%", font=fnt, fill=white)
-        tmpl = Image.alpha_composite(tmpl, blank)
-        tmpl.save("./data/ship/tmp_ship.png", "PNG")
-
     async def text_ship(self, ctx, author, user, rate):
         msg = "**Love rate between {0} & {1} is:**\n`{3}` {2}%"
         progress_bar = self.create_progress_bar(rate)
@@ -100,14 +80,9 @@ class Ship(commands.Cog):
         return bar
 
 
-async def get_avatar(user):
+async def get_avatar(bot, user):
     try:
-        user_url = user.display_avatar.replace(format="png").url
-        response = requests.get(user_url + "?size=256")
-        avatar = Image.open(io.BytesIO(response.content)).convert('RGBA')
-        tmp = Image.new('RGBA', avatar.size, (255, 255, 255, 255))
-        tmp = Image.alpha_composite(tmp, avatar)
-        return tmp
+        return await bot.assets.fetch_asset(user.display_avatar, size=256)
     except Exception as e:
         print(f"Error fetching avatar: {e}")
         return None
@@ -1,9 +1,20 @@
 import discord
 from discord.ext import commands
 import aiosqlite
+from utils import storage
 from discord import ui
 from discord.ui import View, Select, Button
 import asyncio
+from cogs.commands.tournament import refresh_confirm_list
+
+async def team_position(db, guild_id, tournament_no, team_id):
+    """The team's slot on the confirmed list, counted the way registration numbers it."""
+    cursor = await db.execute(
+        "SELECT COUNT(*) FROM teams WHERE guild_id = ? AND tournament_no = ? AND confirmed = 1 AND id <= ?",
+        (guild_id, tournament_no, team_id)
+    )
+    return (await cursor.fetchone())[0]
+
 
 class SlotManager(commands.Cog):
     def __init__(self, bot):
@@ -14,7 +25,7 @@ class SlotManager(commands.Cog):
     async def slotmanager(self, ctx):
         """Initiates the slot manager by showing available tournaments."""
         # Fetch tournaments for the guild
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
             cursor = await db.execute("SELECT tournament_no FROM tournaments WHERE guild_id = ?", (ctx.guild.id,))
             tournaments = await cursor.fetchall()
 
@@ -79,7 +90,7 @@ class SlotManagerView(View):
             return
 
         # Check if the user is a captain in the tournament
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
             cursor = await db.execute(
                 "SELECT * FROM teams WHERE guild_id = ? AND tournament_no = ? AND captain_id = ?",
                 (interaction.guild.id, self.tournament_no, self.user.id)
@@ -91,7 +102,7 @@ class SlotManagerView(View):
             return
 
         # Calculate slot number based on registration order (id)
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
             cursor = await db.execute(
                 "SELECT id FROM teams WHERE guild_id = ? AND tournament_no = ? ORDER BY id",
                 (interaction.guild.id, self.tournament_no)
@@ -119,7 +130,7 @@ class SlotManagerView(View):
             return
 
         # Check registration
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
             cursor = await db.execute(
                 "SELECT * FROM teams WHERE guild_id = ? AND tournament_no = ? AND captain_id = ?",
                 (interaction.guild.id, self.tournament_no, self.user.id)
@@ -147,7 +158,7 @@ class SlotManagerView(View):
             return
 
         # Check registration
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
             cursor = await db.execute(
                 "SELECT * FROM teams WHERE guild_id = ? AND tournament_no = ? AND captain_id = ?",
                 (interaction.guild.id, self.tournament_no, self.user.id)
@@ -171,14 +182,16 @@ class SlotManagerView(View):
                 return
 
             # Update team name in the database
-            async with aiosqlite.connect(self.db_path) as db:
+            async with storage.connect(self.db_path) as db:
                 await db.execute(
                     "UPDATE teams SET team_name = ? WHERE id = ?",
                     (new_team_name, team[0])
                 )
                 await db.commit()
+                position = await team_position(db, interaction.guild.id, self.tournament_no, team[0])
 
             await interaction.followup.send(f"Team name updated to '{new_team_name}'.", ephemeral=True)
+            await refresh_confirm_list(self.bot, interaction.guild.id, self.tournament_no, position)
         except asyncio.TimeoutError:
             await interaction.followup.send("You took too long to respond.", ephemeral=True)
 
@@ -199,8 +212,10 @@ class ConfirmCancelView(View):
             return
 
         # Remove team and update slots_filled
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
+            position = await team_position(db, interaction.guild.id, self.tournament_no, self.team_id)
             await db.execute("DELETE FROM teams WHERE id = ?", (self.team_id,))
+            await db.execute("DELETE FROM team_players WHERE team_id = ?", (self.team_id,))
             await db.execute(
                 "UPDATE tournaments SET slots_filled = slots_filled - 1 WHERE guild_id = ? AND tournament_no = ?",
                 (interaction.guild.id, self.tournament_no)
@@ -208,6 +223,8 @@ class ConfirmCancelView(View):
             await db.commit()
 
         await interaction.response.send_message("Your slot has been cancelled.", ephemeral=True)
+        # every team after this one moved up a slot
+        await refresh_confirm_list(self.bot, interaction.guild.id, self.tournament_no, position, shifted=True)
 
     @discord.ui.button(label="No", style=discord.ButtonStyle.secondary)
     async def cancel_cancel(self, interaction: discord.Interaction, button: Button):
@@ -1,16 +1,42 @@
 import discord
 from discord.ext import commands
 import random
-import os
+import io
 import uuid
-from PIL import Image
 import bisect
+from collections import OrderedDict
+from PIL import Image
 from utils.Tools import *
+from utils.render import renderer, SLOT_ITEM
+
+GIF_CACHE_BYTES = 16 * 1024 * 1024
 
 
 class Slots(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.gif_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self.gif_cache_size = 0
+        with Image.open('data/pictures/slot-reel.png') as reel:
+            # header only, decoding happens in the renderer
+            self.items = reel.height // SLOT_ITEM
+
+    async def render_spin(self, s1: int, s2: int, s3: int) -> bytes:
+        """Render a spin, reusing the GIF of a recently seen outcome."""
+        key = (s1, s2, s3)
+        gif = self.gif_cache.get(key)
+        if gif is not None:
+            self.gif_cache.move_to_end(key)
+            return gif
+
+        gif = await renderer.render("slots", s1=s1, s2=s2, s3=s3)
+        if key not in self.gif_cache:
+            self.gif_cache[key] = gif
+            self.gif_cache_size += len(gif)
+            while self.gif_cache_size > GIF_CACHE_BYTES and len(self.gif_cache) > 1:
+                _, evicted = self.gif_cache.popitem(last=False)
+                self.gif_cache_size -= len(evicted)
+        return gif
 
     @commands.command(aliases=['slot'])
     @blacklist_check()
@@ -18,13 +44,7 @@ class Slots(commands.Cog):
     @commands.cooldown(1, 3, commands.BucketType.user)
     async def slots(self, ctx: commands.Context):
         try:
-            path = os.path.join('data/pictures/')
-            facade = Image.open(f'{path}slot-face.png').convert('RGBA')
-            reel = Image.open(f'{path}slot-reel.png').convert('RGBA')
-
-            rw, rh = reel.size
-            item = 180
-            items = rh // item
+            items = self.items
 
             s1 = random.randint(1, items - 1)
             s2 = random.randint(1, items - 1)
@@ -43,27 +63,10 @@ class Slots(commands.Cog):
                 s2 = s2 - 6 if s2 == items else s2
                 s3 = s3 - 6 if s3 == items else s3
 
-            images = []
-            speed = 6
-            for i in range(1, (item // speed) + 1):
-                bg = Image.new('RGBA', facade.size, color=(255, 255, 255))
-                bg.paste(reel, (25 + rw * 0, 100 - (speed * i * s1)))
-                bg.paste(reel, (25 + rw * 1, 100 - (speed * i * s2)))
-                bg.paste(reel, (25 + rw * 2, 100 - (speed * i * s3)))
-                bg.alpha_composite(facade)
-                images.append(bg)
-
             unique_filename = str(uuid.uuid4()) + '.gif'
-            fp = os.path.join('data/pictures/', unique_filename)
-
-            images[0].save(
-                fp,
-                save_all=True,
-                append_images=images[1:],
-                duration=50
-            )
+            gif = await self.render_spin(s1, s2, s3)
 
-            file = discord.File(fp, filename=unique_filename)
+            file = discord.File(io.BytesIO(gif), filename=unique_filename)
             message = await ctx.reply(file=file)
 
             if (1 + s1) % 6 == (1 + s2) % 6 == (1 + s3) % 6:
@@ -79,7 +82,6 @@ class Slots(commands.Cog):
             embed.set_image(url=f"attachment://{unique_filename}")
             await message.edit(content=None, embed=embed)
 
-            os.remove(fp)
         except Exception as e:
             print(e)
 
@@ -4,6 +4,7 @@ import sys
 import os
 import time
 import aiosqlite
+from utils import storage
 import platform
 import pkg_resources
 import datetime
@@ -23,15 +24,36 @@ class Stats(commands.Cog):
 
     
     async def setup_database(self):
-        async with aiosqlite.connect("db/stats.db") as db:
+        async with storage.connect("db/stats.db") as db:
            # await db.execute("CREATE TABLE IF NOT EXISTS stats (key TEXT PRIMARY KEY, value INTEGER)")
            # await db.commit()  
             async with db.execute("SELECT value FROM stats WHERE key = 'total_songs_played'") as cursor:
                 row = await cursor.fetchone()
                 self.total_songs_played = row[0] if row else 0
 
+    async def cog_load(self):
+        self.bot.ipc.register("stats", self.local_stats)
+
+    async def cog_unload(self):
+        self.bot.ipc.unregister("stats")
+
+    async def local_stats(self):
+        """This process's share of the counts the stats embed shows."""
+        channels = set(self.bot.get_all_channels())
+        return {
+            "guilds": len(self.bot.guilds),
+            "users": sum(g.member_count for g in self.bot.guilds if g.member_count is not None),
+            "bots": sum(sum(1 for m in g.members if m.bot) for g in self.bot.guilds),
+            "channels": len(channels),
+            "text": sum(1 for c in channels if isinstance(c, discord.TextChannel)),
+            "voice": sum(1 for c in channels if isinstance(c, discord.VoiceChannel)),
+            "category": sum(1 for c in channels if isinstance(c, discord.CategoryChannel)),
+            "connected": sum(1 for vc in self.bot.voice_clients if vc),
+            "playing": sum(1 for vc in self.bot.voice_clients if vc.playing),
+        }
+
     async def update_total_songs_played(self):
-        async with aiosqlite.connect("db/stats.db") as db:
+        async with storage.connect("db/stats.db") as db:
             await db.execute("INSERT OR REPLACE INTO stats (key, value) VALUES ('total_songs_played', ?)", (self.total_songs_played,))
             await db.commit()
 
@@ -75,15 +97,18 @@ class Stats(commands.Cog):
     async def stats(self, ctx):
         processing_message = await ctx.send("<a:loading:1272527164256030873> Loading Olympus information...")
         
-        guild_count = len(self.bot.guilds)
-        user_count = sum(g.member_count for g in self.bot.guilds if g.member_count is not None)
-        bot_count = sum(sum(1 for m in g.members if m.bot) for g in self.bot.guilds)
+        # every cluster's share, summed; one entry when not clustered
+        shares = [share for share in await self.bot.ipc.broadcast("stats") if share] or [await self.local_stats()]
+        totals = {key: sum(share[key] for share in shares) for key in shares[0]}
+        guild_count = totals["guilds"]
+        user_count = totals["users"]
+        bot_count = totals["bots"]
         human_count = user_count - bot_count
-        channel_count = len(set(self.bot.get_all_channels()))
+        channel_count = totals["channels"]
         blahh = human_count + bot_count
-        text_channel_count = len([c for c in self.bot.get_all_channels() if isinstance(c, discord.TextChannel)])
-        voice_channel_count = len([c for c in self.bot.get_all_channels() if isinstance(c, discord.VoiceChannel)])
-        category_channel_count = len([c for c in self.bot.get_all_channels() if isinstance(c, discord.CategoryChannel)])
+        text_channel_count = totals["text"]
+        voice_channel_count = totals["voice"]
+        category_channel_count = totals["category"]
         slash_commands = len([cmd for cmd in self.bot.tree.get_commands()])
         commands_count = len(set(self.bot.walk_commands()))
         uptime_seconds = int(round(time.time() - self.start_time))
@@ -96,8 +121,8 @@ class Stats(commands.Cog):
         memory_info = psutil.virtual_memory()
         
         total_libraries = sum(1 for _ in pkg_resources.working_set)
-        channels_connected = sum(1 for vc in self.bot.voice_clients if vc)
-        playing_tracks = sum(1 for vc in self.bot.voice_clients if vc.playing)
+        channels_connected = totals["connected"]
+        playing_tracks = totals["playing"]
 
         embed = Embed(title="Olympus Statistics: General", color=0x000000)
         embed.add_field(name="<:channel:1204242537804734544> Channels", value=f"Total: **{channel_count}**\nText: **{text_channel_count}**   |   Voice: **{voice_channel_count}**   |   Category: **{category_channel_count}**", inline=False)
@@ -149,7 +174,7 @@ class Stats(commands.Cog):
 
                 db_latency = None
                 try:
-                    async with aiosqlite.connect("db/afk.db") as db:
+                    async with storage.connect("db/afk.db") as db:
                         start_time = time.perf_counter()
                         await db.execute("SELECT 1")
                         end_time = time.perf_counter()
@@ -1,58 +1,293 @@
 import discord
 from discord.ext import commands
 import aiosqlite
+from utils import storage
 from discord import ui
 from discord.ui import View, Modal, Button, TextInput
 import asyncio
 
-class Tournament(commands.Cog):
-    def __init__(self, bot):
-        self.bot = bot
-        self.db_path = "tournament.db"  # SQLite database file path
+CONFIRM_PAGE_SIZE = 10  # Teams per confirmed-teams embed
+
+
+class RegistrationEngine:
+    """Caches registration channels and claims tournament slots atomically."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.db = None
+        self.by_channel = {}  # reg_channel -> tournament row
+        self.ignored_roles = {}  # guild_id -> set of role ids
+        self._lock = asyncio.Lock()
+
+    async def connect(self):
+        """Open the shared connection and make sure the schema exists."""
+        if self.db is None:
+            self.db = await storage.connect(self.db_path, timeout=30)
+            await self.db.execute("PRAGMA journal_mode=WAL;")
+            await self.init_db()
+            await self.refresh()
+        return self.db
+
+    async def close(self):
+        if self.db is not None:
+            await self.db.close()
+            self.db = None
 
     async def init_db(self):
-        """Initialize the SQLite database with required tables."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS tournaments (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    guild_id INTEGER,
-                    tournament_no INTEGER,
-                    reg_channel INTEGER,
-                    confirm_channel INTEGER,
-                    success_role INTEGER,
-                    required_mentions INTEGER,
-                    total_slots INTEGER,
-                    slots_filled INTEGER
+        """Initialize the SQLite database with required tables and indexes."""
+        db = self.db
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS tournaments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER,
+                tournament_no INTEGER,
+                reg_channel INTEGER,
+                confirm_channel INTEGER,
+                success_role INTEGER,
+                required_mentions INTEGER,
+                total_slots INTEGER,
+                slots_filled INTEGER
+            )
+        """)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS teams (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER,
+                tournament_no INTEGER,
+                team_name TEXT,
+                captain_id INTEGER,
+                members TEXT,
+                confirmed INTEGER
+            )
+        """)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS ignored_roles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER,
+                role_id INTEGER,
+                role_name TEXT
+            )
+        """)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS team_players (
+                guild_id INTEGER,
+                tournament_no INTEGER,
+                player_id INTEGER,
+                team_id INTEGER,
+                PRIMARY KEY (guild_id, tournament_no, player_id)
+            )
+        """)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS confirm_pages (
+                tournament_id INTEGER,
+                page INTEGER,
+                message_id INTEGER,
+                PRIMARY KEY (tournament_id, page)
+            )
+        """)
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_tournaments_reg ON tournaments (reg_channel)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_teams_tournament ON teams (guild_id, tournament_no, confirmed)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_teams_name ON teams (guild_id, tournament_no, team_name)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_team_players_team ON team_players (team_id)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_ignored_roles_guild ON ignored_roles (guild_id, role_id)")
+
+        # Backfill the player index for teams registered before it existed
+        cursor = await db.execute("SELECT 1 FROM team_players LIMIT 1")
+        if await cursor.fetchone() is None:
+            cursor = await db.execute("SELECT id, guild_id, tournament_no, captain_id, members FROM teams")
+            rows = []
+            for team_id, guild_id, tournament_no, captain_id, members in await cursor.fetchall():
+                players = [captain_id] + [int(m) for m in (members or "").split(',') if m.strip().isdigit()]
+                rows.extend((guild_id, tournament_no, player_id, team_id) for player_id in players)
+            await db.executemany(
+                "INSERT OR IGNORE INTO team_players (guild_id, tournament_no, player_id, team_id) VALUES (?, ?, ?, ?)",
+                rows
+            )
+        await db.commit()
+
+    async def refresh(self):
+        """Reload the registration channel map and ignored roles from the database."""
+        db = self.db
+        cursor = await db.execute("SELECT * FROM tournaments")
+        self.by_channel = {row[3]: row for row in await cursor.fetchall() if row[3]}
+
+        cursor = await db.execute("SELECT guild_id, role_id FROM ignored_roles")
+        ignored = {}
+        for guild_id, role_id in await cursor.fetchall():
+            ignored.setdefault(guild_id, set()).add(role_id)
+        self.ignored_roles = ignored
+
+    def get(self, channel_id):
+        """Return the cached tournament registering in this channel, if any."""
+        return self.by_channel.get(channel_id)
+
+    def is_ignored(self, member):
+        ignored = self.ignored_roles.get(member.guild.id)
+        if not ignored:
+            return False
+        return any(role.id in ignored for role in member.roles)
+
+    async def claim(self, tournament, team_name, captain_id, member_ids):
+        """Register a team and claim a slot in a single transaction.
+
+        Returns ``(team_id, position, slots_filled, total_slots)`` or raises
+        ``ValueError`` with a user-facing reason.
+        """
+        tournament_id, guild_id, tournament_no = tournament[0], tournament[1], tournament[2]
+        players = list(dict.fromkeys([captain_id] + list(member_ids)))
+        placeholders = ','.join('?' * len(players))
+
+        async with self._lock:
+            db = await self.connect()
+            await db.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = await db.execute(
+                    f"SELECT player_id FROM team_players WHERE guild_id = ? AND tournament_no = ? AND player_id IN ({placeholders})",
+                    (guild_id, tournament_no, *players)
                 )
-            """)
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS teams (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    guild_id INTEGER,
-                    tournament_no INTEGER,
-                    team_name TEXT,
-                    captain_id INTEGER,
-                    members TEXT,
-                    confirmed INTEGER
+                taken = [row[0] for row in await cursor.fetchall()]
+                if captain_id in taken:
+                    raise ValueError("❌ You are already registered in this tournament!")
+                if taken:
+                    raise ValueError(f"{', '.join(f'<@{p}>' for p in taken)} already registered in another team!")
+
+                cursor = await db.execute(
+                    "SELECT 1 FROM teams WHERE guild_id = ? AND tournament_no = ? AND team_name = ?",
+                    (guild_id, tournament_no, team_name)
                 )
-            """)
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS ignored_roles (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    guild_id INTEGER,
-                    role_id INTEGER,
-                    role_name TEXT
+                if await cursor.fetchone():
+                    raise ValueError("Team name already exists!")
+
+                cursor = await db.execute(
+                    "UPDATE tournaments SET slots_filled = slots_filled + 1 WHERE id = ? AND slots_filled < total_slots",
+                    (tournament_id,)
                 )
-            """)
-            await db.commit()
+                if cursor.rowcount == 0:
+                    raise ValueError("All slots are full!")
 
-    async def get_guild_data(self, guild_id):
-        """Fetch guild-specific tournament data."""
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute("SELECT * FROM tournaments WHERE guild_id = ?", (guild_id,))
+                cursor = await db.execute(
+                    "INSERT INTO teams (guild_id, tournament_no, team_name, captain_id, members, confirmed) VALUES (?, ?, ?, ?, ?, ?)",
+                    (guild_id, tournament_no, team_name, captain_id, ','.join(str(m) for m in member_ids), 1)
+                )
+                team_id = cursor.lastrowid
+                await db.executemany(
+                    "INSERT INTO team_players (guild_id, tournament_no, player_id, team_id) VALUES (?, ?, ?, ?)",
+                    [(guild_id, tournament_no, player_id, team_id) for player_id in players]
+                )
+
+                cursor = await db.execute(
+                    "SELECT COUNT(*) FROM teams WHERE guild_id = ? AND tournament_no = ? AND confirmed = 1 AND id <= ?",
+                    (guild_id, tournament_no, team_id)
+                )
+                position = (await cursor.fetchone())[0]
+                cursor = await db.execute(
+                    "SELECT slots_filled, total_slots FROM tournaments WHERE id = ?",
+                    (tournament_id,)
+                )
+                slots_filled, total_slots = await cursor.fetchone()
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+        return team_id, position, slots_filled, total_slots
+
+    async def confirm_page(self, tournament, page):
+        """Fetch one page of confirmed teams and the message currently showing it."""
+        async with self._lock:
+            db = await self.connect()
+            cursor = await db.execute(
+                "SELECT team_name, captain_id, members FROM teams WHERE guild_id = ? AND tournament_no = ? AND confirmed = 1 ORDER BY id LIMIT ? OFFSET ?",
+                (tournament[1], tournament[2], CONFIRM_PAGE_SIZE, page * CONFIRM_PAGE_SIZE)
+            )
+            teams = await cursor.fetchall()
+            cursor = await db.execute(
+                "SELECT message_id FROM confirm_pages WHERE tournament_id = ? AND page = ?",
+                (tournament[0], page)
+            )
+            row = await cursor.fetchone()
+        return teams, row[0] if row else None
+
+    async def find(self, guild_id, tournament_no):
+        """The tournament row for ``tournament_no`` in a guild, registering or not."""
+        async with self._lock:
+            db = await self.connect()
+            cursor = await db.execute(
+                "SELECT * FROM tournaments WHERE guild_id = ? AND tournament_no = ?",
+                (guild_id, tournament_no)
+            )
             return await cursor.fetchone()
 
+    async def last_confirm_page(self, tournament):
+        """Highest page with a confirmed-teams message, or -1."""
+        async with self._lock:
+            db = await self.connect()
+            cursor = await db.execute(
+                "SELECT MAX(page) FROM confirm_pages WHERE tournament_id = ?",
+                (tournament[0],)
+            )
+            row = await cursor.fetchone()
+        return row[0] if row[0] is not None else -1
+
+    async def drop_confirm_message(self, tournament, page):
+        async with self._lock:
+            db = await self.connect()
+            await db.execute(
+                "DELETE FROM confirm_pages WHERE tournament_id = ? AND page = ?",
+                (tournament[0], page)
+            )
+            await db.commit()
+
+    async def set_confirm_message(self, tournament, page, message_id):
+        async with self._lock:
+            db = await self.connect()
+            await db.execute(
+                "INSERT OR REPLACE INTO confirm_pages (tournament_id, page, message_id) VALUES (?, ?, ?)",
+                (tournament[0], page, message_id)
+            )
+            await db.commit()
+
+
+async def refresh_registrations(client):
+    """Drop cached tournament settings after they are edited."""
+    cog = client.get_cog("Tournament")
+    if cog is not None and cog.registrations.db is not None:
+        await cog.registrations.refresh()
+
+
+async def refresh_confirm_list(client, guild_id, tournament_no, position, shifted=False):
+    """Re-render the confirmed-teams page holding ``position`` after a team changed.
+
+    With ``shifted`` (the team was removed, so every later slot moved up) the
+    pages after it are re-rendered too.
+    """
+    cog = client.get_cog("Tournament")
+    if cog is None or cog.registrations.db is None:
+        return
+    tournament = await cog.registrations.find(guild_id, tournament_no)
+    if tournament is None:
+        return
+    first = (position - 1) // CONFIRM_PAGE_SIZE
+    last = await cog.registrations.last_confirm_page(tournament) if shifted else first
+    for page in range(first, last + 1):
+        await cog.update_confirm_list(tournament, page * CONFIRM_PAGE_SIZE + 1)
+
+
+class Tournament(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.db_path = "tournament.db"  # SQLite database file path
+        self.registrations = RegistrationEngine(self.db_path)
+        # (guild_id, tournament_no) -> lock around a confirm page's read, send and store
+        self.confirm_locks = {}
+
+    async def cog_load(self):
+        """Open the registration database and warm the channel cache."""
+        await self.registrations.connect()
+
+    async def cog_unload(self):
+        await self.registrations.close()
+
     @commands.command(name="ignorerole")
     @commands.has_permissions(administrator=True)
     async def ignorerole(self, ctx, role: discord.Role):
@@ -60,7 +295,7 @@ class Tournament(commands.Cog):
         guild_id = ctx.guild.id
         role_id = role.id
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
             cursor = await db.execute(
                 "SELECT * FROM ignored_roles WHERE guild_id = ? AND role_id = ?",
                 (guild_id, role_id)
@@ -76,6 +311,7 @@ class Tournament(commands.Cog):
             )
             await db.commit()
 
+        self.registrations.ignored_roles.setdefault(guild_id, set()).add(role_id)
         await ctx.send(f"Role `{role.name}` has been added to the ignored roles list.")
 
     @commands.command(name="delete_cr")
@@ -122,52 +358,73 @@ class Tournament(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def tournament(self, ctx):
         """Main tournament management command."""
-        await self.init_db()  # Ensure database is initialized
         embed = discord.Embed(title="Tournament Manager", color=0x00ff00)
         view = MainDashboardView(self.bot, self.db_path)
         await ctx.send(embed=embed, view=view)
         print(f"Tournament command executed in guild: {ctx.guild.name}")
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        """Handle team registration via messages."""
-        if message.author.bot or not message.guild:
+    async def update_confirm_list(self, tournament, position):
+        """Edit the confirmed-teams page holding the given slot, sending it if new."""
+        # two registrations landing on a fresh page would otherwise both send it,
+        # and the page whose id gets overwritten is never updated again
+        lock = self.confirm_locks.setdefault((tournament[1], tournament[2]), asyncio.Lock())
+        async with lock:
+            await self._update_confirm_list(tournament, position)
+
+    async def _update_confirm_list(self, tournament, position):
+        confirm_channel = self.bot.get_channel(tournament[4])  # confirm_channel is the fifth column
+        if not confirm_channel:
             return
 
-        guild_data = await self.get_guild_data(message.guild.id)
-        if not guild_data:
+        page = (position - 1) // CONFIRM_PAGE_SIZE
+        teams, message_id = await self.registrations.confirm_page(tournament, page)
+        start = page * CONFIRM_PAGE_SIZE
+
+        if not teams:
+            # a cancellation emptied the last page
+            if message_id:
+                try:
+                    await confirm_channel.get_partial_message(message_id).delete()
+                except discord.NotFound:
+                    pass
+                await self.registrations.drop_confirm_message(tournament, page)
             return
 
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                "SELECT role_id FROM ignored_roles WHERE guild_id = ?",
-                (message.guild.id,)
-            )
-            ignored_roles = [row[0] for row in await cursor.fetchall()]
+        description = [
+            f"{start + idx + 1}. **{team[0]}**\nPlayers: {', '.join(f'<@{m}>' for m in team[2].split(','))}\nCaptain: <@{team[1]}>"
+            for idx, team in enumerate(teams)
+        ]
+        embed = discord.Embed(
+            title=f"Confirmed Teams - Tournament {tournament[2]}",
+            description='\n\n'.join(description),
+            color=0x00ff00
+        )
+        embed.set_footer(text=f"Page {page + 1}")
+
+        if message_id:
+            try:
+                await confirm_channel.get_partial_message(message_id).edit(embed=embed)
+                return
+            except discord.NotFound:
+                pass
+
+        sent = await confirm_channel.send(embed=embed)
+        await self.registrations.set_confirm_message(tournament, page, sent.id)
 
-        if any(role.id in ignored_roles for role in message.author.roles):
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        """Handle team registration via messages."""
+        if message.author.bot or not message.guild:
             return
 
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                "SELECT * FROM tournaments WHERE guild_id = ? AND reg_channel = ?",
-                (message.guild.id, message.channel.id)
-            )
-            tournament = await cursor.fetchone()
+        tournament = self.registrations.get(message.channel.id)
+        if not tournament or tournament[1] != message.guild.id:
+            return
 
-        if not tournament:
+        if self.registrations.is_ignored(message.author):
             return
 
         tournament_no = tournament[2]  # tournament_no is the third column
-        guild_id = message.guild.id
-        captain_id = message.author.id
-
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                "SELECT * FROM teams WHERE guild_id = ? AND tournament_no = ? AND captain_id = ?",
-                (guild_id, tournament_no, captain_id)
-            )
-            existing_team = await cursor.fetchone()
 
         try:
             content = message.content.strip().split('\n')
@@ -177,9 +434,6 @@ class Tournament(commands.Cog):
             team_name = content[0].strip()
             mentions = message.mentions
 
-            if existing_team:
-                raise ValueError("❌ You are already registered in this tournament!")
-
             required_mentions = tournament[6]  # required_mentions is the seventh column
             if len(mentions) < required_mentions:
                 raise ValueError(f"Need at least {required_mentions} team members mentioned!")
@@ -187,67 +441,27 @@ class Tournament(commands.Cog):
             if not team_name.lower().startswith("team"):
                 raise ValueError("Team name must start with 'Team'!")
 
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute(
-                    "SELECT * FROM teams WHERE guild_id = ? AND tournament_no = ? AND team_name = ?",
-                    (guild_id, tournament_no, team_name)
-                )
-                existing_team_name = await cursor.fetchone()
-                if existing_team_name:
-                    raise ValueError("Team name already exists!")
-
-                await db.execute(
-                    "INSERT INTO teams (guild_id, tournament_no, team_name, captain_id, members, confirmed) VALUES (?, ?, ?, ?, ?, ?)",
-                    (guild_id, tournament_no, team_name, captain_id, ','.join(str(m.id) for m in mentions), 1)
-                )
-                await db.execute(
-                    "UPDATE tournaments SET slots_filled = slots_filled + 1 WHERE guild_id = ? AND tournament_no = ?",
-                    (guild_id, tournament_no)
-                )
-                await db.commit()
+            _, position, slots_filled, total_slots = await self.registrations.claim(
+                tournament, team_name, message.author.id, [m.id for m in mentions]
+            )
 
             success_role = message.guild.get_role(tournament[5])  # success_role is the sixth column
             if success_role:
                 for member in [message.author] + mentions:
                     await member.add_roles(success_role)
 
-            confirm_channel = self.bot.get_channel(tournament[4])  # confirm_channel is the fifth column
-            if confirm_channel:
-                async with aiosqlite.connect(self.db_path) as db:
-                    cursor = await db.execute(
-                        "SELECT * FROM teams WHERE guild_id = ? AND tournament_no = ? AND confirmed = ?",
-                        (guild_id, tournament_no, 1)
-                    )
-                    confirmed_teams = await cursor.fetchall()
-
-                description = [
-                    f"{idx+1}. **{team[3]}**\nPlayers: {', '.join(f'<@{m}>' for m in team[5].split(','))}\nCaptain: <@{team[4]}>"
-                    for idx, team in enumerate(confirmed_teams)
-                ]
-
-                embed = discord.Embed(
-                    title=f"Confirmed Teams - Tournament {tournament_no}",
-                    description='\n\n'.join(description),
-                    color=0x00ff00
-                )
-                await confirm_channel.send(embed=embed)
+            await self.update_confirm_list(tournament, position)
 
             await message.add_reaction('✅')
 
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute(
-                    "SELECT slots_filled, total_slots FROM tournaments WHERE guild_id = ? AND tournament_no = ?",
-                    (guild_id, tournament_no)
+            if slots_filled >= total_slots:
+                embed = discord.Embed(
+                    title="All Slots Are Full",
+                    description=f"Registration for Tournament {tournament_no} is now closed!",
+                    color=discord.Color.red()
                 )
-                tournament_data = await cursor.fetchone()
-                if tournament_data[0] >= tournament_data[1]:
-                    embed = discord.Embed(
-                        title="All Slots Are Full",
-                        description=f"Registration for Tournament {tournament_no} is now closed!",
-                        color=discord.Color.red()
-                    )
-                    await message.channel.send(embed=embed)
-                    await message.channel.set_permissions(message.guild.default_role, send_messages=False)
+                await message.channel.send(embed=embed)
+                await message.channel.set_permissions(message.guild.default_role, send_messages=False)
 
         except Exception as e:
             embed = discord.Embed(
@@ -266,7 +480,7 @@ class MainDashboardView(ui.View):
 
     async def get_tournament(self, guild_id):
         """Fetch tournament details from SQLite."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
             cursor = await db.execute("SELECT * FROM tournaments WHERE guild_id = ?", (guild_id,))
             return await cursor.fetchone()
 
@@ -291,7 +505,7 @@ class MainDashboardView(ui.View):
     async def show_tournament(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Displays tournament settings."""
         guild_id = interaction.guild.id
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
             cursor = await db.execute("SELECT * FROM tournaments WHERE guild_id = ?", (guild_id,))
             tournaments = await cursor.fetchall()
 
@@ -419,12 +633,13 @@ class InputModal(Modal):
                 )
                 await progress_message.edit(embed=embed)
 
-            async with aiosqlite.connect(self.db_path) as db:
+            async with storage.connect(self.db_path) as db:
                 await db.execute(
                     "INSERT OR REPLACE INTO tournaments (guild_id, tournament_no, reg_channel, confirm_channel, success_role, required_mentions, total_slots, slots_filled) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
                     (guild.id, 1, created_channels[0]["id"], created_channels[0]["id"], created_roles[0]["id"], 3, count, 0)
                 )
                 await db.commit()
+            await refresh_registrations(interaction.client)
 
             success_embed = discord.Embed(
                 title="✅ Creation Complete",
@@ -462,7 +677,7 @@ class TournamentSetupModal(Modal):
             required_mentions = int(values[3])
             total_slots = int(values[4])
 
-            async with aiosqlite.connect(self.db_path) as db:
+            async with storage.connect(self.db_path) as db:
                 cursor = await db.execute(
                     "SELECT MAX(tournament_no) FROM tournaments WHERE guild_id = ?",
                     (interaction.guild.id,)
@@ -475,6 +690,7 @@ class TournamentSetupModal(Modal):
                     (interaction.guild.id, new_tournament_no, values[0], values[1], values[2], required_mentions, total_slots, 0)
                 )
                 await db.commit()
+            await refresh_registrations(interaction.client)
 
             await interaction.response.send_message(f"✅ Tournament #{new_tournament_no} setup complete!", ephemeral=True)
 
@@ -494,7 +710,7 @@ class TournamentEditView(discord.ui.View):
 
     async def fetch_tournaments(self):
         """Fetch tournaments from SQLite."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
             cursor = await db.execute("SELECT * FROM tournaments WHERE guild_id = ?", (self.guild_id,))
             self.tournaments = await cursor.fetchall()
             self.tournament_index = 0 if self.tournaments else -1
@@ -552,13 +768,14 @@ class TournamentEditView(discord.ui.View):
             msg = await interaction.client.wait_for('message', check=check, timeout=60)
             new_channel = msg.channel_mentions[0]
             tournament = self.tournaments[self.tournament_index]
-            async with aiosqlite.connect(self.db_path) as db:
+            async with storage.connect(self.db_path) as db:
                 column = "reg_channel" if channel_type == "reg_channel" else "confirm_channel"
                 await db.execute(
                     f"UPDATE tournaments SET {column} = ? WHERE guild_id = ? AND tournament_no = ?",
                     (new_channel.id, self.guild_id, tournament[2])
                 )
                 await db.commit()
+            await refresh_registrations(interaction.client)
             await interaction.followup.send(f"{channel_type.replace('_', ' ').title()} updated to: {new_channel.mention}.", ephemeral=True)
             await self.fetch_tournaments()
             await self.update_message(interaction)
@@ -580,12 +797,13 @@ class TournamentEditView(discord.ui.View):
             msg = await interaction.client.wait_for('message', check=check, timeout=30)
             new_total_slots = int(msg.content)
             tournament = self.tournaments[self.tournament_index]
-            async with aiosqlite.connect(self.db_path) as db:
+            async with storage.connect(self.db_path) as db:
                 await db.execute(
                     "UPDATE tournaments SET total_slots = ? WHERE guild_id = ? AND tournament_no = ?",
                     (new_total_slots, self.guild_id, tournament[2])
                 )
                 await db.commit()
+            await refresh_registrations(interaction.client)
             await interaction.followup.send(f"Total slots updated to {new_total_slots}.", ephemeral=True)
             await self.fetch_tournaments()
             await self.update_message(interaction)
@@ -616,12 +834,13 @@ class TournamentEditView(discord.ui.View):
             mention_count = int(msg.content)
             if mention_count >= 0:
                 tournament = self.tournaments[self.tournament_index]
-                async with aiosqlite.connect(self.db_path) as db:
+                async with storage.connect(self.db_path) as db:
                     await db.execute(
                         "UPDATE tournaments SET required_mentions = ? WHERE guild_id = ? AND tournament_no = ?",
                         (mention_count, self.guild_id, tournament[2])
                     )
                     await db.commit()
+                await refresh_registrations(interaction.client)
                 await interaction.followup.send(f"Registration now requires {mention_count} mentions.", ephemeral=True)
                 await self.fetch_tournaments()
                 await self.update_message(interaction)
@@ -698,10 +917,13 @@ class ConfirmDeleteView(View):
     @discord.ui.button(label="Yes", style=discord.ButtonStyle.danger, custom_id="confirm_delete")
     async def confirm_delete(self, interaction: discord.Interaction, button: Button):
         """Confirm deletion of the tournament."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
+            await db.execute("DELETE FROM teams WHERE (guild_id, tournament_no) = (SELECT guild_id, tournament_no FROM tournaments WHERE id = ?)", (self.tournament_id,))
+            await db.execute("DELETE FROM team_players WHERE (guild_id, tournament_no) = (SELECT guild_id, tournament_no FROM tournaments WHERE id = ?)", (self.tournament_id,))
+            await db.execute("DELETE FROM confirm_pages WHERE tournament_id = ?", (self.tournament_id,))
             await db.execute("DELETE FROM tournaments WHERE id = ?", (self.tournament_id,))
-            await db.execute("DELETE FROM teams WHERE tournament_no = (SELECT tournament_no FROM tournaments WHERE id = ?)", (self.tournament_id,))
             await db.commit()
+        await refresh_registrations(interaction.client)
         await interaction.response.send_message("✅ Tournament and associated teams have been deleted.", ephemeral=True)
         self.stop()
 
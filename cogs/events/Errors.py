@@ -5,18 +5,42 @@ from discord.ext import commands
 from utils.config import serverLink
 from core import Olympus, Cog, Context
 from utils.Tools import get_ignore_data
+from utils.help import HelpCatalog, HelpPolicy
 
 class Errors(Cog):
   def __init__(self, client: Olympus):
     self.client = client
+    self.hint_cooldown = commands.CooldownMapping.from_cooldown(1, 15, commands.BucketType.user)
+
+  async def suggest_command(self, ctx: Context):
+    # no-prefix users send every message through the parser, so only hint
+    # on a typed prefix, for a plausible word, and once per cooldown
+    word = ctx.invoked_with
+    if ctx.guild is None or not ctx.prefix or not word or len(word) < 3:
+      return
+    catalog = HelpCatalog.of(self.client)
+    matches = catalog.suggestions.suggest(word)
+    if not matches or self.hint_cooldown.get_bucket(ctx.message).update_rate_limit():
+      return
+
+    policy = await HelpPolicy.fetch(ctx)
+    if policy.blacklisted or policy.ignored:
+      return
+    matches = [
+      name for name in matches
+      if (command := self.client.get_command(name)) and await catalog.can_run(command, ctx, policy)
+    ]
+    if matches:
+      hint = ", ".join(f"`{ctx.clean_prefix}{name}`" for name in matches)
+      await ctx.reply(f"Command `{word}` not found. Did you mean {hint}?", mention_author=False, delete_after=8)
 
   @commands.Cog.listener()
   async def on_command_error(self, ctx: Context, error):
-    if ctx.command is None:
+    if isinstance(error, commands.CommandNotFound):
+      await self.suggest_command(ctx)
       return
-    
 
-    if isinstance(error, commands.CommandNotFound):
+    if ctx.command is None:
       return
 
     if isinstance(error, commands.MissingRequiredArgument):
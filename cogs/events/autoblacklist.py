@@ -2,6 +2,7 @@ import discord
 from core import Olympus, Cog
 from discord.ext import commands
 import aiosqlite
+from utils import storage
 from datetime import datetime, timedelta
 
 class AutoBlacklist(Cog):
@@ -18,7 +19,7 @@ class AutoBlacklist(Cog):
 
     async def add_to_blacklist(self, user_id=None, guild_id=None, channel=None):
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with storage.connect(self.db_path) as db:
                 timestamp = datetime.utcnow()
                 if guild_id:
                     await db.execute('''
@@ -43,7 +44,7 @@ class AutoBlacklist(Cog):
             print(f"Database error: {e}")
 
     async def check_and_blacklist_guild(self, guild_id):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
             async with db.execute(
                 '''
                 SELECT COUNT(DISTINCT user_id) FROM user_blacklist 
@@ -99,7 +100,7 @@ class AutoBlacklist(Cog):
         retry = bucket.update_rate_limit()
 
         if retry:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with storage.connect(self.db_path) as db:
                 async with db.execute('SELECT user_id FROM user_blacklist WHERE user_id = ?', (message.author.id,)) as cursor:
                     if await cursor.fetchone():
                         return
@@ -132,7 +133,7 @@ class AutoBlacklist(Cog):
         retry = bucket.update_rate_limit()
 
         if retry:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with storage.connect(self.db_path) as db:
                 async with db.execute('SELECT user_id FROM user_blacklist WHERE user_id = ?', (ctx.author.id,)) as cursor:
                     if await cursor.fetchone():
                         return
@@ -1,5 +1,7 @@
 import discord
 import aiosqlite
+from utils import storage
+from utils.rest import RequestShed
 import json
 import re
 import asyncio
@@ -30,7 +32,7 @@ class greet(commands.Cog):
     async def process_queue(self, guild):
         while self.join_queue[guild.id]:
             member = self.join_queue[guild.id].pop(0)
-            async with aiosqlite.connect("db/welcome.db") as db:
+            async with storage.connect("db/welcome.db") as db:
                 async with db.execute("SELECT welcome_type, welcome_message, channel_id, embed_data, auto_delete_duration FROM welcome WHERE guild_id = ?", (guild.id,)) as cursor:
                     row = await cursor.fetchone()
             if row is None:
@@ -89,6 +91,9 @@ class greet(commands.Cog):
                     sent_message = await welcome_channel.send(content=content, embed=embed)
                 if auto_delete_duration:
                     await sent_message.delete(delay=auto_delete_duration)
+            except RequestShed:
+                # welcomes are the first thing dropped during a join raid
+                continue
             except discord.Forbidden:
                 continue
             except discord.HTTPException as e:
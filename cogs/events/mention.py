@@ -3,6 +3,7 @@ import discord
 from discord.ext import commands
 from utils.Tools import get_ignore_data
 import aiosqlite
+from utils import storage
 
 class Mention(commands.Cog):
 
@@ -12,7 +13,7 @@ class Mention(commands.Cog):
         self.bot_name = "Olympus"
 
     async def is_blacklisted(self, message):
-        async with aiosqlite.connect("db/block.db") as db:
+        async with storage.connect("db/block.db") as db:
             cursor = await db.execute("SELECT 1 FROM guild_blacklist WHERE guild_id = ?", (message.guild.id,))
             if await cursor.fetchone():
                 return True
@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands
 import asyncio
+from utils.rest import RequestShed
 
 class React(commands.Cog):
 
@@ -45,5 +46,7 @@ class React(commands.Cog):
                 except discord.errors.RateLimited as e:
                     await asyncio.sleep(e.retry_after)
                     await message.add_reaction("<a:owner:1272731689948287068>")
+                except RequestShed:
+                    pass
                 except Exception as e:
                     print(f"An unexpected error occurred Auto react owner mention: {e}")
@@ -3,6 +3,7 @@ from discord.ext import commands
 import topgg
 import datetime
 import aiosqlite
+from utils import storage
 
 class TopGG(commands.Cog):
     def __init__(self, bot):
@@ -15,7 +16,7 @@ class TopGG(commands.Cog):
         self.webhook_manager.run(2022)
 
     async def _init_db(self):
-        self.db = await aiosqlite.connect("db/topgg.db")
+        self.db = await storage.connect("db/topgg.db")
         await self.db.execute("""
             CREATE TABLE IF NOT EXISTS votes (
                 user_id INTEGER PRIMARY KEY,
@@ -1,8 +1,17 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from datetime import datetime
+from collections import OrderedDict, deque
+from utils import storage
+from utils.config import PERSIST_SNIPES
+import json
 from utils.Tools import *
 
+SNIPES_PER_CHANNEL = 10
+SNIPE_MEMORY_BUDGET = 4 * 1024 * 1024  # Approximate bytes kept across all channels
+DB_PATH = "db/snipe.db"
+
+
 class SnipeView(discord.ui.View):
     def __init__(self, bot, snipes, user_id):
         super().__init__(timeout=120)
@@ -79,40 +88,153 @@ class SnipeView(discord.ui.View):
         await self.message.edit(view=self)
 
 
+def _snipe_size(snipe):
+    """Rough in-memory footprint of one snipe entry."""
+    size = 200 + len(snipe['author_name']) + len(snipe['author_avatar']) + len(snipe['content'] or '')
+    for attachment in snipe['attachments']:
+        size += len(attachment['name']) + len(attachment['url'])
+    return size
+
+
+class SnipeStore:
+    """Per-channel deque rings with LRU eviction under a global memory budget."""
+
+    def __init__(self, per_channel=SNIPES_PER_CHANNEL, budget=SNIPE_MEMORY_BUDGET, track_dirty=False):
+        self.per_channel = per_channel
+        self.budget = budget
+        self.size = 0
+        self.channels = OrderedDict()  # channel_id -> deque, least recently used first
+        # channels changed since the last flush; only kept when something flushes them
+        self.track_dirty = track_dirty
+        self.dirty = set()
+
+    def add(self, channel_id, snipe):
+        """Record a deletion, newest first. Returns False for duplicates."""
+        ring = self.channels.get(channel_id)
+        if ring is None:
+            ring = self.channels[channel_id] = deque(maxlen=self.per_channel)
+        else:
+            self.channels.move_to_end(channel_id)
+            if any(s['message_id'] == snipe['message_id'] for s in ring):
+                return False
+
+        if len(ring) == ring.maxlen:
+            self.size -= _snipe_size(ring[-1])
+        ring.appendleft(snipe)
+        self.size += _snipe_size(snipe)
+        if self.track_dirty:
+            self.dirty.add(channel_id)
+        self._evict(keep=channel_id)
+        return True
+
+    def get(self, channel_id):
+        """Snapshot of a channel's snipes, newest first."""
+        ring = self.channels.get(channel_id)
+        if not ring:
+            return []
+        self.channels.move_to_end(channel_id)
+        return list(ring)
+
+    def discard(self, channel_id):
+        ring = self.channels.pop(channel_id, None)
+        if ring is not None:
+            self.size -= sum(_snipe_size(s) for s in ring)
+            if self.track_dirty:
+                self.dirty.add(channel_id)
+
+    def _evict(self, keep):
+        while self.size > self.budget and len(self.channels) > 1:
+            channel_id = next(iter(self.channels))
+            if channel_id == keep:
+                self.channels.move_to_end(channel_id)
+                continue
+            self.discard(channel_id)
+
+
 class Snipe(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.snipes = {}
+        self.snipes = SnipeStore(track_dirty=PERSIST_SNIPES)
+        self.db = None
 
-    @commands.Cog.listener()
-    async def on_message_delete(self, message):
+    async def cog_load(self):
+        if not PERSIST_SNIPES:
+            return
+        self.db = await storage.connect(DB_PATH)
+        await self.db.execute('''CREATE TABLE IF NOT EXISTS snipes (
+            channel_id INTEGER PRIMARY KEY,
+            ring TEXT NOT NULL
+        )''')
+        await self.db.commit()
+        async with self.db.execute("SELECT channel_id, ring FROM snipes") as cursor:
+            async for channel_id, ring in cursor:
+                for snipe in reversed(json.loads(ring)):
+                    self.snipes.add(channel_id, snipe)
+        self.snipes.dirty.clear()
+        self.flush_snipes.start()
+
+    async def cog_unload(self):
+        if self.db is not None:
+            self.flush_snipes.cancel()
+            await self.flush_snipes()
+            await self.db.close()
+            self.db = None
+
+    @tasks.loop(seconds=30)
+    async def flush_snipes(self):
+        """Write changed rings to disk, one compact JSON row per channel."""
+        if not self.snipes.dirty:
+            return
+        dirty, self.snipes.dirty = self.snipes.dirty, set()
+        rows, gone = [], []
+        for channel_id in dirty:
+            ring = self.snipes.channels.get(channel_id)
+            if ring:
+                rows.append((channel_id, json.dumps(list(ring), separators=(',', ':'))))
+            else:
+                gone.append((channel_id,))
+        await self.db.executemany("INSERT OR REPLACE INTO snipes (channel_id, ring) VALUES (?, ?)", rows)
+        await self.db.executemany("DELETE FROM snipes WHERE channel_id = ?", gone)
+        await self.db.commit()
+
+    def _record(self, message):
         if not message.guild or message.author.bot:
             return
-        if message.channel.id not in self.snipes:
-            self.snipes[message.channel.id] = []
-        if len(self.snipes[message.channel.id]) >= 10:
-            self.snipes[message.channel.id].pop(0)
 
         attachments = []
         if message.attachments:
             attachments = [{'name': attachment.filename, 'url': attachment.url} for attachment in message.attachments]
 
-        self.snipes[message.channel.id].insert(0, {
+        self.snipes.add(message.channel.id, {
+            'message_id': message.id,
             'author_name': message.author.name,
-            'author_avatar': message.author.avatar.url,
+            'author_avatar': message.author.display_avatar.url,
             'author_id': message.author.id,
             'content': message.content or None,
             'deleted_at': int(datetime.utcnow().timestamp()),
             'attachments': attachments
         })
 
+    @commands.Cog.listener()
+    async def on_message_delete(self, message):
+        self._record(message)
+
+    @commands.Cog.listener()
+    async def on_bulk_message_delete(self, messages):
+        for message in sorted(messages, key=lambda m: m.id):
+            self._record(message)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.snipes.discard(channel.id)
+
     @commands.hybrid_command(name='snipe', help="Shows the recently deleted messages in the channel.")
     @blacklist_check()
     @ignore_check()
     @commands.cooldown(1, 3, commands.BucketType.user)
     @commands.has_permissions(manage_messages=True)
     async def snipe(self, ctx):
-        channel_snipes = self.snipes.get(ctx.channel.id, [])
+        channel_snipes = self.snipes.get(ctx.channel.id)
         if not channel_snipes:
             await ctx.send("No recently deleted messages found in this channel.")
             return
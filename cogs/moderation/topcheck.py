@@ -1,6 +1,9 @@
 import discord
 from discord.ext import commands
 import aiosqlite
+from utils import storage
+from utils.Tools import is_topcheck_enabled
+from utils.cache import config_cache
 import asyncio
 
 class TopCheck(commands.Cog):
@@ -10,7 +13,7 @@ class TopCheck(commands.Cog):
         self.bot.loop.create_task(self.setup())
 
     async def setup(self):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS topcheck (
                     guild_id INTEGER PRIMARY KEY,
@@ -20,22 +23,19 @@ class TopCheck(commands.Cog):
             await db.commit()
 
     async def is_topcheck_enabled(self, guild_id: int):
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute("SELECT enabled FROM topcheck WHERE guild_id = ?", (guild_id,)) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    return row[0] == 1
-                return False
+        return await is_topcheck_enabled(guild_id)
 
     async def enable_topcheck(self, guild_id: int):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
             await db.execute("INSERT OR REPLACE INTO topcheck (guild_id, enabled) VALUES (?, 1)", (guild_id,))
             await db.commit()
+        await config_cache.invalidate("topcheck", guild_id)
 
     async def disable_topcheck(self, guild_id: int):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with storage.connect(self.db_path) as db:
             await db.execute("UPDATE topcheck SET enabled = 0 WHERE guild_id = ?", (guild_id,))
             await db.commit()
+        await config_cache.invalidate("topcheck", guild_id)
 
     @commands.group(
         name="topcheck",
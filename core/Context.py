@@ -6,6 +6,8 @@ import functools
 from typing import Optional, Any
 import asyncio
 
+from utils.perf import Run
+
 __all__ = ("Context", )
 
 
@@ -13,14 +15,21 @@ class Context(commands.Context):
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
+        # set by Olympus.invoke or CommandTree._call, see utils/perf.py
+        self.perf_run: Optional[Run] = None
 
     def __repr__(self):
         return "<core.Context>"
 
     @property
-    async def session(self):
+    def session(self):
         return self.bot.session
 
+    @property
+    def timings(self) -> dict[str, float]:
+        """Seconds this invocation spent in checks, db, http, render and other, plus total."""
+        return self.perf_run.breakdown() if self.perf_run else {}
+
     @discord.utils.cached_property
     def replied_reference(self) -> Optional[discord.Message]:
         ref = self.message.reference
@@ -8,13 +8,27 @@ import asyncio
 import typing
 from typing import List
 import aiosqlite
-from utils.config import OWNER_IDS
+from utils import storage
+from utils.config import OWNER_IDS, HEALTH_PORT, CONFIG_CACHE
 from utils import getConfig, updateConfig
+from utils.migrations import migrate
+from utils.http import create_session, AssetCache
+from utils.render import renderer
+from utils.help import HelpCatalog
+from utils.profiles import cache_profile
+from utils.ipc import IPCClient
+from utils.cache import config_cache
+from utils.health import HealthServer
+from utils.perf import PerfRecorder, timed
+from utils.rest import RestScheduler, RequestShed, MODERATION, COSMETIC, lane, lane_for
 from .Context import Context
 from discord.ext import commands, tasks
+from discord import app_commands
 from colorama import Fore, Style, init
 import importlib
 import inspect
+import os
+import time
 
 init(autoreset=True)
 
@@ -22,15 +36,33 @@ extensions: List[str] = [
     "cogs"
 ]
 
+class CommandTree(app_commands.CommandTree):
+
+    async def _call(self, interaction, /):
+        # slash commands, hybrid ones included, never reach Olympus.invoke;
+        # this is the task the tree runs each of them in
+        command = interaction.command
+        if command is None or interaction.type is not discord.InteractionType.application_command:
+            return await super()._call(interaction)
+        bot = self.client
+        with bot.perf.command(command.qualified_name) as run, lane(lane_for(command.module)):
+            # picked up by Olympus.get_context when a hybrid command builds its Context
+            interaction.extras["perf_run"] = run
+            await super()._call(interaction)
+            # the tree handles app command errors, hybrid commands their own
+            ctx = interaction.extras.get("context")
+            run.failed = interaction.command_failed or (ctx is not None and ctx.command_failed)
+
+
 class Olympus(commands.AutoShardedBot):
 
-    def __init__(self, *arg, **kwargs):
-        intents = discord.Intents.all()
-        intents.presences = True
-        intents.members = True
+    def __init__(self, *arg, cluster_id: typing.Optional[int] = None,
+                 shard_ids: typing.Optional[List[int]] = None,
+                 shard_count: typing.Optional[int] = None, **kwargs):
+        profile = cache_profile()
         super().__init__(command_prefix=self.get_prefix,
                          case_insensitive=True,
-                         intents=intents,
+                         **profile,
                          status=discord.Status.do_not_disturb,
                          strip_after_prefix=True,
                          owner_ids=OWNER_IDS,
@@ -38,16 +70,126 @@ class Olympus(commands.AutoShardedBot):
                              everyone=False, replied_user=False, roles=False),
                          sync_commands_debug=True,
                          sync_commands=True,
-                         shard_count=2)
+                         # None asks Discord for the recommended count; the
+                         # launcher passes its split when running clusters
+                         shard_ids=shard_ids,
+                         shard_count=shard_count,
+                         tree_cls=CommandTree)
+        self.session = None
+        self.assets = None
+        self.help_catalog = None
+        self.chunks_at_startup = profile["chunk_guilds_at_startup"]
+        self.cluster_id = cluster_id
+        self.ipc = IPCClient(cluster_id)
+        self.perf = PerfRecorder()
+        self.rest = RestScheduler(self.http.request)
+        # every REST call goes through here, gateway traffic doesn't
+        self.http.request = timed("http", self.rest.request)
+        self.before_invoke(self.checks_passed)
+        self.after_invoke(self.command_finished)
+        self.health = HealthServer(self, port=HEALTH_PORT + (cluster_id or 0))
+        self.health.collector(self.perf.export)
+        self.health.collector(self.rest.export)
+        self.health.queue("rest_moderation", lambda: self.rest.depth(MODERATION))
+        self.health.queue("rest_cosmetic", lambda: self.rest.depth(COSMETIC))
+        self.health.queue("render", lambda: renderer.in_flight)
+        self.health.queue("ipc", lambda: len(self.ipc.pending))
+        self.health.cache("config", lambda: (config_cache.hits, config_cache.misses))
+        self.health.cache("assets", lambda: (self.assets.hits, self.assets.misses) if self.assets else (0, 0))
 
     async def setup_hook(self):
+        start = time.perf_counter()
+        await self.health.start()
+        self.perf.watchdog.start()
+        if self.cluster_id is not None:
+            await self.ipc.connect(int(os.environ["IPC_PORT"]))
+        config_cache.attach(self.ipc)
+        self.session = create_session()
+        self.assets = AssetCache(self.session)
+        # clustered, the launcher has migrated before starting any cluster
+        if self.cluster_id is None:
+            versions = await migrate()
+            upgraded = sum(1 for before, after in versions.values() if before != after)
+            print(Fore.GREEN + Style.BRIGHT + f"Migrated {len(versions)} databases ({upgraded} upgraded) in {(time.perf_counter() - start) * 1000:.0f} ms")
         await self.load_extensions() 
+        self.help_catalog = HelpCatalog(self)
+
+    async def close(self):
+        await super().close()
+        await self.health.close()
+        self.perf.watchdog.stop()
+        await self.ipc.close()
+        if self.session is not None:
+            await self.session.close()
+        renderer.close()
+        await storage.close_pool()
+        if self.cluster_id is None and CONFIG_CACHE == "shm":
+            # clustered, the launcher removes the block once every cluster is gone
+            config_cache.versions.close()
+            config_cache.versions.unlink()
+
+    async def before_identify_hook(self, shard_id, *, initial=False):
+        # clusters share Discord's identify rate limit, so the launcher paces them
+        if not await self.ipc.identify_slot(shard_id):
+            await super().before_identify_hook(shard_id, initial=initial)
+
+    async def _run_event(self, coro, event_name, *args, **kwargs):
+        # every listener, cog or not, is scheduled through here
+        try:
+            with self.perf.listener(event_name, coro), lane(lane_for(getattr(coro, "__module__", None))):
+                await coro(*args, **kwargs)
+        except asyncio.CancelledError:
+            pass
+        except RequestShed:
+            # a cosmetic listener gave up under load; the scheduler counted it
+            pass
+        except Exception:
+            try:
+                await self.on_error(event_name, *args, **kwargs)
+            except asyncio.CancelledError:
+                pass
+
+    async def invoke(self, ctx, /):
+        if ctx.command is None:
+            return await super().invoke(ctx)
+        with self.perf.command(ctx.command.qualified_name) as run, lane(lane_for(ctx.command.module)):
+            ctx.perf_run = run
+            await super().invoke(ctx)
+            # command errors are handled inside invoke and never reach us
+            run.failed = ctx.command_failed
+
+    async def checks_passed(self, ctx):
+        # runs once checks, cooldowns and argument parsing are done
+        if getattr(ctx, "perf_run", None) is not None:
+            ctx.perf_run.checks_done()
+
+    async def command_finished(self, ctx):
+        if getattr(ctx, "perf_run", None) is not None:
+            ctx.perf_run.finished = time.perf_counter()
+
+    async def get_context(self, origin, /, *, cls=Context):
+        ctx = await super().get_context(origin, cls=cls)
+        if isinstance(origin, discord.Interaction) and "perf_run" in origin.extras:
+            ctx.perf_run = origin.extras["perf_run"]
+            origin.extras["context"] = ctx
+        return ctx
+
+    async def add_cog(self, cog, /, **kwargs):
+        await super().add_cog(cog, **kwargs)
+        # extension (re)loads add and remove cogs; HelpCatalog.of rebuilds on next use
+        self.help_catalog = None
+
+    async def remove_cog(self, name, /, **kwargs):
+        cog = await super().remove_cog(name, **kwargs)
+        self.help_catalog = None
+        return cog
 
     async def load_extensions(self):
         for extension in extensions:
+            start = time.perf_counter()
             try:
                 await self.load_extension(extension) 
-                print(Fore.GREEN + Style.BRIGHT + f"Loaded extension: {extension}")
+                print(Fore.GREEN + Style.BRIGHT + f"Loaded extension: {extension} in {(time.perf_counter() - start) * 1000:.0f} ms")
             except Exception as e:
                 print(
                     f"{Fore.RED}{Style.BRIGHT}Failed to load extension {extension}. {e}"
@@ -61,6 +203,18 @@ class Olympus(commands.AutoShardedBot):
                                        type=discord.ActivityType.playing,
                                        name='$help | .gg/odx'))
 
+    async def on_guild_available(self, guild: discord.Guild):
+        # without startup chunking the owner may not be cached, and most
+        # permission checks compare against guild.owner
+        if guild.owner is None and not self.chunks_at_startup:
+            try:
+                await guild.query_members(user_ids=[guild.owner_id], cache=True)
+            except (asyncio.TimeoutError, discord.ClientException):
+                pass
+
+    async def on_guild_join(self, guild: discord.Guild):
+        await self.on_guild_available(guild)
+
     async def send_raw(self, channel_id: int, content: str,
                        **kwargs) -> typing.Optional[discord.Message]:
         await self.http.send_message(channel_id, content, **kwargs)
@@ -82,7 +236,7 @@ class Olympus(commands.AutoShardedBot):
     async def get_prefix(self, message: discord.Message):
         if message.guild:
             guild_id = message.guild.id
-            async with aiosqlite.connect('db/np.db') as db:
+            async with storage.connect('db/np.db') as db:
                 async with db.execute("SELECT id FROM np WHERE id = ?", (message.author.id,)) as cursor:
                     row = await cursor.fetchone()
                     if row:
@@ -96,7 +250,7 @@ class Olympus(commands.AutoShardedBot):
                         prefix = data["prefix"]
                         return commands.when_mentioned_or(prefix)(self, message)
         else:
-            async with aiosqlite.connect('db/np.db') as db:
+            async with storage.connect('db/np.db') as db:
                 async with db.execute("SELECT id FROM np WHERE id = ?", (message.author.id,)) as cursor:
                     row = await cursor.fetchone()
                     if row:
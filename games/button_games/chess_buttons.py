@@ -51,8 +51,12 @@ class ChessInput(discord.ui.Modal, title="Make your move"):
                 ephemeral=True,
             )
         else:
+            await interaction.response.defer()
             await game.place_move(uci)
 
+            if game.difficulty and not game.board.is_game_over():
+                await game.play_engine_move()
+
             if game.board.is_game_over():
                 self.view.disable_all()
                 embed = await game.fetch_results()
@@ -60,7 +64,9 @@ class ChessInput(discord.ui.Modal, title="Make your move"):
             else:
                 embed = await game.make_embed()
 
-            return await interaction.response.edit_message(embed=embed, view=self.view)
+            return await interaction.edit_original_response(
+                embed=embed, view=self.view, attachments=[await game.render_board()]
+            )
 
 
 class ChessButton(WordInputButton):
@@ -134,7 +140,7 @@ class BetaChess(Chess):
         embed = await self.make_embed()
         self.view = ChessView(self, timeout=timeout)
 
-        self.message = await ctx.send(embed=embed, view=self.view)
+        self.message = await ctx.send(embed=embed, view=self.view, file=await self.render_board())
 
         await self.view.wait()
         return self.message
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
 from typing import Optional, Literal
-import random
 
 import discord
 from discord.ext import commands
 
-from ..twenty_48 import Twenty48
+from ..twenty_48 import Twenty48, HINT_EMOJI
 from ..utils import DiscordColor, DEFAULT_COLOR, BaseView
 
 
@@ -14,9 +13,12 @@ class Twenty48_Button(discord.ui.Button["BaseView"]):
     def __init__(self, game: BetaTwenty48, emoji: str) -> None:
         self.game = game
 
-        style = (
-            discord.ButtonStyle.red if emoji == "⏹️" else discord.ButtonStyle.blurple
-        )
+        if emoji == "⏹️":
+            style = discord.ButtonStyle.red
+        elif emoji == HINT_EMOJI:
+            style = discord.ButtonStyle.gray
+        else:
+            style = discord.ButtonStyle.blurple
 
         super().__init__(
             style=style, emoji=discord.PartialEmoji(name=emoji), label="\u200b"
@@ -35,17 +37,11 @@ class Twenty48_Button(discord.ui.Button["BaseView"]):
             self.view.stop()
             return await interaction.message.delete()
 
-        elif emoji == "➡️":
-            self.game.move_right()
-
-        elif emoji == "⬅️":
-            self.game.move_left()
-
-        elif emoji == "⬇️":
-            self.game.move_down()
+        if emoji == HINT_EMOJI:
+            await interaction.response.defer()
+            return await interaction.edit_original_response(embed=await self.game.hint_embed())
 
-        elif emoji == "⬆️":
-            self.game.move_up()
+        self.game.move(emoji)
 
         lost = self.game.spawn_new()
         won = self.game.check_win()
@@ -85,6 +81,7 @@ class BetaTwenty48(Twenty48):
         win_at: Literal[2048, 4096, 8192] = 8192,
         timeout: Optional[float] = None,
         delete_button: bool = False,
+        hints: bool = False,
         embed_color: DiscordColor = DEFAULT_COLOR,
         **kwargs,
     ) -> discord.Message:
@@ -101,6 +98,8 @@ class BetaTwenty48(Twenty48):
             the timeout for the view, by default None
         delete_button : bool, optional
             specifies whether or not to add a stop button, by default False
+        hints : bool, optional
+            specifies whether or not to add a button that suggests the best move, by default False
         embed_color : DiscordColor, optional
             the color of the game embed, by default DEFAULT_COLOR
 
@@ -115,9 +114,12 @@ class BetaTwenty48(Twenty48):
         self.player = ctx.author
         self.view = BaseView(timeout=timeout)
 
-        self.board[random.randrange(4)][random.randrange(4)] = 2
-        self.board[random.randrange(4)][random.randrange(4)] = 2
+        await self.load_tables()
+        self.spawn_new()
+        self.spawn_new()
 
+        if hints:
+            self._controls.append(HINT_EMOJI)
         if delete_button:
             self._controls.append("⏹️")
 
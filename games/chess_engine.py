@@ -0,0 +1,310 @@
+"""Local chess engine for the play-vs-bot mode.
+
+The search is a plain function of a FEN string and a time budget so it can
+run in a worker process; each worker keeps its own Zobrist-keyed
+transposition table between moves, so consecutive moves of a game start
+from the previous search's results.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+import asyncio
+import os
+import time
+
+import chess
+import chess.polyglot
+
+__all__: tuple[str, ...] = (
+    "DIFFICULTIES",
+    "search",
+    "ChessEngine",
+    "engine",
+)
+
+# seconds per move, maximum depth
+DIFFICULTIES: dict[str, tuple[float, int]] = {
+    "easy": (0.5, 1),
+    "medium": (1.5, 3),
+    "hard": (3.0, 64),
+}
+
+MATE = 100_000
+TABLE_SIZE = 1 << 20
+CHECK_EVERY = 1024
+
+_EXACT, _LOWER, _UPPER = 0, 1, 2
+
+PIECE_VALUES = {
+    chess.PAWN: 100,
+    chess.KNIGHT: 320,
+    chess.BISHOP: 330,
+    chess.ROOK: 500,
+    chess.QUEEN: 900,
+    chess.KING: 0,
+}
+
+# piece-square tables from white's point of view, a8..h1 row by row
+_PST_ROWS = {
+    chess.PAWN: (
+        0, 0, 0, 0, 0, 0, 0, 0,
+        50, 50, 50, 50, 50, 50, 50, 50,
+        10, 10, 20, 30, 30, 20, 10, 10,
+        5, 5, 10, 25, 25, 10, 5, 5,
+        0, 0, 0, 20, 20, 0, 0, 0,
+        5, -5, -10, 0, 0, -10, -5, 5,
+        5, 10, 10, -20, -20, 10, 10, 5,
+        0, 0, 0, 0, 0, 0, 0, 0,
+    ),
+    chess.KNIGHT: (
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20, 0, 0, 0, 0, -20, -40,
+        -30, 0, 10, 15, 15, 10, 0, -30,
+        -30, 5, 15, 20, 20, 15, 5, -30,
+        -30, 0, 15, 20, 20, 15, 0, -30,
+        -30, 5, 10, 15, 15, 10, 5, -30,
+        -40, -20, 0, 5, 5, 0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50,
+    ),
+    chess.BISHOP: (
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 10, 10, 5, 0, -10,
+        -10, 5, 5, 10, 10, 5, 5, -10,
+        -10, 0, 10, 10, 10, 10, 0, -10,
+        -10, 10, 10, 10, 10, 10, 10, -10,
+        -10, 5, 0, 0, 0, 0, 5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20,
+    ),
+    chess.ROOK: (
+        0, 0, 0, 0, 0, 0, 0, 0,
+        5, 10, 10, 10, 10, 10, 10, 5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        0, 0, 0, 5, 5, 0, 0, 0,
+    ),
+    chess.QUEEN: (
+        -20, -10, -10, -5, -5, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 5, 5, 5, 0, -10,
+        -5, 0, 5, 5, 5, 5, 0, -5,
+        0, 0, 5, 5, 5, 5, 0, -5,
+        -10, 5, 5, 5, 5, 5, 0, -10,
+        -10, 0, 5, 0, 0, 0, 0, -10,
+        -20, -10, -10, -5, -5, -10, -10, -20,
+    ),
+    chess.KING: (
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+        20, 20, 0, 0, 0, 0, 20, 20,
+        20, 30, 10, 0, 0, 10, 30, 20,
+    ),
+}
+
+# (piece_type, color) -> value + table indexed by python-chess square (a1 = 0)
+PST: dict[tuple[int, bool], tuple[int, ...]] = {}
+for _piece, _rows in _PST_ROWS.items():
+    _white = tuple(PIECE_VALUES[_piece] + _rows[(7 - sq // 8) * 8 + sq % 8] for sq in range(64))
+    PST[(_piece, chess.WHITE)] = _white
+    PST[(_piece, chess.BLACK)] = tuple(_white[chess.square_mirror(sq)] for sq in range(64))
+
+
+class _Timeout(Exception):
+    pass
+
+
+def evaluate(board: chess.Board) -> int:
+    """Material and piece-square score from the side to move's point of view."""
+    score = 0
+    for (piece, color), table in PST.items():
+        total = sum(table[sq] for sq in chess.scan_forward(board.pieces_mask(piece, color)))
+        score += total if color == chess.WHITE else -total
+    return score if board.turn == chess.WHITE else -score
+
+
+class _Search:
+    def __init__(self, board: chess.Board, table: dict, deadline: float) -> None:
+        self.board = board
+        self.table = table
+        self.deadline = deadline
+        self.nodes = 0
+        self.killers: dict[int, list[chess.Move]] = {}
+
+    def _tick(self) -> None:
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY == 0 and time.perf_counter() > self.deadline:
+            raise _Timeout
+
+    def _ordered(self, moves: list[chess.Move], tt_move: Optional[chess.Move], ply: int) -> list[chess.Move]:
+        board = self.board
+        killers = self.killers.get(ply, ())
+
+        def key(move: chess.Move) -> int:
+            if move == tt_move:
+                return -1_000_000
+            if board.is_capture(move):
+                victim = board.piece_type_at(move.to_square) or chess.PAWN
+                attacker = board.piece_type_at(move.from_square)
+                return -100_000 - PIECE_VALUES[victim] * 10 + PIECE_VALUES[attacker] // 100
+            if move.promotion:
+                return -90_000
+            if move in killers:
+                return -80_000
+            return 0
+
+        return sorted(moves, key=key)
+
+    def quiesce(self, alpha: int, beta: int) -> int:
+        self._tick()
+        stand = evaluate(self.board)
+        if stand >= beta:
+            return stand
+        alpha = max(alpha, stand)
+
+        board = self.board
+        for move in self._ordered(list(board.generate_legal_captures()), None, -1):
+            board.push(move)
+            score = -self.quiesce(-beta, -alpha)
+            board.pop()
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+    def negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self._tick()
+        board = self.board
+
+        if ply and (board.is_repetition(2) or board.halfmove_clock >= 100):
+            return 0
+
+        key = chess.polyglot.zobrist_hash(board)
+        entry = self.table.get(key)
+        tt_move = None
+        if entry is not None:
+            e_depth, flag, value, tt_move = entry
+            if ply and e_depth >= depth:
+                if flag == _EXACT:
+                    return value
+                if flag == _LOWER and value >= beta:
+                    return value
+                if flag == _UPPER and value <= alpha:
+                    return value
+
+        moves = list(board.legal_moves)
+        if not moves:
+            return -MATE + ply if board.is_check() else 0
+        if depth <= 0:
+            return self.quiesce(alpha, beta)
+
+        original_alpha = alpha
+        best, best_move = -MATE - 1, None
+        for move in self._ordered(moves, tt_move, ply):
+            board.push(move)
+            score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            board.pop()
+            if score > best:
+                best, best_move = score, move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if not board.is_capture(move):
+                    killers = self.killers.setdefault(ply, [])
+                    if move not in killers:
+                        killers.insert(0, move)
+                        del killers[2:]
+                break
+
+        if len(self.table) >= TABLE_SIZE:
+            self.table.clear()
+        if best <= original_alpha:
+            flag = _UPPER
+        elif best >= beta:
+            flag = _LOWER
+        else:
+            flag = _EXACT
+        self.table[key] = (depth, flag, best, best_move)
+        return best
+
+
+_table: dict = {}
+
+
+def search(fen: str, time_limit: float = 1.5, max_depth: int = 64) -> tuple[Optional[str], int, int]:
+    """
+    iterative-deepening alpha-beta search
+
+    Returns
+    -------
+    tuple[Optional[str], int, int]
+        the best move in UCI notation (None if there are no legal moves),
+        the deepest completed depth and the number of nodes searched
+    """
+    board = chess.Board(fen)
+    moves = list(board.legal_moves)
+    if not moves:
+        return None, 0, 0
+
+    state = _Search(board, _table, time.perf_counter() + time_limit)
+    best = moves[0]
+    completed = 0
+
+    for depth in range(1, max_depth + 1):
+        try:
+            score = state.negamax(depth, -MATE - 1, MATE + 1, 0)
+        except _Timeout:
+            break
+        entry = _table.get(chess.polyglot.zobrist_hash(board))
+        if entry is not None and entry[3] is not None:
+            best = entry[3]
+        completed = depth
+        if abs(score) >= MATE - max_depth or time.perf_counter() > state.deadline:
+            break
+
+    return best.uci(), completed, state.nodes
+
+
+class ChessEngine:
+    """Runs searches in a dedicated process pool so games never block the event loop."""
+
+    def __init__(self, workers: Optional[int] = None) -> None:
+        self.workers = workers or max(1, min(2, (os.cpu_count() or 2) - 1))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.searches = 0
+        self.nodes = 0
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    async def best_move(self, board: chess.Board, difficulty: str = "medium") -> Optional[chess.Move]:
+        time_limit, max_depth = DIFFICULTIES[difficulty]
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.pool, search, board.fen(), time_limit, max_depth)
+        try:
+            uci, _, nodes = await asyncio.wait_for(future, time_limit + 10)
+        except BrokenProcessPool:
+            self._pool = None
+            raise
+        self.searches += 1
+        self.nodes += nodes
+        return chess.Move.from_uci(uci) if uci else None
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+engine = ChessEngine()
@@ -1,22 +1,30 @@
 from __future__ import annotations
 
-from typing import Optional, ClassVar, Literal
+from typing import Optional, Literal
 import asyncio
 
 import discord
 from discord.ext import commands
 import chess
 
+from utils.render import renderer
 from .utils import DiscordColor, DEFAULT_COLOR
+from .chess_engine import engine
+from .sessions import SessionRouter
 
 
 class Chess:
-    BASE_URL: ClassVar[str] = "http://www.fen-to-image.com/image/64/double/coords/"
-
-    def __init__(self, *, white: discord.User, black: discord.User) -> None:
+    def __init__(
+        self,
+        *,
+        white: discord.User,
+        black: discord.User,
+        difficulty: Optional[str] = None,
+    ) -> None:
         self.white = white
         self.black = black
         self.turn = self.white
+        self.difficulty = difficulty
 
         self.winner: Optional[discord.User] = None
         self.message: Optional[discord.Message] = None
@@ -31,7 +39,7 @@ class Chess:
     async def make_embed(self) -> discord.Embed:
         embed = discord.Embed(title="Chess Game", color=discord.Color.random())
         embed.description = f"**Turn:** `{self.turn}`\n**Color:** `{self.get_color()}`\n**Check:** `{self.board.is_check()}`"
-        embed.set_image(url=f"{self.BASE_URL}{self.board.board_fen()}")
+        embed.set_image(url="attachment://chess.png")
 
         embed.add_field(
             name="Last Move",
@@ -65,9 +73,24 @@ class Chess:
                 f"Game over\nVariant end condition. | Score: `{results}`"
             )
 
-        embed.set_image(url=f"{self.BASE_URL}{self.board.board_fen()}")
+        embed.set_image(url="attachment://chess.png")
         return embed
 
+    async def render_board(self) -> discord.File:
+        last_move = None
+        if self.board.move_stack:
+            move = self.board.peek()
+            last_move = [move.from_square, move.to_square]
+        check = self.board.king(self.board.turn) if self.board.is_check() else None
+        return await renderer.render_file(
+            "chess", "chess.png", board_fen=self.board.board_fen(), last_move=last_move, check=check
+        )
+
+    async def play_engine_move(self) -> chess.Board:
+        """lets the local engine play for black"""
+        move = await engine.best_move(self.board, self.difficulty)
+        return await self.place_move(move.uci())
+
     async def start(
         self,
         ctx: commands.Context[commands.Bot],
@@ -98,40 +121,44 @@ class Chess:
         """
         self.embed_color = discord.Color.random()
 
-        embed = await self.make_embed()
-        self.message = await ctx.send(embed=embed, **kwargs)
-
-        while not ctx.bot.is_closed():
+        players = (self.white,) if self.difficulty else (self.white, self.black)
+        with SessionRouter.of(ctx.bot).open(ctx, users=players) as session:
+            embed = await self.make_embed()
+            self.message = await ctx.send(embed=embed, file=await self.render_board(), **kwargs)
+            session.bind(None)
+
+            while not ctx.bot.is_closed():
+
+                def check(m: discord.Message) -> bool:
+                    try:
+                        if self.board.parse_uci(m.content.lower()):
+                            return m.author == self.turn
+                        else:
+                            return False
+                    except ValueError:
+                        return False
 
-            def check(m: discord.Message) -> bool:
                 try:
-                    if self.board.parse_uci(m.content.lower()):
-                        return m.author == self.turn and m.channel == ctx.channel
-                    else:
-                        return False
-                except ValueError:
-                    return False
+                    message: discord.Message = await session.wait(check=check, timeout=timeout)
+                except asyncio.TimeoutError:
+                    return
 
-            try:
-                message: discord.Message = await ctx.bot.wait_for(
-                    "message", timeout=timeout, check=check
-                )
-            except asyncio.TimeoutError:
-                return
+                await self.place_move(message.content.lower())
 
-            await self.place_move(message.content.lower())
-            embed = await self.make_embed()
+                if add_reaction_after_move:
+                    await message.add_reaction("✅")
 
-            if add_reaction_after_move:
-                await message.add_reaction("✅")
+                if self.difficulty and not self.board.is_game_over():
+                    await self.play_engine_move()
 
-            if self.board.is_game_over():
-                break
+                if self.board.is_game_over():
+                    break
 
-            await self.message.edit(embed=embed)
+                embed = await self.make_embed()
+                await self.message.edit(embed=embed, attachments=[await self.render_board()])
 
         embed = await self.fetch_results()
-        await self.message.edit(embed=embed)
+        await self.message.edit(embed=embed, attachments=[await self.render_board()])
         await ctx.send("~ Game Over ~")
 
         return self.message
@@ -6,23 +6,245 @@ import asyncio
 import discord
 from discord.ext import commands
 
-from .utils import DiscordColor, DEFAULT_COLOR
+from .utils import DiscordColor, DEFAULT_COLOR, executor
+from .sessions import SessionRouter
 
 RED = "🔴"
 BLUE = "🔵"
 BLANK = "⬛"
 
+WIDTH = 7
+HEIGHT = 6
+_H1 = HEIGHT + 1
+
+BOTTOM_MASK = sum(1 << (col * _H1) for col in range(WIDTH))
+BOARD_MASK = BOTTOM_MASK * ((1 << HEIGHT) - 1)
+ODD_ROWS = BOTTOM_MASK * 0b010101
+EVEN_ROWS = BOTTOM_MASK * 0b101010
+MOVE_ORDER = (3, 2, 4, 1, 5, 0, 6)
+
+# search depth, and the number of empty cells below which the solver plays perfectly
+DIFFICULTIES: dict[str, tuple[int, int]] = {
+    "easy": (2, 0),
+    "medium": (5, 12),
+    "hard": (8, 16),
+}
+
+WIN_SCORE = 1000
+TABLE_SIZE = 1 << 18
+
+_EXACT, _LOWER, _UPPER = 0, 1, 2
+
+
+def _top_mask(col: int) -> int:
+    return 1 << (HEIGHT - 1 + col * _H1)
+
+
+def _bottom_mask(col: int) -> int:
+    return 1 << (col * _H1)
+
+
+def _column_mask(col: int) -> int:
+    return ((1 << HEIGHT) - 1) << (col * _H1)
+
+
+def _aligned(bits: int) -> bool:
+    for shift in (1, _H1, _H1 - 1, _H1 + 1):
+        m = bits & (bits >> shift)
+        if m & (m >> (2 * shift)):
+            return True
+    return False
+
+
+def _winning_cells(bits: int, mask: int) -> int:
+    """Empty cells that would complete four for ``bits``."""
+    # vertical
+    r = (bits << 1) & (bits << 2) & (bits << 3)
+
+    for shift in (_H1, _H1 - 1, _H1 + 1):
+        p = (bits << shift) & (bits << 2 * shift)
+        r |= p & (bits << 3 * shift)
+        r |= p & (bits >> shift)
+        p = (bits >> shift) & (bits >> 2 * shift)
+        r |= p & (bits << shift)
+        r |= p & (bits >> 3 * shift)
+
+    return r & (BOARD_MASK ^ mask)
+
+
+class Position:
+    """
+    Connect-4 bitboard
+
+    Each column takes ``HEIGHT + 1`` bits (one sentinel bit on top), so the
+    whole board fits in a 64-bit integer. ``current`` holds the stones of the
+    player to move and ``mask`` every stone on the board.
+    """
+
+    __slots__ = ("current", "mask", "moves")
+
+    def __init__(self, current: int = 0, mask: int = 0, moves: int = 0) -> None:
+        self.current = current
+        self.mask = mask
+        self.moves = moves
+
+    def copy(self) -> Position:
+        return Position(self.current, self.mask, self.moves)
+
+    def key(self) -> int:
+        return self.current + self.mask
+
+    def can_play(self, col: int) -> bool:
+        return not self.mask & _top_mask(col)
+
+    def is_full(self) -> bool:
+        return self.moves == WIDTH * HEIGHT
+
+    def is_winning_move(self, col: int) -> bool:
+        bits = self.current | ((self.mask + _bottom_mask(col)) & _column_mask(col))
+        return _aligned(bits)
+
+    def play(self, col: int) -> int:
+        """Drops a stone for the player to move and returns its row, 0 being the bottom."""
+        move = (self.mask + _bottom_mask(col)) & _column_mask(col)
+        self.current ^= self.mask
+        self.mask |= move
+        self.moves += 1
+        return move.bit_length() - 1 - col * _H1
+
+    def stones(self, first: bool) -> int:
+        """Stones of the first (or second) player."""
+        if (self.moves % 2 == 0) == first:
+            return self.current
+        return self.current ^ self.mask
+
+
+def _popcount(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+class Solver:
+    """
+    Negamax with alpha-beta pruning and a transposition table
+
+    ``depth`` bounds the search; leaves are scored by open winning cells,
+    favouring those on the rows the owner can claim through zugzwang. Once
+    ``endgame`` or fewer cells are empty the game is searched to the end.
+    """
+
+    def __init__(self, depth: int = 5, endgame: int = 0) -> None:
+        self.depth = depth
+        self.endgame = endgame
+        self.table: dict[int, tuple[int, int, int]] = {}
+        self.nodes = 0
+
+    @classmethod
+    def for_difficulty(cls, difficulty: str) -> Solver:
+        return cls(*DIFFICULTIES[difficulty])
+
+    def evaluate(self, pos: Position) -> int:
+        opponent = pos.current ^ pos.mask
+        mine = _winning_cells(pos.current, pos.mask)
+        theirs = _winning_cells(opponent, pos.mask)
+        # the first player profits from threats on odd rows, the second from even ones
+        if pos.moves % 2 == 0:
+            mine_good, theirs_good = ODD_ROWS, EVEN_ROWS
+        else:
+            mine_good, theirs_good = EVEN_ROWS, ODD_ROWS
+        return (
+            2 * (_popcount(mine) - _popcount(theirs))
+            + 3 * (_popcount(mine & mine_good) - _popcount(theirs & theirs_good))
+        )
+
+    def negamax(self, pos: Position, depth: int, alpha: int, beta: int) -> int:
+        self.nodes += 1
+
+        for col in MOVE_ORDER:
+            if pos.can_play(col) and pos.is_winning_move(col):
+                return WIN_SCORE - pos.moves
+
+        if pos.moves >= WIDTH * HEIGHT - 1:
+            return 0
+        if depth == 0:
+            return self.evaluate(pos)
+
+        original_alpha = alpha
+        key = pos.key()
+        entry = self.table.get(key)
+        if entry is not None and entry[0] >= depth:
+            _, flag, value = entry
+            if flag == _EXACT:
+                return value
+            if flag == _LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        best = -WIN_SCORE
+        for col in MOVE_ORDER:
+            if not pos.can_play(col):
+                continue
+            child = pos.copy()
+            child.play(col)
+            score = -self.negamax(child, depth - 1, -beta, -alpha)
+            if score > best:
+                best = score
+            if best > alpha:
+                alpha = best
+            if alpha >= beta:
+                break
+
+        if len(self.table) >= TABLE_SIZE:
+            self.table.clear()
+        if best <= original_alpha:
+            flag = _UPPER
+        elif best >= beta:
+            flag = _LOWER
+        else:
+            flag = _EXACT
+        self.table[key] = (depth, flag, best)
+        return best
+
+    def best_move(self, pos: Position) -> int:
+        """Column the player to move should play."""
+        self.nodes = 0
+        empty = WIDTH * HEIGHT - pos.moves
+        depth = empty if empty <= self.endgame else self.depth
+        best_col, best = None, -WIN_SCORE - 1
+        for col in MOVE_ORDER:
+            if not pos.can_play(col):
+                continue
+            if pos.is_winning_move(col):
+                return col
+            child = pos.copy()
+            child.play(col)
+            score = -self.negamax(child, depth - 1, -WIN_SCORE, -best)
+            if score > best:
+                best_col, best = col, score
+        return best_col
+
 
 class ConnectFour:
     """
     Connect-4 Game
     """
 
-    def __init__(self, *, red: discord.User, blue: discord.User) -> None:
+    def __init__(
+        self,
+        *,
+        red: discord.User,
+        blue: discord.User,
+        difficulty: Optional[str] = None,
+    ) -> None:
         self.red_player = red
         self.blue_player = blue
 
-        self.board: list[list[str]] = [[BLANK for _ in range(7)] for _ in range(6)]
+        self.position = Position()
+        self.solver: Optional[Solver] = (
+            Solver.for_difficulty(difficulty) if difficulty else None
+        )
         self._controls: tuple[str, ...] = (
             "1️⃣",
             "2️⃣",
@@ -48,6 +270,19 @@ class ConnectFour:
             v: k for k, v in self.player_to_emoji.items()
         }
 
+    @property
+    def board(self) -> list[list[str]]:
+        red = self.position.stones(first=True)
+        blue = self.position.stones(first=False)
+        board = []
+        for row in range(HEIGHT - 1, -1, -1):
+            line = []
+            for col in range(WIDTH):
+                bit = 1 << (col * _H1 + row)
+                line.append(RED if red & bit else BLUE if blue & bit else BLANK)
+            board.append(line)
+        return board
+
     def board_string(self) -> str:
         board = "1️⃣2️⃣3️⃣4️⃣5️⃣6️⃣7️⃣\n"
         for row in self.board:
@@ -71,68 +306,26 @@ class ConnectFour:
 
             column = self._conversion[column]
 
-        for x in range(5, -1, -1):
-            if self.board[x][column] == BLANK:
-                self.board[x][column] = self.player_to_emoji[user]
-                break
+        if self.position.can_play(column):
+            if self.position.is_winning_move(column):
+                self.winner = user
+            self.position.play(column)
 
         self.turn = self.red_player if user == self.blue_player else self.blue_player
         return self.board
 
     def is_game_over(self) -> bool:
+        return self.winner is not None or self.position.is_full()
 
-        if all(i != BLANK for i in self.board[0]):
-            return True
+    @executor()
+    def _search(self) -> int:
+        return self.solver.best_move(self.position.copy())
 
-        for x in range(6):
-            for i in range(4):
-                if (
-                    self.board[x][i]
-                    == self.board[x][i + 1]
-                    == self.board[x][i + 2]
-                    == self.board[x][i + 3]
-                    and self.board[x][i] != BLANK
-                ):
-                    self.winner = self.emoji_to_player[self.board[x][i]]
-                    return True
-
-        for x in range(3):
-            for i in range(7):
-                if (
-                    self.board[x][i]
-                    == self.board[x + 1][i]
-                    == self.board[x + 2][i]
-                    == self.board[x + 3][i]
-                    and self.board[x][i] != BLANK
-                ):
-                    self.winner = self.emoji_to_player[self.board[x][i]]
-                    return True
-
-        for x in range(3):
-            for i in range(4):
-                if (
-                    self.board[x][i]
-                    == self.board[x + 1][i + 1]
-                    == self.board[x + 2][i + 2]
-                    == self.board[x + 3][i + 3]
-                    and self.board[x][i] != BLANK
-                ):
-                    self.winner = self.emoji_to_player[self.board[x][i]]
-                    return True
-
-        for x in range(5, 2, -1):
-            for i in range(4):
-                if (
-                    self.board[x][i]
-                    == self.board[x - 1][i + 1]
-                    == self.board[x - 2][i + 2]
-                    == self.board[x - 3][i + 3]
-                    and self.board[x][i] != BLANK
-                ):
-                    self.winner = self.emoji_to_player[self.board[x][i]]
-                    return True
-
-        return False
+    async def play_ai_move(self) -> int:
+        """Lets the solver play for the current player and returns the chosen column."""
+        column = await self._search()
+        self.place_move(column, self.turn)
+        return column
 
     async def start(
         self,
@@ -157,6 +350,8 @@ class ConnectFour:
         remove_reaction_after : bool, optional
             specifies whether or not to remove the user's move reaction, by default False
 
+        when the game was created with a ``difficulty``, ``blue`` is played by the solver
+
         Returns
         -------
         discord.Message
@@ -164,40 +359,47 @@ class ConnectFour:
         """
         self.embed_color = discord.Color.random()
 
-        embed = self.make_embed(status=False)
-        self.message = await ctx.send(self.board_string(), embed=embed, **kwargs)
+        status = False
+        humans = (self.red_player,) if self.solver else (self.red_player, self.blue_player)
+        with SessionRouter.of(ctx.bot).open(ctx, users=humans) as session:
+            embed = self.make_embed(status=False)
+            self.message = await ctx.send(self.board_string(), embed=embed, **kwargs)
+            session.bind(self.message)
 
-        for button in self._controls:
-            await self.message.add_reaction(button)
+            for button in self._controls:
+                await self.message.add_reaction(button)
 
-        while not ctx.bot.is_closed():
+            while not ctx.bot.is_closed():
 
-            def check(reaction: discord.Reaction, user: discord.User) -> bool:
-                return (
-                    str(reaction.emoji) in self._controls
-                    and user == self.turn
-                    and reaction.message == self.message
-                    and self.board[0][self._conversion[str(reaction.emoji)]] == BLANK
-                )
+                def check(reaction: discord.Reaction, user: discord.User) -> bool:
+                    return (
+                        str(reaction.emoji) in self._controls
+                        and user == self.turn
+                        and self.position.can_play(self._conversion[str(reaction.emoji)])
+                    )
 
-            try:
-                reaction, user = await ctx.bot.wait_for(
-                    "reaction_add", timeout=timeout, check=check
-                )
-            except asyncio.TimeoutError:
-                break
+                try:
+                    reaction, user = await session.wait(check=check, timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
 
-            emoji = str(reaction.emoji)
-            self.place_move(emoji, user)
+                emoji = str(reaction.emoji)
+                self.place_move(emoji, user)
 
-            if status := self.is_game_over():
-                break
+                if status := self.is_game_over():
+                    break
 
-            if remove_reaction_after:
-                await self.message.remove_reaction(emoji, user)
+                if remove_reaction_after:
+                    await self.message.remove_reaction(emoji, user)
 
-            embed = self.make_embed(status=False)
-            await self.message.edit(content=self.board_string(), embed=embed)
+                if self.solver:
+                    await self.play_ai_move()
+
+                    if status := self.is_game_over():
+                        break
+
+                embed = self.make_embed(status=False)
+                await self.message.edit(content=self.board_string(), embed=embed)
 
         embed = self.make_embed(status=status)
         await self.message.edit(content=self.board_string(), embed=embed)
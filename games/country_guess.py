@@ -1,16 +1,93 @@
+from __future__ import annotations
+
 import asyncio
 import difflib
 import os
 import pathlib
 import random
+from collections import OrderedDict
 from typing import Union, Optional
 from io import BytesIO
 
 import discord
 from discord.ext import commands
-from PIL import Image, ImageFilter, ImageOps
-
+from utils.render import renderer
 from .utils import *
+from .sessions import SessionRouter
+
+FLAG_CACHE_BYTES = 32 * 1024 * 1024
+# hard mode starts at the first radius, every hint sharpens the image one step
+BLUR_STEPS: tuple[int, ...] = (10, 6, 3)
+
+
+class CountryAssets:
+    """
+    Country name index and encoded image cache for one asset folder
+
+    Every variant (plain, blurred at a given radius, inverted) is rendered once
+    and kept as PNG bytes in a byte-bounded LRU, so starting a game or showing
+    a hint is a dict lookup.
+    """
+
+    _folders: dict[str, CountryAssets] = {}
+
+    def __init__(self, folder: str) -> None:
+        self.path = pathlib.Path(__file__).parent / folder
+        self.files: dict[str, str] = {
+            name.strip()[:-4].lower(): name for name in sorted(os.listdir(self.path)) if name.endswith(".png")
+        }
+        self.names: tuple[str, ...] = tuple(self.files)
+        self.images: OrderedDict[tuple[str, int, bool], bytes] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def of(cls, folder: str) -> CountryAssets:
+        assets = cls._folders.get(folder)
+        if assets is None:
+            assets = cls._folders[folder] = cls(folder)
+        return assets
+
+    async def image(self, country: str, *, blur: int = 0, invert: bool = False) -> bytes:
+        key = (country, blur, invert)
+        data = self.images.get(key)
+        if data is not None:
+            self.hits += 1
+            self.images.move_to_end(key)
+            return data
+
+        self.misses += 1
+        path = str(self.path / self.files[country])
+        if blur or invert:
+            data = await renderer.render("country", path=path, blur=blur, invert=invert)
+        else:
+            data = await asyncio.to_thread(pathlib.Path(path).read_bytes)
+
+        if key not in self.images:
+            self.images[key] = data
+            self.size += len(data)
+            while self.size > FLAG_CACHE_BYTES and len(self.images) > 1:
+                _, evicted = self.images.popitem(last=False)
+                self.size -= len(evicted)
+        return data
+
+    async def warm(self, *, blur: tuple[int, ...] = (0,), invert: bool = False) -> None:
+        """renders the given variants of every country, a few at a time"""
+        keys = [(name, radius) for name in self.names for radius in blur]
+        step = max(renderer.workers, 1) * 2
+        for i in range(0, len(keys), step):
+            await asyncio.gather(
+                *(self.image(name, blur=radius, invert=invert) for name, radius in keys[i:i + step])
+            )
+
+    def stats(self) -> dict:
+        return {
+            "images": len(self.images),
+            "bytes": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
 
 
 class CountryGuesser:
@@ -41,49 +118,31 @@ class CountryGuesser:
             self.light_mode = light_mode
 
         folder = "assets/country-flags" if self.is_flags else "assets/country-data"
-        self._countries_path = pathlib.Path(__file__).parent / folder
-        self.all_countries = os.listdir(self._countries_path)
+        self.assets = CountryAssets.of(folder)
+        self.all_countries = self.assets.names
         self.responses_count = 0
+        self.blur_step = 0
 
-    @executor()
-    def invert_image(self, image_path: Union[BytesIO, os.PathLike, str]) -> BytesIO:
-        with Image.open(image_path) as img:
-            img = img.convert("RGBA")
-            r, g, b, a = img.split()
-            rgb = Image.merge("RGB", (r, g, b))
-            rgb = ImageOps.invert(rgb)
-            rgb = rgb.split()
-            img = Image.merge("RGBA", rgb + (a,))
-
-            buf = BytesIO()
-            img.save(buf, "PNG")
-            buf.seek(0)
-            return buf
-
-    @executor()
-    def blur_image(self, image_path: Union[BytesIO, os.PathLike, str]) -> BytesIO:
-        with Image.open(image_path) as img:
-            img = img.convert("RGBA")
-            img = img.filter(ImageFilter.GaussianBlur(10))
-
-            buf = BytesIO()
-            img.save(buf, "PNG")
-            buf.seek(0)
-            return buf
+    @property
+    def blur(self) -> int:
+        if not self.hard_mode or self.blur_step >= len(BLUR_STEPS):
+            return 0
+        return BLUR_STEPS[self.blur_step]
 
     async def get_country(self) -> discord.File:
-        country_file = random.choice(self.all_countries)
-        self.country = country_file.strip()[:-4].lower()
-
-        file = os.path.join(self._countries_path, country_file)
-
-        if self.hard_mode:
-            file = await self.blur_image(file)
+        self.country = random.choice(self.all_countries)
+        self.blur_step = 0
 
-        if self.light_mode:
-            file = await self.invert_image(file)
+        data = await self.assets.image(self.country, blur=self.blur, invert=self.light_mode)
+        return discord.File(BytesIO(data), "country.png")
 
-        return discord.File(file, "country.png")
+    async def get_image_hint(self) -> Optional[discord.File]:
+        """the next, less blurred version of the image; None once it is fully sharp"""
+        if not self.blur:
+            return None
+        self.blur_step += 1
+        data = await self.assets.image(self.country, blur=self.blur, invert=self.light_mode)
+        return discord.File(BytesIO(data), "country.png")
 
     def get_blanks(self) -> str:
         return " ".join("_" if char != " " else " " for char in self.country)
@@ -123,17 +182,11 @@ class CountryGuesser:
     ) -> Optional[tuple[discord.Message, str]]:
         def check(m: discord.Message) -> bool:
             if length:
-                return (
-                    m.channel == ctx.channel
-                    and m.author != ctx.bot.user
-                    and len(m.content) == length
-                )
+                return m.author != ctx.bot.user and len(m.content) == length
             else:
-                return m.channel == ctx.channel and m.author != ctx.bot.user
+                return m.author != ctx.bot.user
 
-        message: discord.Message = await ctx.bot.wait_for(
-            "message", timeout=self.timeout, check=check
-        )
+        message: discord.Message = await self.session.wait(check=check, timeout=self.timeout)
         content = message.content.strip().lower()
 
         if options:
@@ -156,36 +209,42 @@ class CountryGuesser:
         self.embed = self.get_embed()
         self.embed.set_footer(text="send your guess within 100 seconds into the chat now!")
 
-        self.message = await ctx.send(embed=self.embed, file=file)
-
-        self.accepted_length = None
-        start_time = asyncio.get_event_loop().time()
-
-        while not ctx.bot.is_closed() and asyncio.get_event_loop().time() - start_time < self.timeout:
-            try:
-                msg, response = await self.wait_for_response(ctx)
-            except asyncio.TimeoutError:
-                break
-
-            self.responses_count += 1
-
-            if response == self.country:
-                elapsed_time = round(asyncio.get_event_loop().time() - start_time, 2)
-                await msg.reply(
-                    f"That is correct! The country was `{self.country.title()}`"
-                )
-                return await self.end_game(ctx, msg.author, elapsed_time)
-            else:
-                acc = self.get_accuracy(response)
-
-                if self.responses_count % 10 == 0 and self.hints:
-                    hint = self.get_hint()
-                    await ctx.send(f"Hint: `{hint}`")
-
-                await msg.reply(
-                    f"That was incorrect! but you are `{acc}%` of the way there!",
-                    mention_author=False,
-                )
+        with SessionRouter.of(ctx.bot).open(ctx) as self.session:
+            self.message = await ctx.send(embed=self.embed, file=file)
+            self.session.bind(None)
+
+            self.accepted_length = None
+            start_time = asyncio.get_event_loop().time()
+
+            while not ctx.bot.is_closed() and asyncio.get_event_loop().time() - start_time < self.timeout:
+                try:
+                    msg, response = await self.wait_for_response(ctx)
+                except asyncio.TimeoutError:
+                    break
+
+                self.responses_count += 1
+
+                if response == self.country:
+                    elapsed_time = round(asyncio.get_event_loop().time() - start_time, 2)
+                    await msg.reply(
+                        f"That is correct! The country was `{self.country.title()}`"
+                    )
+                    return await self.end_game(ctx, msg.author, elapsed_time)
+                else:
+                    acc = self.get_accuracy(response)
+
+                    if self.responses_count % 10 == 0 and self.hints:
+                        hint = self.get_hint()
+                        image = await self.get_image_hint()
+                        if image:
+                            await ctx.send(f"Hint: `{hint}`", file=image)
+                        else:
+                            await ctx.send(f"Hint: `{hint}`")
+
+                    await msg.reply(
+                        f"That was incorrect! but you are `{acc}%` of the way there!",
+                        mention_author=False,
+                    )
 
         # Check if the time has exceeded the timeout
         #if asyncio.get_event_loop().time() - start_time > timeout:
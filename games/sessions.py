@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from typing import Optional, Callable, Iterable, Any
+from collections import defaultdict
+import asyncio
+import time
+
+import discord
+from discord.ext import commands
+
+__all__: tuple[str, ...] = (
+    "MAX_GUILD_SESSIONS",
+    "IDLE_TIMEOUT",
+    "SessionLimitReached",
+    "GameSession",
+    "SessionRouter",
+)
+
+MAX_GUILD_SESSIONS = 15
+IDLE_TIMEOUT = 600
+SWEEP_INTERVAL = 60
+SESSION_QUEUE_SIZE = 50
+
+Key = tuple[int, Optional[int], Optional[int]]
+
+
+class SessionLimitReached(commands.MaxConcurrencyReached):
+    """The guild already has ``MAX_GUILD_SESSIONS`` games running."""
+
+    def __init__(self, limit: int) -> None:
+        super().__init__(limit, commands.BucketType.guild)
+
+
+class GameSession:
+    """
+    One running game's inbox.
+
+    The router pushes matching gateway events into the session; the game
+    pulls them with :meth:`wait`, which mirrors ``bot.wait_for``.
+    """
+
+    def __init__(
+        self,
+        router: SessionRouter,
+        *,
+        guild_id: Optional[int],
+        channel_id: int,
+        users: Optional[tuple[int, ...]] = None,
+    ) -> None:
+        self.router = router
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.users = users
+        self.message_id: Optional[int] = None
+        self.keys: list[Key] = []
+        self.last_active = time.monotonic()
+        self.closed = False
+        self._queue: asyncio.Queue = asyncio.Queue(SESSION_QUEUE_SIZE)
+
+    def __enter__(self) -> GameSession:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def bind(self, message: Optional[discord.Message]) -> None:
+        """Route reactions on ``message`` (or, with ``None``, channel messages) to this session."""
+        self.message_id = message.id if message else None
+        self.router._index(self)
+
+    def feed(self, event: Any) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass
+
+    async def wait(
+        self,
+        *,
+        check: Optional[Callable[..., bool]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        waits for the next routed event that passes ``check``
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            no matching event arrived within ``timeout``, or the session was evicted
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if self.closed or (remaining is not None and remaining <= 0):
+                raise asyncio.TimeoutError
+
+            event = await asyncio.wait_for(self._queue.get(), remaining)
+            if event is None:
+                raise asyncio.TimeoutError
+
+            args = event if isinstance(event, tuple) else (event,)
+            if check is None or check(*args):
+                self.last_active = time.monotonic()
+                return event
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.router._remove(self)
+        self.feed(None)
+
+
+class SessionRouter:
+    """
+    Routes reactions and messages to the game that owns them.
+
+    Sessions are indexed by ``(channel_id, message_id, user_id)``; a ``None``
+    message id means plain channel messages, a ``None`` user id means anyone.
+    Each gateway event costs two dict lookups instead of one check per
+    pending ``wait_for`` across every guild.
+    """
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self.sessions: dict[Key, list[GameSession]] = defaultdict(list)
+        self.guild_counts: dict[Optional[int], int] = defaultdict(int)
+        self.live: set[GameSession] = set()
+        self._sweeper: Optional[asyncio.Task] = None
+
+        bot.add_listener(self.on_message)
+        bot.add_listener(self.on_reaction_add)
+
+    @classmethod
+    def of(cls, bot: commands.Bot) -> SessionRouter:
+        router = getattr(bot, "game_sessions", None)
+        if router is None:
+            router = bot.game_sessions = cls(bot)
+        return router
+
+    def open(
+        self,
+        ctx: commands.Context[commands.Bot],
+        *,
+        users: Optional[Iterable[discord.abc.User]] = None,
+    ) -> GameSession:
+        """
+        reserves a session slot in the guild
+
+        Raises
+        ------
+        SessionLimitReached
+            the guild is already running ``MAX_GUILD_SESSIONS`` games
+        """
+        guild_id = ctx.guild.id if ctx.guild else None
+        if guild_id is not None and self.guild_counts[guild_id] >= MAX_GUILD_SESSIONS:
+            raise SessionLimitReached(MAX_GUILD_SESSIONS)
+
+        session = GameSession(
+            self,
+            guild_id=guild_id,
+            channel_id=ctx.channel.id,
+            users=tuple(user.id for user in users) if users is not None else None,
+        )
+        self.guild_counts[guild_id] += 1
+        self.live.add(session)
+
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep())
+        return session
+
+    def _index(self, session: GameSession) -> None:
+        self._unindex(session)
+        users = session.users if session.users is not None else (None,)
+        session.keys = [(session.channel_id, session.message_id, user) for user in users]
+        for key in session.keys:
+            self.sessions[key].append(session)
+
+    def _unindex(self, session: GameSession) -> None:
+        for key in session.keys:
+            bucket = self.sessions.get(key)
+            if bucket and session in bucket:
+                bucket.remove(session)
+                if not bucket:
+                    del self.sessions[key]
+        session.keys = []
+
+    def _remove(self, session: GameSession) -> None:
+        self._unindex(session)
+        if session in self.live:
+            self.live.discard(session)
+            self.guild_counts[session.guild_id] -= 1
+            if self.guild_counts[session.guild_id] <= 0:
+                del self.guild_counts[session.guild_id]
+
+    def _route(self, key: Key, event: Any) -> None:
+        for session in self.sessions.get(key, ()):
+            session.feed(event)
+
+    async def on_message(self, message: discord.Message) -> None:
+        if not self.sessions:
+            return
+        channel_id = message.channel.id
+        self._route((channel_id, None, message.author.id), message)
+        self._route((channel_id, None, None), message)
+
+    async def on_reaction_add(self, reaction: discord.Reaction, user: discord.User) -> None:
+        if not self.sessions:
+            return
+        message = reaction.message
+        self._route((message.channel.id, message.id, user.id), (reaction, user))
+        self._route((message.channel.id, message.id, None), (reaction, user))
+
+    async def _sweep(self) -> None:
+        while self.live:
+            await asyncio.sleep(SWEEP_INTERVAL)
+            cutoff = time.monotonic() - IDLE_TIMEOUT
+            for session in [s for s in self.live if s.last_active < cutoff]:
+                session.close()
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self.live),
+            "keys": len(self.sessions),
+            "guilds": len(self.guild_counts),
+        }
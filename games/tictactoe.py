@@ -7,6 +7,7 @@ import discord
 from discord.ext import commands
 
 from .utils import DiscordColor, DEFAULT_COLOR
+from .sessions import SessionRouter
 
 
 class Tictactoe:
@@ -145,39 +146,35 @@ class Tictactoe:
         """
         self.embed_color = embed_color
 
-        embed = self.make_embed()
-        self.message = await ctx.send(self.board_string(), embed=embed, **kwargs)
+        with SessionRouter.of(ctx.bot).open(ctx, users=(self.cross, self.circle)) as session:
+            embed = self.make_embed()
+            self.message = await ctx.send(self.board_string(), embed=embed, **kwargs)
+            session.bind(self.message)
 
-        for button in self._controls:
-            await self.message.add_reaction(button)
+            for button in self._controls:
+                await self.message.add_reaction(button)
 
-        while not ctx.bot.is_closed():
+            while not ctx.bot.is_closed():
 
-            def check(reaction: discord.Reaction, user: discord.User) -> bool:
-                return (
-                    str(reaction.emoji) in self._controls
-                    and user == self.turn
-                    and reaction.message == self.message
-                )
+                def check(reaction: discord.Reaction, user: discord.User) -> bool:
+                    return str(reaction.emoji) in self._controls and user == self.turn
 
-            try:
-                reaction, user = await ctx.bot.wait_for(
-                    "reaction_add", timeout=timeout, check=check
-                )
-            except asyncio.TimeoutError:
-                break
+                try:
+                    reaction, user = await session.wait(check=check, timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
 
-            if self.is_game_over():
-                break
+                if self.is_game_over():
+                    break
 
-            emoji = str(reaction.emoji)
-            self.make_move(emoji, user)
-            embed = self.make_embed()
+                emoji = str(reaction.emoji)
+                self.make_move(emoji, user)
+                embed = self.make_embed()
 
-            if remove_reaction_after:
-                await self.message.remove_reaction(emoji, user)
+                if remove_reaction_after:
+                    await self.message.remove_reaction(emoji, user)
 
-            await self.message.edit(content=self.board_string(), embed=embed)
+                await self.message.edit(content=self.board_string(), embed=embed)
 
         embed = self.make_embed(game_over=True)
         await self.message.edit(content=self.board_string(), embed=embed)
@@ -6,13 +6,13 @@ import os
 import asyncio
 import random
 import pathlib
-import itertools
+import functools
 
 import discord
 from discord.ext import commands
-from PIL import Image, ImageDraw, ImageFont
-
+from utils.render import renderer
 from .utils import *
+from .sessions import SessionRouter
 
 if TYPE_CHECKING:
     from typing_extensions import TypeAlias
@@ -56,6 +56,173 @@ async def create_2048_emojis(
     return result
 
 
+ROW_MASK = 0xFFFF
+COL_MASK = 0x000F000F000F000F
+MAX_EXPONENT = 15
+
+DIRECTIONS: tuple[str, ...] = ("⬅️", "➡️", "⬆️", "⬇️")
+HINT_DEPTH = 2
+HINT_EMOJI = "💡"
+
+
+def _unpack_row(row: int) -> list[int]:
+    return [(row >> (4 * c)) & 0xF for c in range(4)]
+
+
+def _pack_row(tiles: list[int]) -> int:
+    return sum(tile << (4 * c) for c, tile in enumerate(tiles))
+
+
+def _reverse_row(row: int) -> int:
+    return ((row >> 12) & 0xF) | ((row >> 4) & 0xF0) | ((row << 4) & 0xF00) | ((row << 12) & 0xF000)
+
+
+def _slide_left(tiles: list[int]) -> list[int]:
+    tiles = [t for t in tiles if t]
+    result = []
+    i = 0
+    while i < len(tiles):
+        if i + 1 < len(tiles) and tiles[i] == tiles[i + 1]:
+            result.append(min(tiles[i] + 1, MAX_EXPONENT))
+            i += 2
+        else:
+            result.append(tiles[i])
+            i += 1
+    return result + [0] * (4 - len(result))
+
+
+def _row_score(tiles: list[int]) -> float:
+    """Expectimax leaf heuristic for one row: empty cells, merges and monotonicity."""
+    empty = tiles.count(0)
+    merges = 0
+    prev = 0
+    counter = 0
+    for tile in tiles:
+        if not tile:
+            continue
+        if tile == prev:
+            counter += 1
+        elif counter:
+            merges += 1 + counter
+            counter = 0
+        prev = tile
+    if counter:
+        merges += 1 + counter
+
+    left = right = 0
+    for a, b in zip(tiles, tiles[1:]):
+        if a > b:
+            left += a ** 4 - b ** 4
+        else:
+            right += b ** 4 - a ** 4
+
+    return 200000.0 + 270.0 * empty + 700.0 * merges - 47.0 * min(left, right) - 11.0 * sum(t ** 3.5 for t in tiles)
+
+
+@functools.lru_cache(maxsize=None)
+def _move_tables() -> tuple[list[int], list[int]]:
+    """Row-move lookup tables, indexed by a packed 16-bit row."""
+    left = [_pack_row(_slide_left(_unpack_row(row))) for row in range(65536)]
+    right = [_reverse_row(left[_reverse_row(row)]) for row in range(65536)]
+    return left, right
+
+
+@functools.lru_cache(maxsize=None)
+def _score_table() -> list[float]:
+    return [_row_score(_unpack_row(row)) for row in range(65536)]
+
+
+def _transpose(cells: int) -> int:
+    a1 = cells & 0xF0F00F0FF0F00F0F
+    a2 = cells & 0x0000F0F00000F0F0
+    a3 = cells & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def _shift_rows(cells: int, table: list[int]) -> int:
+    return (
+        table[cells & ROW_MASK]
+        | table[(cells >> 16) & ROW_MASK] << 16
+        | table[(cells >> 32) & ROW_MASK] << 32
+        | table[(cells >> 48) & ROW_MASK] << 48
+    )
+
+
+def move_cells(cells: int, direction: str) -> int:
+    """
+    applies a move to a packed board
+
+    The board is 16 four-bit exponents, row-major from the top left, so a
+    move is four row lookups (plus two transposes for vertical moves).
+    """
+    left, right = _move_tables()
+    if direction == "⬅️":
+        return _shift_rows(cells, left)
+    if direction == "➡️":
+        return _shift_rows(cells, right)
+    if direction == "⬆️":
+        return _transpose(_shift_rows(_transpose(cells), left))
+    if direction == "⬇️":
+        return _transpose(_shift_rows(_transpose(cells), right))
+    raise KeyError("Provided emoji is not one of the valid controls")
+
+
+def empty_cells(cells: int) -> list[int]:
+    return [i for i in range(16) if not (cells >> (4 * i)) & 0xF]
+
+
+def _score(cells: int) -> float:
+    score = _score_table()
+    transposed = _transpose(cells)
+    return sum(
+        score[(cells >> shift) & ROW_MASK] + score[(transposed >> shift) & ROW_MASK]
+        for shift in (0, 16, 32, 48)
+    )
+
+
+def best_move(cells: int, depth: int = HINT_DEPTH) -> Optional[str]:
+    """
+    expectimax over the player's moves and the spawned `2`
+
+    Returns
+    -------
+    Optional[str]
+        the control emoji of the best move, or None when no move changes the board
+    """
+    cache: dict[tuple[int, int], float] = {}
+
+    def chance(board: int, depth: int) -> float:
+        empty = empty_cells(board)
+        if depth == 0 or not empty:
+            return _score(board)
+        key = (board, depth)
+        if key not in cache:
+            cache[key] = sum(maximize(board | (1 << (4 * i)), depth - 1) for i in empty) / len(empty)
+        return cache[key]
+
+    def maximize(board: int, depth: int) -> float:
+        best = 0.0
+        for direction in DIRECTIONS:
+            moved = move_cells(board, direction)
+            if moved != board:
+                best = max(best, chance(moved, depth))
+        return best
+
+    choice, best = None, -1.0
+    for direction in DIRECTIONS:
+        moved = move_cells(cells, direction)
+        if moved == cells:
+            continue
+        value = chance(moved, depth)
+        if value > best:
+            choice, best = direction, value
+    return choice
+
+
 class Twenty48:
     """
     Twenty48 Game
@@ -73,7 +240,7 @@ class Twenty48:
         self.embed_color: Optional[DiscordColor] = None
         self.embed: Optional[discord.Embed] = None
 
-        self.board: Board = [[0 for _ in range(4)] for _ in range(4)]
+        self.cells: int = 0
         self.message: Optional[discord.Message] = None
 
         self._controls = ["⬅️", "➡️", "⬆️", "⬇️"]
@@ -113,66 +280,47 @@ class Twenty48:
 
             self.IMG_LENGTH = self.BORDER_W * 2 + self.SQ_S * 4 + self.SPACE_W * 3
 
-            self._font = ImageFont.truetype(
-                str(pathlib.Path(__file__).parent / "assets/ClearSans-Bold.ttf"), 50
-            )
+            self._font_path = str(pathlib.Path(__file__).parent / "assets/ClearSans-Bold.ttf")
 
-    def _reverse(self, board: Board) -> Board:
-        return [row[::-1] for row in board]
-
-    def _transp(self, board: Board) -> Board:
-        return [[board[i][j] for i in range(4)] for j in range(4)]
-
-    def _merge(self, board: Board) -> Board:
-        for i in range(4):
-            for j in range(3):
-                tile = board[i][j]
-                if tile == board[i][j + 1] and tile != 0:
-                    board[i][j] *= 2
-                    board[i][j + 1] = 0
-        return board
-
-    def _compress(self, board: Board) -> Board:
-        new_board = [[0 for _ in range(4)] for _ in range(4)]
-        for i in range(4):
-            pos = 0
-            for j in range(4):
-                if board[i][j] != 0:
-                    new_board[i][pos] = board[i][j]
-                    pos += 1
-        return new_board
+    @property
+    def board(self) -> Board:
+        return [
+            [1 << tile if tile else 0 for tile in _unpack_row((self.cells >> (16 * r)) & ROW_MASK)]
+            for r in range(4)
+        ]
+
+    @board.setter
+    def board(self, board: Board) -> None:
+        self.cells = sum(
+            _pack_row([tile.bit_length() - 1 if tile else 0 for tile in row]) << (16 * r)
+            for r, row in enumerate(board)
+        )
+
+    def move(self, direction: str) -> bool:
+        """
+        applies one of the arrow controls
+
+        Returns
+        -------
+        bool
+            returns whether or not any tile moved
+        """
+        moved = move_cells(self.cells, direction)
+        changed = moved != self.cells
+        self.cells = moved
+        return changed
 
     def move_left(self) -> None:
-        stage = self._compress(self.board)
-        stage = self._merge(stage)
-        stage = self._compress(stage)
-        self.board = stage
+        self.move("⬅️")
 
     def move_right(self) -> None:
-        stage = self._reverse(self.board)
-        stage = self._compress(stage)
-        stage = self._merge(stage)
-        stage = self._compress(stage)
-        stage = self._reverse(stage)
-        self.board = stage
+        self.move("➡️")
 
     def move_up(self) -> None:
-        stage = self._transp(self.board)
-        stage = self._compress(stage)
-        stage = self._merge(stage)
-        stage = self._compress(stage)
-        stage = self._transp(stage)
-        self.board = stage
+        self.move("⬆️")
 
     def move_down(self) -> None:
-        stage = self._transp(self.board)
-        stage = self._reverse(stage)
-        stage = self._compress(stage)
-        stage = self._merge(stage)
-        stage = self._compress(stage)
-        stage = self._reverse(stage)
-        stage = self._transp(stage)
-        self.board = stage
+        self.move("⬇️")
 
     def spawn_new(self) -> bool:
         """
@@ -183,18 +331,24 @@ class Twenty48:
         bool
             returns whether or not the game is lost
         """
-        board = self.board
-        zeroes = [
-            (j, i) for j, sub in enumerate(board) for i, el in enumerate(sub) if el == 0
-        ]
+        zeroes = empty_cells(self.cells)
 
         if not zeroes:
             return True
         else:
-            i, j = random.choice(zeroes)
-            board[i][j] = 2
+            self.cells |= 1 << (4 * random.choice(zeroes))
             return False
 
+    @executor()
+    def load_tables(self) -> None:
+        """builds the move tables off the event loop, once per process"""
+        _move_tables()
+
+    @executor()
+    def hint(self) -> Optional[str]:
+        """the control the expectimax solver recommends for the current board"""
+        return best_move(self.cells)
+
     def number_to_emoji(self) -> str:
         board = self.board
         game_string = ""
@@ -208,10 +362,10 @@ class Twenty48:
         return game_string
 
     def check_win(self) -> bool:
-        flattened = itertools.chain(*self.board)
+        tiles = {(self.cells >> (4 * i)) & 0xF for i in range(16)}
 
         for num in (2048, 4096, 8192):
-            if num in flattened:
+            if num.bit_length() - 1 in tiles:
                 if num == 2048:
                     self.embed = discord.Embed(description="", color=discord.Color.random())
                 self.embed.description += f"⭐: Congrats! You hit **{num}**!\n"
@@ -221,42 +375,28 @@ class Twenty48:
                     return True
         return False
 
-    @executor()
-    def render_image(self) -> discord.File:
-        SQ = self.SQ_S
-        with Image.new("RGB", (self.IMG_LENGTH, self.IMG_LENGTH), self.BG_CLR) as img:
-            cursor = ImageDraw.Draw(img)
-
-            x = y = self.BORDER_W
-            for row in self.board:
-                for tile in row:
-                    tile = str(tile)
-                    color, fsize = self._color_mapping.get(tile)
-                    font = self._font.font_variant(size=fsize)
-                    cursor.rounded_rectangle(
-                        (x, y, x + SQ, y + SQ), radius=5, width=0, fill=color
-                    )
-
-                    if tile != "0":
-                        text_fill = (
-                            self.DARK_CLR if tile in ("2", "4") else self.LIGHT_CLR
-                        )
-                        cursor.text(
-                            (x + SQ / 2, y + SQ / 2),
-                            tile,
-                            font=font,
-                            anchor="mm",
-                            fill=text_fill,
-                        )
-
-                    x += SQ + self.SPACE_W
-                x = self.BORDER_W
-                y += SQ + self.SPACE_W
-
-            buf = BytesIO()
-            img.save(buf, "PNG")
-        buf.seek(0)
-        return discord.File(buf, "2048.png")
+    async def render_image(self) -> discord.File:
+        style = {
+            "colors": self._color_mapping,
+            "light": self.LIGHT_CLR,
+            "dark": self.DARK_CLR,
+            "bg": self.BG_CLR,
+            "border": self.BORDER_W,
+            "square": self.SQ_S,
+            "space": self.SPACE_W,
+            "font": self._font_path,
+        }
+        return await renderer.render_file(
+            "twenty_48", "2048.png", board=self.board, style=style, key=id(self)
+        )
+
+    async def hint_embed(self) -> discord.Embed:
+        direction = await self.hint()
+        text = f"{HINT_EMOJI} Hint: {direction}" if direction else f"{HINT_EMOJI} No move changes the board."
+        embed = discord.Embed(description=text, color=discord.Color.random())
+        if self.embed and self.embed.description:
+            embed.description = self.embed.description + text
+        return embed
 
     async def start(
         self,
@@ -266,6 +406,7 @@ class Twenty48:
         timeout: Optional[float] = None,
         remove_reaction_after: bool = False,
         delete_button: bool = False,
+        hints: bool = False,
         embed_color: DiscordColor = DEFAULT_COLOR,
         **kwargs,
     ) -> discord.Message:
@@ -284,6 +425,8 @@ class Twenty48:
             specifies whether or not to remove the move reaction, by default False
         delete_button : bool, optional
             specifies whether or not to include a stop button or not, by default False
+        hints : bool, optional
+            specifies whether or not to include a button that suggests the best move, by default False
         embed_color : DiscordColor, optional
             the color of the game embed, by default DEFAULT_COLOR
 
@@ -296,79 +439,77 @@ class Twenty48:
         self.embed_color = embed_color
         self.player = ctx.author
 
-        self.board[random.randrange(4)][random.randrange(4)] = 2
-        self.board[random.randrange(4)][random.randrange(4)] = 2
-
-        if self._render_image:
-            image = await self.render_image()
-            self.message = await ctx.send(file=image, **kwargs)
-        else:
-            board_string = self.number_to_emoji()
-            self.message = await ctx.send(board_string, **kwargs)
-
-        if delete_button:
-            self._controls.append("⏹️")
-
-        for button in self._controls:
-            await self.message.add_reaction(button)
-
-        while not ctx.bot.is_closed():
-
-            def check(reaction: discord.Reaction, user: discord.User) -> bool:
-                return (
-                    str(reaction.emoji) in self._controls
-                    and user == self.player
-                    and reaction.message == self.message
-                )
-
-            try:
-                reaction, user = await ctx.bot.wait_for(
-                    "reaction_add", timeout=timeout, check=check
-                )
-            except asyncio.TimeoutError:
-                break
-
-            emoji = str(reaction.emoji)
+        await self.load_tables()
+        self.spawn_new()
+        self.spawn_new()
 
-            if delete_button and emoji == "⏹️":
-                await self.message.delete()
-                break
+        with SessionRouter.of(ctx.bot).open(ctx, users=(self.player,)) as session:
+            if self._render_image:
+                image = await self.render_image()
+                self.message = await ctx.send(file=image, **kwargs)
+            else:
+                board_string = self.number_to_emoji()
+                self.message = await ctx.send(board_string, **kwargs)
+            session.bind(self.message)
 
-            if emoji == "➡️":
-                self.move_right()
+            if hints:
+                self._controls.append(HINT_EMOJI)
+            if delete_button:
+                self._controls.append("⏹️")
 
-            elif emoji == "⬅️":
-                self.move_left()
+            for button in self._controls:
+                await self.message.add_reaction(button)
 
-            elif emoji == "⬇️":
-                self.move_down()
+            while not ctx.bot.is_closed():
 
-            elif emoji == "⬆️":
-                self.move_up()
+                def check(reaction: discord.Reaction, user: discord.User) -> bool:
+                    return str(reaction.emoji) in self._controls
 
-            if remove_reaction_after:
                 try:
-                    await self.message.remove_reaction(emoji, user)
-                except discord.DiscordException:
-                    pass
-
-            lost = self.spawn_new()
-            won = self.check_win()
-
-            if lost:
-                self.embed = discord.Embed(
-                    description="Game Over! You lost.",
-                    color=discord.Color.random(),
-                )
+                    reaction, user = await session.wait(check=check, timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+
+                emoji = str(reaction.emoji)
+
+                if delete_button and emoji == "⏹️":
+                    await self.message.delete()
+                    break
+
+                if emoji == HINT_EMOJI:
+                    await self.message.edit(embed=await self.hint_embed())
+                    if remove_reaction_after:
+                        try:
+                            await self.message.remove_reaction(emoji, user)
+                        except discord.DiscordException:
+                            pass
+                    continue
+
+                self.move(emoji)
+
+                if remove_reaction_after:
+                    try:
+                        await self.message.remove_reaction(emoji, user)
+                    except discord.DiscordException:
+                        pass
+
+                lost = self.spawn_new()
+                won = self.check_win()
+
+                if lost:
+                    self.embed = discord.Embed(
+                        description="Game Over! You lost.",
+                        color=discord.Color.random(),
+                    )
 
-            if self._render_image:
-                image = await self.render_image()
-                await self.message.edit(attachments=[image], embed=self.embed)
-            else:
-                board_string = self.number_to_emoji()
-                await self.message.edit(content=board_string, embed=self.embed)
+                if self._render_image:
+                    image = await self.render_image()
+                    await self.message.edit(attachments=[image], embed=self.embed)
+                else:
+                    board_string = self.number_to_emoji()
+                    await self.message.edit(content=board_string, embed=self.embed)
 
-            if won or lost:
-                break
+                if won or lost:
+                    break
 
         return self.message
@@ -6,17 +6,18 @@ from io import BytesIO
 
 import textwrap
 import time
-import random
 import asyncio
 import aiohttp
 import difflib
 import pathlib
 
-from PIL import Image, ImageDraw, ImageFont
 import discord
 from discord.ext import commands
 
+from utils.render import renderer
 from .utils import *
+from .sessions import SessionRouter
+from .words import WordIndex
 
 
 class UserData(TypedDict):
@@ -38,22 +39,9 @@ class TypeRacer:
         3: "🥉",
     }
 
-    @executor()
-    def _tr_img(self, text: str, font: str) -> BytesIO:
-
-        text = "\n".join(textwrap.wrap(text, width=25))
-
-        font = ImageFont.truetype(font, 30)
-        x, y = font.getsize_multiline(text)
-
-        with Image.new("RGB", (x + 20, y + 30), (0, 0, 30)) as image:
-            cursor = ImageDraw.Draw(image)
-            cursor.multiline_text((10, 10), text, font=font, fill=(220, 200, 220))
-
-            buffer = BytesIO()
-            image.save(buffer, "PNG")
-            buffer.seek(0)
-            return buffer
+    async def _tr_img(self, text: str, font: str) -> BytesIO:
+        data = await renderer.render("typeracer", text=text, font_path=font)
+        return BytesIO(data)
 
     def format_line(self, i: int, data: UserData) -> str:
         return f" • {self.EMOJI_MAP[i]} | {data['user'].mention} in {data['time']:.2f}s | **WPM:** {data['wpm']:.2f} | **ACC:** {data['acc']:.2f}%"
@@ -73,53 +61,50 @@ class TypeRacer:
         winners = []
         start = time.perf_counter()
 
-        while not ctx.bot.is_closed():
-
-            def check(m: discord.Message) -> bool:
-                content = m.content.lower().replace("\n", " ")
-                if (
-                    m.channel == ctx.channel
-                    and not m.author.bot
-                    and m.author not in map(lambda m: m["user"], winners)
-                ):
-                    sim = difflib.SequenceMatcher(None, content, text).ratio()
-                    return sim >= min_accuracy
-
-            try:
-                message: discord.Message = await ctx.bot.wait_for(
-                    "message", timeout=timeout, check=check
+        with SessionRouter.of(ctx.bot).open(ctx) as session:
+            session.bind(None)
+
+            while not ctx.bot.is_closed():
+
+                def check(m: discord.Message) -> bool:
+                    content = m.content.lower().replace("\n", " ")
+                    if not m.author.bot and m.author not in map(lambda m: m["user"], winners):
+                        sim = difflib.SequenceMatcher(None, content, text).ratio()
+                        return sim >= min_accuracy
+
+                try:
+                    message: discord.Message = await session.wait(check=check, timeout=timeout)
+                except asyncio.TimeoutError:
+                    if winners:
+                        break
+                    else:
+                        return await ctx.reply(
+                            "Looks like no one responded",
+                            allowed_mentions=discord.AllowedMentions.none(),
+                        )
+
+                end = time.perf_counter()
+                content = message.content.lower().replace("\n", " ")
+                timeout -= round(end - start)
+
+                winners.append(
+                    {
+                        "user": message.author,
+                        "time": end - start,
+                        "wpm": len(text.split()) / ((end - start) / 60),
+                        "acc": difflib.SequenceMatcher(None, content, text).ratio() * 100,
+                    }
                 )
-            except asyncio.TimeoutError:
-                if winners:
-                    break
-                else:
-                    return await ctx.reply(
-                        "Looks like no one responded",
-                        allowed_mentions=discord.AllowedMentions.none(),
-                    )
-
-            end = time.perf_counter()
-            content = message.content.lower().replace("\n", " ")
-            timeout -= round(end - start)
-
-            winners.append(
-                {
-                    "user": message.author,
-                    "time": end - start,
-                    "wpm": len(text.split()) / ((end - start) / 60),
-                    "acc": difflib.SequenceMatcher(None, content, text).ratio() * 100,
-                }
-            )
 
-            self.embed.description += (
-                self.format_line(len(winners), winners[len(winners) - 1]) + "\n"
-            )
-            await self.message.edit(embed=self.embed)
+                self.embed.description += (
+                    self.format_line(len(winners), winners[len(winners) - 1]) + "\n"
+                )
+                await self.message.edit(embed=self.embed)
 
-            await message.add_reaction(self.EMOJI_MAP[len(winners)])
+                await message.add_reaction(self.EMOJI_MAP[len(winners)])
 
-            if len(winners) >= 3:
-                break
+                if len(winners) >= 3:
+                    break
 
         desc = [self.format_line(i, x) for i, x in enumerate(winners, 1)]
         embed = discord.Embed(
@@ -131,6 +116,15 @@ class TypeRacer:
             embed=embed, allowed_mentions=discord.AllowedMentions.none()
         )
 
+    async def _fetch_sentence(self, session: aiohttp.ClientSession) -> str:
+        async with session.get(self.SENTENCE_URL) as r:
+            if r.ok:
+                text: dict[str, Any] = await r.json()
+                return text.get("content", "")
+            raise RuntimeError(
+                f"HTTP request raised an error: {r.status}; {r.reason}"
+            )
+
     async def start(
         self,
         ctx: commands.Context[commands.Bot],
@@ -183,20 +177,15 @@ class TypeRacer:
         parent = pathlib.Path(__file__).parent
 
         if not words_mode:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.SENTENCE_URL) as r:
-                    if r.ok:
-                        text: dict[str, Any] = await r.json()
-                        text = text.get("content", "")
-                    else:
-                        raise RuntimeError(
-                            f"HTTP request raised an error: {r.status}; {r.reason}"
-                        )
+            session = getattr(ctx.bot, "session", None)
+            if session is None:
+                async with aiohttp.ClientSession() as session:
+                    text = await self._fetch_sentence(session)
+            else:
+                text = await self._fetch_sentence(session)
 
         else:
-            with open(parent / "assets/words.txt", "r") as wordsfp:
-                words = wordsfp.read().splitlines()
-                text = " ".join(random.choice(words).lower() for _ in range(8))
+            text = " ".join(WordIndex.of().sample(8))
 
         if max_quote_length is not None:
             if len(text) > max_quote_length:
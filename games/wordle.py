@@ -1,16 +1,16 @@
 from __future__ import annotations
 
 import pathlib
-import random
 import asyncio
 from typing import Optional, Final
 from io import BytesIO
 
 import discord
 from discord.ext import commands
-from PIL import Image, ImageDraw, ImageFont
-
+from utils.render import renderer
 from .utils import *
+from .sessions import SessionRouter
+from .words import WordIndex
 
 BORDER: Final[int] = 40
 SQ: Final[int] = 100
@@ -30,19 +30,17 @@ class Wordle:
     Wordle Game
     """
 
-    def __init__(self, word: Optional[str] = None, *, text_size: int = 55) -> None:
+    def __init__(self, word: Optional[str] = None, *, daily: bool = False, text_size: int = 55) -> None:
         self.embed_color: Optional[DiscordColor] = None
 
         parent = pathlib.Path(__file__).parent
-        self._valid_words = tuple(
-            open(parent / "assets/words.txt", "r").read().splitlines()
-        )
+        self._valid_words = WordIndex.of()
         self._text_size = text_size
-        self._font = ImageFont.truetype(
-            str(parent / "assets/HelveticaNeuBold.ttf"), self._text_size
-        )
+        self._font_path = str(parent / "assets/HelveticaNeuBold.ttf")
 
         self.guesses: list[list[dict[str, str]]] = []
+        self.daily = daily
+        self.won: Optional[bool] = None
 
         if word:
             if len(word) != 5:
@@ -52,8 +50,10 @@ class Wordle:
                 raise ValueError("Word must be an alphabetical string")
 
             self.word = word
+        elif daily:
+            self.word: str = self._valid_words.daily(5)
         else:
-            self.word: str = random.choice(self._valid_words)
+            self.word: str = self._valid_words.random(5)
 
     def parse_guess(self, guess: str) -> bool:
         self.guesses.append([])
@@ -64,40 +64,17 @@ class Wordle:
                 color = GRAY
             self.guesses[-1].append({"letter": l, "color": color})
 
+        if guess == self.word:
+            self.won = True
+        elif len(self.guesses) >= 6:
+            self.won = False
         return guess == self.word
 
-    @executor()
-    def render_image(self) -> BytesIO:
-        with Image.new("RGB", (WIDTH, HEIGHT), (255, 255, 255)) as img:
-            cursor = ImageDraw.Draw(img)
-
-            x = y = BORDER
-            for i in range(6):
-                for j in range(5):
-                    try:
-                        letter = self.guesses[i][j]
-                        color = letter["color"]
-                        act_letter = letter["letter"]
-                    except (IndexError, KeyError):
-                        cursor.rectangle((x, y, x + SQ, y + SQ), outline=LGRAY, width=4)
-                    else:
-                        cursor.rectangle((x, y, x + SQ, y + SQ), width=0, fill=color)
-                        cursor.text(
-                            (x + SQ / 2, y + SQ / 2),
-                            act_letter.upper(),
-                            font=self._font,
-                            anchor="mm",
-                            fill=(255, 255, 255),
-                        )
-
-                    x += SQ + SPACE
-                x = BORDER
-                y += SQ + SPACE
-
-            buf = BytesIO()
-            img.save(buf, "PNG")
-        buf.seek(0)
-        return buf
+    async def render_image(self) -> BytesIO:
+        data = await renderer.render(
+            "wordle", guesses=self.guesses, font_path=self._font_path, text_size=self._text_size
+        )
+        return BytesIO(data)
 
     async def start(
         self,
@@ -131,52 +108,48 @@ class Wordle:
         embed.set_image(url="attachment://wordle.png")
         embed.set_footer(text='Say "stop" to cancel the game!')
 
-        self.message = await ctx.send(embed=embed, file=discord.File(buf, "wordle.png"))
-
-        while not ctx.bot.is_closed():
+        with SessionRouter.of(ctx.bot).open(ctx, users=(ctx.author,)) as session:
+            self.message = await ctx.send(embed=embed, file=discord.File(buf, "wordle.png"))
+            session.bind(None)
 
-            def check(m: discord.Message) -> bool:
-                return (
-                    (len(m.content) == 5 or m.content.lower() == "stop")
-                    and m.author == ctx.author
-                    and m.channel == ctx.channel
-                )
+            while not ctx.bot.is_closed():
 
-            try:
-                guess: discord.Message = await ctx.bot.wait_for(
-                    "message", timeout=timeout, check=check
-                )
-            except asyncio.TimeoutError:
-                break
+                def check(m: discord.Message) -> bool:
+                    return len(m.content) == 5 or m.content.lower() == "stop"
 
-            content = guess.content.lower()
+                try:
+                    guess: discord.Message = await session.wait(check=check, timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
 
-            if content == "stop":
-                await ctx.send(f"Game Over! cancelled, the word was: **{self.word}**")
-                break
+                content = guess.content.lower()
 
-            if content not in self._valid_words:
-                await ctx.send("That is not a valid word!")
-            else:
-                won = self.parse_guess(content)
-                buf = await self.render_image()
+                if content == "stop":
+                    await ctx.send(f"Game Over! cancelled, the word was: **{self.word}**")
+                    break
 
-                await self.message.delete()
+                if content not in self._valid_words:
+                    await ctx.send("That is not a valid word!")
+                else:
+                    won = self.parse_guess(content)
+                    buf = await self.render_image()
 
-                embed = discord.Embed(title="Wordle!", color=discord.Color.random())
-                embed.set_image(url="attachment://wordle.png")
+                    await self.message.delete()
 
-                self.message = await ctx.send(
-                    embed=embed, file=discord.File(buf, "wordle.png")
-                )
+                    embed = discord.Embed(title="Wordle!", color=discord.Color.random())
+                    embed.set_image(url="attachment://wordle.png")
 
-                if won:
-                    await ctx.send("Game Over! You won!")
-                    break
-                elif len(self.guesses) >= 6:
-                    await ctx.send(
-                        f"Game Over! You lose, the word was: **{self.word}**"
+                    self.message = await ctx.send(
+                        embed=embed, file=discord.File(buf, "wordle.png")
                     )
-                    break
+
+                    if won:
+                        await ctx.send("Game Over! You won!")
+                        break
+                    elif len(self.guesses) >= 6:
+                        await ctx.send(
+                            f"Game Over! You lose, the word was: **{self.word}**"
+                        )
+                        break
 
         return self.message
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import Optional
+import datetime
+import hashlib
+import pathlib
+import random
+
+from utils.assets import atlas
+
+__all__: tuple[str, ...] = (
+    "WORDS_PATH",
+    "WordIndex",
+)
+
+WORDS_PATH = str(pathlib.Path(__file__).parent / "assets/words.txt")
+
+
+class WordIndex:
+    """
+    Process-wide index over a word list
+
+    Membership checks go through a frozenset, random picks through
+    per-length tuples; both are built once per file and shared by every game.
+    """
+
+    _indexes: dict[str, WordIndex] = {}
+
+    def __init__(self, words: tuple[str, ...]) -> None:
+        self.words = words
+        self.lookup = frozenset(words)
+
+        buckets: dict[int, list[str]] = {}
+        for word in words:
+            buckets.setdefault(len(word), []).append(word)
+        self.by_length: dict[int, tuple[str, ...]] = {
+            length: tuple(bucket) for length, bucket in buckets.items()
+        }
+
+    @classmethod
+    def of(cls, path: str = WORDS_PATH) -> WordIndex:
+        index = cls._indexes.get(path)
+        if index is None:
+            words = tuple(word.strip().lower() for word in atlas.words(path) if word.strip())
+            index = cls._indexes[path] = cls(words)
+        return index
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.lookup
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def random(self, length: Optional[int] = None) -> str:
+        return random.choice(self.by_length[length] if length else self.words)
+
+    def sample(self, count: int, length: Optional[int] = None) -> list[str]:
+        bucket = self.by_length[length] if length else self.words
+        return [random.choice(bucket) for _ in range(count)]
+
+    def daily(self, length: int = 5, day: Optional[datetime.date] = None) -> str:
+        """the word of the day (UTC), the same in every guild and process"""
+        day = day or datetime.datetime.utcnow().date()
+        bucket = self.by_length[length]
+        digest = hashlib.sha256(f"{day.isoformat()}:{length}".encode()).digest()
+        return bucket[int.from_bytes(digest[:8], "big") % len(bucket)]
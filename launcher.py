@@ -0,0 +1,103 @@
+"""Runs the bot as several cluster processes, each with a slice of the shards.
+
+    python launcher.py [clusters]
+
+Asks Discord for the recommended shard count, splits the shard ids into
+``clusters`` contiguous ranges (default: one per CPU core, never more than
+shards) and starts ``main.py`` once per range with ``CLUSTER_ID``,
+``SHARD_IDS``, ``SHARD_COUNT`` and ``IPC_PORT`` in its environment. The
+launcher hosts the IPC hub the clusters talk through (see utils/ipc.py)
+and restarts a cluster that exits, backing off if it keeps crashing. It
+runs the database migrations (utils/migrations.py) itself before starting
+any cluster, since the clusters share the files. With
+``CONFIG_CACHE=shm`` it also owns the shared block utils/cache.py maps.
+
+``python main.py`` on its own still runs every shard in one process.
+"""
+import asyncio
+import os
+import sys
+import time
+
+import aiohttp
+
+from utils.cache import config_cache
+from utils.config import CONFIG_CACHE
+from utils.ipc import IPCHub
+from utils.migrations import MIGRATIONS, migrate
+
+IPC_PORT = int(os.environ.get("IPC_PORT", 8765))
+GATEWAY_URL = "https://discord.com/api/v10/gateway/bot"
+# a cluster that ran this long before exiting restarts without delay
+HEALTHY_RUN = 300
+
+
+async def recommended_shards(token: str) -> tuple[int, int]:
+    """(shard count, identify max_concurrency) as Discord recommends them."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(GATEWAY_URL, headers={"Authorization": f"Bot {token}"}) as response:
+            response.raise_for_status()
+            data = await response.json()
+    return data["shards"], data["session_start_limit"]["max_concurrency"]
+
+
+def split(shard_count: int, clusters: int) -> list[list[int]]:
+    """Contiguous shard ranges, sizes differing by at most one."""
+    clusters = max(1, min(clusters, shard_count))
+    size, extra = divmod(shard_count, clusters)
+    ranges, start = [], 0
+    for cluster in range(clusters):
+        end = start + size + (cluster < extra)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+async def run_cluster(cluster_id: int, shard_ids: list[int], shard_count: int) -> None:
+    env = {
+        **os.environ,
+        "CLUSTER_ID": str(cluster_id),
+        "SHARD_IDS": ",".join(map(str, shard_ids)),
+        "SHARD_COUNT": str(shard_count),
+        "IPC_PORT": str(IPC_PORT),
+    }
+    backoff = 1
+    while True:
+        started = time.monotonic()
+        process = await asyncio.create_subprocess_exec(sys.executable, "main.py", env=env)
+        print(f"Cluster {cluster_id} started (pid {process.pid}, shards {shard_ids[0]}-{shard_ids[-1]})")
+        code = await process.wait()
+        backoff = 1 if time.monotonic() - started > HEALTHY_RUN else min(backoff * 2, 300)
+        print(f"Cluster {cluster_id} exited with {code}, restarting in {backoff}s")
+        await asyncio.sleep(backoff)
+
+
+async def main() -> None:
+    token = os.environ["TOKEN"]
+    clusters = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    shard_count, max_concurrency = await recommended_shards(token)
+    ranges = split(shard_count, clusters)
+    print(f"{shard_count} shards across {len(ranges)} clusters (identify concurrency {max_concurrency})")
+
+    # migrated once here: clusters migrating the same files at once lock each other out
+    versions = await migrate()
+    if len(versions) < len(MIGRATIONS):
+        raise SystemExit(f"{len(MIGRATIONS) - len(versions)} databases failed to migrate, not starting clusters")
+    print(f"Migrated {len(versions)} databases")
+
+    hub = IPCHub(IPC_PORT, max_concurrency)
+    await hub.start()
+    try:
+        await asyncio.gather(*(run_cluster(cluster_id, shard_ids, shard_count)
+                               for cluster_id, shard_ids in enumerate(ranges)))
+    finally:
+        await hub.close()
+        if CONFIG_CACHE == "shm":
+            # importing utils.cache mapped the block; the launcher outlives
+            # every cluster, so it is the one to remove it
+            config_cache.versions.close()
+            config_cache.versions.unlink()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
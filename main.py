@@ -3,7 +3,6 @@ import os
 
 import asyncio
 import traceback
-from threading import Thread
 from datetime import datetime
 
 import aiohttp
@@ -20,8 +19,6 @@ from discord.ext import commands
 
 import jishaku
 
-from cogs import *
-
 
 #Configuring Jishaku behavior
 os.environ["JISHAKU_NO_DM_TRACEBACK"] = "False"
@@ -30,7 +27,14 @@ os.environ["JISHAKU_NO_UNDERSCORE"] = "True"
 os.environ["JISHAKU_FORCE_PAGINATOR"] = "True"
 
 
-client = Olympus()
+# set by launcher.py when this process runs one cluster of the shards
+CLUSTER_ID = int(os.environ["CLUSTER_ID"]) if "CLUSTER_ID" in os.environ else None
+SHARD_IDS = [int(shard) for shard in os.environ["SHARD_IDS"].split(",")] if "SHARD_IDS" in os.environ else None
+SHARD_COUNT = int(os.environ["SHARD_COUNT"]) if "SHARD_COUNT" in os.environ else None
+# the first cluster (or the only process) owns the one-per-bot jobs
+PRIMARY = CLUSTER_ID in (None, 0)
+
+client = Olympus(cluster_id=CLUSTER_ID, shard_ids=SHARD_IDS, shard_count=SHARD_COUNT)
 tree = client.tree
 TOKEN = os.getenv("TOKEN")
 
@@ -44,6 +48,8 @@ async def on_ready():
     print(f"Logged in as: {client.user}")
     print(f"Connected to: {len(client.guilds)} guilds")
     print(f"Connected to: {len(client.users)} users")
+    if not PRIMARY:
+        return
     try:
         synced = await client.tree.sync()
         all_commands = list(client.commands)
@@ -54,28 +60,6 @@ async def on_ready():
 
 
 
-from flask import Flask
-from threading import Thread
-
-app = Flask(__name__)
-
-
-@app.route('/')
-def home():
-    return f"P Development 2024"
-
-
-def run():
-    app.run(host='0.0.0.0', port=8080)
-
-
-def keep_alive():
-    server = Thread(target=run)
-    server.start()
-
-
-keep_alive()
-
 import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient
 
@@ -87,7 +71,8 @@ db = mongo_client["tournament_db"]  # Replace with your database name
 
 async def main():
     async with client:
-        os.system("clear")
+        if CLUSTER_ID is None:
+            os.system("clear")
         #await client.load_extension("cogs")
         await client.load_extension("jishaku")
         await client.load_extension("cogs.commands.tournament")
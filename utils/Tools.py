@@ -1,28 +1,20 @@
 import json, sys, os
 import discord
 from discord.ext import commands
-from core import Context
 import aiosqlite
+from utils import storage
+from utils.cache import config_cache
 import asyncio
 
-async def setup_db():
-  async with aiosqlite.connect('db/prefix.db') as db:
-    await db.execute('''
-      CREATE TABLE IF NOT EXISTS prefixes (
-        guild_id INTEGER PRIMARY KEY,
-        prefix TEXT NOT NULL
-      )
-    ''')
-    await db.commit()
-
-
-asyncio.run(setup_db())
 
 async def is_topcheck_enabled(guild_id: int):
-    async with aiosqlite.connect('db/topcheck.db') as db:
-        async with db.execute("SELECT enabled FROM topcheck WHERE guild_id = ?", (guild_id,)) as cursor:
-            row = await cursor.fetchone()
-            return row is not None and row[0] == 1
+    async def load():
+        async with storage.connect('db/topcheck.db') as db:
+            async with db.execute("SELECT enabled FROM topcheck WHERE guild_id = ?", (guild_id,)) as cursor:
+                row = await cursor.fetchone()
+                return row is not None and row[0] == 1
+
+    return await config_cache.get("topcheck", guild_id, load)
             
 
 
@@ -75,23 +67,27 @@ def updateignore(guild_id, data):
 
 
 async def getConfig(guildID):
-  async with aiosqlite.connect('db/prefix.db') as db:
-    async with db.execute("SELECT prefix FROM prefixes WHERE guild_id = ?", (guildID,)) as cursor:
-      row = await cursor.fetchone()
-      if row:
-        return {"prefix": row[0]}
-      else:
-        defaultConfig = {"prefix": "$"}
-        await updateConfig(guildID, defaultConfig)
-        return defaultConfig
+  async def load():
+    async with storage.connect('db/prefix.db') as db:
+      async with db.execute("SELECT prefix FROM prefixes WHERE guild_id = ?", (guildID,)) as cursor:
+        row = await cursor.fetchone()
+        if row:
+          return {"prefix": row[0]}
+    defaultConfig = {"prefix": "$"}
+    await updateConfig(guildID, defaultConfig)
+    return defaultConfig
+
+  # callers get their own copy, the cached one stays as stored
+  return dict(await config_cache.get("prefix", guildID, load))
 
 async def updateConfig(guildID, data):
-  async with aiosqlite.connect('db/prefix.db') as db:
+  async with storage.connect('db/prefix.db') as db:
     await db.execute(
       "INSERT OR REPLACE INTO prefixes (guild_id, prefix) VALUES (?, ?)",
       (guildID, data["prefix"])
     )
     await db.commit()
+  await config_cache.invalidate("prefix", guildID)
 
 
 
@@ -103,7 +99,7 @@ def restart_program():
 def blacklist_check():
 
   async def predicate(ctx):
-    async with aiosqlite.connect('db/block.db') as db:
+    async with storage.connect('db/block.db') as db:
       cursor = await db.execute("SELECT 1 FROM user_blacklist WHERE user_id = ?", (str(ctx.author.id),))
       user_blacklisted = await cursor.fetchone()
       if user_blacklisted:
@@ -120,7 +116,11 @@ def blacklist_check():
     
 
 async def get_ignore_data(guild_id: int) -> dict:
-    async with aiosqlite.connect("db/ignore.db") as db:
+    """The guild's ignored channels, users and commands and bypassed users; cached, don't mutate."""
+    return await config_cache.get("ignore", guild_id, lambda: _load_ignore_data(guild_id))
+
+async def _load_ignore_data(guild_id: int) -> dict:
+    async with storage.connect("db/ignore.db") as db:
         data = {
             "channel": set(),
             "user": set(),
@@ -146,6 +146,32 @@ async def get_ignore_data(guild_id: int) -> dict:
 
     return data
 
+async def get_automod_data(guild_id: int) -> dict:
+    """
+    The guild's automod settings for the message listeners: whether it is
+    enabled, each event's punishment, ignored channel and role ids and the
+    log channel. Cached; cogs/commands/automod.py invalidates it on change.
+    """
+    async def load():
+        async with storage.connect("db/automod.db") as db:
+            cursor = await db.execute("SELECT enabled FROM automod WHERE guild_id = ?", (guild_id,))
+            enabled = await cursor.fetchone()
+            cursor = await db.execute("SELECT event, punishment FROM automod_punishments WHERE guild_id = ?", (guild_id,))
+            punishments = dict(await cursor.fetchall())
+            cursor = await db.execute("SELECT type, id FROM automod_ignored WHERE guild_id = ?", (guild_id,))
+            ignored = await cursor.fetchall()
+            cursor = await db.execute("SELECT log_channel FROM automod_logging WHERE guild_id = ?", (guild_id,))
+            log_channel = await cursor.fetchone()
+        return {
+            "enabled": enabled is not None and enabled[0] == 1,
+            "punishments": punishments,
+            "channel": [id for kind, id in ignored if kind == "channel"],
+            "role": [id for kind, id in ignored if kind == "role"],
+            "log_channel": log_channel[0] if log_channel else None,
+        }
+
+    return await config_cache.get("automod", guild_id, load)
+
 def ignore_check():
     async def predicate(ctx):
         data = await get_ignore_data(ctx.guild.id)
@@ -168,6 +194,15 @@ def ignore_check():
 
     return commands.check(predicate)
 
+def chunk_check():
+    """Loads the guild's full member list first when the cache profile skipped it at startup."""
+    async def predicate(ctx):
+        if ctx.guild and not ctx.guild.chunked and ctx.bot.intents.members:
+            await ctx.guild.chunk()
+        return True
+
+    return commands.check(predicate)
+
 def top_check():
     async def predicate(ctx):
         if not ctx.guild:
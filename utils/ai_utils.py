@@ -104,9 +104,13 @@ async def poly_image_gen(session, prompt):
         image_data = await response.read()
         return io.BytesIO(image_data)
 
-async def generate_image_prodia(prompt, model, sampler, seed, neg):
+async def generate_image_prodia(prompt, model, sampler, seed, neg, session=None):
     print("\033[1;32m(Prodia) Creating image for :\033[0m", prompt)
     start_time = time.time()
+    if session is None:
+        async with aiohttp.ClientSession() as session:
+            return await generate_image_prodia(prompt, model, sampler, seed, neg, session)
+
     async def create_job(prompt, model, sampler, seed, neg):
         url = 'https://api.prodia.com/generate'
         params = {
@@ -120,10 +124,9 @@ async def generate_image_prodia(prompt, model, sampler, seed, neg):
             'upscale': 'True',
             'aspect_ratio': 'square'
         }
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                data = await response.json()
-                return data['job']
+        async with session.get(url, params=params) as response:
+            data = await response.json()
+            return data['job']
 
     job_id = await create_job(prompt, model, sampler, seed, neg)
     url = f'https://api.prodia.com/job/{job_id}'
@@ -132,17 +135,16 @@ async def generate_image_prodia(prompt, model, sampler, seed, neg):
         'accept': '*/*',
     }
 
-    async with aiohttp.ClientSession() as session:
-        while True:
-            async with session.get(url, headers=headers) as response:
-                json = await response.json()
-                if json['status'] == 'succeeded':
-                    async with session.get(f'https://images.prodia.xyz/{job_id}.png?download=1', headers=headers) as response:
-                        content = await response.content.read()
-                        img_file_obj = io.BytesIO(content)
-                        duration = time.time() - start_time
-                        print(f"\033[1;34m(Prodia) Finished image creation\n\033[0mJob id : {job_id}  Prompt : ", prompt, "in", duration, "seconds.")
-                        return img_file_obj
+    while True:
+        async with session.get(url, headers=headers) as response:
+            json = await response.json()
+            if json['status'] == 'succeeded':
+                async with session.get(f'https://images.prodia.xyz/{job_id}.png?download=1', headers=headers) as response:
+                    content = await response.content.read()
+                    img_file_obj = io.BytesIO(content)
+                    duration = time.time() - start_time
+                    print(f"\033[1;34m(Prodia) Finished image creation\n\033[0mJob id : {job_id}  Prompt : ", prompt, "in", duration, "seconds.")
+                    return img_file_obj
 
 async def text_to_speech(text):
     bytes_obj = io.BytesIO()
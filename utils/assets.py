@@ -0,0 +1,66 @@
+import os
+from typing import Iterable, Optional
+
+from PIL import Image, ImageFont
+
+__all__ = ("AssetAtlas", "atlas")
+
+
+class AssetAtlas:
+    """Process-wide registry of decoded images, fonts and word lists.
+
+    Everything is decoded once, lazily on first use or eagerly through
+    :meth:`preload`, and shared afterwards. Images returned by :meth:`image`
+    are shared and must be treated as read-only (paste sources, crops);
+    use :meth:`copy` to get a private canvas to composite onto.
+    """
+
+    def __init__(self):
+        self._images: dict = {}
+        self._fonts: dict = {}
+        self._words: dict = {}
+
+    def image(self, path: str, mode: Optional[str] = "RGBA") -> Image.Image:
+        key = (os.path.normpath(path), mode)
+        img = self._images.get(key)
+        if img is None:
+            with Image.open(path) as src:
+                img = src.convert(mode) if mode else src.copy()
+            self._images[key] = img
+        return img
+
+    def copy(self, path: str, mode: Optional[str] = "RGBA") -> Image.Image:
+        """Private, writable copy of a shared image."""
+        return self.image(path, mode).copy()
+
+    def font(self, path: str, size: int) -> ImageFont.FreeTypeFont:
+        key = (os.path.normpath(path), size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = ImageFont.truetype(path, size)
+        return font
+
+    def words(self, path: str) -> tuple:
+        key = os.path.normpath(path)
+        words = self._words.get(key)
+        if words is None:
+            with open(path, "r") as fp:
+                words = self._words[key] = tuple(fp.read().splitlines())
+        return words
+
+    def preload(self, images: Iterable[str] = (), fonts: Iterable[tuple] = ()) -> None:
+        for path in images:
+            self.image(path)
+        for path, size in fonts:
+            self.font(path, size)
+
+    def stats(self) -> dict:
+        return {
+            "images": len(self._images),
+            "image_bytes": sum(len(img.mode) * img.width * img.height for img in self._images.values()),
+            "fonts": len(self._fonts),
+            "word_lists": len(self._words),
+        }
+
+
+atlas = AssetAtlas()
@@ -0,0 +1,189 @@
+"""Per-guild configuration cache, kept coherent across cluster processes.
+
+Hot lookups (prefix, ignore lists, topcheck, automod settings) go through
+:data:`config_cache`::
+
+    data = await config_cache.get("ignore", guild_id, load)
+
+and whatever changes the underlying rows calls
+``await config_cache.invalidate("ignore", guild_id)`` after committing.
+
+Every entry is stamped with the version of its key at the moment the load
+started; a lookup only returns it while that version is current, so a
+change that lands mid-load is never cached over. The backend decides where
+versions live, picked with ``CONFIG_CACHE`` (see utils.config):
+
+``memory`` (default)
+    a dict in this process; right for ``python main.py``.
+``ipc``
+    the same dict in every cluster, with invalidations broadcast through
+    the launcher's hub (utils/ipc.py). Unclustered it behaves like ``memory``.
+``shm``
+    a table of version counters in shared memory that every process on the
+    host maps. Invalidating is one counter bump, seen by the next lookup in
+    any process, with no messages involved. The launcher removes the block
+    when it exits; a bot run without it does so on close.
+"""
+import zlib
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from utils.config import CONFIG_CACHE
+
+__all__ = (
+    "BACKENDS", "MemoryVersions", "IPCVersions", "SharedVersions",
+    "ConfigCache", "config_cache",
+)
+
+BACKENDS = ("memory", "ipc", "shm")
+
+Key = tuple[str, Hashable]
+
+
+class MemoryVersions:
+    """Version counters in a plain dict."""
+
+    def __init__(self):
+        self.versions: dict[Key, int] = {}
+
+    def current(self, key: Key) -> int:
+        return self.versions.get(key, 0)
+
+    def bump(self, key: Key) -> None:
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    async def invalidate(self, key: Key) -> None:
+        self.bump(key)
+
+    def attach(self, ipc) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class IPCVersions(MemoryVersions):
+    """Local counters; invalidations are bumped on every cluster through the IPC hub."""
+
+    def __init__(self):
+        super().__init__()
+        self.ipc = None
+
+    def attach(self, ipc) -> None:
+        self.ipc = ipc
+        ipc.register("cache_invalidate", self.remote_bump)
+
+    async def remote_bump(self, namespace: str, key: Any) -> None:
+        self.bump((namespace, key))
+
+    async def invalidate(self, key: Key) -> None:
+        self.bump(key)
+        if self.ipc is not None and self.ipc.connected:
+            await self.ipc.broadcast("cache_invalidate", timeout=1.0, namespace=key[0], key=key[1])
+
+
+class SharedVersions:
+    """
+    Counters in a shared memory block, hashed by key.
+
+    Two keys sharing a slot only cost each other a reload. Bumps are a plain
+    read and write: two racing bumps may land as one, but either way the
+    counter moves past the version any stale entry was stamped with.
+    """
+
+    NAME = "olympus-config-cache"
+    SLOTS = 1 << 16
+
+    def __init__(self, name: str = NAME):
+        try:
+            self.shm = SharedMemory(name, create=True, size=self.SLOTS * 8)
+        except FileExistsError:
+            self.shm = SharedMemory(name)
+        # attaching registers the block too, and the tracker would unlink it
+        # when this process exits; its owner (the launcher) does that instead
+        resource_tracker.unregister(self.shm._name, "shared_memory")
+        self.counters = self.shm.buf.cast("Q")
+
+    @staticmethod
+    def slot(key: Key) -> int:
+        return zlib.crc32(f"{key[0]}:{key[1]}".encode()) % SharedVersions.SLOTS
+
+    def current(self, key: Key) -> int:
+        return self.counters[self.slot(key)]
+
+    def bump(self, key: Key) -> None:
+        slot = self.slot(key)
+        self.counters[slot] = (self.counters[slot] + 1) & 0xFFFFFFFFFFFFFFFF
+
+    async def invalidate(self, key: Key) -> None:
+        self.bump(key)
+
+    def attach(self, ipc) -> None:
+        pass
+
+    def close(self) -> None:
+        self.counters.release()
+        self.shm.close()
+
+    def unlink(self) -> None:
+        # SharedMemory.unlink unregisters again, which the tracker rejects
+        resource_tracker.register(self.shm._name, "shared_memory")
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            # already removed, by an earlier close
+            resource_tracker.unregister(self.shm._name, "shared_memory")
+
+
+class ConfigCache:
+    """Loader-backed cache of per-guild settings, invalidated by key."""
+
+    def __init__(self, versions):
+        self.versions = versions
+        self.entries: dict[Key, tuple[int, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, namespace: str, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """The cached value for ``(namespace, key)``, calling ``loader()`` when missing or stale."""
+        full = (namespace, key)
+        version = self.versions.current(full)
+        entry = self.entries.get(full)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        value = await loader()
+        self.entries[full] = (version, value)
+        return value
+
+    async def invalidate(self, namespace: str, key: Hashable) -> None:
+        """Marks ``(namespace, key)`` stale here and, depending on the backend, everywhere else."""
+        self.entries.pop((namespace, key), None)
+        await self.versions.invalidate((namespace, key))
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Drops this process's copies (all of them, or one namespace's)."""
+        if namespace is None:
+            self.entries.clear()
+        else:
+            for full in [full for full in self.entries if full[0] == namespace]:
+                del self.entries[full]
+
+    def attach(self, ipc) -> None:
+        """Lets the ``ipc`` backend reach the other clusters; called from setup_hook."""
+        self.versions.attach(ipc)
+
+
+def _backend(name: str):
+    if name not in BACKENDS:
+        raise ValueError(f"CONFIG_CACHE must be one of {', '.join(BACKENDS)}, not {name!r}")
+    if name == "ipc":
+        return IPCVersions()
+    if name == "shm":
+        return SharedVersions()
+    return MemoryVersions()
+
+
+config_cache = ConfigCache(_backend(CONFIG_CACHE))
@@ -1,6 +1,16 @@
 import os
 
 TOKEN = os.environ.get("TOKEN")
+# files | single | sharded, see utils/storage.py
+STORAGE_MODE = os.environ.get("STORAGE_MODE", "files")
+# full | balanced | lean, see utils/profiles.py
+CACHE_PROFILE = os.environ.get("CACHE_PROFILE", "full")
+# memory | ipc | shm, see utils/cache.py
+CONFIG_CACHE = os.environ.get("CONFIG_CACHE", "memory")
+# true | false, mirror snipes to db/snipe.db so they survive restarts, see cogs/moderation/snipe.py
+PERSIST_SNIPES = os.environ.get("PERSIST_SNIPES", "false").lower() in ("1", "true", "yes")
+# clusters listen on HEALTH_PORT + cluster id, see utils/health.py
+HEALTH_PORT = int(os.environ.get("HEALTH_PORT", 8080))
 NAME = "Olympus"
 server = "https://discord.com/invite/odx"
 ch = "https://discord.com/channels/699587669059174461/1271825678710476911"
@@ -1,30 +1,48 @@
 import yaml
 import json
 import os
-
-# Config load
-with open('config.yml', 'r', encoding='utf-8') as config_file:
-    config = yaml.safe_load(config_file)
+from functools import lru_cache
 
 ## Language settings ##
-valid_language_codes = []
 lang_directory = "lang"
 
-current_language_code = config['LANGUAGE']
 
-for filename in os.listdir(lang_directory):
-    if filename.startswith("lang.") and filename.endswith(".json") and os.path.isfile(
-            os.path.join(lang_directory, filename)):
-        language_code = filename.split(".")[1]
-        valid_language_codes.append(language_code)
+# Config load, deferred until the first module attribute access
+@lru_cache(maxsize=None)
+def load_config() -> dict:
+    with open('config.yml', 'r', encoding='utf-8') as config_file:
+        return yaml.safe_load(config_file)
 
-def load_current_language() -> dict:
+@lru_cache(maxsize=None)
+def load_language_codes() -> list:
+    valid_language_codes = []
+    for filename in os.listdir(lang_directory):
+        if filename.startswith("lang.") and filename.endswith(".json") and os.path.isfile(
+                os.path.join(lang_directory, filename)):
+            language_code = filename.split(".")[1]
+            valid_language_codes.append(language_code)
+    return valid_language_codes
+
+def __getattr__(name: str):
+    if name == "config":
+        return load_config()
+    if name == "current_language_code":
+        return load_config()['LANGUAGE']
+    if name == "valid_language_codes":
+        return load_language_codes()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+@lru_cache(maxsize=None)
+def _load_language(language_code: str) -> dict:
     lang_file_path = os.path.join(
-        lang_directory, f"lang.{current_language_code}.json")
+        lang_directory, f"lang.{language_code}.json")
     with open(lang_file_path, encoding="utf-8") as lang_file:
         current_language = json.load(lang_file)
     return current_language
 
+def load_current_language() -> dict:
+    return _load_language(load_config()['LANGUAGE'])
+
 # Instructions loader
 def load_instructions() -> dict:
     instructions = {}
@@ -42,4 +60,4 @@ def load_active_channels() -> dict:
     if os.path.exists("channels.json"):
         with open("channels.json", "r", encoding='utf-8') as f:
             active_channels = json.load(f)
-    return active_channels
\ No newline at end of file
+    return active_channels
@@ -0,0 +1,215 @@
+"""Liveness, readiness and Prometheus metrics over HTTP, on the bot's own loop.
+
+:class:`HealthServer` (``bot.health``) is an ``aiohttp.web`` app started from
+``setup_hook`` on ``HEALTH_PORT``, plus the cluster id when clustered, since
+every cluster reports on its own shards:
+
+``/``
+    plain text, for the uptime pingers the old Flask keep-alive served.
+``/livez``
+    200 while the event loop keeps up, 503 once the lag monitor stalls or the
+    bot is closing.
+``/readyz``
+    200 once every shard of this process is connected, 503 listing the
+    ones that aren't.
+``/metrics``
+    Prometheus text format: shard status and gateway latency, event-loop
+    lag, queue depths and cache hit rates.
+
+Cogs add their own queues and caches with :meth:`HealthServer.queue` and
+:meth:`HealthServer.cache`, usually in ``cog_load``.
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from aiohttp import web
+
+__all__ = ("LoopMonitor", "Metrics", "HealthServer")
+
+# a loop that hasn't run the monitor for this long is considered hung
+LIVE_TIMEOUT = 10.0
+
+
+class LoopMonitor:
+    """Samples event-loop lag: how late a ``sleep(interval)`` wakes up."""
+
+    def __init__(self, interval: float = 0.5, window: int = 120):
+        self.interval = interval
+        self.samples: deque[float] = deque(maxlen=window)
+        self.last_tick = time.monotonic()
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def lag(self) -> float:
+        return self.samples[-1] if self.samples else 0.0
+
+    @property
+    def peak(self) -> float:
+        """Worst lag over the sample window (a minute by default)."""
+        return max(self.samples, default=0.0)
+
+    def start(self) -> None:
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def run(self) -> None:
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self.last_tick = time.monotonic()
+            self.samples.append(max(0.0, self.last_tick - start - self.interval))
+
+    def stalled(self) -> bool:
+        return time.monotonic() - self.last_tick > LIVE_TIMEOUT
+
+
+def _value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(label) -> str:
+    return str(label).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """Collects samples and renders them in the Prometheus text format."""
+
+    def __init__(self):
+        self.families: dict[str, tuple[str, str, list[tuple[dict, float]]]] = {}
+
+    def add(self, name: str, kind: str, help: str, value: float, **labels) -> None:
+        self.families.setdefault(name, (kind, help, []))[2].append((labels, value))
+
+    def render(self) -> str:
+        lines = []
+        for name, (kind, help, samples) in self.families.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label}}} {_value(value)}" if label else f"{name} {_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class HealthServer:
+    """The bot's HTTP endpoint; see the module docstring."""
+
+    def __init__(self, bot, host: str = "0.0.0.0", port: int = 8080):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self.monitor = LoopMonitor()
+        self.queues: dict[str, Callable[[], int]] = {}
+        self.caches: dict[str, Callable[[], tuple[int, int]]] = {}
+        self.collectors: list[Callable[[Metrics], None]] = []
+        self.runner: Optional[web.AppRunner] = None
+        self.started = time.time()
+
+    def queue(self, name: str, depth: Callable[[], int]) -> None:
+        """Reports ``depth()`` as ``olympus_queue_depth{queue=name}``."""
+        self.queues[name] = depth
+
+    def cache(self, name: str, counts: Callable[[], tuple[int, int]]) -> None:
+        """Reports ``counts()`` (hits, misses) for cache ``name``."""
+        self.caches[name] = counts
+
+    def collector(self, collect: Callable[["Metrics"], None]) -> None:
+        """Calls ``collect(metrics)`` on every scrape to add series of its own."""
+        self.collectors.append(collect)
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.add_routes([
+            web.get("/", self.home),
+            web.get("/livez", self.livez),
+            web.get("/readyz", self.readyz),
+            web.get("/metrics", self.metrics),
+        ])
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        self.monitor.start()
+
+    async def close(self) -> None:
+        self.monitor.stop()
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+    async def home(self, request: web.Request) -> web.Response:
+        return web.Response(text="P Development 2024")
+
+    async def livez(self, request: web.Request) -> web.Response:
+        if self.bot.is_closed():
+            return web.Response(status=503, text="closing")
+        if self.monitor.stalled():
+            return web.Response(status=503, text=f"event loop stalled for {time.monotonic() - self.monitor.last_tick:.1f}s")
+        return web.Response(text="ok")
+
+    def unready_shards(self) -> list[int]:
+        expected = self.bot.shard_ids or range(self.bot.shard_count or 1)
+        return [
+            shard_id for shard_id in expected
+            if (shard := self.bot.get_shard(shard_id)) is None or shard.is_closed() or math.isinf(shard.latency)
+        ]
+
+    async def readyz(self, request: web.Request) -> web.Response:
+        if not self.bot.is_ready():
+            return web.Response(status=503, text="starting")
+        if unready := self.unready_shards():
+            return web.Response(status=503, text=f"shards not connected: {', '.join(map(str, unready))}")
+        return web.Response(text="ok")
+
+    def collect(self) -> Metrics:
+        bot = self.bot
+        metrics = Metrics()
+        metrics.add("olympus_up", "gauge", "Whether the bot is running.", int(not bot.is_closed()))
+        metrics.add("olympus_ready", "gauge", "Whether every shard of this process is connected.",
+                    int(bot.is_ready() and not self.unready_shards()))
+        metrics.add("olympus_start_time_seconds", "gauge", "Unix time the process started.", self.started)
+        metrics.add("olympus_guilds", "gauge", "Guilds on this process's shards.", len(bot.guilds))
+
+        for shard_id, shard in sorted(bot.shards.items()):
+            metrics.add("olympus_shard_up", "gauge", "Whether the shard's gateway connection is open.",
+                        int(not shard.is_closed()), shard=shard_id)
+            metrics.add("olympus_shard_latency_seconds", "gauge", "Gateway heartbeat latency per shard.",
+                        shard.latency, shard=shard_id)
+
+        metrics.add("olympus_event_loop_lag_seconds", "gauge", "Latest event-loop lag sample.", self.monitor.lag)
+        metrics.add("olympus_event_loop_lag_max_seconds", "gauge", "Worst event-loop lag over the last minute.",
+                    self.monitor.peak)
+        loop = asyncio.get_running_loop()
+        # handles due to run right now; a long backlog means the loop is saturated
+        metrics.add("olympus_event_loop_ready_handles", "gauge", "Callbacks waiting for the event loop.",
+                    len(getattr(loop, "_ready", ())))
+        metrics.add("olympus_asyncio_tasks", "gauge", "Pending asyncio tasks.", len(asyncio.all_tasks(loop)))
+
+        for name, depth in self.queues.items():
+            metrics.add("olympus_queue_depth", "gauge", "Items waiting in an internal queue.", depth(), queue=name)
+
+        for name, counts in self.caches.items():
+            hits, misses = counts()
+            metrics.add("olympus_cache_hits_total", "counter", "Cache lookups served from memory.", hits, cache=name)
+            metrics.add("olympus_cache_misses_total", "counter", "Cache lookups that had to load.", misses, cache=name)
+            metrics.add("olympus_cache_hit_ratio", "gauge", "Hits over lookups since start.",
+                        hits / (hits + misses) if hits + misses else 0.0, cache=name)
+
+        for collect in self.collectors:
+            collect(metrics)
+        return metrics
+
+    async def metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.collect().render(),
+                            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
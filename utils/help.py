@@ -1,8 +1,246 @@
 import discord
 import functools
+from typing import Iterable, Optional
+from discord import app_commands
+from discord.ext import commands
 from utils.Tools import *
 
 
+# checks answered from the invoking user's HelpPolicy instead of running them
+# per command; the blacklist and ignore ones would each open a database.
+# top_check only ever refuses at invoke time and chunk_check never refuses,
+# so neither hides a command (nor chunks a guild just to draw the menu).
+POLICY_CHECKS = {
+    "blacklist_check.<locals>.predicate": "blacklist",
+    "ignore_check.<locals>.predicate": "ignore",
+    "top_check.<locals>.predicate": None,
+    "chunk_check.<locals>.predicate": None,
+    "is_owner.<locals>.predicate": "owner",
+    # staff lists live on the command's cog, so HelpPolicy.allows reads them from there
+    "is_owner_or_staff": "staff",
+}
+
+
+def classify(command: commands.Command) -> tuple:
+    """Splits ``command``'s checks into policy keys and checks that still have to run."""
+    keys, checks = set(), []
+    for check in command.checks:
+        name = getattr(check, "__qualname__", "")
+        if name in POLICY_CHECKS:
+            if POLICY_CHECKS[name]:
+                keys.add(POLICY_CHECKS[name])
+        else:
+            checks.append(check)
+    return frozenset(keys), tuple(checks)
+
+
+class HelpPolicy:
+    """What one user may see in one channel, read from the database once per help invocation."""
+
+    __slots__ = ("blacklisted", "ignored", "ignored_commands", "owner", "user_id")
+
+    def __init__(self, blacklisted: bool, ignored: bool, ignored_commands: set, owner: bool, user_id: int):
+        self.blacklisted = blacklisted
+        self.ignored = ignored
+        self.ignored_commands = ignored_commands
+        self.owner = owner
+        self.user_id = user_id
+
+    @classmethod
+    async def fetch(cls, ctx: commands.Context) -> "HelpPolicy":
+        blacklisted = not await blacklist_check().predicate(ctx)
+        ignored, ignored_commands = False, set()
+        if ctx.guild:
+            data = await get_ignore_data(ctx.guild.id)
+            if str(ctx.author.id) not in data["bypassuser"]:
+                ignored = str(ctx.channel.id) in data["channel"] or str(ctx.author.id) in data["user"]
+                ignored_commands = data["command"]
+        return cls(blacklisted, ignored, ignored_commands, await ctx.bot.is_owner(ctx.author), ctx.author.id)
+
+    def ignores(self, command: commands.Command) -> bool:
+        """Same answer as ``ignore_check`` for ``command``, without the queries."""
+        if self.ignored:
+            return True
+        names = [command.name, *command.aliases]
+        return any(name.strip().lower() in self.ignored_commands for name in names)
+
+    def allows(self, keys: frozenset, command: commands.Command) -> bool:
+        if "blacklist" in keys and self.blacklisted:
+            return False
+        if "ignore" in keys and self.ignores(command):
+            return False
+        if "owner" in keys and not self.owner:
+            return False
+        if "staff" in keys and not (self.owner or self.user_id in getattr(command.cog, "staff", ())):
+            return False
+        return True
+
+
+def distance(a: str, b: str, limit: Optional[int] = None) -> int:
+    """
+    Edit distance counting an adjacent swap as one edit (``pnig`` -> ``ping``
+    is 1). With ``limit``, gives up as soon as the answer must exceed it and
+    returns ``limit + 1``.
+    """
+    # a shared prefix or suffix costs nothing, and typos usually leave both
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a) if limit is None or len(a) <= limit else limit + 1
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    previous, current = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if limit is not None and min(current) > limit:
+            return limit + 1
+    return current[-1]
+
+
+def bigrams(word: str) -> set[str]:
+    word = f" {word} "
+    return {word[i:i + 2] for i in range(len(word) - 1)}
+
+
+class SuggestionIndex:
+    """
+    Bigram index over command names and aliases, for "did you mean" hints.
+
+    Every term maps to the qualified name it stands for, so ``$h`` and
+    ``$help`` suggest the same command. A lookup counts shared bigrams
+    through the posting lists, then computes a bounded edit distance for
+    the few best-overlapping terms only.
+    """
+
+    # terms sharing the most bigrams with the word that get an exact distance
+    CANDIDATES = 12
+
+    def __init__(self, terms: dict[str, str]):
+        self.terms = terms
+        self.postings: dict[str, list[str]] = {}
+        for term in terms:
+            for gram in bigrams(term):
+                self.postings.setdefault(gram, []).append(term)
+
+    @classmethod
+    def from_commands(cls, commands_: Iterable[commands.Command]) -> "SuggestionIndex":
+        terms = {}
+        for command in sorted(commands_, key=lambda c: c.qualified_name):
+            parent = f"{command.full_parent_name} " if command.parent else ""
+            for name in (command.name, *command.aliases):
+                terms.setdefault(f"{parent}{name}".lower(), command.qualified_name)
+        return cls(terms)
+
+    def search(self, word: str, tolerance: int) -> list[tuple[int, str]]:
+        """Terms within ``tolerance`` edits of ``word``, closest first."""
+        grams = bigrams(word)
+        shared: dict[str, int] = {}
+        for gram in grams:
+            for term in self.postings.get(gram, ()):
+                shared[term] = shared.get(term, 0) + 1
+        # one edit breaks at most three of the word's bigrams (a swap), so
+        # anything sharing fewer can't be within tolerance
+        least = max(1, len(grams) - 3 * tolerance)
+        candidates = sorted(
+            (term for term, count in shared.items()
+             if count >= least and abs(len(term) - len(word)) <= tolerance),
+            key=shared.__getitem__, reverse=True,
+        )[:self.CANDIDATES]
+        found = []
+        for term in candidates:
+            d = distance(word, term, tolerance)
+            if d <= tolerance:
+                found.append((d, term))
+        found.sort()
+        return found
+
+    def suggest(self, word: str, limit: int = 3, tolerance: Optional[int] = None) -> list[str]:
+        """
+        Up to ``limit`` qualified command names for a mistyped ``word``.
+
+        The tolerance grows with the word: one edit up to four letters, two
+        up to eight, three beyond. Ties go to terms sharing the first letter.
+        """
+        word = word.strip().lower()
+        if not word:
+            return []
+        if tolerance is None:
+            tolerance = 1 if len(word) <= 4 else 2 if len(word) <= 8 else 3
+        ranked = sorted(self.search(word, tolerance), key=lambda hit: (hit[0], hit[1][0] != word[0], hit[1]))
+        names = []
+        for _, term in ranked:
+            name = self.terms[term]
+            if name not in names:
+                names.append(name)
+                if len(names) == limit:
+                    break
+        return names
+
+
+class HelpCatalog:
+    """
+    The parts of the help menu that only change when cogs do: category
+    pages and their select options, command names and counts, the typo
+    :class:`SuggestionIndex`, and each command's checks sorted into policy
+    keys and cheap checks.
+
+    Built after the extensions load and dropped whenever a cog is added or
+    removed (see ``Olympus.add_cog``); :meth:`of` rebuilds it on demand.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.labels, self.options, self.embeds = [], [], []
+        for cog in bot.cogs.values():
+            if "help_custom" not in dir(cog):
+                continue
+            emoji, label, description = cog.help_custom()
+            self.labels.append(label)
+            self.options.append(discord.SelectOption(label=label, emoji=emoji, description=description))
+            embed = discord.Embed(title=f"{emoji} {label}", color=0x000000)
+            for command in cog.get_commands():
+                params = "".join(f" <{param}>" for param in command.clean_params)
+                embed.add_field(name=f"{command.name}{params}", value=f"{command.help}\n\u200b", inline=False)
+            self.embeds.append(embed)
+
+        walked = set(bot.walk_commands())
+        self.total = len(walked)
+        self.rules = {command: classify(command) for command in walked}
+        self.suggestions = SuggestionIndex.from_commands(walked)
+        self.slash = len([cmd for cmd in bot.tree.get_commands() if isinstance(cmd, app_commands.Command)])
+
+    @classmethod
+    def of(cls, bot: commands.Bot) -> "HelpCatalog":
+        if getattr(bot, "help_catalog", None) is None:
+            bot.help_catalog = cls(bot)
+        return bot.help_catalog
+
+    async def can_run(self, command: commands.Command, ctx: commands.Context, policy: HelpPolicy) -> bool:
+        """``command.can_run`` for listing purposes, with the database-backed checks read from ``policy``."""
+        if not command.enabled:
+            return False
+        keys, checks = self.rules.get(command) or classify(command)
+        if not policy.allows(keys, command):
+            return False
+        for check in checks:
+            try:
+                if not await discord.utils.maybe_coroutine(check, ctx):
+                    return False
+            except commands.CommandError:
+                return False
+        return True
+
+
 class Dropdown(discord.ui.Select):
 
     def __init__(self, ctx, options):
@@ -48,9 +286,9 @@ class Button(discord.ui.Button):
 
 class View(discord.ui.View):
 
-    def __init__(self, mapping: dict, ctx: discord.ext.commands.context.Context, homeembed: discord.embeds.Embed, ui: int):
+    def __init__(self, catalog: HelpCatalog, ctx: discord.ext.commands.context.Context, homeembed: discord.embeds.Embed, ui: int):
         super().__init__(timeout=None)
-        self.mapping, self.ctx, self.home = mapping, ctx, homeembed
+        self.catalog, self.ctx, self.home = catalog, ctx, homeembed
         self.index, self.buttons = 0, None
 
         self.options, self.embeds, self.total_pages = self.gen_embeds()
@@ -76,44 +314,13 @@ class View(discord.ui.View):
         return buttons
 
     def find_index_from_select(self, value):
-        i = 0
-        for cog in self.get_cogs():
-            if "help_custom" in dir(cog):
-                _, label, _ = cog.help_custom()
-                if label == value:
-                    return i + 1
-                i += 1
-
-    def get_cogs(self):
-        return list(self.mapping.keys())
+        if value in self.catalog.labels:
+            return self.catalog.labels.index(value) + 1
 
     def gen_embeds(self):
-        options, embeds = [], []
-        total_pages = 0
-
-        options.append(
-            discord.SelectOption(label="Home",
-                                 emoji='🏠', description=""))
-        embeds.append(self.home)
-        total_pages += 1
-
-        for cog in self.get_cogs():
-            if "help_custom" in dir(cog):
-                emoji, label, description = cog.help_custom()
-                options.append(discord.SelectOption(label=label, emoji=emoji, description=description))
-                embed = discord.Embed(title=f"{emoji} {label}",
-                                      color=0x000000)
-
-                for command in cog.get_commands():
-                    params = ""
-                    for param in command.clean_params:
-                        params += f" <{param}>"
-                    embed.add_field(name=f"{command.name}{params}",
-                                    value=f"{command.help}\n\u200b",
-                                    inline=False)
-
-                embeds.append(embed)
-                total_pages += 1
+        options = [discord.SelectOption(label="Home", emoji='🏠', description=""), *self.catalog.options]
+        embeds = [self.home, *self.catalog.embeds]
+        total_pages = len(embeds)
 
         self.home.set_footer(text=f"• Help page 1/{total_pages} | Requested by: {self.ctx.author.display_name}",
                              icon_url=f"{self.ctx.bot.user.avatar.url}")
@@ -127,7 +334,8 @@ class View(discord.ui.View):
     async def to_page(self, page: int, interaction: discord.Interaction):
         if not self.index + page < 0 or not self.index + page > len(self.options):
             await self.set_index(page)
-            embed = self.embeds[self.index]
+            # category pages are shared by every open menu, so footers go on a copy
+            embed = self.embeds[self.index].copy()
             embed.set_footer(text=f"• Help page {self.index + 1}/{self.total_pages} | Requested by: {self.ctx.author.display_name}",
                              icon_url=f"{self.ctx.bot.user.avatar.url}")
             await interaction.response.edit_message(embed=embed, view=self)
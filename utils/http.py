@@ -0,0 +1,108 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import aiohttp
+import discord
+
+from utils.perf import record
+
+__all__ = ("create_session", "AssetCache")
+
+
+def create_session() -> aiohttp.ClientSession:
+    """Build the bot-wide pooled session with keep-alive and connection limits."""
+    connector = aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=20,
+        ttl_dns_cache=300,
+        keepalive_timeout=30,
+    )
+    timeout = aiohttp.ClientTimeout(total=30, connect=10)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, trace_configs=[_timing_trace()])
+
+
+def _timing_trace() -> aiohttp.TraceConfig:
+    """Charges each request's time to the command or listener that made it (utils.perf)."""
+    async def on_start(session, context, params):
+        context.start = time.perf_counter()
+
+    async def on_end(session, context, params):
+        record("http", time.perf_counter() - context.start)
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(on_start)
+    trace.on_request_end.append(on_end)
+    trace.on_request_exception.append(on_end)
+    return trace
+
+
+class AssetCache:
+    """Size-bounded LRU cache of downloaded bytes (avatars, badges, images).
+
+    Entries are keyed by URL, or by asset hash for Discord assets so a changed
+    avatar is fetched again while an unchanged one is served from memory.
+    Concurrent requests for the same key share one download.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, max_bytes: int = 32 * 1024 * 1024,
+                 max_item_bytes: int = 4 * 1024 * 1024):
+        self.session = session
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._pending: dict = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def fetch(self, url: str, *, key: Optional[str] = None) -> Optional[bytes]:
+        """Return the bytes behind ``url``, or ``None`` if the request failed."""
+        key = key or url
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+        self.misses += 1
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = asyncio.ensure_future(self._download(url, key))
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def fetch_asset(self, asset: discord.Asset, *, size: int = 256,
+                          format: str = "png") -> Optional[bytes]:
+        """Fetch a Discord asset, keyed by its hash so re-uploads invalidate it."""
+        asset = asset.replace(size=size, format=format)
+        return await self.fetch(asset.url, key=f"{asset.key}:{size}:{format}")
+
+    async def _download(self, url: str, key: str) -> Optional[bytes]:
+        try:
+            async with self.session.get(url) as response:
+                if response.status != 200:
+                    return None
+                data = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error fetching {url}: {e}")
+            return None
+        self._store(key, data)
+        return data
+
+    def _store(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_item_bytes or key in self._entries:
+            return
+        self._entries[key] = data
+        self.size += len(data)
+        while self.size > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
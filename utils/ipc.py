@@ -0,0 +1,211 @@
+"""Messages between bot clusters and the launcher.
+
+``launcher.py`` runs one :class:`IPCHub`; every cluster process connects to
+it with an :class:`IPCClient` (``bot.ipc``). Frames are one JSON object per
+line over a local TCP socket.
+
+``await bot.ipc.broadcast("stats")`` runs the ``stats`` handler on every
+cluster, this one included, and returns their results as a list. Cogs
+register handlers in ``cog_load`` with :meth:`IPCClient.register`. A bot
+started on its own (``python main.py``) is never connected, so broadcasts
+just run the local handler and commands work the same either way.
+
+The hub also hands out IDENTIFY slots: Discord allows one identify per
+rate-limit bucket every five seconds across *all* processes, which a
+single AutoShardedBot would otherwise only enforce for its own shards.
+"""
+import asyncio
+import itertools
+import json
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+__all__ = ("IPCHub", "IPCClient", "IDENTIFY_INTERVAL")
+
+IDENTIFY_INTERVAL = 5.0
+HOST = "127.0.0.1"
+
+
+async def send(writer: asyncio.StreamWriter, frame: dict) -> None:
+    writer.write(json.dumps(frame, separators=(",", ":")).encode() + b"\n")
+    await writer.drain()
+
+
+class IPCHub:
+    """Launcher side: relays broadcasts to every cluster and collects the replies."""
+
+    def __init__(self, port: int, max_concurrency: int = 1):
+        self.port = port
+        self.max_concurrency = max_concurrency
+        self.clusters: dict[int, asyncio.StreamWriter] = {}
+        self.pending: dict[str, tuple[asyncio.Future, dict]] = {}
+        self.buckets: dict[int, float] = {}
+        self.identify_lock = asyncio.Lock()
+        self.ids = itertools.count()
+        self.server = None
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self.serve, HOST, self.port)
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            for writer in self.clusters.values():
+                writer.close()
+            await self.server.wait_closed()
+
+    async def serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        cluster = None
+        try:
+            while line := await reader.readline():
+                frame = json.loads(line)
+                op = frame["op"]
+                if op == "hello":
+                    cluster = frame["cluster"]
+                    self.clusters[cluster] = writer
+                elif op == "request":
+                    asyncio.create_task(self.relay(writer, frame))
+                elif op == "reply":
+                    waiting = self.pending.get(frame["id"])
+                    if waiting:
+                        future, replies = waiting
+                        replies[frame["cluster"]] = frame["data"]
+                        if len(replies) >= len(self.clusters) and not future.done():
+                            future.set_result(None)
+                elif op == "identify":
+                    asyncio.create_task(self.identify(writer, frame))
+        except (ConnectionError, json.JSONDecodeError):
+            pass
+        finally:
+            if cluster is not None and self.clusters.get(cluster) is writer:
+                del self.clusters[cluster]
+                # don't leave broadcasts waiting for a reply that won't come
+                for future, replies in self.pending.values():
+                    if len(replies) >= len(self.clusters) and not future.done():
+                        future.set_result(None)
+            writer.close()
+
+    async def relay(self, requester: asyncio.StreamWriter, frame: dict) -> None:
+        key = f"hub-{next(self.ids)}"
+        future = asyncio.get_running_loop().create_future()
+        replies: dict[int, Any] = {}
+        self.pending[key] = (future, replies)
+        call = {"op": "call", "id": key, "method": frame["method"], "kwargs": frame["kwargs"]}
+        for writer in list(self.clusters.values()):
+            try:
+                await send(writer, call)
+            except ConnectionError:
+                pass
+        try:
+            await asyncio.wait_for(future, frame["timeout"])
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            del self.pending[key]
+        data = [replies[cluster] for cluster in sorted(replies)]
+        await send(requester, {"op": "result", "id": frame["id"], "data": data})
+
+    async def identify(self, writer: asyncio.StreamWriter, frame: dict) -> None:
+        bucket = frame["shard_id"] % self.max_concurrency
+        async with self.identify_lock:
+            wait = self.buckets.get(bucket, 0) + IDENTIFY_INTERVAL - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self.buckets[bucket] = time.monotonic()
+        await send(writer, {"op": "result", "id": frame["id"], "data": None})
+
+
+class IPCClient:
+    """Cluster side, available as ``bot.ipc``."""
+
+    def __init__(self, cluster_id: Optional[int] = None):
+        self.cluster_id = cluster_id
+        self.handlers: dict[str, Callable[..., Awaitable[Any]]] = {}
+        self.pending: dict[str, asyncio.Future] = {}
+        self.ids = itertools.count()
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.reader_task: Optional[asyncio.Task] = None
+
+    @property
+    def connected(self) -> bool:
+        return self.writer is not None and not self.writer.is_closing()
+
+    def register(self, method: str, handler: Callable[..., Awaitable[Any]]) -> None:
+        """``handler(**kwargs)`` answers ``method``; its result must be JSON-serialisable."""
+        self.handlers[method] = handler
+
+    def unregister(self, method: str) -> None:
+        self.handlers.pop(method, None)
+
+    async def connect(self, port: int) -> None:
+        reader, self.writer = await asyncio.open_connection(HOST, port)
+        await send(self.writer, {"op": "hello", "cluster": self.cluster_id})
+        self.reader_task = asyncio.create_task(self.read(reader))
+
+    async def close(self) -> None:
+        if self.reader_task:
+            self.reader_task.cancel()
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+
+    async def read(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while line := await reader.readline():
+                frame = json.loads(line)
+                if frame["op"] == "call":
+                    asyncio.create_task(self.answer(frame))
+                elif frame["op"] == "result":
+                    future = self.pending.pop(frame["id"], None)
+                    if future and not future.done():
+                        future.set_result(frame["data"])
+        except (ConnectionError, json.JSONDecodeError):
+            pass
+        finally:
+            self.writer = None
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("IPC hub went away"))
+            self.pending.clear()
+
+    async def call_local(self, method: str, kwargs: dict) -> Any:
+        handler = self.handlers.get(method)
+        if handler is None:
+            return None
+        return await handler(**kwargs)
+
+    async def answer(self, frame: dict) -> None:
+        try:
+            data = await self.call_local(frame["method"], frame["kwargs"])
+        except Exception as e:
+            print(f"IPC handler {frame['method']} failed: {e!r}")
+            data = None
+        if self.connected:
+            await send(self.writer, {"op": "reply", "id": frame["id"], "cluster": self.cluster_id, "data": data})
+
+    async def request(self, frame: dict, timeout: float) -> Any:
+        key = f"{self.cluster_id}-{next(self.ids)}"
+        future = asyncio.get_running_loop().create_future()
+        self.pending[key] = future
+        await send(self.writer, {**frame, "id": key})
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.pending.pop(key, None)
+
+    async def broadcast(self, method: str, *, timeout: float = 5.0, **kwargs) -> list:
+        """
+        Results of ``method`` from every cluster that answered within
+        ``timeout``, in cluster order; clusters whose handler failed give ``None``.
+        """
+        if not self.connected:
+            return [await self.call_local(method, kwargs)]
+        # the hub waits up to timeout for the clusters, give it a moment to reply
+        return await self.request({"op": "request", "method": method, "kwargs": kwargs, "timeout": timeout}, timeout + 2)
+
+    async def identify_slot(self, shard_id: int) -> bool:
+        """Waits for the hub's go-ahead to IDENTIFY; ``False`` when not clustered."""
+        if not self.connected:
+            return False
+        await self.request({"op": "identify", "shard_id": shard_id}, None)
+        return True
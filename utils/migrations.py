@@ -0,0 +1,510 @@
+"""Versioned schema migrations for the bot's SQLite files.
+
+Each database file has an ordered list of migration scripts; the number of
+scripts applied is kept in the file's ``PRAGMA user_version``, so a script
+runs exactly once per file. :func:`migrate` runs every pending script for all
+files concurrently from ``setup_hook``, before any cog is loaded or the
+gateway connects, so listeners never see a missing table. Clustered, the
+launcher runs it once before starting the clusters instead.
+
+Cogs keep their own ``CREATE TABLE IF NOT EXISTS`` calls so they still work
+when reloaded on their own; against a migrated file those are no-ops.
+
+Run ``python -m utils.migrations`` from the repository root to migrate and
+print the query plans of the hot-path queries in :data:`HOT_QUERIES`; it
+exits with status 1 if any file failed to migrate.
+"""
+import asyncio
+import os
+import sys
+import time
+from typing import Optional
+
+from utils import storage
+
+__all__ = ("MIGRATIONS", "HOT_QUERIES", "migrate", "query_plans", "plan_report")
+
+
+MIGRATIONS: dict[str, list[str]] = {
+    "db/prefix.db": [
+        """
+        CREATE TABLE IF NOT EXISTS prefixes (guild_id INTEGER PRIMARY KEY, prefix TEXT NOT NULL);
+        """,
+    ],
+    "db/np.db": [
+        """
+        CREATE TABLE IF NOT EXISTS np (id INTEGER PRIMARY KEY, expiry_time TEXT NULL);
+        CREATE TABLE IF NOT EXISTS staff (id INTEGER PRIMARY KEY);
+        CREATE TABLE IF NOT EXISTS autonp (guild_id INTEGER PRIMARY KEY);
+        """,
+    ],
+    "db/block.db": [
+        """
+        CREATE TABLE IF NOT EXISTS user_blacklist (user_id INTEGER PRIMARY KEY, timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE IF NOT EXISTS guild_blacklist (guild_id INTEGER PRIMARY KEY, timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        """,
+    ],
+    "db/ignore.db": [
+        """
+        CREATE TABLE IF NOT EXISTS ignored_commands (guild_id INTEGER, command_name TEXT);
+        CREATE TABLE IF NOT EXISTS ignored_channels (guild_id INTEGER, channel_id INTEGER);
+        CREATE TABLE IF NOT EXISTS ignored_users (guild_id INTEGER, user_id INTEGER);
+        CREATE TABLE IF NOT EXISTS bypassed_users (guild_id INTEGER, user_id INTEGER);
+        """,
+        # ignore_check reads all four tables by guild on every command
+        """
+        CREATE INDEX IF NOT EXISTS idx_ignored_commands_guild ON ignored_commands (guild_id, command_name);
+        CREATE INDEX IF NOT EXISTS idx_ignored_channels_guild ON ignored_channels (guild_id, channel_id);
+        CREATE INDEX IF NOT EXISTS idx_ignored_users_guild ON ignored_users (guild_id, user_id);
+        CREATE INDEX IF NOT EXISTS idx_bypassed_users_guild ON bypassed_users (guild_id, user_id);
+        """,
+    ],
+    "db/topcheck.db": [
+        """
+        CREATE TABLE IF NOT EXISTS topcheck (guild_id INTEGER PRIMARY KEY, enabled INTEGER);
+        """,
+    ],
+    "db/afk.db": [
+        """
+        CREATE TABLE IF NOT EXISTS afk (
+            user_id INTEGER PRIMARY KEY,
+            AFK TEXT NOT NULL,
+            reason TEXT NOT NULL,
+            time INTEGER NOT NULL,
+            mentions INTEGER NOT NULL,
+            dm TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS afk_guild (
+            user_id INTEGER NOT NULL,
+            guild_id INTEGER NOT NULL,
+            PRIMARY KEY (user_id, guild_id)
+        );
+        """,
+    ],
+    "db/anti.db": [
+        """
+        CREATE TABLE IF NOT EXISTS antinuke (guild_id INTEGER PRIMARY KEY, status BOOLEAN);
+        CREATE TABLE IF NOT EXISTS antinuke_logging (guild_id INTEGER PRIMARY KEY, log_channel INTEGER);
+        CREATE TABLE IF NOT EXISTS extraowners (guild_id INTEGER PRIMARY KEY, owner_id INTEGER);
+        CREATE TABLE IF NOT EXISTS limit_settings (
+            guild_id INTEGER,
+            action_type TEXT,
+            action_limit INTEGER,
+            time_window INTEGER,
+            PRIMARY KEY (guild_id, action_type)
+        );
+        CREATE TABLE IF NOT EXISTS whitelisted_users (
+            guild_id INTEGER,
+            user_id INTEGER,
+            ban BOOLEAN DEFAULT FALSE,
+            kick BOOLEAN DEFAULT FALSE,
+            prune BOOLEAN DEFAULT FALSE,
+            botadd BOOLEAN DEFAULT FALSE,
+            serverup BOOLEAN DEFAULT FALSE,
+            memup BOOLEAN DEFAULT FALSE,
+            chcr BOOLEAN DEFAULT FALSE,
+            chdl BOOLEAN DEFAULT FALSE,
+            chup BOOLEAN DEFAULT FALSE,
+            rlcr BOOLEAN DEFAULT FALSE,
+            rlup BOOLEAN DEFAULT FALSE,
+            rldl BOOLEAN DEFAULT FALSE,
+            meneve BOOLEAN DEFAULT FALSE,
+            mngweb BOOLEAN DEFAULT FALSE,
+            mngstemo BOOLEAN DEFAULT FALSE,
+            PRIMARY KEY (guild_id, user_id)
+        );
+        CREATE TABLE IF NOT EXISTS Nightmode (guildId TEXT, roleId TEXT, adminPermissions INTEGER);
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_nightmode_guild ON Nightmode (guildId, roleId);
+        """,
+    ],
+    "db/automod.db": [
+        """
+        CREATE TABLE IF NOT EXISTS automod (guild_id INTEGER PRIMARY KEY, enabled INTEGER DEFAULT 0);
+        CREATE TABLE IF NOT EXISTS automod_punishments (
+            guild_id INTEGER,
+            event TEXT,
+            punishment TEXT,
+            PRIMARY KEY (guild_id, event)
+        );
+        CREATE TABLE IF NOT EXISTS automod_ignored (
+            guild_id INTEGER,
+            type TEXT,
+            id INTEGER,
+            PRIMARY KEY (guild_id, type, id)
+        );
+        CREATE TABLE IF NOT EXISTS automod_logging (guild_id INTEGER, log_channel INTEGER, PRIMARY KEY (guild_id));
+        """,
+    ],
+    "db/autoreact.db": [
+        """
+        CREATE TABLE IF NOT EXISTS autoreact (guild_id INTEGER, trigger TEXT, emojis TEXT);
+        """,
+        # read by guild on every message
+        """
+        CREATE INDEX IF NOT EXISTS idx_autoreact_guild ON autoreact (guild_id, trigger);
+        """,
+    ],
+    "db/autoresponder.db": [
+        """
+        CREATE TABLE IF NOT EXISTS autoresponses (
+            guild_id INTEGER,
+            name TEXT,
+            message TEXT,
+            PRIMARY KEY (guild_id, name)
+        );
+        """,
+        # every message is matched with LOWER(name) = ?, which the primary key cannot serve
+        """
+        CREATE INDEX IF NOT EXISTS idx_autoresponses_lower_name ON autoresponses (guild_id, LOWER(name));
+        """,
+    ],
+    "db/autorole.db": [
+        """
+        CREATE TABLE IF NOT EXISTS autorole (guild_id INTEGER PRIMARY KEY, bots TEXT NOT NULL, humans TEXT NOT NULL);
+        """,
+    ],
+    "db/badges.db": [
+        """
+        CREATE TABLE IF NOT EXISTS badges (
+            user_id INTEGER PRIMARY KEY,
+            owner INTEGER DEFAULT 0,
+            staff INTEGER DEFAULT 0,
+            partner INTEGER DEFAULT 0,
+            sponsor INTEGER DEFAULT 0,
+            friend INTEGER DEFAULT 0,
+            early INTEGER DEFAULT 0,
+            vip INTEGER DEFAULT 0,
+            bug INTEGER DEFAULT 0
+        );
+        """,
+    ],
+    "db/blword.db": [
+        """
+        CREATE TABLE IF NOT EXISTS blacklist (guild_id TEXT, word TEXT, PRIMARY KEY (guild_id, word));
+        CREATE TABLE IF NOT EXISTS bypass_roles (guild_id TEXT, role_id INTEGER, PRIMARY KEY (guild_id, role_id));
+        CREATE TABLE IF NOT EXISTS bypass (guild_id TEXT, user_id INTEGER, PRIMARY KEY (guild_id, user_id));
+        """,
+    ],
+    "db/customrole.db": [
+        """
+        CREATE TABLE IF NOT EXISTS roles (
+            guild_id INTEGER PRIMARY KEY,
+            staff INTEGER,
+            girl INTEGER,
+            vip INTEGER,
+            guest INTEGER,
+            frnd INTEGER,
+            reqrole INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS custom_roles (guild_id INTEGER, name TEXT, role_id INTEGER, PRIMARY KEY (guild_id, name));
+        """,
+    ],
+    "db/emergency.db": [
+        """
+        CREATE TABLE IF NOT EXISTS authorised_users (guild_id INTEGER, user_id INTEGER);
+        CREATE TABLE IF NOT EXISTS emergency_roles (guild_id INTEGER, role_id INTEGER);
+        CREATE TABLE IF NOT EXISTS restore_roles (
+            guild_id INTEGER NOT NULL,
+            role_id INTEGER NOT NULL,
+            disabled_perms TEXT NOT NULL,
+            PRIMARY KEY (guild_id, role_id)
+        );
+        CREATE TABLE IF NOT EXISTS role_positions (guild_id INTEGER, role_id INTEGER, previous_position INTEGER);
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_authorised_users_guild ON authorised_users (guild_id, user_id);
+        CREATE INDEX IF NOT EXISTS idx_emergency_roles_guild ON emergency_roles (guild_id, role_id);
+        CREATE INDEX IF NOT EXISTS idx_role_positions_guild ON role_positions (guild_id, role_id);
+        """,
+    ],
+    "db/giveaways.db": [
+        """
+        CREATE TABLE IF NOT EXISTS Giveaway (
+            guild_id INTEGER,
+            host_id INTEGER,
+            start_time TIMESTAMP,
+            ends_at TIMESTAMP,
+            prize TEXT,
+            winners INTEGER,
+            message_id INTEGER,
+            channel_id INTEGER,
+            PRIMARY KEY (guild_id, message_id)
+        );
+        """,
+        # the end checker polls for due giveaways every few seconds; reroll/end look up by message
+        """
+        CREATE INDEX IF NOT EXISTS idx_giveaway_ends_at ON Giveaway (ends_at);
+        CREATE INDEX IF NOT EXISTS idx_giveaway_message ON Giveaway (message_id);
+        """,
+    ],
+    "db/invc.db": [
+        """
+        CREATE TABLE IF NOT EXISTS vcroles (guild_id INTEGER PRIMARY KEY, role_id INTEGER NOT NULL);
+        """,
+    ],
+    "db/media.db": [
+        """
+        CREATE TABLE IF NOT EXISTS media_channels (guild_id INTEGER PRIMARY KEY, channel_id INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS media_bypass (guild_id INTEGER, user_id INTEGER, PRIMARY KEY (guild_id, user_id));
+        """,
+    ],
+    "db/notify.db": [
+        """
+        CREATE TABLE IF NOT EXISTS notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            type TEXT NOT NULL UNIQUE,
+            role_id INTEGER NOT NULL,
+            channel_id INTEGER NOT NULL
+        );
+        """,
+        # settings were global per type; key them by guild. Old rows get their
+        # guild_id from the channel once the notify cog sees the cache ready.
+        """
+        CREATE TABLE notifications_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER,
+            type TEXT NOT NULL,
+            role_id INTEGER NOT NULL,
+            channel_id INTEGER NOT NULL,
+            UNIQUE (guild_id, type)
+        );
+        INSERT INTO notifications_new (id, type, role_id, channel_id)
+            SELECT id, type, role_id, channel_id FROM notifications;
+        DROP TABLE notifications;
+        ALTER TABLE notifications_new RENAME TO notifications;
+        """,
+    ],
+    "db/snipe.db": [
+        """
+        CREATE TABLE IF NOT EXISTS snipes (channel_id INTEGER PRIMARY KEY, ring TEXT NOT NULL);
+        """,
+    ],
+    "db/stats.db": [
+        """
+        CREATE TABLE IF NOT EXISTS stats (key TEXT PRIMARY KEY, value INTEGER);
+        """,
+    ],
+    "db/warn.db": [
+        """
+        CREATE TABLE IF NOT EXISTS warns (guild_id INTEGER, user_id INTEGER, warns INTEGER, PRIMARY KEY (guild_id, user_id));
+        """,
+    ],
+    "db/welcome.db": [
+        """
+        CREATE TABLE IF NOT EXISTS welcome (
+            guild_id INTEGER PRIMARY KEY,
+            welcome_type TEXT,
+            welcome_message TEXT,
+            channel_id INTEGER,
+            embed_data TEXT,
+            auto_delete_duration INTEGER
+        );
+        """,
+    ],
+    "db/wordle.db": [
+        """
+        CREATE TABLE IF NOT EXISTS wordle_stats (
+            guild_id INTEGER,
+            user_id INTEGER,
+            played INTEGER DEFAULT 0,
+            won INTEGER DEFAULT 0,
+            streak INTEGER DEFAULT 0,
+            best_streak INTEGER DEFAULT 0,
+            last_daily TEXT,
+            PRIMARY KEY (guild_id, user_id)
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS wordle_daily (user_id INTEGER PRIMARY KEY, last_daily TEXT);
+        INSERT OR IGNORE INTO wordle_daily (user_id, last_daily)
+            SELECT user_id, MAX(last_daily) FROM wordle_stats WHERE last_daily IS NOT NULL GROUP BY user_id;
+        """,
+    ],
+    "vc_247.db": [
+        """
+        CREATE TABLE IF NOT EXISTS vc_status (guild_id INTEGER PRIMARY KEY, voice_channel_id INTEGER, enabled INTEGER);
+        """,
+    ],
+    "tournament.db": [
+        """
+        CREATE TABLE IF NOT EXISTS tournaments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER,
+            tournament_no INTEGER,
+            reg_channel INTEGER,
+            confirm_channel INTEGER,
+            success_role INTEGER,
+            required_mentions INTEGER,
+            total_slots INTEGER,
+            slots_filled INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS teams (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER,
+            tournament_no INTEGER,
+            team_name TEXT,
+            captain_id INTEGER,
+            members TEXT,
+            confirmed INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS ignored_roles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER,
+            role_id INTEGER,
+            role_name TEXT
+        );
+        CREATE TABLE IF NOT EXISTS team_players (
+            guild_id INTEGER,
+            tournament_no INTEGER,
+            player_id INTEGER,
+            team_id INTEGER,
+            PRIMARY KEY (guild_id, tournament_no, player_id)
+        );
+        CREATE TABLE IF NOT EXISTS confirm_pages (
+            tournament_id INTEGER,
+            page INTEGER,
+            message_id INTEGER,
+            PRIMARY KEY (tournament_id, page)
+        );
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_tournaments_reg ON tournaments (reg_channel);
+        CREATE INDEX IF NOT EXISTS idx_teams_tournament ON teams (guild_id, tournament_no, confirmed);
+        CREATE INDEX IF NOT EXISTS idx_teams_name ON teams (guild_id, tournament_no, team_name);
+        CREATE INDEX IF NOT EXISTS idx_team_players_team ON team_players (team_id);
+        CREATE INDEX IF NOT EXISTS idx_ignored_roles_guild ON ignored_roles (guild_id, role_id);
+        """,
+    ],
+}
+
+# (database, query) pairs run on every message or command; parameters are all NULL for EXPLAIN
+HOT_QUERIES: list[tuple[str, str]] = [
+    ("db/prefix.db", "SELECT prefix FROM prefixes WHERE guild_id = ?"),
+    ("db/np.db", "SELECT id FROM np WHERE id = ?"),
+    ("db/block.db", "SELECT 1 FROM user_blacklist WHERE user_id = ?"),
+    ("db/block.db", "SELECT 1 FROM guild_blacklist WHERE guild_id = ?"),
+    ("db/ignore.db", "SELECT channel_id FROM ignored_channels WHERE guild_id = ?"),
+    ("db/ignore.db", "SELECT user_id FROM ignored_users WHERE guild_id = ?"),
+    ("db/ignore.db", "SELECT command_name FROM ignored_commands WHERE guild_id = ?"),
+    ("db/ignore.db", "SELECT user_id FROM bypassed_users WHERE guild_id = ?"),
+    ("db/afk.db", "SELECT AFK, time, mentions, reason FROM afk WHERE user_id = ?"),
+    ("db/afk.db", "SELECT guild_id FROM afk_guild WHERE user_id = ?"),
+    ("db/automod.db", "SELECT enabled FROM automod WHERE guild_id = ?"),
+    ("db/automod.db", "SELECT id FROM automod_ignored WHERE guild_id = ? AND type = ?"),
+    ("db/automod.db", "SELECT punishment FROM automod_punishments WHERE guild_id = ? AND event = ?"),
+    ("db/autoreact.db", "SELECT trigger, emojis FROM autoreact WHERE guild_id = ?"),
+    ("db/autoresponder.db", "SELECT message FROM autoresponses WHERE guild_id = ? AND LOWER(name) = ?"),
+    ("db/media.db", "SELECT channel_id FROM media_channels WHERE guild_id = ?"),
+    ("db/media.db", "SELECT 1 FROM media_bypass WHERE guild_id = ? AND user_id = ?"),
+    ("db/blword.db", "SELECT * FROM blacklist WHERE guild_id = ? AND word = ?"),
+    ("db/anti.db", "SELECT status FROM antinuke WHERE guild_id = ?"),
+    ("db/anti.db", "SELECT owner_id FROM extraowners WHERE guild_id = ? AND owner_id = ?"),
+    ("db/anti.db", "SELECT ban FROM whitelisted_users WHERE guild_id = ? AND user_id = ?"),
+    ("db/emergency.db", "SELECT 1 FROM authorised_users WHERE guild_id = ? AND user_id = ?"),
+    ("db/giveaways.db", "SELECT ends_at, guild_id, message_id FROM Giveaway WHERE ends_at <= ?"),
+    ("db/giveaways.db", "SELECT ends_at, guild_id, message_id FROM Giveaway WHERE message_id = ?"),
+]
+
+
+async def _migrate_file(path: str, scripts: list[str], mode: Optional[str] = None) -> tuple[int, int]:
+    folder = os.path.dirname(storage.resolve(path, mode))
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+
+    module = os.path.normpath(path)
+    async with storage.connect(path, mode=mode) as db:
+        # merged storage files hold several modules, so versions go in a table instead
+        if storage.shared(mode):
+            await db.execute("PRAGMA journal_mode=WAL")
+            await db.execute("CREATE TABLE IF NOT EXISTS schema_versions (module TEXT PRIMARY KEY, version INTEGER)")
+            await db.commit()
+            async with db.execute("SELECT version FROM schema_versions WHERE module = ?", (module,)) as cursor:
+                row = await cursor.fetchone()
+            version = row[0] if row else 0
+        else:
+            async with db.execute("PRAGMA user_version") as cursor:
+                (version,) = await cursor.fetchone()
+
+        current = version
+        for script in scripts[version:]:
+            current += 1
+            if storage.shared(mode):
+                bump = f"INSERT OR REPLACE INTO schema_versions (module, version) VALUES ('{module}', {current});"
+            else:
+                bump = f"PRAGMA user_version = {current};"
+            # executescript commits first, so the version bump rides in the same script
+            await db.executescript(f"BEGIN;\n{script}\n{bump}\nCOMMIT;")
+    return version, current
+
+
+async def _migrate_target(paths: list[str], mode: Optional[str] = None) -> list:
+    results = []
+    for path in paths:
+        try:
+            results.append(await _migrate_file(path, MIGRATIONS[path], mode))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+async def migrate(mode: Optional[str] = None) -> dict[str, tuple[int, int]]:
+    """
+    Brings every database in :data:`MIGRATIONS` up to date, in the layout of
+    storage ``mode`` (the configured one by default).
+
+    Modules sharing a storage file are migrated one after another, separate
+    files concurrently. Returns a mapping of module file to
+    ``(version before, version after)``.
+    """
+    targets: dict[str, list[str]] = {}
+    for path in MIGRATIONS:
+        targets.setdefault(storage.resolve(path, mode), []).append(path)
+
+    groups = list(targets.values())
+    results = await asyncio.gather(*(_migrate_target(paths, mode) for paths in groups))
+    versions = {}
+    for paths, outcomes in zip(groups, results):
+        for path, result in zip(paths, outcomes):
+            if isinstance(result, Exception):
+                print(f"Failed to migrate {path}: {result!r}")
+            else:
+                versions[path] = result
+    return versions
+
+
+async def query_plans() -> list[tuple[str, str, list[str]]]:
+    plans = []
+    for path, query in HOT_QUERIES:
+        async with storage.connect(path) as db:
+            params = (None,) * query.count("?")
+            async with db.execute(f"EXPLAIN QUERY PLAN {query}", params) as cursor:
+                plans.append((path, query, [row[-1] for row in await cursor.fetchall()]))
+    return plans
+
+
+def plan_report(plans: list[tuple[str, str, list[str]]]) -> str:
+    """One block per query; full table scans are flagged."""
+    lines = []
+    for path, query, steps in plans:
+        flag = "SCAN" if any(step.startswith("SCAN") for step in steps) else "ok"
+        lines.append(f"[{flag:>4}] {path}: {query}")
+        lines.extend(f"         {step}" for step in steps)
+    return "\n".join(lines)
+
+
+async def _main() -> int:
+    start = time.perf_counter()
+    versions = await migrate()
+    for path, (before, after) in versions.items():
+        if before != after:
+            print(f"{path}: v{before} -> v{after}")
+    print(f"Migrated {len(versions)} databases in {(time.perf_counter() - start) * 1000:.0f} ms\n")
+    print(plan_report(await query_plans()))
+    await storage.close_pool()
+    return 0 if len(versions) == len(MIGRATIONS) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main()))
@@ -0,0 +1,324 @@
+"""Where the event loop's time goes.
+
+:class:`PerfRecorder` (``bot.perf``) times every listener run and every
+command invocation: ``Olympus._run_event`` wraps listeners in
+:meth:`PerfRecorder.track`, ``Olympus.invoke`` prefix commands and
+``core.Olympus.CommandTree`` slash commands, hybrid ones invoked as slash
+commands included. Each name keeps a call and error
+count, the last :data:`WINDOW` latencies in a ring buffer, from which p50
+and p99 are read, and totals per phase: the database (``utils.storage``),
+HTTP (``bot.http`` and ``bot.session``) and the render pool report the time
+they spend to the running call through :func:`record`. Commands also split
+off their checks, argument parsing and cooldowns, the time up to the
+``before_invoke`` hook; ``ctx.timings`` has the breakdown of one invocation.
+
+:class:`Profiler` is opt-in per command: while a command is being profiled
+each invocation runs under cProfile, and the ones slower than the command's
+p99 keep their pstats.
+
+:class:`StallWatchdog` runs in a thread of its own. When the loop misses its
+heartbeat for longer than the threshold it captures what the loop thread is
+executing, so a blocking call shows up with its stack rather than as lag.
+
+Both surface through the owner ``perf`` command and ``/metrics``.
+"""
+import asyncio
+import cProfile
+import functools
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, ContextManager, Iterator, Optional
+
+__all__ = (
+    "WINDOW", "STALL_THRESHOLD", "PARTS", "PHASES", "Run", "record", "timed",
+    "Stats", "Stall", "StallWatchdog", "Capture", "Profiler", "PerfRecorder",
+)
+
+WINDOW = 512
+STALL_THRESHOLD = 0.5
+# what record() can charge time to
+PARTS = ("db", "http", "render")
+# how a call's time is broken down; "other" is whatever is left (own code, awaiting Discord's gateway...)
+PHASES = ("checks",) + PARTS + ("other",)
+
+
+@dataclass
+class Run:
+    """One tracked call; set ``failed`` for errors that don't propagate (commands)."""
+    started: float = field(default_factory=time.perf_counter)
+    finished: Optional[float] = None
+    # when the command's checks and parsing were done; None for listeners
+    checked: Optional[float] = None
+    failed: bool = False
+    spent: dict[str, float] = field(default_factory=lambda: dict.fromkeys(PARTS, 0.0))
+    spent_in_checks: dict[str, float] = field(default_factory=dict)
+
+    def checks_done(self) -> None:
+        self.checked = time.perf_counter()
+        self.spent_in_checks = dict(self.spent)
+
+    def breakdown(self) -> dict[str, float]:
+        """Seconds per phase (see :data:`PHASES`) plus ``total``."""
+        total = (self.finished or time.perf_counter()) - self.started
+        phases = {"checks": self.checked - self.started if self.checked else 0.0}
+        for part in PARTS:
+            phases[part] = self.spent[part] - self.spent_in_checks.get(part, 0.0)
+        # concurrent awaits can overlap, so the parts may add up to more than the total
+        phases["other"] = max(0.0, total - sum(phases.values()))
+        phases["total"] = total
+        return phases
+
+
+# the listener or command running in this task
+_current: ContextVar[Optional[Run]] = ContextVar("perf_run", default=None)
+
+
+def record(part: str, seconds: float) -> None:
+    """Charges ``seconds`` of ``part`` (one of :data:`PARTS`) to whatever is tracked in this task."""
+    run = _current.get()
+    if run is not None:
+        run.spent[part] += seconds
+
+
+def timed(part: str, func: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+    """Wraps coroutine function ``func`` so its time is recorded as ``part``."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            record(part, time.perf_counter() - start)
+
+    return wrapper
+
+
+class Stats:
+    """Counters, phase totals and a latency ring buffer for one listener or command."""
+
+    __slots__ = ("calls", "errors", "total", "phases", "samples")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.samples: deque[float] = deque(maxlen=WINDOW)
+
+    def add(self, run: Run) -> None:
+        breakdown = run.breakdown()
+        self.calls += 1
+        self.errors += run.failed
+        self.total += breakdown["total"]
+        for phase in PHASES:
+            self.phases[phase] += breakdown[phase]
+        self.samples.append(breakdown["total"])
+
+    def percentile(self, q: float) -> float:
+        """Latency at quantile ``q`` over the last :data:`WINDOW` calls."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+@dataclass
+class Stall:
+    started: float
+    duration: float
+    stack: str
+
+
+class StallWatchdog:
+    """Thread that captures the loop thread's stack when the loop stops answering."""
+
+    def __init__(self, threshold: float = STALL_THRESHOLD, keep: int = 20):
+        self.threshold = threshold
+        self.stalls: deque[Stall] = deque(maxlen=keep)
+        self.count = 0
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread: Optional[int] = None
+        self.last_beat = time.monotonic()
+        self.current: Optional[Stall] = None
+        self.stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
+        self.stopped.clear()
+        self.beat()
+        self.thread = threading.Thread(target=self.watch, name="stall-watchdog", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+    def beat(self) -> None:
+        now = time.monotonic()
+        if self.current is not None:
+            self.current.duration = now - self.last_beat
+            self.current = None
+        self.last_beat = now
+        if not self.stopped.is_set():
+            self.loop.call_later(self.threshold / 4, self.beat)
+
+    def watch(self) -> None:
+        while not self.stopped.wait(self.threshold / 4):
+            blocked = time.monotonic() - self.last_beat
+            if blocked < self.threshold or self.current is not None:
+                continue
+            frame = sys._current_frames().get(self.loop_thread)
+            stack = "".join(traceback.format_stack(frame)) if frame else ""
+            self.current = Stall(time.time() - blocked, blocked, stack)
+            self.stalls.append(self.current)
+            self.count += 1
+
+
+@dataclass
+class Capture:
+    """cProfile results of one slow invocation."""
+    started: float
+    breakdown: dict[str, float]
+    stats: pstats.Stats
+
+    @property
+    def duration(self) -> float:
+        return self.breakdown["total"]
+
+    def report(self, limit: int = 20, sort: str = "cumulative") -> str:
+        stream = io.StringIO()
+        self.stats.stream = stream
+        self.stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def top(self, limit: int = 10) -> list[tuple[float, int, str]]:
+        """
+        (own seconds, calls, "function (file:line)") of the functions that spent
+        the most time themselves; cumulative time is dominated by the loop's
+        own frames, which wrap everything.
+        """
+        rows = sorted(self.stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+        return [
+            (own, calls, f"{func} ({os.path.basename(file)}:{line})")
+            for (file, line, func), (_, calls, own, _, _) in rows
+        ]
+
+    def dump(self) -> bytes:
+        """The pstats file contents, readable with ``pstats.Stats(path)`` or snakeviz."""
+        return marshal.dumps(self.stats.stats)
+
+
+class Profiler:
+    """
+    cProfile for opted-in commands, keeping the slowest invocations.
+
+    cProfile follows the loop thread, not the task, so a capture also holds
+    whatever else ran while the command was awaiting; only one invocation
+    is profiled at a time.
+    """
+
+    def __init__(self, keep: int = 5):
+        self.keep = keep
+        self.targets: set[str] = set()
+        self.captures: dict[str, list[Capture]] = {}
+        self.active = False
+
+    def begin(self, name: str) -> Optional[cProfile.Profile]:
+        if name not in self.targets or self.active:
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # another profiler (a debugger, jishaku's) already owns the thread
+            return None
+        self.active = True
+        return profile
+
+    def end(self, name: str, profile: cProfile.Profile, run: Run, stats: Optional[Stats]) -> None:
+        profile.disable()
+        self.active = False
+        breakdown = run.breakdown()
+        captures = self.captures.setdefault(name, [])
+        # the slowest 1%: at or above the p99 of what ran so far, and among the slowest kept
+        cutoff = stats.percentile(0.99) if stats else 0.0
+        if breakdown["total"] < cutoff or (len(captures) >= self.keep and breakdown["total"] <= captures[-1].duration):
+            return
+        captures.append(Capture(time.time() - breakdown["total"], breakdown, pstats.Stats(profile)))
+        captures.sort(key=lambda capture: capture.duration, reverse=True)
+        del captures[self.keep:]
+
+
+class PerfRecorder:
+    """Per-listener and per-command timings; see the module docstring."""
+
+    def __init__(self):
+        self.listeners: dict[str, Stats] = {}
+        self.commands: dict[str, Stats] = {}
+        self.watchdog = StallWatchdog()
+        self.profiler = Profiler()
+
+    @contextmanager
+    def track(self, table: dict, name: str) -> Iterator[Run]:
+        run = Run()
+        token = _current.set(run)
+        try:
+            yield run
+        except asyncio.CancelledError:
+            raise
+        except BaseException:
+            run.failed = True
+            raise
+        finally:
+            _current.reset(token)
+            if run.finished is None:
+                run.finished = time.perf_counter()
+            stats = table.get(name)
+            if stats is None:
+                stats = table[name] = Stats()
+            stats.add(run)
+
+    def listener(self, event_name: str, coro) -> ContextManager[Run]:
+        return self.track(self.listeners, f"{event_name}:{getattr(coro, '__qualname__', coro)}")
+
+    @contextmanager
+    def command(self, qualified_name: str) -> Iterator[Run]:
+        profile = self.profiler.begin(qualified_name)
+        with self.track(self.commands, qualified_name) as run:
+            try:
+                yield run
+            finally:
+                if profile is not None:
+                    self.profiler.end(qualified_name, profile, run, self.commands.get(qualified_name))
+
+    def export(self, metrics) -> None:
+        """Adds the listener, command and stall series to a ``utils.health.Metrics``."""
+        for kind, table in (("listener", self.listeners), ("command", self.commands)):
+            for name, stats in table.items():
+                labels = {kind: name}
+                metrics.add(f"olympus_{kind}_calls_total", "counter", f"{kind.title()} runs.", stats.calls, **labels)
+                metrics.add(f"olympus_{kind}_errors_total", "counter", f"{kind.title()} runs that raised.",
+                            stats.errors, **labels)
+                metrics.add(f"olympus_{kind}_seconds_total", "counter", f"Time spent in the {kind}.",
+                            stats.total, **labels)
+                for phase in PHASES:
+                    metrics.add(f"olympus_{kind}_phase_seconds_total", "counter",
+                                f"Time spent in the {kind} by phase (checks, db, http, render, other).",
+                                stats.phases[phase], phase=phase, **labels)
+                for q in (0.5, 0.99):
+                    metrics.add(f"olympus_{kind}_latency_seconds", "gauge",
+                                f"{kind.title()} latency quantiles over the last {WINDOW} runs.",
+                                stats.percentile(q), quantile=q, **labels)
+        metrics.add("olympus_event_loop_stalls_total", "counter",
+                    f"Times the loop was blocked for over {self.watchdog.threshold}s.", self.watchdog.count)
@@ -0,0 +1,42 @@
+"""Gateway intents and member caching, chosen with ``CACHE_PROFILE``.
+
+``full`` (default)
+    every intent and every guild chunked at startup, so every member and
+    presence of every guild stays in memory.
+``balanced``
+    every intent, but no startup chunking: only the members Discord sends on
+    its own (online ones, voice, joins, command targets) are cached. Commands
+    that need a guild's whole member list chunk it on first use through
+    :func:`utils.Tools.chunk_check`.
+``lean``
+    ``balanced`` without the presences intent, the busiest gateway stream.
+    Member statuses read as offline and stream notifications stop.
+
+``python -m benchmarks.profile_bench`` compares memory and startup time.
+"""
+import discord
+
+from utils.config import CACHE_PROFILE
+
+__all__ = ("PROFILES", "cache_profile")
+
+PROFILES = ("full", "balanced", "lean")
+
+if CACHE_PROFILE not in PROFILES:
+    raise ValueError(f"CACHE_PROFILE must be one of {', '.join(PROFILES)}, not {CACHE_PROFILE!r}")
+
+
+def cache_profile(name: str = None) -> dict:
+    """Client keyword arguments for profile ``name`` (default: ``CACHE_PROFILE``)."""
+    name = name or CACHE_PROFILE
+    intents = discord.Intents.all()
+    if name == "lean":
+        intents.presences = False
+    return {
+        "intents": intents,
+        # joined keeps members fetched for converters and owner lookups, voice
+        # keeps voice channel member lists whole; what shrinks the cache is
+        # not chunking, which decides how many members arrive at all
+        "member_cache_flags": discord.MemberCacheFlags.from_intents(intents),
+        "chunk_guilds_at_startup": name == "full",
+    }
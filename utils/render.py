@@ -0,0 +1,532 @@
+"""Off-loop image rendering.
+
+Render jobs are declarative: a job name plus plain, picklable parameters
+(bytes, ints, strings, lists). Each job runs in a dedicated process pool and
+returns encoded image bytes, so Pillow work never holds the event loop.
+"""
+import asyncio
+import os
+import textwrap
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from io import BytesIO
+from typing import Optional
+
+import discord
+from PIL import Image, ImageDraw, ImageFilter, ImageOps
+
+from utils.assets import atlas
+from utils.perf import record
+
+__all__ = ("RenderService", "RenderTimeout", "renderer")
+
+
+class RenderTimeout(Exception):
+    """A render job did not finish within its time budget."""
+
+
+def _encode(img: Image.Image, format: str = "PNG", **kwargs) -> bytes:
+    buf = BytesIO()
+    img.save(buf, format, **kwargs)
+    return buf.getvalue()
+
+
+def _render_ship(author_avatar: bytes, user_avatar: bytes, author: str, user: str, rate: int) -> bytes:
+    red = (191, 15, 0, 255)
+    white = (255, 255, 255, 255)
+    tmpl = atlas.copy("./data/ship/Template.png")
+    fill = atlas.image("./data/ship/Tmpl_fill.png")
+    blank = Image.new('RGBA', tmpl.size, (255, 255, 255, 0))
+    fnt = atlas.font("./data/ship/font.ttf", 34)
+    draw = ImageDraw.Draw(blank)
+    for avatar, pos in ((author_avatar, (20, 50)), (user_avatar, (20, 312))):
+        avatar = Image.open(BytesIO(avatar)).convert('RGBA')
+        avatar = Image.alpha_composite(Image.new('RGBA', avatar.size, white), avatar)
+        tmpl.paste(avatar.resize((150, 150), Image.Resampling.LANCZOS), pos)
+    offset = (100 - rate) * 2
+    fill = fill.crop((0, offset, fill.width, fill.height))
+    blank.paste(fill, (tmpl.width - fill.width - 1, 154 + offset))
+    draw.text((20, 10), str(author), font=fnt, fill=red)
+    draw.text((20, 460), str(user), font=fnt, fill=red)
+    fnt = atlas.font("./data/ship/font.ttf", 80)
+    draw.text((330, 192), str(rate) + "%", font=fnt, fill=white)
+    return _encode(Image.alpha_composite(tmpl, blank))
+
+
+def _render_blackjack(hands: list, cards_path: str = "data/cards/") -> bytes:
+    bg = atlas.copy(os.path.join(cards_path, 'table.png'))
+    hands = [[atlas.image(os.path.join(cards_path, card)) for card in hand] for hand in hands]
+    bg_center_x = bg.size[0] // 2
+    bg_center_y = bg.size[1] // 2
+
+    img_w = hands[0][0].size[0]
+    img_h = hands[0][0].size[1]
+
+    start_y = bg_center_y - (((len(hands) * img_h) + ((len(hands) - 1) * 15)) // 2)
+
+    for hand in hands:
+        start_x = bg_center_x - (((len(hand) * img_w) + ((len(hand) - 1) * 10)) // 2)
+        for card in hand:
+            bg.alpha_composite(card, (start_x, start_y))
+            start_x += img_w + 10
+        start_y += img_h + 15
+
+    return _encode(bg)
+
+
+SLOT_ITEM = 180
+SLOT_SPEED = 6
+SLOT_FRAMES = SLOT_ITEM // SLOT_SPEED
+SLOT_ORIGIN = (25, 100)
+SLOT_TILE_CACHE = 512
+
+
+@lru_cache(maxsize=None)
+def _slot_strips(path: str) -> tuple:
+    """Palette, static facade frame and per-column facade slices, built once per process.
+
+    Only the reel window of the facade is translucent, so every frame is the
+    same pre-quantized facade with three reel tiles pasted into the window.
+    """
+    facade = atlas.image(f'{path}slot-face.png')
+    reel = atlas.image(f'{path}slot-reel.png')
+    rw = reel.width
+    x0, y0, x1, y1 = facade.getchannel("A").point(lambda v: 255 if v < 255 else 0).getbbox()
+
+    base = Image.alpha_composite(Image.new('RGBA', facade.size, (255, 255, 255, 255)), facade)
+    sample = Image.new('RGB', (base.width + rw, max(base.height, reel.height)), (255, 255, 255))
+    sample.paste(base.convert('RGB'), (0, 0))
+    sample.paste(reel.convert('RGB'), (base.width, 0))
+    palette = sample.quantize(256, method=Image.Quantize.MEDIANCUT)
+
+    columns = []
+    for c in range(3):
+        left = SLOT_ORIGIN[0] + rw * c
+        box = (max(left, x0), y0, min(left + rw, x1), y1)
+        columns.append((box, left, facade.crop(box)))
+    base = base.convert('RGB').quantize(palette=palette, dither=Image.Dither.NONE)
+    return palette, base, tuple(columns)
+
+
+@lru_cache(maxsize=SLOT_TILE_CACHE)
+def _slot_tile(path: str, column: int, offset: int) -> Image.Image:
+    """One quantized reel column, scrolled by ``offset`` and seen through the facade."""
+    palette, _, columns = _slot_strips(path)
+    reel = atlas.image(f'{path}slot-reel.png')
+    (x0, y0, x1, y1), left, glass = columns[column]
+    top = y0 - (SLOT_ORIGIN[1] - offset)
+    tile = Image.new('RGBA', glass.size, (255, 255, 255, 255))
+    tile.alpha_composite(reel.crop((x0 - left, top, x1 - left, top + y1 - y0)))
+    tile.alpha_composite(glass)
+    return tile.convert('RGB').quantize(palette=palette, dither=Image.Dither.NONE)
+
+
+def _render_slots(s1: int, s2: int, s3: int, path: str = "data/pictures/") -> bytes:
+    _, base, columns = _slot_strips(path)
+
+    images = []
+    for i in range(1, SLOT_FRAMES + 1):
+        frame = base.copy()
+        for column, stop in enumerate((s1, s2, s3)):
+            box = columns[column][0]
+            frame.paste(_slot_tile(path, column, SLOT_SPEED * i * stop), box[:2])
+        images.append(frame)
+
+    # every frame shares one palette, so the encoder can skip re-quantizing
+    return _encode(images[0], "GIF", save_all=True, append_images=images[1:], duration=50, optimize=False)
+
+
+def _render_badges(badges: list, font_path: str, badge_size: int = 120, padding: int = 80,
+                   num_columns: int = 4, image_width: int = 960, image_height: int = 540) -> bytes:
+    img = Image.new('RGBA', (image_width, image_height), (255, 255, 255, 0))
+    draw = ImageDraw.Draw(img)
+    font = atlas.font(font_path, 25)
+
+    upper_y = (image_height // 4) - (badge_size // 2)
+    lower_y = (3 * image_height // 4) - (badge_size // 2)
+    x_positions = [padding + i * ((image_width - 2 * padding) // (num_columns - 1)) for i in range(num_columns)]
+
+    for i, (name, data) in enumerate(badges):
+        y = upper_y if i < num_columns else lower_y
+        x = x_positions[i % num_columns]
+        badge_img = Image.open(BytesIO(data)).convert('RGBA').resize((badge_size, badge_size))
+        img.paste(badge_img, (x - badge_size // 2, y), badge_img)
+        text_bbox = draw.textbbox((0, 0), name, font=font)
+        text_width = (text_bbox[2] - text_bbox[0]) + 2
+        draw.text((x - text_width // 2, y + badge_size + 5), name, fill=(255, 0, 0), font=font)
+
+    return _encode(img)
+
+
+def _render_wordle(guesses: list, font_path: str, text_size: int = 55) -> bytes:
+    border, sq, space = 40, 100, 10
+    width = border * 2 + sq * 5 + space * 4
+    height = border * 2 + sq * 6 + space * 5
+    lgray = (198, 201, 205)
+    font = atlas.font(font_path, text_size)
+
+    with Image.new("RGB", (width, height), (255, 255, 255)) as img:
+        cursor = ImageDraw.Draw(img)
+
+        x = y = border
+        for i in range(6):
+            for j in range(5):
+                try:
+                    letter = guesses[i][j]
+                    color = tuple(letter["color"])
+                    act_letter = letter["letter"]
+                except (IndexError, KeyError):
+                    cursor.rectangle((x, y, x + sq, y + sq), outline=lgray, width=4)
+                else:
+                    cursor.rectangle((x, y, x + sq, y + sq), width=0, fill=color)
+                    cursor.text(
+                        (x + sq / 2, y + sq / 2),
+                        act_letter.upper(),
+                        font=font,
+                        anchor="mm",
+                        fill=(255, 255, 255),
+                    )
+
+                x += sq + space
+            x = border
+            y += sq + space
+
+        return _encode(img)
+
+
+TWENTY_48_FRAMES = 64
+
+_twenty_48_backgrounds: dict = {}
+_twenty_48_tiles: dict = {}
+_twenty_48_frames: "OrderedDict[object, tuple]" = OrderedDict()
+
+
+def _twenty_48_tile(style: dict, style_key: str, tile: str) -> Image.Image:
+    sprite = _twenty_48_tiles.get((style_key, tile))
+    if sprite is None:
+        sq = style["square"]
+        color, fsize = style["colors"].get(tile)
+        sprite = Image.new("RGB", (sq + 1, sq + 1), tuple(style["bg"]))
+        cursor = ImageDraw.Draw(sprite)
+        cursor.rounded_rectangle((0, 0, sq, sq), radius=5, width=0, fill=tuple(color))
+        if tile != "0":
+            text_fill = style["dark"] if tile in ("2", "4") else style["light"]
+            cursor.text(
+                (sq / 2, sq / 2),
+                tile,
+                font=atlas.font(style["font"], fsize),
+                anchor="mm",
+                fill=tuple(text_fill),
+            )
+        sprite = _twenty_48_tiles[(style_key, tile)] = sprite
+    return sprite
+
+
+def _twenty_48_origin(style: dict, row: int, col: int) -> tuple[int, int]:
+    step = style["square"] + style["space"]
+    return style["border"] + col * step, style["border"] + row * step
+
+
+def _render_twenty_48(board: list, style: dict, key=None) -> bytes:
+    """Draw a 2048 board, repainting only the tiles that changed since this game's last frame."""
+    style_key = repr(style)
+    empty = [[0] * 4 for _ in range(4)]
+
+    frame = _twenty_48_frames.pop(key, None) if key is not None else None
+    if frame is not None and frame[0] == style_key:
+        _, img, previous = frame
+    else:
+        background = _twenty_48_backgrounds.get(style_key)
+        if background is None:
+            length = style["border"] * 2 + style["square"] * 4 + style["space"] * 3
+            background = Image.new("RGB", (length, length), tuple(style["bg"]))
+            for row in range(4):
+                for col in range(4):
+                    background.paste(_twenty_48_tile(style, style_key, "0"), _twenty_48_origin(style, row, col))
+            _twenty_48_backgrounds[style_key] = background
+        img, previous = background.copy(), empty
+
+    for row in range(4):
+        for col in range(4):
+            if board[row][col] != previous[row][col]:
+                sprite = _twenty_48_tile(style, style_key, str(board[row][col]))
+                img.paste(sprite, _twenty_48_origin(style, row, col))
+
+    if key is not None:
+        _twenty_48_frames[key] = (style_key, img, [list(row) for row in board])
+        while len(_twenty_48_frames) > TWENTY_48_FRAMES:
+            _twenty_48_frames.popitem(last=False)
+    return _encode(img)
+
+
+def _render_typeracer(text: str, font_path: str) -> bytes:
+    text = "\n".join(textwrap.wrap(text, width=25))
+
+    font = atlas.font(font_path, 30)
+    # getsize_multiline was removed in Pillow 10
+    _, _, x, y = ImageDraw.Draw(Image.new("RGB", (1, 1))).multiline_textbbox((0, 0), text, font=font)
+
+    with Image.new("RGB", (x + 20, y + 30), (0, 0, 30)) as image:
+        cursor = ImageDraw.Draw(image)
+        cursor.multiline_text((10, 10), text, font=font, fill=(220, 200, 220))
+        return _encode(image)
+
+
+def _render_country(path: str, blur: int = 0, invert: bool = False) -> bytes:
+    """
+    Flag/outline variant for the country guesser, palette-encoded to stay small
+    in the game's byte cache. Blurred variants are rendered at half size since a
+    blur leaves no detail worth the pixels.
+    """
+    with Image.open(path) as src:
+        img = src.convert("RGBA")
+    if blur:
+        img = img.reduce(2).filter(ImageFilter.GaussianBlur(blur / 2))
+    if invert:
+        r, g, b, a = img.split()
+        rgb = ImageOps.invert(Image.merge("RGB", (r, g, b)))
+        img = Image.merge("RGBA", rgb.split() + (a,))
+    return _encode(img.quantize(256, method=Image.Quantize.FASTOCTREE))
+
+
+CHESS_LIGHT = (240, 217, 181)
+CHESS_DARK = (181, 136, 99)
+CHESS_HIGHLIGHT = (205, 210, 106)
+CHESS_CHECK = (235, 97, 80)
+CHESS_FONT = "utils/arial.ttf"
+
+# piece outlines on a 100x100 grid: ("polygon"|"ellipse"|"rectangle", points, ink)
+# ink 255 draws the silhouette and 0 cuts it back out
+_PIECE_SHAPES = {
+    "p": [
+        ("ellipse", (38, 22, 62, 46), 255),
+        ("polygon", ((34, 80), (42, 48), (58, 48), (66, 80)), 255),
+        ("ellipse", (34, 44, 66, 54), 255),
+    ],
+    "r": [
+        ("rectangle", (32, 38, 68, 80), 255),
+        ("rectangle", (26, 18, 74, 40), 255),
+        ("rectangle", (37, 18, 44, 28), 0),
+        ("rectangle", (56, 18, 63, 28), 0),
+    ],
+    "n": [
+        ("polygon", ((30, 80), (34, 58), (46, 46), (30, 48), (24, 40), (42, 20), (50, 12), (54, 20),
+                     (64, 24), (72, 42), (72, 80)), 255),
+        ("ellipse", (44, 26, 50, 32), 0),
+    ],
+    "b": [
+        ("polygon", ((36, 80), (44, 50), (56, 50), (64, 80)), 255),
+        ("ellipse", (36, 20, 64, 56), 255),
+        ("ellipse", (45, 8, 55, 18), 255),
+        ("polygon", ((50, 30), (54, 27), (62, 38), (58, 41)), 0),
+    ],
+    "q": [
+        ("polygon", ((28, 80), (20, 30), (36, 54), (40, 22), (50, 50), (60, 22), (64, 54), (80, 30),
+                     (72, 80)), 255),
+        ("ellipse", (15, 24, 25, 34), 255),
+        ("ellipse", (35, 16, 45, 26), 255),
+        ("ellipse", (55, 16, 65, 26), 255),
+        ("ellipse", (75, 24, 85, 34), 255),
+    ],
+    "k": [
+        ("polygon", ((30, 80), (32, 48), (68, 48), (70, 80)), 255),
+        ("ellipse", (34, 26, 66, 54), 255),
+        ("rectangle", (46, 4, 54, 30), 255),
+        ("rectangle", (38, 11, 62, 18), 255),
+    ],
+}
+
+_chess_sprites: dict = {}
+_chess_boards: dict = {}
+
+
+def _chess_sprite(symbol: str, size: int) -> Image.Image:
+    """One piece from the atlas, drawn 4x oversampled and cached per square size."""
+    sprite = _chess_sprites.get((symbol, size))
+    if sprite is None:
+        scale = size * 4 / 100
+        mask = Image.new("L", (size * 4, size * 4), 0)
+        cursor = ImageDraw.Draw(mask)
+        for kind, points, ink in _PIECE_SHAPES[symbol.lower()] + [("rectangle", (22, 78, 78, 90), 255)]:
+            if kind == "polygon":
+                getattr(cursor, kind)([(x * scale, y * scale) for x, y in points], fill=ink)
+            else:
+                getattr(cursor, kind)([v * scale for v in points], fill=ink)
+
+        white = symbol.isupper()
+        fill = (250, 250, 250) if white else (45, 45, 45)
+        edge = (20, 20, 20) if white else (225, 225, 225)
+        outline = mask.filter(ImageFilter.MaxFilter(int(scale * 3) | 1))
+
+        big = Image.new("RGBA", mask.size, edge + (0,))
+        big.paste(edge + (255,), (0, 0), outline)
+        big.paste(fill + (255,), (0, 0), mask)
+        sprite = _chess_sprites[(symbol, size)] = big.resize((size, size), Image.Resampling.LANCZOS)
+    return sprite
+
+
+def _chess_board(size: int, flipped: bool) -> Image.Image:
+    board = _chess_boards.get((size, flipped))
+    if board is None:
+        board = Image.new("RGB", (size * 8, size * 8))
+        cursor = ImageDraw.Draw(board)
+        font = atlas.font(CHESS_FONT, max(10, size // 5))
+        for row in range(8):
+            for col in range(8):
+                light = (row + col) % 2 == 0
+                x, y = col * size, row * size
+                cursor.rectangle((x, y, x + size - 1, y + size - 1), fill=CHESS_LIGHT if light else CHESS_DARK)
+                label_fill = CHESS_DARK if light else CHESS_LIGHT
+                if col == 0:
+                    rank = row + 1 if flipped else 8 - row
+                    cursor.text((x + 3, y + 2), str(rank), font=font, fill=label_fill)
+                if row == 7:
+                    file = "hgfedcba"[col] if flipped else "abcdefgh"[col]
+                    cursor.text((x + size - 3, y + size - 2), file, font=font, fill=label_fill, anchor="rd")
+        board = _chess_boards[(size, flipped)] = board
+    return board
+
+
+def _render_chess(board_fen: str, last_move: Optional[list] = None, check: Optional[int] = None,
+                  flipped: bool = False, size: int = 64) -> bytes:
+    img = _chess_board(size, flipped).copy()
+
+    def origin(square: int) -> tuple[int, int]:
+        file, rank = square % 8, square // 8
+        if flipped:
+            return (7 - file) * size, rank * size
+        return file * size, (7 - rank) * size
+
+    overlay = ImageDraw.Draw(img)
+    for square, color in [(sq, CHESS_HIGHLIGHT) for sq in (last_move or ())] + (
+        [(check, CHESS_CHECK)] if check is not None else []
+    ):
+        x, y = origin(square)
+        overlay.rectangle((x, y, x + size - 1, y + size - 1), fill=color)
+
+    square = 56
+    for row in board_fen.split("/"):
+        for char in row:
+            if char.isdigit():
+                square += int(char)
+                continue
+            sprite = _chess_sprite(char, size)
+            img.paste(sprite, origin(square), sprite)
+            square += 1
+        square -= 16
+
+    return _encode(img)
+
+
+JOBS = {
+    "ship": _render_ship,
+    "blackjack": _render_blackjack,
+    "slots": _render_slots,
+    "badges": _render_badges,
+    "wordle": _render_wordle,
+    "twenty_48": _render_twenty_48,
+    "typeracer": _render_typeracer,
+    "country": _render_country,
+    "chess": _render_chess,
+}
+
+
+def _run_job(job: str, params: dict) -> bytes:
+    return JOBS[job](**params)
+
+
+def _init_worker() -> None:
+    """Decode the hot card, slot and ship assets once per worker process, and build the slot strips."""
+    cards = [os.path.join("data/cards", name) for name in os.listdir("data/cards") if name.endswith(".png")]
+    atlas.preload(
+        images=cards + [
+            "data/pictures/slot-face.png",
+            "data/pictures/slot-reel.png",
+            "data/ship/Template.png",
+            "data/ship/Tmpl_fill.png",
+        ],
+        fonts=[("./data/ship/font.ttf", 34), ("./data/ship/font.ttf", 80)],
+    )
+    _slot_strips("data/pictures/")
+
+
+class RenderService:
+    """Runs render jobs in a dedicated process pool with timeouts and metrics."""
+
+    def __init__(self, workers: Optional[int] = None, timeout: float = 20.0):
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.timeout = timeout
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.job_seconds: dict = {}
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        return self._pool
+
+    async def render(self, job: str, *, timeout: Optional[float] = None, **params) -> bytes:
+        """Run ``job`` with ``params`` off the event loop and return the encoded bytes."""
+        if job not in JOBS:
+            raise KeyError(f"Unknown render job: {job}")
+
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        start = time.perf_counter()
+        try:
+            future = loop.run_in_executor(self.pool, _run_job, job, params)
+            result = await asyncio.wait_for(future, timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise RenderTimeout(f"Render job {job!r} took longer than {timeout or self.timeout}s")
+        except BrokenProcessPool:
+            self.failed += 1
+            self._pool = None
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            record("render", time.perf_counter() - start)
+
+        self.completed += 1
+        count, total = self.job_seconds.get(job, (0, 0.0))
+        self.job_seconds[job] = (count + 1, total + time.perf_counter() - start)
+        return result
+
+    async def render_file(self, job: str, filename: str, **params) -> discord.File:
+        """Render ``job`` straight into a ``discord.File``."""
+        data = await self.render(job, **params)
+        return discord.File(BytesIO(data), filename)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_depth": self.in_flight,
+            "peak_queue_depth": self.peak_in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "avg_ms": {
+                job: round(total / count * 1000, 2)
+                for job, (count, total) in self.job_seconds.items()
+            },
+        }
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+renderer = RenderService()
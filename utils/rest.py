@@ -0,0 +1,312 @@
+"""Priority lanes for the bot's outgoing REST calls.
+
+Every ``bot.http.request`` goes through :class:`RestScheduler` (``bot.rest``),
+which files it under one of three lanes depending on what is making it:
+
+``security``
+    antinuke and the emergency command. Never queued and never shed: a
+    raid's bans and role strips go straight to discord.py's rate limiter.
+``moderation``
+    the default: commands, automod, tasks, views, everything not listed.
+``cosmetic``
+    welcome messages, autoreact and owner-mention reactions, mention
+    replies and the music controller.
+
+Moderation and cosmetic calls share :data:`SLOTS` requests in flight,
+handed out in lane order, and cosmetic calls hold at most
+:data:`COSMETIC_SLOTS` of them, so reactions sleeping on their bucket
+can't crowd out a timeout. While security calls are going out, and for
+:data:`SECURITY_HOLD` seconds after the last one, no cosmetic call starts,
+which leaves Discord's global rate limit to the raid response.
+
+Under pressure the cosmetic lane gives way:
+
+- a call is shed, raising :class:`RequestShed`, when :data:`COSMETIC_BACKLOG`
+  calls are already waiting or once it has waited :data:`COSMETIC_DEADLINE`
+  seconds;
+- an edit queued behind another edit of the same message is folded into
+  it, and both callers get the result of the one PATCH that goes out.
+  ``Message.edit`` only sends the fields it was given, so the earlier
+  edit's fields are carried over unless the later one sets them too: the
+  PATCH sent is the full state both asked for. Edits uploading files are
+  never coalesced.
+
+The lane is a context variable. ``Olympus._run_event``, ``Olympus.invoke``
+and ``CommandTree._call`` (slash commands) set it from the listener's or
+command's module (:data:`MODULE_LANES`);
+anything else wraps its calls in ``with lane(COSMETIC):``. Lane depths and
+counters are in ``/metrics``.
+"""
+import asyncio
+import functools
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterator, Optional
+
+import discord
+
+__all__ = (
+    "SECURITY", "MODERATION", "COSMETIC", "LANES", "MODULE_LANES", "SLOTS", "COSMETIC_SLOTS",
+    "COSMETIC_BACKLOG", "COSMETIC_DEADLINE", "SECURITY_HOLD",
+    "RequestShed", "lane", "lane_for", "RestScheduler",
+)
+
+SECURITY, MODERATION, COSMETIC = range(3)
+LANES = ("security", "moderation", "cosmetic")
+
+# module (or package) -> lane; the rest run in MODERATION
+MODULE_LANES = {
+    "cogs.antinuke": SECURITY,
+    "cogs.commands.emergency": SECURITY,
+    "cogs.events.autoreact": COSMETIC,
+    "cogs.events.react": COSMETIC,
+    "cogs.events.greet2": COSMETIC,
+    "cogs.events.mention": COSMETIC,
+}
+
+# moderation and cosmetic calls in flight; well under the global 50 requests/s
+SLOTS = 32
+COSMETIC_SLOTS = 8
+COSMETIC_BACKLOG = 256
+COSMETIC_DEADLINE = 10.0
+SECURITY_HOLD = 2.0
+
+# the route of Message.edit, the only cosmetic call that is coalesced (JSON bodies only)
+MESSAGE_EDIT = "/channels/{channel_id}/messages/{message_id}"
+
+
+class RequestShed(discord.ClientException):
+    """A cosmetic REST call dropped because the scheduler is under pressure."""
+
+
+_lane: ContextVar[int] = ContextVar("rest_lane", default=MODERATION)
+
+
+@contextmanager
+def lane(value: int) -> Iterator[None]:
+    """Sends the REST calls made inside the block (and tasks started there) in lane ``value``."""
+    token = _lane.set(value)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+@functools.lru_cache(maxsize=None)
+def lane_for(module: Optional[str]) -> int:
+    """The lane for code defined in ``module``."""
+    for prefix, value in MODULE_LANES.items():
+        if module == prefix or (module or "").startswith(prefix + "."):
+            return value
+    return MODERATION
+
+
+class Ticket:
+    """A call waiting for a slot."""
+
+    __slots__ = ("lane", "key", "payload", "enqueued", "granted", "result", "timer")
+
+    def __init__(self, lane: int, key: Optional[str] = None, payload: Optional[dict] = None):
+        loop = asyncio.get_running_loop()
+        self.lane = lane
+        # "PATCH <url>" for message edits that can be coalesced, and their JSON body
+        self.key = key
+        self.payload = payload
+        self.enqueued = time.monotonic()
+        # None once the call may go out, or the Ticket of the edit that replaced it
+        self.granted: asyncio.Future = loop.create_future()
+        # what replaced edits wait on; only made when one does
+        self.result: Optional[asyncio.Future] = None
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    def settle(self, result: Any = None, exception: Optional[BaseException] = None) -> None:
+        if self.result is None or self.result.done():
+            return
+        if exception is not None:
+            self.result.set_exception(exception)
+        else:
+            self.result.set_result(result)
+
+
+class RestScheduler:
+    """Lanes in front of ``HTTPClient.request``; see the module docstring."""
+
+    def __init__(self, send: Callable[..., Awaitable], slots: int = SLOTS, cosmetic_slots: int = COSMETIC_SLOTS):
+        self.send = send
+        self.slots = slots
+        self.cosmetic_slots = cosmetic_slots
+        self.waiting: list[deque[Ticket]] = [deque() for _ in LANES]
+        self.in_flight = [0] * len(LANES)
+        # the queued edit of each message, for coalescing
+        self.edits: dict[str, Ticket] = {}
+        self.security_until = 0.0
+        self.wakeup: Optional[asyncio.TimerHandle] = None
+        self.sent = [0] * len(LANES)
+        self.shed = [0] * len(LANES)
+        self.coalesced = [0] * len(LANES)
+        self.waited = [0.0] * len(LANES)
+
+    def depth(self, lane: int) -> int:
+        return len(self.waiting[lane])
+
+    async def request(self, route, **kwargs) -> Any:
+        """Stands in for ``HTTPClient.request``: waits for a slot in the caller's lane, then sends."""
+        current = _lane.get()
+        if current == SECURITY:
+            return await self.send_security(route, **kwargs)
+
+        ticket = self.enqueue(current, route, kwargs)
+        try:
+            newer = await ticket.granted
+        except RequestShed as exc:
+            ticket.settle(exception=exc)
+            raise
+        except asyncio.CancelledError:
+            self.abandon(ticket)
+            raise
+        if newer is not None:
+            return await self.follow(ticket, newer)
+
+        self.sent[current] += 1
+        try:
+            result = await self.send(route, **kwargs)
+        except BaseException as exc:
+            ticket.settle(exception=exc)
+            raise
+        finally:
+            self.release(current)
+        ticket.settle(result)
+        return result
+
+    async def send_security(self, route, **kwargs) -> Any:
+        self.in_flight[SECURITY] += 1
+        self.sent[SECURITY] += 1
+        try:
+            return await self.send(route, **kwargs)
+        finally:
+            self.in_flight[SECURITY] -= 1
+            self.security_until = time.monotonic() + SECURITY_HOLD
+            self.grant()
+
+    def enqueue(self, current: int, route, kwargs: dict) -> Ticket:
+        queue = self.waiting[current]
+        if current != COSMETIC:
+            ticket = Ticket(current)
+            queue.append(ticket)
+            self.grant()
+            return ticket
+
+        key = None
+        if route.method == "PATCH" and route.path == MESSAGE_EDIT and not kwargs.get("files") and "form" not in kwargs:
+            key = f"PATCH {route.url}"
+        ticket = Ticket(current, key, kwargs.get("json") or {})
+        older = self.edits.get(key) if key else None
+        if older is not None:
+            # edits only send the fields they change: keep the older edit's unless this one overrides them
+            ticket.payload = kwargs["json"] = {**older.payload, **ticket.payload}
+            self.dequeue(older)
+            ticket.result = asyncio.get_running_loop().create_future()
+            older.granted.set_result(ticket)
+            self.coalesced[current] += 1
+        elif len(queue) >= COSMETIC_BACKLOG:
+            self.shed[current] += 1
+            raise RequestShed(f"{route.method} {route.path}: {len(queue)} cosmetic calls already waiting")
+        if key:
+            self.edits[key] = ticket
+        ticket.timer = asyncio.get_running_loop().call_later(COSMETIC_DEADLINE, self.expire, ticket)
+        queue.append(ticket)
+        self.grant()
+        return ticket
+
+    def dequeue(self, ticket: Ticket) -> None:
+        """Takes a ticket out of its queue without granting it."""
+        try:
+            self.waiting[ticket.lane].remove(ticket)
+        except ValueError:
+            pass
+        self.forget(ticket)
+
+    def forget(self, ticket: Ticket) -> None:
+        if ticket.timer is not None:
+            ticket.timer.cancel()
+        if ticket.key and self.edits.get(ticket.key) is ticket:
+            del self.edits[ticket.key]
+
+    def expire(self, ticket: Ticket) -> None:
+        if ticket.granted.done():
+            return
+        self.dequeue(ticket)
+        self.shed[ticket.lane] += 1
+        ticket.granted.set_exception(RequestShed(f"waited over {COSMETIC_DEADLINE:g}s for a cosmetic slot"))
+
+    def abandon(self, ticket: Ticket) -> None:
+        """Cleans up after a caller cancelled while waiting."""
+        granted = ticket.granted
+        if not granted.done() or granted.cancelled():
+            self.dequeue(ticket)
+        elif granted.exception() is None and granted.result() is None:
+            # the slot was handed over just before the cancellation landed
+            self.release(ticket.lane)
+        ticket.settle(exception=RequestShed("the edit this one was merged into was cancelled"))
+
+    async def follow(self, ticket: Ticket, newer: Ticket) -> Any:
+        """Waits for the edit that replaced ``ticket`` and passes its outcome on."""
+        try:
+            result = await asyncio.shield(newer.result)
+        except asyncio.CancelledError:
+            # nobody reads the outcome now; retrieve it so asyncio doesn't warn
+            newer.result.add_done_callback(lambda future: future.cancelled() or future.exception())
+            ticket.settle(exception=RequestShed("the edit this one was merged into was cancelled"))
+            raise
+        except BaseException as exc:
+            ticket.settle(exception=exc)
+            raise
+        ticket.settle(result)
+        return result
+
+    def free(self, current: int, now: float) -> bool:
+        if self.in_flight[MODERATION] + self.in_flight[COSMETIC] >= self.slots:
+            return False
+        if current == COSMETIC:
+            return (self.in_flight[COSMETIC] < self.cosmetic_slots
+                    and not self.in_flight[SECURITY] and now >= self.security_until)
+        return True
+
+    def grant(self) -> None:
+        """Hands free slots to waiting calls, moderation first."""
+        now = time.monotonic()
+        for current in (MODERATION, COSMETIC):
+            queue = self.waiting[current]
+            while queue and self.free(current, now):
+                ticket = queue.popleft()
+                self.forget(ticket)
+                self.in_flight[current] += 1
+                self.waited[current] += now - ticket.enqueued
+                ticket.granted.set_result(None)
+        # cosmetic calls held back by a security burst need a nudge once it's over
+        if self.waiting[COSMETIC] and not self.in_flight[SECURITY] and now < self.security_until and self.wakeup is None:
+            self.wakeup = asyncio.get_running_loop().call_later(self.security_until - now, self.wake)
+
+    def wake(self) -> None:
+        self.wakeup = None
+        self.grant()
+
+    def release(self, current: int) -> None:
+        self.in_flight[current] -= 1
+        self.grant()
+
+    def export(self, metrics) -> None:
+        """Adds the per-lane series to a ``utils.health.Metrics``."""
+        for index, name in enumerate(LANES):
+            metrics.add("olympus_rest_requests_total", "counter", "REST calls sent, by lane.",
+                        self.sent[index], lane=name)
+            metrics.add("olympus_rest_in_flight", "gauge", "REST calls awaiting Discord, by lane.",
+                        self.in_flight[index], lane=name)
+            metrics.add("olympus_rest_wait_seconds_total", "counter", "Time REST calls spent waiting for a slot.",
+                        self.waited[index], lane=name)
+            metrics.add("olympus_rest_shed_total", "counter", "REST calls dropped under pressure.",
+                        self.shed[index], lane=name)
+            metrics.add("olympus_rest_coalesced_total", "counter", "Message edits merged into a later edit.",
+                        self.coalesced[index], lane=name)
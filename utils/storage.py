@@ -0,0 +1,272 @@
+"""Where each module's SQLite tables live.
+
+Every cog opens its database through :func:`connect` with the module's
+historical path (``db/afk.db``, ``db/anti.db`` ...). The storage mode decides
+which physical file that path maps to:
+
+``files`` (default)
+    one file per module, exactly as before.
+``single``
+    every module in ``db/olympus.db``; one WAL, one fsync stream and one page
+    cache for everything a message touches.
+``sharded``
+    modules grouped by access pattern into a few files (see :data:`SHARDS`),
+    so the per-message reads share a file without every write contending on
+    one lock.
+
+The mode comes from ``STORAGE_MODE`` in the environment (see ``utils.config``).
+Table names are unique across modules, so merged files need no renaming.
+
+In the merged modes a merged file is opened once, not on every ``connect``:
+connections left by ``async with`` blocks wait in a pool of up to
+:data:`POOL_SIZE` per file for the next one. ``Olympus.close`` shuts them
+down with :func:`close_pool`.
+
+``python -m utils.storage migrate single|sharded`` brings the per-module files
+and the merged ones up to the current schema, then copies the former into
+the latter; run it once with the bot stopped, then start it with the matching
+``STORAGE_MODE``.
+"""
+import asyncio
+import os
+import sqlite3
+import sys
+import time
+from typing import Optional, Union
+
+import aiosqlite
+
+from utils.config import STORAGE_MODE
+from utils.perf import record
+
+__all__ = (
+    "MODES", "SINGLE_PATH", "SHARDS", "POOL_SIZE", "resolve", "shared", "connect", "close_pool", "migrate_storage",
+)
+
+MODES = ("files", "single", "sharded")
+SINGLE_PATH = "db/olympus.db"
+# idle connections kept per merged file
+POOL_SIZE = 4
+
+# merged file -> module files; anything not listed goes to the last shard
+SHARDS: dict[str, tuple[str, ...]] = {
+    # read on every command: prefix, no-prefix, blacklist and ignore checks
+    "db/core.db": (
+        "db/prefix.db", "db/np.db", "db/block.db", "db/ignore.db", "db/topcheck.db",
+    ),
+    # read on every message or audit-log event
+    "db/guard.db": (
+        "db/anti.db", "db/automod.db", "db/autoreact.db", "db/autoresponder.db", "db/blword.db",
+        "db/media.db", "db/afk.db", "db/emergency.db", "db/snipe.db",
+    ),
+    "db/features.db": (),
+}
+
+_shard_of = {module: shard for shard, modules in SHARDS.items() for module in modules}
+_default_shard = list(SHARDS)[-1]
+
+if STORAGE_MODE not in MODES:
+    raise ValueError(f"STORAGE_MODE must be one of {', '.join(MODES)}, not {STORAGE_MODE!r}")
+
+
+def resolve(path: str, mode: Optional[str] = None) -> str:
+    """The physical file holding the tables of module ``path``."""
+    mode = mode or STORAGE_MODE
+    if mode == "single":
+        return SINGLE_PATH
+    if mode == "sharded":
+        return _shard_of.get(os.path.normpath(path), _default_shard)
+    return path
+
+
+def shared(mode: Optional[str] = None) -> bool:
+    """Whether several modules share a file, so ``PRAGMA user_version`` can't version them."""
+    return (mode or STORAGE_MODE) != "files"
+
+
+class TimedConnection(aiosqlite.Connection):
+    """Reports the time spent opening and waiting on the connection to ``utils.perf``."""
+
+    async def _connect(self):
+        start = time.perf_counter()
+        try:
+            return await super()._connect()
+        finally:
+            record("db", time.perf_counter() - start)
+
+    async def _execute(self, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await super()._execute(fn, *args, **kwargs)
+        finally:
+            record("db", time.perf_counter() - start)
+
+
+# (merged file, connect kwargs) -> connections returned by async with blocks
+_idle: dict[tuple, list[TimedConnection]] = {}
+
+
+class PooledConnection:
+    """
+    What :func:`connect` returns for a merged file: awaited or entered, it
+    hands out an idle connection to that file, opening one only if none is
+    left. Leaving the ``async with`` block returns the connection to the
+    pool, rolled back like ``close`` would; awaited, it's the caller's to
+    close.
+    """
+
+    def __init__(self, key: tuple, connector, iter_chunk_size: int):
+        self.key = key
+        self.connector = connector
+        self.iter_chunk_size = iter_chunk_size
+        self.connection: Optional[TimedConnection] = None
+
+    async def acquire(self) -> TimedConnection:
+        idle = _idle.get(self.key)
+        if idle:
+            return idle.pop()
+        connection = TimedConnection(self.connector, self.iter_chunk_size)
+        # an idle connection's thread must not keep the process alive
+        connection._thread.daemon = True
+        return await connection
+
+    def __await__(self):
+        return self.acquire().__await__()
+
+    async def __aenter__(self) -> TimedConnection:
+        self.connection = await self.acquire()
+        return self.connection
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        connection, self.connection = self.connection, None
+        # closed inside the block
+        if not connection._running:
+            return
+        try:
+            if connection.in_transaction:
+                await connection.rollback()
+        except BaseException:
+            connection.stop()
+            raise
+        idle = _idle.setdefault(self.key, [])
+        if len(idle) < POOL_SIZE:
+            idle.append(connection)
+        else:
+            await connection.close()
+
+
+async def close_pool() -> None:
+    """Closes the idle connections to merged files."""
+    connections = [connection for idle in _idle.values() for connection in idle]
+    _idle.clear()
+    for connection in connections:
+        await connection.close()
+
+
+def connect(
+    path: str, *, mode: Optional[str] = None, iter_chunk_size: int = 64, **kwargs
+) -> Union[TimedConnection, PooledConnection]:
+    """
+    ``aiosqlite.connect`` for module ``path`` under the active storage mode.
+
+    Merged files run in WAL mode with ``synchronous=NORMAL``: commits append
+    to the log without an fsync each, and readers never block the writer.
+    Their connections are pooled, see :class:`PooledConnection`.
+    """
+    mode = mode or STORAGE_MODE
+    target = resolve(path, mode)
+    kwargs.setdefault("timeout", 30 if shared(mode) else 5)
+
+    def connector() -> sqlite3.Connection:
+        conn = sqlite3.connect(target, **kwargs)
+        if shared(mode):
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    if shared(mode):
+        key = (os.path.abspath(target), tuple(sorted(kwargs.items())))
+        return PooledConnection(key, connector, iter_chunk_size)
+    return TimedConnection(connector, iter_chunk_size)
+
+
+def _copy_module(target: sqlite3.Connection, source: str) -> dict[str, int]:
+    """Copies every table and index of ``source`` into ``target``; existing rows win."""
+    copied = {}
+    target.execute("ATTACH DATABASE ? AS src", (source,))
+    try:
+        (version,) = target.execute("PRAGMA src.user_version").fetchone()
+        objects = target.execute(
+            "SELECT type, name, sql FROM src.sqlite_master "
+            "WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' ORDER BY type = 'index'"
+        ).fetchall()
+        for kind, name, sql in objects:
+            sql = sql.replace(f"CREATE {kind.upper()} ", f"CREATE {kind.upper()} IF NOT EXISTS ", 1)
+            target.execute(sql)
+            if kind == "table":
+                # by name: a merged file created by the bot can order or add columns differently
+                existing = {row[1] for row in target.execute(f'PRAGMA main.table_info("{name}")')}
+                columns = ", ".join(
+                    f'"{row[1]}"' for row in target.execute(f'PRAGMA src.table_info("{name}")') if row[1] in existing
+                )
+                target.execute(f'INSERT OR IGNORE INTO main."{name}" ({columns}) SELECT {columns} FROM src."{name}"')
+                (copied[name],) = target.execute(f'SELECT COUNT(*) FROM src."{name}"').fetchone()
+        target.execute(
+            "INSERT OR REPLACE INTO schema_versions (module, version) VALUES (?, ?)",
+            (os.path.normpath(source), version),
+        )
+        target.commit()
+    finally:
+        target.execute("DETACH DATABASE src")
+    return copied
+
+
+async def migrate_storage(mode: str, modules: Optional[list[str]] = None) -> dict[str, dict[str, int]]:
+    """
+    One-shot copy of the per-module files into the ``mode`` layout.
+
+    Both layouts are migrated to the current schema first, so the copy never
+    meets a table with columns missing on either side. Safe to re-run: tables
+    are created only if missing and rows are inserted with ``OR IGNORE``.
+    The source files get their pending migrations but no other changes.
+    """
+    if mode not in ("single", "sharded"):
+        raise ValueError("can only migrate to 'single' or 'sharded'")
+    from utils.migrations import MIGRATIONS, migrate
+    if modules is None:
+        modules = list(MIGRATIONS)
+
+    for layout in ("files", mode):
+        versions = await migrate(layout)
+        if len(versions) < len(MIGRATIONS):
+            raise RuntimeError(f"{len(MIGRATIONS) - len(versions)} databases failed to migrate in {layout!r} mode")
+    await close_pool()
+    return await asyncio.to_thread(_copy_modules, mode, modules)
+
+
+def _copy_modules(mode: str, modules: list[str]) -> dict[str, dict[str, int]]:
+    report = {}
+    connections: dict[str, sqlite3.Connection] = {}
+    try:
+        for module in modules:
+            if not os.path.exists(module):
+                continue
+            target = resolve(module, mode)
+            conn = connections.get(target)
+            if conn is None:
+                conn = connections[target] = sqlite3.connect(target, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("CREATE TABLE IF NOT EXISTS schema_versions (module TEXT PRIMARY KEY, version INTEGER)")
+                conn.isolation_level = ""
+            report[module] = _copy_module(conn, module)
+    finally:
+        for conn in connections.values():
+            conn.close()
+    return report
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] != "migrate" or sys.argv[2] not in ("single", "sharded"):
+        sys.exit("usage: python -m utils.storage migrate single|sharded")
+    for module, tables in asyncio.run(migrate_storage(sys.argv[2])).items():
+        rows = ", ".join(f"{name}={count}" for name, count in tables.items())
+        print(f"{module} -> {resolve(module, sys.argv[2])}: {rows}")